@@ -0,0 +1,411 @@
+"""
+Benchmark harness: synthetic tenant data and timed endpoint scenarios.
+
+generate_tenant() builds one realistic tenant (stores, staff, clients, sales,
+pipelines, appointments and the populate_jewelry_data catalogue) with
+bulk_create in batches, so 100k clients / 500k sales finish in minutes on a
+local Postgres or SQLite. Signals are bypassed, so the rollup table is rebuilt
+at the end exactly as after a fresh deploy.
+
+run_scenarios() calls key endpoints in-process through DRF's APIClient as a
+user of the right role and records wall time and query count per call. Write
+scenarios (import, client create, reminder fan-out) run inside a transaction
+that is rolled back, so the dataset is the same for every scenario and run. The cache is cleared before every run, so timings and query
+counts are both for a cold cache.
+
+Results are plain JSON (see run_benchmarks) so two commits can be compared
+with compare_results().
+
+    python manage.py generate_benchmark_data --slug bench --clients 100000 --sales 500000 --stores 50
+    python manage.py run_benchmarks --slug bench --output before.json
+    python manage.py run_benchmarks --slug bench --compare before.json
+"""
+import csv
+import io
+import json
+import logging
+import random
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import datetime, time as dt_time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.clients.models import Appointment, Client
+from apps.sales.models import Sale, SalesPipeline
+from apps.stores.models import Store
+from apps.tenants.models import Tenant
+from apps.users.models import User
+from core.query_profiler_middleware import QueryProfile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+HISTORY_DAYS = 365
+
+FIRST_NAMES = ['Aarav', 'Vivaan', 'Aditya', 'Diya', 'Ananya', 'Ishaan', 'Kavya', 'Meera', 'Rohan', 'Saanvi',
+               'Arjun', 'Priya', 'Neha', 'Rahul', 'Sneha', 'Karthik', 'Lakshmi', 'Vikram', 'Pooja', 'Nikhil']
+LAST_NAMES = ['Sharma', 'Iyer', 'Patel', 'Reddy', 'Nair', 'Gupta', 'Menon', 'Rao', 'Shah', 'Kumar',
+              'Joshi', 'Pillai', 'Mehta', 'Das', 'Singh', 'Verma', 'Agarwal', 'Bose', 'Chopra', 'Kapoor']
+CITIES = [('Chennai', 'TN'), ('Bengaluru', 'KA'), ('Mumbai', 'MH'), ('Hyderabad', 'TG'), ('Kochi', 'KL'),
+          ('Ahmedabad', 'GJ'), ('Delhi', 'DL'), ('Pune', 'MH'), ('Coimbatore', 'TN'), ('Jaipur', 'RJ')]
+LEAD_SOURCES = ['walkin', 'referral', 'online', 'social_media', 'exhibition', 'website', 'whatsapp']
+COMMUNITIES = ['hindu', 'muslim', 'christian', 'jain', 'tamil', 'telugu', 'gujarati', 'marwari', 'other']
+STATUSES = [Client.Status.GENERAL] * 8 + [Client.Status.VIP] * 3 + [Client.Status.VVIP]
+STAGE_WEIGHTS = [
+    (SalesPipeline.Stage.INTERESTED, 25), (SalesPipeline.Stage.STORE_WALKIN, 15),
+    (SalesPipeline.Stage.NEGOTIATION, 15), (SalesPipeline.Stage.CLOSED_WON, 25),
+    (SalesPipeline.Stage.CLOSED_LOST, 15), (SalesPipeline.Stage.EXHIBITION, 5),
+]
+APPOINTMENT_STATUSES = ['scheduled', 'confirmed', 'completed', 'cancelled', 'no_show']
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create write created_at/updated_at values spread over the history window."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _bulk_insert(model, rows, batch_size, label, stdout=None):
+    """bulk_create an iterator of unsaved instances batch by batch; returns the created pks."""
+    pks, batch, started = [], [], time.monotonic()
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            pks.extend(obj.pk for obj in model.objects.bulk_create(batch))
+            batch = []
+    if batch:
+        pks.extend(obj.pk for obj in model.objects.bulk_create(batch))
+    if stdout:
+        stdout.write(f'  {label}: {len(pks)} rows in {time.monotonic() - started:.1f}s')
+    return pks
+
+
+@transaction.atomic
+def generate_tenant(slug, *, stores=5, sales_per_store=4, clients=10000, sales=20000, pipelines=20000,
+                    appointments=5000, seed=1, batch_size=DEFAULT_BATCH_SIZE, stdout=None):
+    """Create a synthetic tenant. Returns a summary of what was generated."""
+    if Tenant.objects.filter(slug=slug).exists():
+        raise ValueError(f'Tenant {slug!r} already exists; delete it or pick another slug')
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    started = time.monotonic()
+
+    def created_at():
+        return now - timedelta(seconds=rng.randint(0, HISTORY_DAYS * 86400))
+
+    tenant = Tenant.objects.create(name=f'Benchmark {slug}', slug=slug)
+    store_objs = Store.objects.bulk_create([
+        Store(
+            name=f'Store {i + 1}', code=f'{slug[:20]}-{i + 1}', address=f'{i + 1} Main Road',
+            city=CITIES[i % len(CITIES)][0], state=CITIES[i % len(CITIES)][1], tenant=tenant,
+        )
+        for i in range(stores)
+    ])
+
+    admin = User.objects.create_user(
+        username=f'{slug}_admin', password='benchmark', role=User.Role.BUSINESS_ADMIN, tenant=tenant,
+    )
+    staff = {}
+    for index, store in enumerate(store_objs):
+        manager = User.objects.create_user(
+            username=f'{slug}_manager_{index + 1}', password='benchmark', role=User.Role.MANAGER,
+            tenant=tenant, store=store,
+        )
+        sellers = User.objects.bulk_create([
+            User(
+                username=f'{slug}_sales_{index + 1}_{n + 1}', role=User.Role.INHOUSE_SALES,
+                tenant=tenant, store=store, manager=manager, password=admin.password,
+            )
+            for n in range(sales_per_store)
+        ])
+        staff[store.id] = (manager, sellers)
+
+    # Catalogue: the same jewellery set the demo command creates
+    call_command('populate_jewelry_data', tenant_id=tenant.id, store_id=store_objs[0].id, stdout=io.StringIO())
+
+    if stdout:
+        stdout.write(f'Tenant {slug} (id {tenant.id}): {stores} stores, {stores * (sales_per_store + 1) + 1} users')
+
+    owners, client_stores = [], []
+
+    def client_rows():
+        for i in range(clients):
+            store = store_objs[i % stores]
+            seller = rng.choice(staff[store.id][1])
+            city, state = rng.choice(CITIES)
+            created = created_at()
+            owners.append(seller.id)
+            client_stores.append(store.id)
+            yield Client(
+                first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                phone=f'9{tenant.id % 1000:03d}{i:06d}', city=city, state=state, country='India',
+                lead_source=rng.choice(LEAD_SOURCES), community=rng.choice(COMMUNITIES),
+                status=rng.choice(STATUSES),
+                tenant=tenant, store=store, created_by=seller, assigned_to=seller,
+                created_at=created, updated_at=created,
+            )
+
+    with explicit_timestamps(Client, Sale, SalesPipeline, Appointment):
+        client_ids = _bulk_insert(Client, client_rows(), batch_size, 'clients', stdout)
+        client_owner = dict(zip(client_ids, owners))
+        client_store = dict(zip(client_ids, client_stores))
+
+        def sale_rows():
+            for i in range(sales):
+                client_id = rng.choice(client_ids)
+                subtotal = Decimal(rng.randrange(5000, 500000, 500))
+                created = created_at()
+                yield Sale(
+                    order_number=f'{slug[:12]}-{i + 1:07d}', client_id=client_id,
+                    sales_representative_id=client_owner[client_id], store_id=client_store[client_id],
+                    status=rng.choice([Sale.Status.DELIVERED, Sale.Status.CONFIRMED, Sale.Status.PENDING]),
+                    subtotal=subtotal, total_amount=subtotal, paid_amount=subtotal, tenant=tenant,
+                    created_at=created, updated_at=created, order_date=created,
+                )
+
+        def pipeline_rows():
+            stages, weights = zip(*STAGE_WEIGHTS)
+            for i in range(pipelines):
+                client_id = rng.choice(client_ids)
+                stage = rng.choices(stages, weights)[0]
+                value = Decimal(rng.randrange(5000, 800000, 500))
+                created = created_at()
+                won = stage == SalesPipeline.Stage.CLOSED_WON
+                yield SalesPipeline(
+                    title=f'Deal {i + 1}', client_id=client_id, sales_representative_id=client_owner[client_id],
+                    store_id=client_store[client_id],
+                    stage=stage, expected_value=value, actual_value=value if won else Decimal('0'),
+                    actual_close_date=timezone.localdate(created) if won else None,
+                    tenant=tenant, created_at=created, updated_at=created,
+                )
+
+        def appointment_rows():
+            for i in range(appointments):
+                client_id = rng.choice(client_ids)
+                day = timezone.localdate(now) + timedelta(days=rng.randint(-90, 30))
+                appointment = Appointment(
+                    client_id=client_id, tenant=tenant, date=day, time=dt_time(rng.randint(10, 19), rng.choice([0, 30])),
+                    purpose='Product viewing', status=rng.choice(APPOINTMENT_STATUSES), duration=60,
+                    created_by_id=client_owner[client_id], assigned_to_id=client_owner[client_id],
+                    created_at=now, updated_at=now,
+                )
+                appointment.reminder_due_at = appointment.compute_reminder_due_at()
+                yield appointment
+
+        _bulk_insert(Sale, sale_rows(), batch_size, 'sales', stdout)
+        _bulk_insert(SalesPipeline, pipeline_rows(), batch_size, 'pipelines', stdout)
+        _bulk_insert(Appointment, appointment_rows(), batch_size, 'appointments', stdout)
+
+    # bulk_create skipped the rollup signals: rebuild the tenant's rollups like a fresh deploy would
+    call_command('backfill_daily_rollups', tenant=tenant.id, stdout=io.StringIO())
+
+    summary = {
+        'tenant_id': tenant.id, 'slug': slug, 'stores': stores,
+        'users': User.objects.filter(tenant=tenant).count(), 'clients': len(client_ids),
+        'sales': sales, 'pipelines': pipelines, 'appointments': appointments,
+        'seconds': round(time.monotonic() - started, 1),
+    }
+    if stdout:
+        stdout.write(f"Done in {summary['seconds']}s")
+    return summary
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+def _import_csv(rows=200):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(['first_name', 'last_name', 'phone', 'city', 'lead_source', 'created_at'])
+    created_at = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
+    for i in range(rows):
+        writer.writerow([
+            f'Import{i}', 'Benchmark', f'8{int(time.time()) % 100000:05d}{i:04d}', 'Chennai', 'walkin', created_at,
+        ])
+    return buffer.getvalue().encode()
+
+
+def _import_request(context):
+    upload = SimpleUploadedFile('customers.csv', _import_csv(), content_type='text/csv')
+    return context['client'].post('/api/clients/import/', {'file': upload, 'confirm': 'true'}, format='multipart')
+
+
+def _create_client_request(context):
+    return context['client'].post('/api/clients/clients/', {
+        'first_name': 'Fanout', 'last_name': 'Benchmark', 'phone': f'7{int(time.time() * 1000) % 10 ** 9:09d}',
+        'city': 'Chennai', 'state': 'TN', 'catchment_area': 'Central', 'sales_person': 'Benchmark',
+        'reason_for_visit': 'purchase', 'lead_source': 'walkin', 'product_type': 'Necklace',
+        'customer_interests_input': [json.dumps({'category': 'Necklace', 'products': [{'product': 'Temple necklace', 'revenue': '50000'}]})],
+    }, format='json')
+
+
+def _dispatch_reminders(context):
+    from apps.notifications.reminders import dispatch_due_reminders
+    dispatch_due_reminders(now=timezone.now() + timedelta(days=1))
+
+
+def _business_dashboard_request(context):
+    # The monthly filter only applies with explicit year and (0-indexed) month;
+    # without them the view falls back to today. Use the last complete month,
+    # which the generated history always covers.
+    last_month = timezone.localdate().replace(day=1) - timedelta(days=1)
+    return context['client'].get('/api/tenants/dashboard/', {
+        'filter_type': 'monthly', 'year': last_month.year, 'month': last_month.month - 1,
+    })
+
+
+def _get(url):
+    return lambda context: context['client'].get(url)
+
+
+# (name, role, request callable, writes)
+SCENARIOS = [
+    ('clients.list', 'business_admin', _get('/api/clients/clients/'), False),
+    ('clients.list.manager', 'manager', _get('/api/clients/clients/'), False),
+    ('clients.search', 'business_admin', _get('/api/clients/clients/?search=Sharma'), False),
+    ('clients.export_csv', 'business_admin', _get('/api/clients/clients/export/csv/'), False),
+    ('clients.import', 'business_admin', _import_request, True),
+    ('clients.create_fanout', 'inhouse_sales', _create_client_request, True),
+    ('dashboard.business', 'business_admin', _business_dashboard_request, False),
+    ('dashboard.manager', 'manager', _get('/api/tenants/manager-dashboard/'), False),
+    ('analytics.business_admin', 'business_admin', _get('/api/analytics/business-admin/'), False),
+    ('team.performance', 'manager', _get('/api/sales-team/performance/'), False),
+    ('segmentation.analytics', 'business_admin', _get('/api/clients/segmentation/analytics/'), False),
+    ('appointments.slots', 'inhouse_sales', _get('/api/clients/appointments/slots/'), False),
+    ('notifications.reminder_fanout', None, _dispatch_reminders, True),
+]
+
+
+def _user_for(tenant, role):
+    users = User.objects.filter(tenant=tenant, is_active=True).select_related('tenant', 'store')
+    return users.filter(role=role).order_by('id').first()
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _run_once(scenario_call, context, writes):
+    # Every run starts cold: otherwise cached endpoints would time cache hits
+    # on all but the first run while still reporting the cold run's queries
+    cache.clear()
+    # Count through an execute wrapper: connection.queries caps at 9000 entries
+    # and stops being reliable once a heavy scenario has filled it
+    queries = QueryProfile()
+    with connection.execute_wrapper(queries):
+        started = time.perf_counter()
+        if writes:
+            with transaction.atomic():
+                response = scenario_call(context)
+                transaction.set_rollback(True)
+        else:
+            response = scenario_call(context)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    status = getattr(response, 'status_code', None)
+    if hasattr(response, 'streaming_content'):
+        # Streaming exports do their work while the body is consumed
+        with connection.execute_wrapper(queries):
+            started = time.perf_counter()
+            b''.join(response.streaming_content)
+            elapsed_ms += (time.perf_counter() - started) * 1000
+    return elapsed_ms, queries.count, status
+
+
+def run_scenarios(slug, repeat=3, only=None, stdout=None):
+    """Time every scenario `repeat` times against tenant `slug`. Returns the JSON-able result dict."""
+    tenant = Tenant.objects.get(slug=slug)
+    results = {}
+    with override_settings(ALLOWED_HOSTS=['*'], AUTOMATION_WORKFLOWS_ASYNC=False):
+        for name, role, scenario_call, writes in SCENARIOS:
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            client = APIClient()
+            if role:
+                user = _user_for(tenant, role)
+                if user is None:
+                    results[name] = {'skipped': f'no {role} user'}
+                    continue
+                client.force_authenticate(user=user)
+            context = {'client': client, 'tenant': tenant}
+            timings, query_counts, statuses = [], [], set()
+            for _ in range(repeat):
+                try:
+                    elapsed_ms, queries, status = _run_once(scenario_call, context, writes)
+                except Exception as e:
+                    logger.warning("Benchmark %s failed: %s", name, e, exc_info=True)
+                    results[name] = {'error': f'{type(e).__name__}: {e}'}
+                    break
+                timings.append(elapsed_ms)
+                query_counts.append(queries)
+                statuses.add(status)
+            else:
+                results[name] = {
+                    'runs': repeat,
+                    'median_ms': round(statistics.median(timings), 1),
+                    'min_ms': round(min(timings), 1),
+                    'max_ms': round(max(timings), 1),
+                    'queries': max(query_counts),
+                    'status': sorted(s for s in statuses if s is not None),
+                }
+            if stdout:
+                stdout.write(f'  {name}: {results[name]}')
+
+    return {
+        'commit': _git_commit(),
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'database': connection.vendor,
+        'dataset': {
+            'tenant': slug,
+            'stores': Store.objects.filter(tenant=tenant).count(),
+            'clients': Client.objects.filter(tenant=tenant).count(),
+            'sales': Sale.objects.filter(tenant=tenant).count(),
+            'pipelines': SalesPipeline.objects.filter(tenant=tenant).count(),
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline, current, tolerance=0.2):
+    """
+    Compare two run_scenarios() outputs. Returns [(name, field, before, after)]
+    for every scenario that got slower by more than `tolerance` (median_ms) or
+    runs more queries than before.
+    """
+    regressions = []
+    for name, after in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before or 'median_ms' not in before or 'median_ms' not in after:
+            continue
+        if after['median_ms'] > before['median_ms'] * (1 + tolerance):
+            regressions.append((name, 'median_ms', before['median_ms'], after['median_ms']))
+        if after['queries'] > before['queries']:
+            regressions.append((name, 'queries', before['queries'], after['queries']))
+    return regressions
@@ -0,0 +1,73 @@
+"""
+Rebuild DailySalesRollup rows from the raw sale, client, pipeline and appointment
+tables. Run once after deploying the rollup table, then nightly over the last
+few days as a safety net for writes that bypass model signals, e.g.:
+  15 3 * * * python manage.py backfill_daily_rollups --days 3
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from apps.analytics.rollups import BACKFILL_CHUNK_DAYS, local_day, rebuild_daily_rollups
+from apps.clients.models import Appointment, Client
+from apps.sales.models import Sale, SalesPipeline
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Backfill/rebuild the daily sales rollup table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=int, help='Only rebuild this tenant id')
+        parser.add_argument('--days', type=int, help='Only rebuild the last N days (including today)')
+        parser.add_argument('--start', help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last day to rebuild (YYYY-MM-DD, default: today)')
+
+    def _parse_day(self, value, name):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f'--{name} must be YYYY-MM-DD, got {value!r}')
+
+    def _first_activity_day(self, tenant):
+        """Earliest day with any rollup-relevant row for a tenant, or None."""
+        candidates = [
+            Sale.objects.filter(tenant=tenant).aggregate(first=Min('created_at'))['first'],
+            Client.objects.filter(tenant=tenant).aggregate(first=Min('created_at'))['first'],
+            SalesPipeline.objects.filter(tenant=tenant).aggregate(first=Min('created_at'))['first'],
+            Appointment.objects.filter(tenant=tenant).aggregate(first=Min('date'))['first'],
+        ]
+        days = [local_day(value) for value in candidates if value]
+        return min(days) if days else None
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        end_day = self._parse_day(options['end'], 'end') if options['end'] else today
+        if options['days']:
+            start_day = end_day - timedelta(days=options['days'] - 1)
+        elif options['start']:
+            start_day = self._parse_day(options['start'], 'start')
+        else:
+            start_day = None  # from each tenant's first activity
+
+        tenants = Tenant.objects.all()
+        if options['tenant']:
+            tenants = tenants.filter(id=options['tenant'])
+
+        total_rows = 0
+        for tenant in tenants:
+            first_day = start_day or self._first_activity_day(tenant)
+            if not first_day or first_day > end_day:
+                continue
+            tenant_rows = 0
+            chunk_start = first_day
+            while chunk_start <= end_day:
+                chunk_end = min(chunk_start + timedelta(days=BACKFILL_CHUNK_DAYS - 1), end_day)
+                tenant_rows += rebuild_daily_rollups(tenant.id, chunk_start, chunk_end)
+                chunk_start = chunk_end + timedelta(days=1)
+            total_rows += tenant_rows
+            self.stdout.write(f'  {tenant.name}: {tenant_rows} row(s) for {first_day} to {end_day}')
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {total_rows} daily rollup row(s).'))
@@ -0,0 +1,44 @@
+"""
+Generate a synthetic benchmark tenant (see apps/analytics/benchmarks.py), e.g.:
+  python manage.py generate_benchmark_data --slug bench --clients 100000 --sales 500000 --pipelines 500000 --stores 50
+Point DB_ENGINE/DB_NAME (or DATABASE_URL) at a scratch database first; never run
+this against production.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.benchmarks import DEFAULT_BATCH_SIZE, generate_tenant
+
+
+class Command(BaseCommand):
+    help = 'Create a synthetic tenant with configurable volumes for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--slug', default='benchmark', help='Slug of the tenant to create')
+        parser.add_argument('--stores', type=int, default=5)
+        parser.add_argument('--sales-per-store', type=int, default=4, help='In-house sales users per store')
+        parser.add_argument('--clients', type=int, default=10000)
+        parser.add_argument('--sales', type=int, default=20000)
+        parser.add_argument('--pipelines', type=int, default=20000)
+        parser.add_argument('--appointments', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=1, help='Random seed, so runs are reproducible')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['stores'] < 1 or options['sales_per_store'] < 1 or options['clients'] < 1:
+            raise CommandError('--stores, --sales-per-store and --clients must be at least 1')
+        try:
+            summary = generate_tenant(
+                options['slug'],
+                stores=options['stores'],
+                sales_per_store=options['sales_per_store'],
+                clients=options['clients'],
+                sales=options['sales'],
+                pipelines=options['pipelines'],
+                appointments=options['appointments'],
+                seed=options['seed'],
+                batch_size=options['batch_size'],
+                stdout=self.stdout,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Generated benchmark tenant {summary['slug']} (id {summary['tenant_id']})"))
@@ -0,0 +1,60 @@
+"""
+Rank API endpoints from the query profiler's JSONL samples
+(core/query_profiler_middleware.py, QUERY_PROFILER_ENABLED=True), e.g.:
+  python manage.py query_profile_report --sort db_ms --limit 20
+"""
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SORT_KEYS = ('db_ms', 'duration_ms', 'queries', 'samples')
+
+
+class Command(BaseCommand):
+    help = 'Rank sampled slow / N+1 API endpoints by database time, duration or query count'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=None, help='Sample file (default: QUERY_PROFILER_SAMPLE_FILE)')
+        parser.add_argument('--sort', choices=SORT_KEYS, default='db_ms', help='Rank by the total of this figure')
+        parser.add_argument('--limit', type=int, default=20)
+
+    def handle(self, *args, **options):
+        path = options['file'] or getattr(settings, 'QUERY_PROFILER_SAMPLE_FILE', None)
+        if not path:
+            raise CommandError('No sample file given and QUERY_PROFILER_SAMPLE_FILE is not set')
+
+        endpoints = defaultdict(lambda: {
+            'samples': 0, 'db_ms': 0.0, 'duration_ms': 0.0, 'queries': 0, 'max_queries': 0, 'repeated': {},
+        })
+        try:
+            with open(path) as sample_file:
+                for line in sample_file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    stats = endpoints[f"{record['method']} {record['route']}"]
+                    stats['samples'] += 1
+                    stats['db_ms'] += record['db_ms']
+                    stats['duration_ms'] += record['duration_ms']
+                    stats['queries'] += record['queries']
+                    stats['max_queries'] = max(stats['max_queries'], record['queries'])
+                    for duplicate in record.get('duplicates', []):
+                        seen = stats['repeated'].setdefault(duplicate['fingerprint'], [0, duplicate['sql']])
+                        seen[0] = max(seen[0], duplicate['count'])
+        except FileNotFoundError:
+            raise CommandError(f'Sample file {path} does not exist (is the profiler enabled?)')
+
+        ranked = sorted(endpoints.items(), key=lambda item: item[1][options['sort']], reverse=True)
+        for endpoint, stats in ranked[:options['limit']]:
+            samples = stats['samples']
+            self.stdout.write(self.style.SUCCESS(endpoint))
+            self.stdout.write(
+                f"  samples={samples} avg_ms={stats['duration_ms'] / samples:.1f} "
+                f"avg_db_ms={stats['db_ms'] / samples:.1f} avg_queries={stats['queries'] / samples:.1f} "
+                f"max_queries={stats['max_queries']}"
+            )
+            for fingerprint, (count, sql) in sorted(stats['repeated'].items(), key=lambda item: -item[1][0])[:3]:
+                self.stdout.write(f"  repeated x{count} [{fingerprint}] {sql[:160]}")
@@ -0,0 +1,53 @@
+"""
+Time key API endpoints against a benchmark tenant and emit JSON, e.g.:
+  python manage.py run_benchmarks --slug bench --output results/$(git rev-parse --short HEAD).json
+  python manage.py run_benchmarks --slug bench --compare results/main.json
+Exits non-zero with --compare when a scenario got slower than --tolerance or
+runs more queries than the baseline.
+"""
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.benchmarks import SCENARIOS, compare_results, run_scenarios
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Run the endpoint benchmark scenarios and print/save the timings as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--slug', default='benchmark', help='Tenant created by generate_benchmark_data')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario (the median is reported)')
+        parser.add_argument('--only', nargs='*', help=f"Scenario name prefixes, e.g. clients dashboard "
+                                                      f"(all: {', '.join(name for name, *_ in SCENARIOS)})")
+        parser.add_argument('--output', help='Write the JSON result here instead of stdout')
+        parser.add_argument('--compare', help='Baseline JSON to compare against')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed median slowdown (0.2 = 20%%)')
+
+    def handle(self, *args, **options):
+        if not Tenant.objects.filter(slug=options['slug']).exists():
+            raise CommandError(f"No tenant {options['slug']!r}; run generate_benchmark_data first")
+
+        result = run_scenarios(
+            options['slug'], repeat=options['repeat'], only=options['only'],
+            stdout=self.stdout if options['output'] else None,
+        )
+        payload = json.dumps(result, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(payload + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(payload)
+
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions = compare_results(baseline, result, tolerance=options['tolerance'])
+            for name, field, before, after in regressions:
+                self.stderr.write(f'REGRESSION {name} {field}: {before} -> {after}')
+            if regressions:
+                sys.exit(1)
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}"))
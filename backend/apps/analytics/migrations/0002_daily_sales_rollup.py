@@ -0,0 +1,112 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tenants", "0003_alter_tenant_phone"),
+        ("stores", "0002_store_tenant"),
+        ("analytics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailySalesRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("sales_count", models.PositiveIntegerField(default=0)),
+                (
+                    "sales_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("confirmed_sales_count", models.PositiveIntegerField(default=0)),
+                (
+                    "confirmed_sales_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("new_clients", models.PositiveIntegerField(default=0)),
+                ("pipelines_created", models.PositiveIntegerField(default=0)),
+                ("pipelines_open", models.PositiveIntegerField(default=0)),
+                (
+                    "pipelines_open_value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("deals_won", models.PositiveIntegerField(default=0)),
+                (
+                    "deals_won_value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("deals_lost", models.PositiveIntegerField(default=0)),
+                ("appointments_scheduled", models.PositiveIntegerField(default=0)),
+                ("appointments_completed", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "salesperson",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "store",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_rollups",
+                        to="stores.store",
+                    ),
+                ),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_rollups",
+                        to="tenants.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily Sales Rollup",
+                "verbose_name_plural": "Daily Sales Rollups",
+                "ordering": ["-day"],
+                "indexes": [
+                    models.Index(
+                        fields=["tenant", "day"], name="analytics_d_tenant__68d89f_idx"
+                    ),
+                    models.Index(
+                        fields=["tenant", "store", "day"],
+                        name="analytics_d_tenant__b7770a_idx",
+                    ),
+                    models.Index(
+                        fields=["tenant", "salesperson", "day"],
+                        name="analytics_d_tenant__4240ec_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailysalesrollup",
+            constraint=models.UniqueConstraint(
+                fields=("tenant", "store", "salesperson", "day"),
+                name="analytics_rollup_unique_bucket",
+            ),
+        ),
+    ]
@@ -237,3 +237,76 @@ class Report(models.Model):
 
     def __str__(self):
         return f"{self.name} - {self.get_report_type_display()}"
+
+
+class DailySalesRollup(models.Model):
+    """
+    Pre-aggregated daily facts per (tenant, store, salesperson, day).
+
+    Maintained incrementally by apps.analytics.rollups (rows for a tenant-day are
+    recomputed after sale, client, pipeline and appointment writes) and rebuilt by
+    the backfill_daily_rollups command. Date-range KPIs are sums over these rows
+    instead of scans over the raw tables.
+    """
+    tenant = models.ForeignKey(
+        'tenants.Tenant',
+        on_delete=models.CASCADE,
+        related_name='daily_rollups'
+    )
+    store = models.ForeignKey(
+        'stores.Store',
+        on_delete=models.CASCADE,
+        related_name='daily_rollups',
+        null=True,
+        blank=True
+    )
+    salesperson = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='daily_rollups',
+        null=True,
+        blank=True
+    )
+    day = models.DateField()
+
+    # Sales (by sale creation day)
+    sales_count = models.PositiveIntegerField(default=0)
+    sales_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    confirmed_sales_count = models.PositiveIntegerField(default=0)
+    confirmed_sales_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    # Customers (by creation day, assigned salesperson)
+    new_clients = models.PositiveIntegerField(default=0)
+
+    # Pipeline: created/open by creation day, won/lost by close day
+    pipelines_created = models.PositiveIntegerField(default=0)
+    pipelines_open = models.PositiveIntegerField(default=0)
+    pipelines_open_value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    deals_won = models.PositiveIntegerField(default=0)
+    deals_won_value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    deals_lost = models.PositiveIntegerField(default=0)
+
+    # Appointments (by appointment day)
+    appointments_scheduled = models.PositiveIntegerField(default=0)
+    appointments_completed = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Daily Sales Rollup')
+        verbose_name_plural = _('Daily Sales Rollups')
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant', 'store', 'salesperson', 'day'],
+                name='analytics_rollup_unique_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['tenant', 'day']),
+            models.Index(fields=['tenant', 'store', 'day']),
+            models.Index(fields=['tenant', 'salesperson', 'day']),
+        ]
+
+    def __str__(self):
+        return f"{self.tenant_id}/{self.store_id}/{self.salesperson_id} - {self.day}"
@@ -0,0 +1,319 @@
+"""
+Daily rollup maintenance and queries.
+
+DailySalesRollup holds one row per (tenant, store, salesperson, day). Rows for a
+tenant's day are rebuilt from the raw tables with a handful of grouped queries
+shortly after a sale, client, pipeline or appointment touching that day is
+written (queued at commit and rebuilt by a worker thread, see Incremental
+maintenance below and apps/analytics/signals.py), and for whole date ranges by
+the backfill_daily_rollups command. Rebuilding a bucket rather than applying deltas
+keeps the rollup idempotent: re-running a day always converges to the raw data.
+
+Dimensions:
+  - store:       Sale/SalesPipeline.store for sales and deals (the client's store,
+                 else the sales representative's), the client's store otherwise
+  - salesperson: Sale/SalesPipeline.sales_representative, Client/Appointment.assigned_to
+  - day:         local (TIME_ZONE) date of created_at; pipeline won/lost use
+                 actual_close_date and appointments their own date
+"""
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from core.commit_hooks import after_commit
+
+from .models import DailySalesRollup
+
+logger = logging.getLogger(__name__)
+
+CONFIRMED_SALE_STATUSES = ['confirmed', 'delivered']
+OPEN_PIPELINE_STAGES = ['exhibition', 'social_media', 'interested', 'store_walkin', 'negotiation']
+BACKFILL_CHUNK_DAYS = 31
+
+COUNT_FIELDS = [
+    'sales_count', 'confirmed_sales_count', 'new_clients', 'pipelines_created', 'pipelines_open',
+    'deals_won', 'deals_lost', 'appointments_scheduled', 'appointments_completed',
+]
+AMOUNT_FIELDS = ['sales_revenue', 'confirmed_sales_revenue', 'pipelines_open_value', 'deals_won_value']
+MEASURE_FIELDS = COUNT_FIELDS + AMOUNT_FIELDS
+
+ZERO = Value(Decimal('0.00'), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+
+def _day_bounds(start_day, end_day):
+    """Aware [start, end) datetimes covering local days start_day..end_day."""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def _collect_facts(tenant_id, start_day, end_day):
+    """Return {(day, store_id, salesperson_id): {measure: value}} for a tenant's days."""
+    from apps.clients.models import Appointment, Client
+    from apps.sales.models import Sale, SalesPipeline
+
+    start, end = _day_bounds(start_day, end_day)
+    facts = defaultdict(dict)
+
+    def merge(rows, day_key, store_key, salesperson_key):
+        for row in rows:
+            key = (row.pop(day_key), row.pop(store_key), row.pop(salesperson_key))
+            facts[key].update({field: value for field, value in row.items() if value})
+
+    confirmed = Q(status__in=CONFIRMED_SALE_STATUSES)
+    merge(
+        Sale.objects.filter(tenant_id=tenant_id, created_at__gte=start, created_at__lt=end)
+        .annotate(rollup_day=TruncDate('created_at'))
+        .values('rollup_day', 'store_id', 'sales_representative_id')
+        .annotate(
+            sales_count=Count('id'),
+            sales_revenue=Sum('total_amount'),
+            confirmed_sales_count=Count('id', filter=confirmed),
+            confirmed_sales_revenue=Sum('total_amount', filter=confirmed),
+        ).order_by(),
+        'rollup_day', 'store_id', 'sales_representative_id',
+    )
+    merge(
+        Client.objects.filter(tenant_id=tenant_id, is_deleted=False, created_at__gte=start, created_at__lt=end)
+        .annotate(rollup_day=TruncDate('created_at'))
+        .values('rollup_day', 'store_id', 'assigned_to_id')
+        .annotate(new_clients=Count('id')).order_by(),
+        'rollup_day', 'store_id', 'assigned_to_id',
+    )
+    is_open = Q(stage__in=OPEN_PIPELINE_STAGES)
+    merge(
+        SalesPipeline.objects.filter(tenant_id=tenant_id, created_at__gte=start, created_at__lt=end)
+        .annotate(rollup_day=TruncDate('created_at'))
+        .values('rollup_day', 'store_id', 'sales_representative_id')
+        .annotate(
+            pipelines_created=Count('id'),
+            pipelines_open=Count('id', filter=is_open),
+            pipelines_open_value=Sum('expected_value', filter=is_open),
+        ).order_by(),
+        'rollup_day', 'store_id', 'sales_representative_id',
+    )
+    merge(
+        SalesPipeline.objects.filter(
+            tenant_id=tenant_id,
+            stage__in=['closed_won', 'closed_lost'],
+            actual_close_date__gte=start_day,
+            actual_close_date__lte=end_day,
+        )
+        .values('actual_close_date', 'store_id', 'sales_representative_id')
+        .annotate(
+            deals_won=Count('id', filter=Q(stage='closed_won')),
+            deals_won_value=Sum('expected_value', filter=Q(stage='closed_won')),
+            deals_lost=Count('id', filter=Q(stage='closed_lost')),
+        ).order_by(),
+        'actual_close_date', 'store_id', 'sales_representative_id',
+    )
+    merge(
+        Appointment.objects.filter(tenant_id=tenant_id, is_deleted=False, date__gte=start_day, date__lte=end_day)
+        .values('date', 'client__store_id', 'assigned_to_id')
+        .annotate(
+            appointments_scheduled=Count('id'),
+            appointments_completed=Count('id', filter=Q(status='completed')),
+        ).order_by(),
+        'date', 'client__store_id', 'assigned_to_id',
+    )
+    return facts
+
+
+def _lock_days(tenant_id, start_day, end_day):
+    """
+    Serialise rebuilds of the same (tenant, day) buckets with transaction-level
+    advisory locks, taken in day order; other days and tenants, and writes to
+    the tenant row, are not blocked. Other databases serialise writes anyway.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT pg_advisory_xact_lock(%s, day) FROM generate_series(%s, %s) AS day',
+            [tenant_id, start_day.toordinal(), end_day.toordinal()],
+        )
+
+
+def rebuild_daily_rollups(tenant_id, start_day, end_day=None):
+    """
+    Recompute every rollup row for a tenant between start_day and end_day (inclusive).
+
+    Holds a lock per (tenant, day) so concurrent rebuilds of the same buckets
+    can't interleave their delete/insert. Returns the number of rows written.
+    """
+    from apps.tenants.models import Tenant
+
+    end_day = end_day or start_day
+    with transaction.atomic():
+        if not Tenant.objects.filter(id=tenant_id).exists():
+            return 0
+        _lock_days(tenant_id, start_day, end_day)
+        facts = _collect_facts(tenant_id, start_day, end_day)
+        DailySalesRollup.objects.filter(tenant_id=tenant_id, day__gte=start_day, day__lte=end_day).delete()
+        rows = [
+            DailySalesRollup(tenant_id=tenant_id, day=day, store_id=store_id, salesperson_id=salesperson_id, **measures)
+            for (day, store_id, salesperson_id), measures in facts.items()
+            if measures
+        ]
+        DailySalesRollup.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Incremental maintenance
+# ---------------------------------------------------------------------------
+#
+# Writes only queue their (tenant, day) buckets: each write's keys ride on its
+# own commit hook (core.commit_hooks, dropped if the transaction rolls back)
+# into a process-wide set, and the first key to arrive starts a timer. After
+# ANALYTICS_ROLLUP_DEBOUNCE_SECONDS a worker thread rebuilds every bucket queued
+# so far, once each, off the request path. ANALYTICS_ROLLUP_REFRESH_ASYNC=False
+# rebuilds inline at commit instead (tests, scripts). Buckets still queued when
+# a process exits are lost; the nightly backfill_daily_rollups run repairs them.
+
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+
+_dirty = set()
+_lock = threading.Lock()
+_timer = None
+
+
+def refresh_buckets(keys):
+    """Rebuild the given (tenant_id, day) buckets one by one. Returns how many were rebuilt."""
+    rebuilt = 0
+    for tenant_id, day in sorted(keys):
+        try:
+            rebuild_daily_rollups(tenant_id, day)
+            rebuilt += 1
+        except Exception as e:
+            logger.error("Daily rollup refresh failed for tenant %s on %s: %s", tenant_id, day, e, exc_info=True)
+    return rebuilt
+
+
+def _on_commit(keys):
+    if not getattr(settings, 'ANALYTICS_ROLLUP_REFRESH_ASYNC', True):
+        refresh_buckets(keys)
+        return
+    global _timer
+    with _lock:
+        _dirty.update(keys)
+        if _timer is None:
+            delay = getattr(settings, 'ANALYTICS_ROLLUP_DEBOUNCE_SECONDS', DEFAULT_DEBOUNCE_SECONDS)
+            _timer = threading.Timer(delay, _drain_in_worker_thread)
+            _timer.daemon = True
+            _timer.start()
+
+
+def _take_dirty():
+    global _timer
+    with _lock:
+        keys = set(_dirty)
+        _dirty.clear()
+        _timer = None
+    return keys
+
+
+def _drain_in_worker_thread():
+    close_old_connections()
+    try:
+        flush_rollup_refreshes()
+    finally:
+        connection.close()
+
+
+def flush_rollup_refreshes():
+    """Rebuild every bucket queued so far, now. Returns the number rebuilt."""
+    return refresh_buckets(_take_dirty())
+
+
+def schedule_rollup_refresh(tenant_id, days):
+    """Queue (tenant, day) buckets to be rebuilt once the current transaction commits."""
+    keys = {(tenant_id, day) for day in days if day} if tenant_id else set()
+    if keys:
+        after_commit(_on_commit, keys, description=f"Daily rollup refresh for tenant {tenant_id}")
+
+
+def local_day(value):
+    """Local date of a datetime or ISO string (dates pass through)."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def rollup_queryset(tenant, start_day=None, end_day=None, store=None, salesperson=None):
+    """Rollup rows for a tenant, optionally bounded by day and scoped to a store/salesperson."""
+    rows = DailySalesRollup.objects.filter(tenant=tenant)
+    if start_day:
+        rows = rows.filter(day__gte=local_day(start_day))
+    if end_day:
+        rows = rows.filter(day__lte=local_day(end_day))
+    if store is not None:
+        rows = rows.filter(store=store)
+    if salesperson is not None:
+        rows = rows.filter(salesperson=salesperson)
+    return rows
+
+
+def _measure_sums():
+    sums = {field: Coalesce(Sum(field), 0) for field in COUNT_FIELDS}
+    sums.update({field: Coalesce(Sum(field), ZERO) for field in AMOUNT_FIELDS})
+    return sums
+
+
+def rollup_totals(tenant, start_day=None, end_day=None, store=None, salesperson=None):
+    """Sum every measure over a date range. Returns {measure: total}."""
+    return rollup_queryset(tenant, start_day, end_day, store, salesperson).aggregate(**_measure_sums())
+
+
+def rollup_breakdown(group_by, tenant, start_day=None, end_day=None, store=None, salesperson=None):
+    """Sum every measure grouped by 'store', 'salesperson' or 'day'. Returns {group_value: totals}."""
+    field = {'store': 'store_id', 'salesperson': 'salesperson_id', 'day': 'day'}[group_by]
+    rows = (
+        rollup_queryset(tenant, start_day, end_day, store, salesperson)
+        .values(field)
+        .annotate(**_measure_sums())
+        .order_by(field)
+    )
+    return {row.pop(field): row for row in rows}
+
+
+def rollup_window_totals(tenant, windows, store=None, salesperson=None, fields=None):
+    """
+    Sum measures over several day windows in a single query.
+
+    windows maps a name to (start_day, end_day); either bound may be None for an
+    open-ended window. Returns {name: {measure: total}}.
+    """
+    fields = fields or MEASURE_FIELDS
+    aggregates = {}
+    for name, (start_day, end_day) in windows.items():
+        condition = Q()
+        if start_day:
+            condition &= Q(day__gte=local_day(start_day))
+        if end_day:
+            condition &= Q(day__lte=local_day(end_day))
+        for field in fields:
+            default = ZERO if field in AMOUNT_FIELDS else Value(0)
+            aggregates[f'{name}__{field}'] = Coalesce(Sum(field, filter=condition), default)
+    totals = rollup_queryset(tenant, store=store, salesperson=salesperson).aggregate(**aggregates)
+    return {
+        name: {field: totals[f'{name}__{field}'] for field in fields}
+        for name in windows
+    }
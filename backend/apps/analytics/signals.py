@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.clients.models import Appointment, Client
+from apps.sales.models import Sale, SalesPipeline
+from core.snapshots import stored_values
+from .rollups import local_day, schedule_rollup_refresh
+
+
+@receiver(pre_save, sender=Client)
+def remember_client_store(sender, instance, **kwargs):
+    previous = stored_values(instance, 'store_id')
+    instance._rollup_previous_store_id = previous['store_id'] if previous else instance.store_id
+
+
+@receiver([post_save, post_delete], sender=Client)
+def refresh_rollups_for_client(sender, instance, **kwargs):
+    days = {local_day(instance.created_at)}
+    if getattr(instance, '_rollup_previous_store_id', instance.store_id) != instance.store_id:
+        # Appointments (and sales and deals, through their attributed store) are
+        # bucketed by the client's store, so moving a client re-buckets its whole history
+        days.update(local_day(d) for d in instance.sales.values_list('created_at', flat=True))
+        for created_at, closed_on in instance.pipelines.values_list('created_at', 'actual_close_date'):
+            days.update((local_day(created_at), closed_on))
+        days.update(instance.appointments.values_list('date', flat=True))
+    schedule_rollup_refresh(instance.tenant_id, days)
+
+
+@receiver([post_save, post_delete], sender=Sale)
+def refresh_rollups_for_sale(sender, instance, **kwargs):
+    schedule_rollup_refresh(instance.tenant_id, {local_day(instance.created_at)})
+
+
+@receiver(pre_save, sender=SalesPipeline)
+def remember_pipeline_close_date(sender, instance, **kwargs):
+    previous = stored_values(instance, 'actual_close_date')
+    instance._rollup_previous_close_date = previous['actual_close_date'] if previous else None
+
+
+@receiver([post_save, post_delete], sender=SalesPipeline)
+def refresh_rollups_for_pipeline(sender, instance, **kwargs):
+    schedule_rollup_refresh(instance.tenant_id, {
+        local_day(instance.created_at),
+        local_day(instance.actual_close_date),
+        getattr(instance, '_rollup_previous_close_date', None),
+    })
+
+
+@receiver(pre_save, sender=Appointment)
+def remember_appointment_date(sender, instance, **kwargs):
+    previous = stored_values(instance, 'date')
+    instance._rollup_previous_date = previous['date'] if previous else None
+
+
+@receiver([post_save, post_delete], sender=Appointment)
+def refresh_rollups_for_appointment(sender, instance, **kwargs):
+    schedule_rollup_refresh(instance.tenant_id, {
+        local_day(instance.date),
+        getattr(instance, '_rollup_previous_date', None),
+    })
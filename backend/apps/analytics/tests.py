@@ -1,3 +1,134 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.clients.models import Client
+from apps.sales.models import Sale, SalesPipeline
+from apps.stores.models import Store
+from apps.tenants.models import Tenant
+from . import rollups
+from .models import DailySalesRollup
+from .rollups import rollup_breakdown, rollup_totals, rollup_window_totals
+
+User = get_user_model()
+
+
+@override_settings(ANALYTICS_ROLLUP_REFRESH_ASYNC=False)
+class DailySalesRollupTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store = Store.objects.create(
+            name="Main Store", code="MS001", address="123 Test St", city="Test City", state="Test State",
+            tenant=self.tenant,
+        )
+        self.sales_user = User.objects.create_user(
+            username="sales", password="testpass123", role=User.Role.INHOUSE_SALES,
+            tenant=self.tenant, store=self.store,
+        )
+        self.today = timezone.localdate()
+
+    def _create_activity(self):
+        client = Client.objects.create(
+            first_name="John", phone="1234567890", tenant=self.tenant, store=self.store,
+            assigned_to=self.sales_user,
+        )
+        Sale.objects.create(
+            order_number="ORD001", client=client, sales_representative=self.sales_user,
+            status=Sale.Status.CONFIRMED, subtotal=Decimal("1000.00"), total_amount=Decimal("1000.00"),
+            tenant=self.tenant,
+        )
+        SalesPipeline.objects.create(
+            title="Deal", client=client, sales_representative=self.sales_user,
+            stage=SalesPipeline.Stage.CLOSED_WON, expected_value=Decimal("750.00"),
+            actual_close_date=self.today, tenant=self.tenant,
+        )
+        return client
+
+    def test_writes_refresh_rollup_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_activity()
+
+        row = DailySalesRollup.objects.get(tenant=self.tenant, day=self.today)
+        self.assertEqual((row.store_id, row.salesperson_id), (self.store.id, self.sales_user.id))
+        self.assertEqual(row.new_clients, 1)
+        self.assertEqual(row.sales_count, 1)
+        self.assertEqual(row.confirmed_sales_revenue, Decimal("1000.00"))
+        self.assertEqual(row.deals_won, 1)
+        self.assertEqual(row.deals_won_value, Decimal("750.00"))
+
+    @override_settings(ANALYTICS_ROLLUP_REFRESH_ASYNC=True, CLIENT_STATUS_RECOMPUTE_ASYNC=False)
+    def test_async_refreshes_are_coalesced_off_the_request_path(self):
+        if rollups._timer is not None:
+            rollups._timer.cancel()
+        rollups._take_dirty()
+        with patch('apps.analytics.rollups.threading.Timer') as timer, \
+                self.captureOnCommitCallbacks(execute=True):
+            self._create_activity()
+        self.assertEqual(timer.call_count, 1)
+        self.assertFalse(DailySalesRollup.objects.exists())
+
+        # Every write touched the same bucket: one rebuild
+        self.assertEqual(rollups.flush_rollup_refreshes(), 1)
+        self.assertEqual(rollup_totals(self.tenant, self.today, self.today)['sales_count'], 1)
+        self.assertEqual(rollups.flush_rollup_refreshes(), 0)
+
+    def test_soft_deleted_client_leaves_rollup(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            client = self._create_activity()
+        with self.captureOnCommitCallbacks(execute=True):
+            client.is_deleted = True
+            client.save()
+
+        self.assertEqual(rollup_totals(self.tenant, self.today, self.today)['new_clients'], 0)
+
+    def test_backfill_and_window_queries(self):
+        self._create_activity()  # callbacks never run: only the backfill builds rows
+        self.assertFalse(DailySalesRollup.objects.exists())
+
+        call_command('backfill_daily_rollups', tenant=self.tenant.id, stdout=open('/dev/null', 'w'))
+
+        totals = rollup_window_totals(
+            self.tenant,
+            {'today': (self.today, self.today), 'last_week': (self.today - timedelta(days=7), self.today - timedelta(days=1))},
+            store=self.store,
+        )
+        self.assertEqual(totals['today']['sales_count'], 1)
+        self.assertEqual(totals['last_week']['sales_count'], 0)
+        self.assertEqual(
+            rollup_breakdown('salesperson', self.tenant, self.today, self.today)[self.sales_user.id]['deals_won'], 1,
+        )
+
+
+class BenchmarkHarnessTest(TestCase):
+    def test_generate_and_run_scenario(self):
+        from .benchmarks import generate_tenant, run_scenarios
+
+        summary = generate_tenant(
+            'bench-test', stores=1, sales_per_store=1, clients=20, sales=10, pipelines=10, appointments=5,
+            stdout=open('/dev/null', 'w'),
+        )
+        tenant = Tenant.objects.get(slug='bench-test')
+        self.assertEqual(Client.objects.filter(tenant=tenant).count(), 20)
+        self.assertEqual(Sale.objects.filter(tenant=tenant).count(), 10)
+        self.assertTrue(summary)
+
+        result = run_scenarios('bench-test', repeat=2, only=['clients.list', 'dashboard.business'])
+        listing = result['results']['clients.list']
+        self.assertEqual(listing['status'], [200])
+        self.assertGreater(listing['queries'], 0)
+        self.assertEqual(result['results']['dashboard.business']['status'], [200])
+
+    def test_compare_results_flags_slower_and_chattier_scenarios(self):
+        from .benchmarks import compare_results
+
+        baseline = {'results': {'a': {'median_ms': 100, 'queries': 10}, 'b': {'median_ms': 100, 'queries': 10}}}
+        current = {'results': {'a': {'median_ms': 110, 'queries': 10}, 'b': {'median_ms': 200, 'queries': 12},
+                               'c': {'error': 'boom'}}}
+        self.assertEqual(compare_results(baseline, current, tolerance=0.2), [
+            ('b', 'median_ms', 100, 200), ('b', 'queries', 10, 12),
+        ])
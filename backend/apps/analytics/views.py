@@ -10,6 +10,10 @@ from apps.sales.models import Sale, SalesPipeline
 from apps.users.models import User
 from apps.stores.models import Store
 from apps.tenants.models import Tenant
+from .rollups import rollup_window_totals
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 @api_view(['GET'])
@@ -17,8 +21,8 @@ def dashboard_stats(request):
     """
     Get dashboard statistics using existing data.
     """
-    # Get the first tenant or create a default one
-    tenant = Tenant.objects.first()
+    # Use the user's tenant, falling back to the first tenant
+    tenant = getattr(request.user, 'tenant', None) or Tenant.objects.first()
     
     if not tenant:
         return Response({
@@ -32,38 +36,27 @@ def dashboard_stats(request):
     
     # Check if user is store-specific (manager, inhouse_sales, etc.)
     user = request.user
-    store_filter = {}
-    
-    # If user has a specific store, filter by that store
-    if hasattr(user, 'store') and user.store:
-        store_filter = {'store': user.store}
-        print(f"Filtering analytics for store: {user.store.name}")
-    elif user.role in ['manager', 'inhouse_sales'] and hasattr(user, 'store'):
-        store_filter = {'store': user.store}
-        print(f"Filtering analytics for store: {user.store.name}")
-    elif user.role == 'business_admin':
-        print("Business admin - showing all data across all stores")
-        store_filter = {}
-    else:
-        print("No store filter applied - showing all data")
-    
-    # Current period stats
-    current_clients = Client.objects.filter(
-        created_at__gte=start_date,
-        is_deleted=False,
-        **store_filter
-    ).count()
-    
-    # For sales, filter by store if user has one, otherwise show all
-    if store_filter:
-        current_sales = Sale.objects.filter(
-            created_at__gte=start_date,
-            sales_representative__store=user.store
-        ).count()
-    else:
-        current_sales = Sale.objects.filter(
-            created_at__gte=start_date
-        ).count()
+    store = user.store if getattr(user, 'store', None) else None
+    store_filter = {'store': store} if store else {}
+    
+    # Client, sale and revenue figures come from the daily rollup table
+    today = timezone.localdate()
+    kpis = rollup_window_totals(
+        tenant,
+        {
+            'current': (today - timedelta(days=30), today),
+            'previous': (today - timedelta(days=60), today - timedelta(days=31)),
+            'total': (None, None),
+        },
+        store=store,
+        fields=['new_clients', 'sales_count', 'confirmed_sales_revenue'],
+    )
+    current_clients = kpis['current']['new_clients']
+    current_sales = kpis['current']['sales_count']
+    current_revenue = kpis['current']['confirmed_sales_revenue']
+    previous_clients = kpis['previous']['new_clients']
+    previous_sales = kpis['previous']['sales_count']
+    previous_revenue = kpis['previous']['confirmed_sales_revenue']
     
     # For products, filter by store if user has one, otherwise show all
     if store_filter:
@@ -71,73 +64,20 @@ def dashboard_stats(request):
             created_at__gte=start_date,
             store=user.store
         ).count()
-    else:
-        current_products = Product.objects.filter(
-            created_at__gte=start_date
-        ).count()
-    
-    # For revenue, filter by store if user has one, otherwise show all
-    if store_filter:
-        current_revenue = Sale.objects.filter(
-            created_at__gte=start_date,
-            status__in=['confirmed', 'delivered'],
-            sales_representative__store=user.store
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-    else:
-        current_revenue = Sale.objects.filter(
-            created_at__gte=start_date,
-            status__in=['confirmed', 'delivered']
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-    
-    # Previous period stats
-    previous_clients = Client.objects.filter(
-        created_at__gte=previous_start,
-        created_at__lt=start_date,
-        is_deleted=False,
-        **store_filter
-    ).count()
-    
-    # For sales, filter by store if user has one, otherwise show all
-    if store_filter:
-        previous_sales = Sale.objects.filter(
-            created_at__gte=previous_start,
-            created_at__lt=start_date,
-            sales_representative__store=user.store
-        ).count()
-    else:
-        previous_sales = Sale.objects.filter(
-            created_at__gte=previous_start,
-            created_at__lt=start_date
-        ).count()
-    
-    # For products, filter by store if user has one, otherwise show all
-    if store_filter:
         previous_products = Product.objects.filter(
             created_at__gte=previous_start,
             created_at__lt=start_date,
             store=user.store
         ).count()
     else:
+        current_products = Product.objects.filter(
+            created_at__gte=start_date
+        ).count()
         previous_products = Product.objects.filter(
             created_at__gte=previous_start,
             created_at__lt=start_date
         ).count()
     
-    # For revenue, filter by store if user has one, otherwise show all
-    if store_filter:
-        previous_revenue = Sale.objects.filter(
-            created_at__gte=previous_start,
-            created_at__lt=start_date,
-            status__in=['confirmed', 'delivered'],
-            sales_representative__store=user.store
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-    else:
-        previous_revenue = Sale.objects.filter(
-            created_at__gte=previous_start,
-            created_at__lt=start_date,
-            status__in=['confirmed', 'delivered']
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-    
     # Calculate percentage changes
     def calculate_change(current, previous):
         if previous == 0:
@@ -217,13 +157,9 @@ def dashboard_stats(request):
         activity.pop('timestamp', None)
     
     # Total counts (not just recent) - filtered by store
-    total_clients = Client.objects.filter(is_deleted=False, **store_filter).count()
-    
-    # For sales, filter by store if user has one, otherwise show all
-    if store_filter:
-        total_sales = Sale.objects.filter(sales_representative__store=user.store).count()
-    else:
-        total_sales = Sale.objects.count()
+    total_clients = kpis['total']['new_clients']
+    total_sales = kpis['total']['sales_count']
+    total_revenue = kpis['total']['confirmed_sales_revenue']
     
     # For products, filter by store if user has one, otherwise show all
     if store_filter:
@@ -231,17 +167,6 @@ def dashboard_stats(request):
     else:
         total_products = Product.objects.count()
     
-    # For revenue, filter by store if user has one, otherwise show all
-    if store_filter:
-        total_revenue = Sale.objects.filter(
-            status__in=['confirmed', 'delivered'],
-            sales_representative__store=user.store
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-    else:
-        total_revenue = Sale.objects.filter(
-            status__in=['confirmed', 'delivered']
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-    
     # Add store context if filtering by store
     if store_filter:
         response_data = {
@@ -309,9 +234,9 @@ def business_admin_dashboard(request):
             start_date = datetime.strptime(start_date_param, '%Y-%m-%d').replace(hour=0, minute=0, second=0, microsecond=0)
             end_date = datetime.strptime(end_date_param, '%Y-%m-%d').replace(hour=23, minute=59, second=59, microsecond=999999)
             
-            print(f"🔍 [DASHBOARD API] Using custom date range: {start_date.date()} to {end_date.date()}")
+            logger.debug('[DASHBOARD API] Using custom date range: %s to %s', start_date.date(), end_date.date())
         except ValueError as e:
-            print(f"❌ [DASHBOARD API] Invalid date format: {e}")
+            logger.warning('[DASHBOARD API] Invalid date format: %s', e)
             # Fallback to default
             end_date = timezone.now()
             start_date = end_date - timedelta(days=30)
@@ -319,7 +244,7 @@ def business_admin_dashboard(request):
         # Default to last 30 days
         end_date = timezone.now()
         start_date = end_date - timedelta(days=30)
-        print(f"🔍 [DASHBOARD API] Using default date range: {start_date.date()} to {end_date.date()}")
+        logger.debug('[DASHBOARD API] Using default date range: %s to %s', start_date.date(), end_date.date())
     
     # Calculate previous period for comparison
     period_duration = end_date - start_date
@@ -618,66 +543,42 @@ def store_analytics(request):
         }, status=400)
     
     store = user.store
-    print(f"Getting analytics for store: {store.name}")
     
     # Get date range for comparisons (last 30 days vs previous 30 days)
     end_date = timezone.now()
     start_date = end_date - timedelta(days=30)
     previous_start = start_date - timedelta(days=30)
     
-    # Store-specific filters
-    store_filter = {'store': store}
-    
-    # Current period stats
-    current_clients = Client.objects.filter(
-        created_at__gte=start_date,
-        is_deleted=False,
-        store=store
-    ).count()
-    
-    current_sales = Sale.objects.filter(
-        created_at__gte=start_date,
-        sales_representative__store=store
-    ).count()
+    # Client, sale and revenue figures come from the daily rollup table
+    today = timezone.localdate()
+    kpis = rollup_window_totals(
+        user.tenant,
+        {
+            'current': (today - timedelta(days=30), today),
+            'previous': (today - timedelta(days=60), today - timedelta(days=31)),
+            'total': (None, None),
+        },
+        store=store,
+        fields=['new_clients', 'sales_count', 'confirmed_sales_revenue'],
+    )
+    current_clients = kpis['current']['new_clients']
+    current_sales = kpis['current']['sales_count']
+    current_revenue = kpis['current']['confirmed_sales_revenue']
+    previous_clients = kpis['previous']['new_clients']
+    previous_sales = kpis['previous']['sales_count']
+    previous_revenue = kpis['previous']['confirmed_sales_revenue']
     
     current_products = Product.objects.filter(
         created_at__gte=start_date,
         store=store
     ).count()
     
-    current_revenue = Sale.objects.filter(
-        created_at__gte=start_date,
-        status__in=['confirmed', 'delivered'],
-        sales_representative__store=store
-    ).aggregate(total=Sum('total_amount'))['total'] or 0
-    
-    # Previous period stats
-    previous_clients = Client.objects.filter(
-        created_at__gte=previous_start,
-        created_at__lt=start_date,
-        is_deleted=False,
-        store=store
-    ).count()
-    
-    previous_sales = Sale.objects.filter(
-        created_at__gte=previous_start,
-        created_at__lt=start_date,
-        sales_representative__store=store
-    ).count()
-    
     previous_products = Product.objects.filter(
         created_at__gte=previous_start,
         created_at__lt=start_date,
         store=store
     ).count()
     
-    previous_revenue = Sale.objects.filter(
-        created_at__gte=previous_start,
-        created_at__lt=start_date,
-        status__in=['confirmed', 'delivered'],
-        sales_representative__store=store
-    ).aggregate(total=Sum('total_amount'))['total'] or 0
-    
     # Calculate percentage changes
     def calculate_change(current, previous):
         if previous == 0:
@@ -747,13 +648,10 @@ def store_analytics(request):
         activity.pop('timestamp', None)
     
     # Total counts for this store
-    total_clients = Client.objects.filter(is_deleted=False, store=store).count()
-    total_sales = Sale.objects.filter(sales_representative__store=store).count()
+    total_clients = kpis['total']['new_clients']
+    total_sales = kpis['total']['sales_count']
     total_products = Product.objects.filter(store=store).count()
-    total_revenue = Sale.objects.filter(
-        status__in=['confirmed', 'delivered'],
-        sales_representative__store=store
-    ).aggregate(total=Sum('total_amount'))['total'] or 0
+    total_revenue = kpis['total']['confirmed_sales_revenue']
     
     # Store-specific information
     store_info = {
@@ -0,0 +1,348 @@
+"""
+Per-user inbox state for announcements and team messages.
+
+Unread counts used to rebuild the whole visibility query (tenant, an OR across
+target stores and the author's store, publish/expiry window, DISTINCT) and
+then exclude every id the user had ever read, on each badge poll. InboxEntry
+materializes the result instead: one row per (user, visible item) carrying
+the read flag, so the counts and the announcement listing are indexed
+lookups on (user, kind, is_read).
+
+Entries are maintained on write:
+  - an announcement is fanned out to its target users when it is saved or its
+    target stores change, once it is live (active, published, not expired);
+    deactivating it removes its entries
+  - a team message gets entries for its recipients as they are added
+  - reads (AnnouncementRead / MessageRead) flip is_read
+  - a user whose tenant or store changes gets their inbox rebuilt
+Writes are applied when the transaction commits (schedule_announcement_sync,
+through core.commit_hooks), like the other fan-out work in this project.
+
+Time windows are handled by the scheduler (the sync_inboxes command, run
+every five minutes from cron): it fans out announcements whose publish_at has
+passed and prunes expired entries. Counts also filter on expires_at, so an
+entry stops counting the moment it expires even if the prune has not run yet.
+
+Users without a tenant (platform staff) see every tenant's announcements and
+keep the query-based path (visible_announcements).
+"""
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.commit_hooks import after_commit
+
+from .models import Announcement, AnnouncementRead, InboxEntry, MessageRead, TeamMessage
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+DEFAULT_BATCH_SIZE = 500
+
+
+# ---------------------------------------------------------------------------
+# Visibility rules
+# ---------------------------------------------------------------------------
+
+def live_announcements(now=None):
+    now = now or timezone.now()
+    return Announcement.objects.filter(is_active=True, publish_at__lte=now).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=now)
+    )
+
+
+def visible_announcements(user, now=None):
+    """Announcements a user can see, computed from the targeting rules (no inbox)."""
+    queryset = live_announcements(now)
+    if user.tenant_id:
+        queryset = queryset.filter(tenant_id=user.tenant_id)
+    if user.store_id:
+        # Untargeted, targeting the user's store, or written by a colleague of that store
+        queryset = queryset.filter(
+            Q(target_stores__isnull=True) | Q(target_stores=user.store_id) | Q(author__store=user.store_id)
+        )
+    return queryset.distinct()
+
+
+def is_live(announcement, now=None):
+    now = now or timezone.now()
+    return (
+        announcement.is_active
+        and announcement.publish_at <= now
+        and (announcement.expires_at is None or announcement.expires_at > now)
+    )
+
+
+def announcement_audience(announcement):
+    """Ids of the users an announcement targets (same rules as visible_announcements)."""
+    users = User.objects.filter(tenant_id=announcement.tenant_id)
+    store_ids = list(announcement.target_stores.values_list('id', flat=True))
+    if store_ids:
+        author_store_id = User.objects.filter(pk=announcement.author_id).values_list('store_id', flat=True).first()
+        users = users.filter(
+            Q(store__isnull=True) | Q(store_id__in=store_ids)
+            | (Q(store_id=author_store_id) if author_store_id else Q(pk__in=[]))
+        )
+    return set(users.values_list('id', flat=True))
+
+
+def message_audience(message):
+    """Ids of the recipients who see a message in their store's inbox."""
+    recipients = message.recipients.filter(tenant_id=message.tenant_id).filter(
+        Q(store__isnull=True) | Q(store_id=message.store_id)
+    )
+    return set(recipients.values_list('id', flat=True))
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+def _reconcile(item_filter, audience, read_by, make_entry):
+    """Make the entries matching item_filter cover exactly `audience`. Returns (added, removed)."""
+    current = set(InboxEntry.objects.filter(**item_filter).values_list('user_id', flat=True))
+    missing = audience - current
+    if missing:
+        InboxEntry.objects.bulk_create(
+            [make_entry(user_id, user_id in read_by) for user_id in missing],
+            batch_size=DEFAULT_BATCH_SIZE, ignore_conflicts=True,
+        )
+    stale = current - audience
+    if stale:
+        InboxEntry.objects.filter(user_id__in=stale, **item_filter).delete()
+    return len(missing), len(stale)
+
+
+def sync_announcement(announcement, now=None):
+    """Fan a live announcement out to its audience, or withdraw it when it is not live."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        if not is_live(announcement, now):
+            InboxEntry.objects.filter(announcement=announcement).delete()
+            Announcement.objects.filter(pk=announcement.pk).update(inbox_delivered_at=None)
+            return
+        read_by = set(AnnouncementRead.objects.filter(announcement=announcement).values_list('user_id', flat=True))
+        _reconcile(
+            {'announcement': announcement},
+            announcement_audience(announcement),
+            read_by,
+            lambda user_id, is_read: InboxEntry(
+                user_id=user_id, kind=InboxEntry.Kind.ANNOUNCEMENT, announcement=announcement,
+                is_read=is_read, expires_at=announcement.expires_at,
+            ),
+        )
+        InboxEntry.objects.filter(announcement=announcement).exclude(
+            expires_at=announcement.expires_at,
+        ).update(expires_at=announcement.expires_at)
+        Announcement.objects.filter(pk=announcement.pk).update(inbox_delivered_at=now)
+
+
+def sync_message(message):
+    """Give each recipient of a message an inbox entry (and drop removed recipients')."""
+    read_by = set(MessageRead.objects.filter(message=message).values_list('user_id', flat=True))
+    with transaction.atomic():
+        _reconcile(
+            {'message': message},
+            message_audience(message),
+            read_by,
+            lambda user_id, is_read: InboxEntry(
+                user_id=user_id, kind=InboxEntry.Kind.MESSAGE, message=message, is_read=is_read,
+            ),
+        )
+
+
+def sync_user(user, now=None):
+    """Rebuild one user's inbox from the visibility rules (after a tenant/store move)."""
+    now = now or timezone.now()
+    if not user.tenant_id:
+        InboxEntry.objects.filter(user=user).delete()
+        return
+    announcement_ids = set(visible_announcements(user, now).values_list('id', flat=True))
+    messages = TeamMessage.objects.filter(recipients=user, tenant_id=user.tenant_id)
+    if user.store_id:
+        messages = messages.filter(store_id=user.store_id)
+    message_ids = set(messages.values_list('id', flat=True))
+    read_announcements = set(AnnouncementRead.objects.filter(user=user).values_list('announcement_id', flat=True))
+    read_messages = set(MessageRead.objects.filter(user=user).values_list('message_id', flat=True))
+    expiry = dict(Announcement.objects.filter(pk__in=announcement_ids).values_list('id', 'expires_at'))
+
+    with transaction.atomic():
+        current = InboxEntry.objects.filter(user=user)
+        has_announcements = set(current.filter(announcement__isnull=False).values_list('announcement_id', flat=True))
+        has_messages = set(current.filter(message__isnull=False).values_list('message_id', flat=True))
+        InboxEntry.objects.bulk_create(
+            [
+                InboxEntry(
+                    user=user, kind=InboxEntry.Kind.ANNOUNCEMENT, announcement_id=announcement_id,
+                    is_read=announcement_id in read_announcements, expires_at=expiry[announcement_id],
+                )
+                for announcement_id in announcement_ids - has_announcements
+            ] + [
+                InboxEntry(
+                    user=user, kind=InboxEntry.Kind.MESSAGE, message_id=message_id,
+                    is_read=message_id in read_messages,
+                )
+                for message_id in message_ids - has_messages
+            ],
+            batch_size=DEFAULT_BATCH_SIZE, ignore_conflicts=True,
+        )
+        current.filter(
+            Q(announcement_id__in=has_announcements - announcement_ids) | Q(message_id__in=has_messages - message_ids)
+        ).delete()
+
+
+def set_read(user_id, is_read, announcement_ids=(), message_ids=()):
+    """Flip the read flag of a user's entries for the given items (one UPDATE)."""
+    items = Q(pk__in=[])
+    if announcement_ids:
+        items |= Q(announcement_id__in=announcement_ids)
+    if message_ids:
+        items |= Q(message_id__in=message_ids)
+    return InboxEntry.objects.filter(items, user_id=user_id).exclude(is_read=is_read).update(is_read=is_read)
+
+
+def mark_announcements_read(user, ids=None, before=None, acknowledge=False):
+    """
+    Record reads (and acknowledgements) for the user's visible announcements
+    with the given ids, or published up to `before`, with one insert and one
+    update per table however many there are. Returns the announcement ids.
+    """
+    now = timezone.now()
+    selected = inbox_announcements(user, now) if user.tenant_id else visible_announcements(user, now)
+    selected = selected.filter(pk__in=ids) if ids is not None else selected.filter(publish_at__lte=before)
+    if acknowledge:
+        selected = selected.filter(requires_acknowledgment=True)
+    announcement_ids = list(selected.order_by().values_list('pk', flat=True))
+    if not announcement_ids:
+        return []
+    with transaction.atomic():
+        AnnouncementRead.objects.bulk_create(
+            [
+                AnnouncementRead(
+                    announcement_id=announcement_id, user=user,
+                    acknowledged=acknowledge, acknowledged_at=now if acknowledge else None,
+                )
+                for announcement_id in announcement_ids
+            ],
+            batch_size=DEFAULT_BATCH_SIZE, ignore_conflicts=True,
+        )
+        if acknowledge:
+            AnnouncementRead.objects.filter(
+                user=user, announcement_id__in=announcement_ids, acknowledged=False,
+            ).update(acknowledged=True, acknowledged_at=now)
+        # bulk_create skips the AnnouncementRead signals
+        set_read(user.pk, True, announcement_ids=announcement_ids)
+    return announcement_ids
+
+
+def mark_messages_read(user, ids=None, before=None):
+    """Record reads for messages the user received, by ids or sent up to `before`. Returns the message ids."""
+    selected = TeamMessage.objects.filter(recipients=user)
+    if user.tenant_id:
+        selected = selected.filter(tenant_id=user.tenant_id)
+    if user.store_id:
+        selected = selected.filter(store_id=user.store_id)
+    selected = selected.filter(pk__in=ids) if ids is not None else selected.filter(created_at__lte=before)
+    message_ids = list(selected.order_by().values_list('pk', flat=True))
+    if not message_ids:
+        return []
+    with transaction.atomic():
+        MessageRead.objects.bulk_create(
+            [MessageRead(message_id=message_id, user=user) for message_id in message_ids],
+            batch_size=DEFAULT_BATCH_SIZE, ignore_conflicts=True,
+        )
+        set_read(user.pk, True, message_ids=message_ids)
+    return message_ids
+
+
+# ---------------------------------------------------------------------------
+# Deferred fan-out
+# ---------------------------------------------------------------------------
+
+def _sync_announcements(announcement_ids):
+    for announcement in Announcement.objects.filter(pk__in=announcement_ids):
+        try:
+            sync_announcement(announcement)
+        except Exception as e:
+            logger.error("Inbox fan-out failed for announcement %s: %s", announcement.pk, e, exc_info=True)
+
+
+def _sync_messages(message_ids):
+    for message in TeamMessage.objects.filter(pk__in=message_ids):
+        try:
+            sync_message(message)
+        except Exception as e:
+            logger.error("Inbox fan-out failed for message %s: %s", message.pk, e, exc_info=True)
+
+
+def schedule_announcement_sync(announcement_id):
+    """Re-fan an announcement out once the current transaction commits."""
+    after_commit(_sync_announcements, {announcement_id})
+
+
+def schedule_message_sync(message_id):
+    after_commit(_sync_messages, {message_id})
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+def publish_due_announcements(now=None):
+    """Fan out announcements that went live since they were last synced. Returns how many."""
+    now = now or timezone.now()
+    due = list(live_announcements(now).filter(inbox_delivered_at__isnull=True))
+    for announcement in due:
+        sync_announcement(announcement, now)
+    return len(due)
+
+
+def prune_expired_entries(now=None):
+    """Delete entries of expired announcements. Returns the number deleted."""
+    now = now or timezone.now()
+    deleted, _ = InboxEntry.objects.filter(expires_at__lte=now).delete()
+    return deleted
+
+
+def run_scheduled_maintenance(now=None):
+    """One scheduler pass: publish what became due, prune what expired."""
+    now = now or timezone.now()
+    return {'published': publish_due_announcements(now), 'pruned': prune_expired_entries(now)}
+
+
+def rebuild_all(now=None):
+    """Rebuild every inbox from scratch (initial backfill, or after bulk data fixes)."""
+    now = now or timezone.now()
+    InboxEntry.objects.filter(announcement__isnull=False).exclude(announcement__in=live_announcements(now)).delete()
+    Announcement.objects.exclude(inbox_delivered_at=None).update(inbox_delivered_at=None)
+    published = publish_due_announcements(now)
+    messages = 0
+    for message in TeamMessage.objects.iterator():
+        sync_message(message)
+        messages += 1
+    return {'announcements': published, 'messages': messages, 'pruned': prune_expired_entries(now)}
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def unread_entries(user, kind, now=None):
+    now = now or timezone.now()
+    return InboxEntry.objects.filter(user=user, kind=kind, is_read=False).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=now)
+    )
+
+
+def unread_count(user, kind, now=None):
+    return unread_entries(user, kind, now).count()
+
+
+def inbox_announcements(user, now=None):
+    """The user's live announcements, through their inbox entries."""
+    now = now or timezone.now()
+    return live_announcements(now).filter(inbox_entries__user=user)
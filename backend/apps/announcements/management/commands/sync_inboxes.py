@@ -0,0 +1,40 @@
+"""
+Inbox scheduler for announcements and team messages.
+
+Fans out announcements whose publish_at has passed and prunes entries of
+expired ones. Run it every few minutes from cron
+(deploy/utho/cron.d/crm-inbox-scheduler):
+
+    python manage.py sync_inboxes
+
+The migration that added the inbox backfilled it; after repairing data with
+raw SQL, rebuild every inbox once:
+
+    python manage.py sync_inboxes --rebuild
+"""
+from django.core.management.base import BaseCommand
+
+from apps.announcements.inbox import rebuild_all, run_scheduled_maintenance
+
+
+class Command(BaseCommand):
+    help = 'Publish due announcements to user inboxes and prune expired entries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Rebuild every inbox from the targeting rules',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            summary = rebuild_all()
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt inboxes for {summary['announcements']} announcement(s) and {summary['messages']} message(s)."
+            ))
+            return
+        summary = run_scheduled_maintenance()
+        self.stdout.write(self.style.SUCCESS(
+            f"Published {summary['published']} announcement(s), pruned {summary['pruned']} expired entr(ies)."
+        ))
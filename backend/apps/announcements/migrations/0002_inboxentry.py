@@ -0,0 +1,169 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:34
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils import timezone
+import django.db.models.deletion
+
+BATCH_SIZE = 500
+
+
+def backfill_inboxes(apps, schema_editor):
+    """Give every tenant user entries for the live announcements and team messages they see (as inbox.rebuild_all)."""
+    Announcement = apps.get_model('announcements', 'Announcement')
+    AnnouncementRead = apps.get_model('announcements', 'AnnouncementRead')
+    InboxEntry = apps.get_model('announcements', 'InboxEntry')
+    MessageRead = apps.get_model('announcements', 'MessageRead')
+    TeamMessage = apps.get_model('announcements', 'TeamMessage')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    now = timezone.now()
+    live = Announcement.objects.filter(is_active=True, publish_at__lte=now).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=now)
+    )
+    for announcement in live.iterator():
+        users = User.objects.filter(tenant_id=announcement.tenant_id)
+        store_ids = list(announcement.target_stores.values_list('id', flat=True))
+        if store_ids:
+            author_store_id = User.objects.filter(pk=announcement.author_id).values_list('store_id', flat=True).first()
+            users = users.filter(
+                Q(store__isnull=True) | Q(store_id__in=store_ids)
+                | (Q(store_id=author_store_id) if author_store_id else Q(pk__in=[]))
+            )
+        read_by = set(AnnouncementRead.objects.filter(announcement=announcement).values_list('user_id', flat=True))
+        InboxEntry.objects.bulk_create(
+            [
+                InboxEntry(
+                    user_id=user_id, kind='announcement', announcement=announcement,
+                    is_read=user_id in read_by, expires_at=announcement.expires_at,
+                )
+                for user_id in users.values_list('id', flat=True)
+            ],
+            batch_size=BATCH_SIZE, ignore_conflicts=True,
+        )
+    live.update(inbox_delivered_at=now)
+
+    for message in TeamMessage.objects.iterator():
+        recipients = message.recipients.filter(tenant_id=message.tenant_id).filter(
+            Q(store__isnull=True) | Q(store_id=message.store_id)
+        )
+        read_by = set(MessageRead.objects.filter(message=message).values_list('user_id', flat=True))
+        InboxEntry.objects.bulk_create(
+            [
+                InboxEntry(user_id=user_id, kind='message', message=message, is_read=user_id in read_by)
+                for user_id in recipients.values_list('id', flat=True)
+            ],
+            batch_size=BATCH_SIZE, ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("announcements", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="announcement",
+            name="inbox_delivered_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="When the announcement was last fanned out to user inboxes (see inbox.py)",
+                null=True,
+            ),
+        ),
+        migrations.CreateModel(
+            name="InboxEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("announcement", "Announcement"),
+                            ("message", "Team Message"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("is_read", models.BooleanField(default=False)),
+                (
+                    "expires_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Copied from the announcement; expired entries are pruned by the inbox scheduler",
+                        null=True,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "announcement",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inbox_entries",
+                        to="announcements.announcement",
+                    ),
+                ),
+                (
+                    "message",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inbox_entries",
+                        to="announcements.teammessage",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inbox_entries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Inbox Entry",
+                "verbose_name_plural": "Inbox Entries",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "kind", "is_read"],
+                        name="inbox_user_kind_read_idx",
+                    ),
+                    models.Index(fields=["expires_at"], name="inbox_expires_at_idx"),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="inboxentry",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("announcement__isnull", False)),
+                fields=("user", "announcement"),
+                name="unique_inbox_announcement",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="inboxentry",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("message__isnull", False)),
+                fields=("user", "message"),
+                name="unique_inbox_message",
+            ),
+        ),
+        migrations.RunPython(backfill_inboxes, migrations.RunPython.noop),
+    ]
@@ -81,6 +81,12 @@ class Announcement(models.Model):
         blank=True,
         help_text=_('When this announcement expires (null for no expiration)')
     )
+    inbox_delivered_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('When the announcement was last fanned out to user inboxes (see inbox.py)')
+    )
 
     # Author and metadata
     author = models.ForeignKey(
@@ -292,4 +298,63 @@ class MessageRead(models.Model):
     def save(self, *args, **kwargs):
         if self.responded and not self.responded_at:
             self.responded_at = timezone.now()
-        super().save(*args, **kwargs) 
\ No newline at end of file
+        super().save(*args, **kwargs) 
+
+class InboxEntry(models.Model):
+    """
+    Per-user inbox state: one row per announcement or team message a user can
+    see, with its read flag. Maintained by apps/announcements/inbox.py so unread
+    counts and inbox listings are indexed lookups.
+    """
+    class Kind(models.TextChoices):
+        ANNOUNCEMENT = 'announcement', _('Announcement')
+        MESSAGE = 'message', _('Team Message')
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='inbox_entries'
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='inbox_entries'
+    )
+    message = models.ForeignKey(
+        TeamMessage,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='inbox_entries'
+    )
+    is_read = models.BooleanField(default=False)
+    expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_('Copied from the announcement; expired entries are pruned by the inbox scheduler')
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Inbox Entry')
+        verbose_name_plural = _('Inbox Entries')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'announcement'], condition=models.Q(announcement__isnull=False),
+                name='unique_inbox_announcement',
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'message'], condition=models.Q(message__isnull=False),
+                name='unique_inbox_message',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'kind', 'is_read'], name='inbox_user_kind_read_idx'),
+            models.Index(fields=['expires_at'], name='inbox_expires_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.kind} {self.announcement_id or self.message_id}"
@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import inbox
+from .models import Announcement, AnnouncementRead, MessageRead, TeamMessage
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Announcement)
+def sync_announcement_inbox(sender, instance, **kwargs):
+    inbox.schedule_announcement_sync(instance.pk)
+
+
+@receiver(m2m_changed, sender=Announcement.target_stores.through)
+def sync_announcement_inbox_on_targets(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Announcement):
+        inbox.schedule_announcement_sync(instance.pk)
+
+
+@receiver(m2m_changed, sender=TeamMessage.recipients.through)
+def sync_message_inbox(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, TeamMessage):
+        inbox.schedule_message_sync(instance.pk)
+
+
+@receiver(post_save, sender=AnnouncementRead)
+@receiver(post_delete, sender=AnnouncementRead)
+def mark_announcement_entry(sender, instance, **kwargs):
+    inbox.set_read(instance.user_id, kwargs['signal'] is post_save, announcement_ids=[instance.announcement_id])
+
+
+@receiver(post_save, sender=MessageRead)
+@receiver(post_delete, sender=MessageRead)
+def mark_message_entry(sender, instance, **kwargs):
+    inbox.set_read(instance.user_id, kwargs['signal'] is post_save, message_ids=[instance.message_id])
+
+
+@receiver(pre_save, sender=User)
+def remember_inbox_scope(sender, instance, update_fields=None, **kwargs):
+    # Logins save last_login only; don't pay a lookup for those
+    if not instance.pk or (update_fields is not None and not {'tenant', 'store'} & set(update_fields)):
+        instance._inbox_scope = None
+        return
+    instance._inbox_scope = sender.objects.filter(pk=instance.pk).values_list('tenant_id', 'store_id').first()
+
+
+@receiver(post_save, sender=User)
+def rebuild_user_inbox(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_inbox_scope', None)
+    if created or (previous is not None and previous != (instance.tenant_id, instance.store_id)):
+        transaction.on_commit(lambda: inbox.sync_user(instance))
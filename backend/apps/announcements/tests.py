@@ -0,0 +1,131 @@
+from datetime import timedelta
+from importlib import import_module
+from unittest.mock import patch
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.stores.models import Store
+from apps.tenants.models import Tenant
+from . import inbox
+from .models import Announcement, AnnouncementRead, InboxEntry, TeamMessage
+
+User = get_user_model()
+
+
+class InboxTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store_a, self.store_b = [
+            Store.objects.create(
+                name=f"Store {code}", code=code, address="1 Test St", city="Test City", state="Test State",
+                tenant=self.tenant,
+            )
+            for code in ('A', 'B')
+        ]
+        self.manager_a = self._user('manager_a', User.Role.MANAGER, self.store_a)
+        self.sales_b = self._user('sales_b', User.Role.INHOUSE_SALES, self.store_b)
+        self.sales_a = self._user('sales_a', User.Role.INHOUSE_SALES, self.store_a)
+        self.admin = self._user('admin', User.Role.BUSINESS_ADMIN, None)
+
+    def _user(self, username, role, store):
+        return User.objects.create_user(
+            username=username, password="testpass123", role=role, tenant=self.tenant, store=store,
+        )
+
+    def _announce(self, publish_at=None, targets=()):
+        with self.captureOnCommitCallbacks(execute=True):
+            announcement = Announcement.objects.create(
+                title="Hello", content="News", author=self.manager_a, tenant=self.tenant,
+                publish_at=publish_at or timezone.now(),
+            )
+            announcement.target_stores.add(*targets)
+        return announcement
+
+    def _audience(self, announcement):
+        return set(InboxEntry.objects.filter(announcement=announcement).values_list('user__username', flat=True))
+
+    def test_fan_out_matches_targeting_rules(self):
+        targeted = self._announce(targets=[self.store_b])
+        # Store B, the author's store and store-less users
+        self.assertEqual(self._audience(targeted), {'manager_a', 'sales_a', 'sales_b', 'admin'})
+        for user in (self.manager_a, self.sales_b, self.admin):
+            self.assertEqual(
+                set(inbox.inbox_announcements(user)), set(inbox.visible_announcements(user)),
+            )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sales_b.store = self.store_a
+            self.sales_b.save()
+        self.assertEqual(
+            set(InboxEntry.objects.filter(user=self.sales_b).values_list('announcement_id', flat=True)), {targeted.id},
+        )
+
+    def test_migration_backfill_matches_fan_out(self):
+        targeted = self._announce(targets=[self.store_b])
+        self._announce(publish_at=timezone.now() + timedelta(hours=1))
+        AnnouncementRead.objects.create(announcement=targeted, user=self.sales_b)
+        with self.captureOnCommitCallbacks(execute=True):
+            message = TeamMessage.objects.create(
+                subject="Shift", content="Swap?", sender=self.manager_a, store=self.store_b, tenant=self.tenant,
+            )
+            message.recipients.add(self.sales_b, self.sales_a)
+        fields = ('user_id', 'kind', 'announcement_id', 'message_id', 'is_read', 'expires_at')
+        expected = set(InboxEntry.objects.values_list(*fields))
+
+        InboxEntry.objects.all().delete()
+        import_module('apps.announcements.migrations.0002_inboxentry').backfill_inboxes(apps, None)
+        self.assertEqual(set(InboxEntry.objects.values_list(*fields)), expected)
+        self.assertEqual(inbox.run_scheduled_maintenance()['published'], 0)
+
+    def test_unread_counts_follow_reads_and_publish_window(self):
+        later = self._announce(publish_at=timezone.now() + timedelta(hours=1))
+        self._announce()
+        self.assertEqual(self._audience(later), set())
+
+        api = APIClient()
+        api.force_authenticate(self.sales_b)
+        self.assertEqual(api.get('/api/announcements/announcements/unread_count/').data['unread_count'], 1)
+
+        # Publish time reached (no save involved): the scheduler delivers it
+        Announcement.objects.filter(pk=later.pk).update(publish_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(inbox.run_scheduled_maintenance()['published'], 1)
+        self.assertEqual(api.get('/api/announcements/announcements/unread_count/').data['unread_count'], 2)
+        api.post(f'/api/announcements/announcements/{later.id}/mark_as_read/')
+        self.assertEqual(api.get('/api/announcements/announcements/unread_count/').data['unread_count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            message = TeamMessage.objects.create(
+                subject="Shift", content="Swap?", sender=self.manager_a, store=self.store_b, tenant=self.tenant,
+            )
+            message.recipients.add(self.sales_b, self.sales_a)
+        self.assertEqual(api.get('/api/announcements/messages/unread_count/').data['unread_count'], 1)
+        self.assertFalse(InboxEntry.objects.filter(message=message, user=self.sales_a).exists())
+
+    def test_bulk_read_and_acknowledge_write_once(self):
+        announcements = [self._announce() for _ in range(3)]
+        Announcement.objects.filter(pk=announcements[0].pk).update(requires_acknowledgment=True)
+        api = APIClient()
+        api.force_authenticate(self.sales_b)
+
+        with patch('apps.announcements.views.broadcast_read_delta') as broadcast, \
+                self.assertNumQueries(6):  # select, savepoint, insert, inbox update, release, count
+            response = api.post(
+                '/api/announcements/announcements/bulk_mark_as_read/',
+                {'before': timezone.now().isoformat()}, format='json',
+            )
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['unread_count'], 0)
+        self.assertEqual(broadcast.call_count, 1)
+        self.assertEqual(AnnouncementRead.objects.filter(user=self.sales_b).count(), 3)
+
+        response = api.post(
+            '/api/announcements/announcements/bulk_acknowledge/',
+            {'ids': [a.id for a in announcements]}, format='json',
+        )
+        self.assertEqual(response.data['ids'], [announcements[0].id])
+        self.assertTrue(AnnouncementRead.objects.get(user=self.sales_b, announcement=announcements[0]).acknowledged)
+        self.assertEqual(api.post('/api/announcements/announcements/bulk_acknowledge/', {}, format='json').status_code, 400)
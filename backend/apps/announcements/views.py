@@ -4,10 +4,12 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Count
-from django.utils import timezone
 from django.contrib.auth import get_user_model
 
-from .models import Announcement, AnnouncementRead, TeamMessage, MessageRead
+from apps.notifications.services import broadcast_read_delta, parse_read_selection
+
+from . import inbox
+from .models import AnnouncementRead, InboxEntry, TeamMessage, MessageRead
 from .serializers import (
     AnnouncementSerializer, AnnouncementCreateSerializer, AnnouncementUpdateSerializer,
     TeamMessageSerializer, TeamMessageCreateSerializer, TeamMessageUpdateSerializer,
@@ -32,37 +34,11 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter announcements based on user's access level and targeting."""
         user = self.request.user
-        
-        # Base queryset - show all active announcements for the user's tenant
-        queryset = Announcement.objects.filter(is_active=True)
-        
-        # Filter by tenant
-        if user.tenant:
-            queryset = queryset.filter(tenant=user.tenant)
-        
-        # Filter by store - show announcements for user's store or store-specific announcements
-        if user.store:
-            # Show announcements that are either:
-            # 1. System-wide announcements (no target_stores)
-            # 2. Store-specific announcements targeting this user's store
-            # 3. Team-specific announcements created by users from the same store
-            queryset = queryset.filter(
-                Q(target_stores__isnull=True) |  # System-wide
-                Q(target_stores=user.store) |    # Store-specific
-                Q(author__store=user.store)      # Created by same store members
-            ).distinct()
-        else:
-            # If user has no store, show all announcements for the tenant
-            pass
-        
-        # Filter by publish date and expiration
-        now = timezone.now()
-        queryset = queryset.filter(
-            Q(publish_at__lte=now) &
-            (Q(expires_at__isnull=True) | Q(expires_at__gt=now))
-        )
-        
-        return queryset.distinct()
+        if user.tenant_id:
+            # Indexed lookup through the user's inbox entries (see inbox.py)
+            return inbox.inbox_announcements(user)
+        # No tenant: every tenant's live announcements
+        return inbox.visible_announcements(user)
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -149,10 +125,41 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         
         return Response({'status': 'acknowledged'})
 
+    @action(detail=False, methods=['post'])
+    def bulk_mark_as_read(self, request):
+        """Mark announcements as read: {'ids': [...]} or {'before': <ISO datetime>}."""
+        return self._bulk_read(request, acknowledge=False)
+
+    @action(detail=False, methods=['post'])
+    def bulk_acknowledge(self, request):
+        """Acknowledge announcements that require it: {'ids': [...]} or {'before': <ISO datetime>}."""
+        return self._bulk_read(request, acknowledge=True)
+
+    def _bulk_read(self, request, acknowledge):
+        try:
+            ids, before = parse_read_selection(request.data)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        user = request.user
+        marked = inbox.mark_announcements_read(user, ids=ids, before=before, acknowledge=acknowledge)
+        unread = inbox.unread_count(user, InboxEntry.Kind.ANNOUNCEMENT) if user.tenant_id else None
+        if marked:
+            broadcast_read_delta(user.id, 'announcement', ids=marked, unread_count=unread)
+        
+        return Response({
+            'status': 'acknowledged' if acknowledge else 'marked as read',
+            'count': len(marked),
+            'ids': marked,
+            'unread_count': unread,
+        })
+
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get count of unread announcements for current user."""
         user = request.user
+        if user.tenant_id:
+            return Response({'unread_count': inbox.unread_count(user, InboxEntry.Kind.ANNOUNCEMENT)})
         read_announcements = AnnouncementRead.objects.filter(user=user).values_list('announcement_id', flat=True)
         
         unread_count = self.get_queryset().exclude(id__in=read_announcements).count()
@@ -261,6 +268,22 @@ class TeamMessageViewSet(viewsets.ModelViewSet):
         
         return Response({'status': 'responded'})
 
+    @action(detail=False, methods=['post'])
+    def bulk_mark_as_read(self, request):
+        """Mark received messages as read: {'ids': [...]} or {'before': <ISO datetime>}."""
+        try:
+            ids, before = parse_read_selection(request.data)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        user = request.user
+        marked = inbox.mark_messages_read(user, ids=ids, before=before)
+        unread = inbox.unread_count(user, InboxEntry.Kind.MESSAGE) if user.tenant_id else None
+        if marked:
+            broadcast_read_delta(user.id, 'message', ids=marked, unread_count=unread)
+        
+        return Response({'status': 'marked as read', 'count': len(marked), 'ids': marked, 'unread_count': unread})
+
     @action(detail=True, methods=['post'])
     def reply(self, request, pk=None):
         """Create a reply to a message."""
@@ -289,6 +312,8 @@ class TeamMessageViewSet(viewsets.ModelViewSet):
     def unread_count(self, request):
         """Get count of unread messages for current user."""
         user = request.user
+        if user.tenant_id:
+            return Response({'unread_count': inbox.unread_count(user, InboxEntry.Kind.MESSAGE)})
         read_messages = MessageRead.objects.filter(user=user).values_list('message_id', flat=True)
         
         unread_count = self.get_queryset().filter(recipients=user).exclude(id__in=read_messages).count()
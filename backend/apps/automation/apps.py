@@ -5,3 +5,6 @@ class AutomationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.automation'
     verbose_name = 'Automation'
+
+    def ready(self):
+        import apps.automation.signals  # noqa
@@ -0,0 +1,432 @@
+"""
+Event-driven AutomationWorkflow engine.
+
+Domain signals (apps/automation/signals.py) call emit(tenant_id, event, instance).
+Active, enabled EVENT workflows are held in a process-local index keyed by
+(tenant_id, trigger_config['event']) with their JSON conditions compiled to
+plain Python predicates, so matching an event is a dict lookup plus a few
+function calls - no queries. The event payload is only built when the tenant
+has workflows for that event.
+
+Matched workflows run after the surrounding transaction commits, on a small
+thread pool (AUTOMATION_WORKFLOWS_ASYNC=False runs them inline). Each run is
+recorded as an AutomationExecution.
+
+The index is rebuilt lazily when a workflow changes: saves bump a version in
+the shared cache and every process re-checks it at most every
+INDEX_CHECK_SECONDS.
+
+Conditions are a list (all must hold) of:
+    {"field": "stage", "operator": "equals", "value": "closed_won"}
+    {"any": [...]}, {"all": [...]}, {"not": {...}}
+Actions are a list of {"type": <registered action>, ...}; see ACTIONS.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from uuid import UUID
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.cache import bump_version, get_version
+from .models import AutomationExecution, AutomationWorkflow
+
+logger = logging.getLogger(__name__)
+
+EVENTS = {
+    'client.created': 'New customer created',
+    'sale.saved': 'Sale created or updated',
+    'pipeline.stage_changed': 'Pipeline moved to a new stage',
+    'appointment.missed': 'Appointment marked as no-show',
+}
+
+INDEX_CHECK_SECONDS = 5
+VERSION_NAMESPACE = 'automation:workflows'
+DEFAULT_WORKERS = 4
+
+
+# ---------------------------------------------------------------------------
+# Condition compilation
+# ---------------------------------------------------------------------------
+
+def _ordered(compare):
+    def check(actual, expected):
+        return actual is not None and expected is not None and compare(actual, expected)
+    return check
+
+
+def _contains(actual, expected):
+    if actual is None:
+        return False
+    if isinstance(actual, str):
+        return str(expected).lower() in actual.lower()
+    return expected in actual
+
+
+OPERATORS = {
+    'equals': lambda actual, expected: actual == expected,
+    'not_equals': lambda actual, expected: actual != expected,
+    'in': lambda actual, expected: actual in expected,
+    'not_in': lambda actual, expected: actual not in expected,
+    'gt': _ordered(lambda a, b: a > b),
+    'gte': _ordered(lambda a, b: a >= b),
+    'lt': _ordered(lambda a, b: a < b),
+    'lte': _ordered(lambda a, b: a <= b),
+    'contains': _contains,
+    'is_empty': lambda actual, expected: actual in (None, '', [], {}),
+    'is_not_empty': lambda actual, expected: actual not in (None, '', [], {}),
+}
+
+
+def compile_condition(spec):
+    """Compile one JSON condition into a predicate(payload) -> bool. Raises ValueError on bad specs."""
+    if not isinstance(spec, dict):
+        raise ValueError(f'Condition must be an object, got {spec!r}')
+    if 'all' in spec:
+        return compile_conditions(spec['all'])
+    if 'any' in spec:
+        predicates = [compile_condition(item) for item in spec['any']]
+        return lambda payload: any(predicate(payload) for predicate in predicates)
+    if 'not' in spec:
+        predicate = compile_condition(spec['not'])
+        return lambda payload: not predicate(payload)
+
+    field = spec.get('field')
+    operator = OPERATORS.get(spec.get('operator', 'equals'))
+    if not field or operator is None:
+        raise ValueError(f'Invalid condition {spec!r}')
+    expected = spec.get('value')
+    if spec.get('operator') in ('in', 'not_in'):
+        expected = frozenset(expected or ())
+    return lambda payload: operator(payload.get(field), expected)
+
+
+def compile_conditions(specs):
+    """Compile a list of conditions that must all hold. An empty list always matches."""
+    predicates = [compile_condition(spec) for spec in specs or ()]
+    if not predicates:
+        return lambda payload: True
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda payload: all(predicate(payload) for predicate in predicates)
+
+
+# ---------------------------------------------------------------------------
+# Workflow index
+# ---------------------------------------------------------------------------
+
+class CompiledWorkflow:
+    __slots__ = ('id', 'name', 'predicate', 'actions')
+
+    def __init__(self, id, name, predicate, actions):
+        self.id = id
+        self.name = name
+        self.predicate = predicate
+        self.actions = actions
+
+
+class WorkflowIndex:
+    """Process-local {(tenant_id, event): [CompiledWorkflow]}, refreshed when the shared version changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = None
+        self._version = None
+        self._checked_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = None
+            self._checked_at = 0.0
+
+    def _build(self):
+        entries = {}
+        rows = AutomationWorkflow.objects.filter(
+            trigger_type=AutomationWorkflow.TriggerType.EVENT,
+            status=AutomationWorkflow.Status.ACTIVE,
+            is_enabled=True,
+        ).filter(
+            Q(max_executions=0) | Q(execution_count__lt=F('max_executions'))
+        ).values('id', 'name', 'tenant_id', 'trigger_config', 'conditions', 'actions')
+        for row in rows:
+            event = (row['trigger_config'] or {}).get('event')
+            if event not in EVENTS:
+                logger.warning("Workflow %s has unknown trigger event %r; skipped", row['id'], event)
+                continue
+            try:
+                predicate = compile_conditions(row['conditions'])
+            except (TypeError, ValueError) as e:
+                logger.warning("Workflow %s has invalid conditions (%s); skipped", row['id'], e)
+                continue
+            entries.setdefault((row['tenant_id'], event), []).append(
+                CompiledWorkflow(row['id'], row['name'], predicate, row['actions'] or [])
+            )
+        return entries
+
+    def entries(self):
+        now = time.monotonic()
+        if self._entries is not None and now - self._checked_at < INDEX_CHECK_SECONDS:
+            return self._entries
+        with self._lock:
+            version = get_version(VERSION_NAMESPACE)
+            if self._entries is None or version != self._version:
+                self._entries = self._build()
+                self._version = version
+            self._checked_at = now
+            return self._entries
+
+    def workflows_for(self, tenant_id, event):
+        return self.entries().get((tenant_id, event), ())
+
+
+index = WorkflowIndex()
+
+
+def invalidate_workflow_index():
+    """Force every process to rebuild its index (called when a workflow changes)."""
+    bump_version(VERSION_NAMESPACE)
+    index.invalidate()
+
+
+def has_workflows(tenant_id, event):
+    """Cheap check used by signals before doing any work to build a payload."""
+    return bool(tenant_id) and bool(index.workflows_for(tenant_id, event))
+
+
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
+
+def _plain(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def build_payload(instance, **extra):
+    """JSON-serialisable snapshot of a model instance's concrete fields, plus extra keys."""
+    payload = {field.attname: _plain(getattr(instance, field.attname)) for field in instance._meta.concrete_fields}
+    payload['model'] = instance._meta.label
+    payload.update({key: _plain(value) for key, value in extra.items()})
+    return payload
+
+
+def match(tenant_id, event, payload):
+    """Workflows of a tenant whose conditions hold for an event payload."""
+    matched = []
+    for workflow in index.workflows_for(tenant_id, event):
+        try:
+            if workflow.predicate(payload):
+                matched.append(workflow)
+        except Exception as e:
+            logger.warning("Workflow %s condition failed on %s: %s", workflow.id, event, e)
+    return matched
+
+
+def emit(tenant_id, event, instance, **extra):
+    """Evaluate an event against the tenant's workflows and dispatch matches after commit."""
+    if not has_workflows(tenant_id, event):
+        return []
+    payload = build_payload(instance, event=event, **extra)
+    matched = match(tenant_id, event, payload)
+    if matched:
+        workflow_ids = [workflow.id for workflow in matched]
+        transaction.on_commit(lambda: dispatch(workflow_ids, event, payload))
+    return matched
+
+
+# ---------------------------------------------------------------------------
+# Dispatch and execution
+# ---------------------------------------------------------------------------
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'AUTOMATION_WORKFLOW_WORKERS', DEFAULT_WORKERS),
+                thread_name_prefix='workflow',
+            )
+        return _pool
+
+
+def _run_in_worker_thread(workflow_id, event, payload):
+    close_old_connections()
+    try:
+        run_workflow(workflow_id, event, payload)
+    except Exception as e:
+        logger.error("Workflow %s failed on %s: %s", workflow_id, event, e, exc_info=True)
+    finally:
+        close_old_connections()
+
+
+def dispatch(workflow_ids, event, payload):
+    if not getattr(settings, 'AUTOMATION_WORKFLOWS_ASYNC', True):
+        for workflow_id in workflow_ids:
+            run_workflow(workflow_id, event, payload)
+        return
+    pool = _get_pool()
+    for workflow_id in workflow_ids:
+        pool.submit(_run_in_worker_thread, workflow_id, event, payload)
+
+
+def run_workflow(workflow_id, event, payload):
+    """Run one workflow's actions for an event. Returns the AutomationExecution, or None if over its limit."""
+    now = timezone.now()
+    # Reserve the run atomically so max_executions holds across workers
+    reserved = AutomationWorkflow.objects.filter(id=workflow_id).filter(
+        Q(max_executions=0) | Q(execution_count__lt=F('max_executions'))
+    ).update(execution_count=F('execution_count') + 1, last_executed=now)
+    if not reserved:
+        return None
+    workflow = AutomationWorkflow.objects.get(id=workflow_id)
+    if workflow.is_limit_reached:
+        invalidate_workflow_index()
+
+    execution = AutomationExecution.objects.create(
+        workflow=workflow,
+        status=AutomationExecution.Status.RUNNING,
+        input_data={'event': event},
+        trigger_data=payload,
+        started_at=now,
+    )
+    started = time.monotonic()
+    results = []
+    try:
+        for action in workflow.actions or []:
+            handler = ACTIONS.get((action or {}).get('type'))
+            if handler is None:
+                raise ValueError(f"Unknown action type {(action or {}).get('type')!r}")
+            results.append(handler(workflow, action, payload) or {})
+        execution.status = AutomationExecution.Status.COMPLETED
+        execution.progress = 100
+    except Exception as e:
+        logger.error("Workflow %s (%s) action failed: %s", workflow.id, workflow.name, e, exc_info=True)
+        execution.status = AutomationExecution.Status.FAILED
+        execution.error_message = str(e)
+    execution.output_data = {'actions': results}
+    execution.completed_at = timezone.now()
+    execution.duration_seconds = int(time.monotonic() - started)
+    execution.save(update_fields=[
+        'status', 'progress', 'error_message', 'output_data', 'completed_at', 'duration_seconds', 'updated_at',
+    ])
+    return execution
+
+
+# ---------------------------------------------------------------------------
+# Actions
+# ---------------------------------------------------------------------------
+
+ACTIONS = {}
+
+EVENT_NOTIFICATION_TYPES = {
+    'client.created': 'new_customer',
+    'sale.saved': 'order_status',
+    'pipeline.stage_changed': 'deal_update',
+    'appointment.missed': 'appointment_updated',
+}
+
+
+def register_action(name):
+    """Decorator registering a callable(workflow, action, payload) -> dict as a workflow action."""
+    def decorator(func):
+        ACTIONS[name] = func
+        return func
+    return decorator
+
+
+class _FormatValues(dict):
+    def __missing__(self, key):
+        return ''
+
+
+def _resolve_recipients(workflow, action, payload):
+    """
+    Recipient user ids from action['recipients'], a list of:
+      - user ids
+      - payload fields holding a user id, e.g. "assigned_to_id", "sales_representative_id"
+      - "role:<role>" for the tenant's users with that role (same store when the payload has store_id)
+    """
+    from apps.users.models import User
+
+    user_ids, roles = set(), set()
+    for recipient in action.get('recipients') or []:
+        if isinstance(recipient, int):
+            user_ids.add(recipient)
+        elif isinstance(recipient, str) and recipient.startswith('role:'):
+            roles.add(recipient[5:])
+        elif isinstance(recipient, str) and payload.get(recipient):
+            user_ids.add(payload[recipient])
+    if roles:
+        users = User.objects.filter(tenant_id=workflow.tenant_id, role__in=roles, is_active=True)
+        if payload.get('store_id'):
+            users = users.filter(store_id=payload['store_id'])
+        user_ids.update(users.values_list('id', flat=True))
+    return User.objects.filter(id__in=user_ids, tenant_id=workflow.tenant_id).values_list('id', flat=True)
+
+
+@register_action('notify')
+def notify(workflow, action, payload):
+    """{"type": "notify", "recipients": [...], "title": "...", "message": "Deal {title} moved to {stage}"}"""
+    from apps.notifications.models import Notification
+
+    values = _FormatValues(payload)
+    created = 0
+    for user_id in _resolve_recipients(workflow, action, payload):
+        Notification.objects.create(
+            user_id=user_id,
+            tenant_id=workflow.tenant_id,
+            store_id=payload.get('store_id'),
+            type=action.get('notification_type') or EVENT_NOTIFICATION_TYPES.get(payload.get('event'), 'announcement'),
+            title=action.get('title', workflow.name).format_map(values),
+            message=action.get('message', '').format_map(values),
+            priority=action.get('priority', 'medium'),
+            metadata={'workflow_id': workflow.id, 'object_id': payload.get('id'), 'model': payload.get('model')},
+        )
+        created += 1
+    return {'type': 'notify', 'notifications': created}
+
+
+# Fields a workflow may write, per model raising events. Everything else -
+# keys, ownership and tenant references in particular - is off limits.
+UPDATABLE_FIELDS = {
+    'clients.Client': {
+        'status', 'customer_status', 'client_category', 'preferred_flag', 'lead_source',
+        'next_follow_up', 'next_follow_up_time', 'summary_notes', 'notes',
+    },
+    'sales.Sale': {'status', 'payment_status', 'notes', 'internal_notes'},
+    'sales.SalesPipeline': {'stage', 'probability', 'next_action', 'next_action_date', 'notes'},
+    'clients.Appointment': {'status', 'notes', 'requires_follow_up', 'follow_up_date', 'follow_up_notes', 'next_action'},
+}
+
+
+@register_action('update_field')
+def update_field(workflow, action, payload):
+    """{"type": "update_field", "field": "status", "value": "vip"} on the object that raised the event."""
+    from django.apps import apps
+
+    model = apps.get_model(payload['model'])
+    name = action.get('field')
+    field = model._meta.get_field(name) if name in UPDATABLE_FIELDS.get(model._meta.label, ()) else None
+    if field is None or not field.concrete or field.primary_key or (
+            field.is_relation and field.related_model._meta.label == 'tenants.Tenant'):
+        raise ValueError(f"Field {name!r} cannot be updated by a workflow")
+    # queryset update: deliberately no signals, so a workflow can't re-trigger itself
+    updated = model.objects.filter(id=payload['id'], tenant_id=workflow.tenant_id).update(
+        **{field.attname: action.get('value')}
+    )
+    return {'type': 'update_field', 'updated': updated}
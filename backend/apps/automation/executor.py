@@ -0,0 +1,252 @@
+"""
+ScheduledTask executor.
+
+The worker claims due tasks with SELECT ... FOR UPDATE SKIP LOCKED, so several
+worker processes can run side by side without running a task twice. Claiming a
+task records a RUNNING TaskExecution and pushes next_execution out by a lease,
+then the task runs on a bounded thread pool outside the claiming transaction.
+When it finishes the execution row gets its timing/output and the task is
+rescheduled: on success for its next regular slot, on failure after
+retry_delay_minutes * 2**(retry - 1) until max_retries is used up.
+
+If a worker dies mid-task, the lease expires, the task becomes due again and
+the abandoned RUNNING execution is marked failed by whoever claims it next.
+
+Entry points:
+  - run_due_tasks(): claim and run everything due now (one-shot)
+  - AutomationWorker.run(): long-running loop used by run_automation_worker
+"""
+import logging
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .handlers import resolve_handler
+from .models import ScheduledTask, TaskExecution
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_SLEEP_SECONDS = 30
+DEFAULT_LEASE_MINUTES = 30
+MIN_SLEEP_SECONDS = 1
+
+FREQUENCY_STEPS = {
+    ScheduledTask.Frequency.MINUTELY: relativedelta(minutes=1),
+    ScheduledTask.Frequency.HOURLY: relativedelta(hours=1),
+    ScheduledTask.Frequency.DAILY: relativedelta(days=1),
+    ScheduledTask.Frequency.WEEKLY: relativedelta(weeks=1),
+    ScheduledTask.Frequency.MONTHLY: relativedelta(months=1),
+    ScheduledTask.Frequency.YEARLY: relativedelta(years=1),
+}
+
+
+def next_run_after(task, after):
+    """Next regular run time of a task after `after` (custom tasks use schedule_config['interval_minutes'])."""
+    step = FREQUENCY_STEPS.get(task.frequency)
+    if step is None:
+        step = relativedelta(minutes=int((task.schedule_config or {}).get('interval_minutes', 60)))
+    return after + step
+
+
+def retry_delay(task, retry_count):
+    """Exponential backoff: retry_delay_minutes, then doubled for each further retry."""
+    return timedelta(minutes=task.retry_delay_minutes * 2 ** (retry_count - 1))
+
+
+def _lease(task):
+    return timedelta(minutes=(task.task_config or {}).get('timeout_minutes', DEFAULT_LEASE_MINUTES))
+
+
+def due_tasks(now):
+    return ScheduledTask.objects.filter(
+        Q(next_execution__isnull=True) | Q(next_execution__lte=now),
+        is_enabled=True,
+        status=ScheduledTask.Status.ACTIVE,
+    )
+
+
+def claim_due_tasks(limit, now=None):
+    """
+    Claim up to `limit` due tasks. Returns [(task, execution)].
+
+    Tasks locked by another worker are skipped. Each claimed task gets a RUNNING
+    TaskExecution and a leased next_execution, committed before any task runs.
+    """
+    now = now or timezone.now()
+    claimed = []
+    if limit <= 0:
+        return claimed
+    with transaction.atomic():
+        tasks = list(
+            due_tasks(now)
+            .select_for_update(skip_locked=True)
+            .order_by(F('next_execution').asc(nulls_first=True))[:limit]
+        )
+        for task in tasks:
+            # A RUNNING execution on a claimable task outlived its lease: its worker is gone
+            TaskExecution.objects.filter(task=task, status=TaskExecution.Status.RUNNING).update(
+                status=TaskExecution.Status.FAILED,
+                error_message='Abandoned: worker stopped before the task finished',
+                completed_at=now,
+            )
+            previous = task.executions.order_by('-created_at').only('status', 'retry_count').first()
+            retry_count = 0
+            if previous and previous.status == TaskExecution.Status.FAILED and previous.retry_count < task.max_retries:
+                retry_count = previous.retry_count + 1
+            execution = TaskExecution.objects.create(
+                task=task,
+                status=TaskExecution.Status.RUNNING,
+                input_data=task.task_config or {},
+                started_at=now,
+                retry_count=retry_count,
+                is_retry=retry_count > 0,
+            )
+            task.next_execution = now + _lease(task)
+            task.save(update_fields=['next_execution', 'updated_at'])
+            claimed.append((task, execution))
+    return claimed
+
+
+def execute_task(task, execution):
+    """Run a claimed task and record the outcome. Returns True on success."""
+    started = time.monotonic()
+    handler = resolve_handler(task)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for task {task.id} ({(task.task_config or {}).get('handler')!r})")
+        output = handler(task) or {}
+        error = None
+    except Exception as e:
+        logger.error("Scheduled task %s (%s) failed: %s", task.id, task.name, e, exc_info=True)
+        output, error = {}, str(e)
+
+    now = timezone.now()
+    succeeded = error is None
+    execution.status = TaskExecution.Status.COMPLETED if succeeded else TaskExecution.Status.FAILED
+    execution.output_data = output
+    execution.error_message = error
+    execution.completed_at = now
+    execution.duration_seconds = int(time.monotonic() - started)
+    execution.progress = 100 if succeeded else execution.progress
+    execution.save(update_fields=[
+        'status', 'output_data', 'error_message', 'completed_at', 'duration_seconds', 'progress', 'updated_at',
+    ])
+
+    if succeeded or execution.retry_count >= task.max_retries or handler is None:
+        next_execution = next_run_after(task, now)
+    else:
+        next_execution = now + retry_delay(task, execution.retry_count + 1)
+    ScheduledTask.objects.filter(id=task.id).update(
+        last_executed=now,
+        next_execution=next_execution,
+        execution_count=F('execution_count') + 1,
+        success_count=F('success_count') + (1 if succeeded else 0),
+        failure_count=F('failure_count') + (0 if succeeded else 1),
+        updated_at=now,
+    )
+    return succeeded
+
+
+def _run_in_worker_thread(task, execution):
+    close_old_connections()
+    try:
+        return execute_task(task, execution)
+    finally:
+        close_old_connections()
+
+
+def run_due_tasks(now=None, limit=100):
+    """Claim and run every due task inline. Returns {'succeeded': n, 'failed': n}."""
+    summary = {'succeeded': 0, 'failed': 0}
+    for task, execution in claim_due_tasks(limit, now=now):
+        summary['succeeded' if execute_task(task, execution) else 'failed'] += 1
+    return summary
+
+
+def next_task_due_at():
+    """Earliest next_execution among enabled active tasks (None when nothing is scheduled)."""
+    return (
+        ScheduledTask.objects.filter(is_enabled=True, status=ScheduledTask.Status.ACTIVE)
+        .order_by(F('next_execution').asc(nulls_first=True))
+        .values_list('next_execution', flat=True)
+        .first()
+    )
+
+
+class AutomationWorker:
+    """
+    Long-running worker: keep up to max_workers tasks running on a thread pool,
+    claiming only as many as there are free slots, and sleep until the next
+    task is due (capped at max_sleep so new tasks are picked up).
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_sleep=DEFAULT_MAX_SLEEP_SECONDS):
+        self.max_workers = max_workers
+        self.max_sleep = max_sleep
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def stop(self, *args):
+        self._stop.set()
+        self._wake.set()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def _on_done(self, future):
+        with self._lock:
+            self._running.discard(future)
+        self._wake.set()
+
+    def free_slots(self):
+        with self._lock:
+            return self.max_workers - len(self._running)
+
+    def seconds_until_next_run(self):
+        next_due = next_task_due_at()
+        if next_due is None and not ScheduledTask.objects.filter(
+            is_enabled=True, status=ScheduledTask.Status.ACTIVE, next_execution__isnull=True,
+        ).exists():
+            return self.max_sleep
+        if next_due is None:
+            return MIN_SLEEP_SECONDS
+        delay = (next_due - timezone.now()).total_seconds()
+        return max(MIN_SLEEP_SECONDS, min(delay, self.max_sleep))
+
+    def run_once(self, pool):
+        close_old_connections()
+        claimed = claim_due_tasks(self.free_slots())
+        for task, execution in claimed:
+            logger.info("Running scheduled task %s (%s), retry %s", task.id, task.name, execution.retry_count)
+            future = pool.submit(_run_in_worker_thread, task, execution)
+            with self._lock:
+                self._running.add(future)
+            future.add_done_callback(self._on_done)
+        return len(claimed)
+
+    def run(self):
+        logger.info("Automation worker started (max_workers=%s, max_sleep=%ss)", self.max_workers, self.max_sleep)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='automation') as pool:
+            while not self._stop.is_set():
+                self._wake.clear()
+                try:
+                    self.run_once(pool)
+                    delay = self.seconds_until_next_run() if self.free_slots() else self.max_sleep
+                except Exception as e:
+                    logger.error("Automation worker iteration failed: %s", e, exc_info=True)
+                    delay = self.max_sleep
+                # Woken early when a running task finishes and frees a slot
+                self._wake.wait(delay)
+            logger.info("Automation worker stopping, waiting for %s running task(s)", len(self._running))
+        logger.info("Automation worker stopped")
@@ -0,0 +1,97 @@
+"""
+Scheduled task handlers.
+
+A ScheduledTask names its handler in task_config['handler']; the worker looks
+it up here and calls it with the task. Handlers return a JSON-serialisable dict
+that is stored on the TaskExecution as output_data, and raise to signal failure
+(the worker then applies the task's retry policy).
+
+Register new handlers with:
+
+    @register_handler('app.something')
+    def run_something(task):
+        ...
+        return {'processed': n}
+"""
+import logging
+
+from django.core.management import call_command
+
+logger = logging.getLogger(__name__)
+
+_HANDLERS = {}
+
+
+def register_handler(name):
+    """Decorator registering a callable(task) -> dict as a scheduled task handler."""
+    def decorator(func):
+        _HANDLERS[name] = func
+        return func
+    return decorator
+
+
+def resolve_handler(task):
+    """Return the handler callable for a task, or None if it names no known handler."""
+    config = task.task_config or {}
+    name = config.get('handler')
+    if not name and config.get('service') == 'google_sheets':
+        # Rows created by setup_automated_sheets_sync before handlers were named
+        name = 'google_sheets.check_connection' if config.get('check_connection') else 'google_sheets.sync'
+    return _HANDLERS.get(name)
+
+
+def registered_handlers():
+    return sorted(_HANDLERS)
+
+
+@register_handler('google_sheets.sync')
+def sync_google_sheets(task):
+    from telecalling.google_sheets_service import sync_leads_from_sheets
+    if not sync_leads_from_sheets():
+        raise RuntimeError('Google Sheets sync failed')
+    return {'synced': True}
+
+
+@register_handler('google_sheets.check_connection')
+def check_google_sheets_connection(task):
+    from telecalling.google_sheets_service import test_google_sheets_connection
+    if not test_google_sheets_connection():
+        raise RuntimeError('Google Sheets connection check failed')
+    return {'connected': True}
+
+
+@register_handler('notifications.appointment_reminders')
+def send_appointment_reminders(task):
+    from apps.notifications.reminders import dispatch_due_reminders
+    return dispatch_due_reminders(batch_size=(task.task_config or {}).get('batch_size', 200))
+
+
+@register_handler('notifications.archive')
+def archive_notifications(task):
+    from apps.notifications.retention import archive_expired_notifications, purge_archived_notifications
+    archived = archive_expired_notifications()
+    return {'archived': archived, 'purged': purge_archived_notifications()}
+
+
+@register_handler('analytics.daily_rollups')
+def refresh_daily_rollups(task):
+    days = (task.task_config or {}).get('days', 3)
+    call_command('backfill_daily_rollups', days=days, tenant=task.tenant_id)
+    return {'days': days}
+
+
+@register_handler('clients.update_statuses')
+def update_customer_statuses(task):
+    call_command('update_customer_statuses', tenant=[task.tenant_id] if task.tenant_id else None)
+    return {}
+
+
+@register_handler('management_command')
+def run_management_command(task):
+    """Generic handler: task_config = {'handler': 'management_command', 'command': name, 'args': [], 'options': {}}."""
+    config = task.task_config or {}
+    command = config.get('command')
+    if not command:
+        raise ValueError("task_config['command'] is required for management_command tasks")
+    call_command(command, *config.get('args', []), **config.get('options', {}))
+    return {'command': command}
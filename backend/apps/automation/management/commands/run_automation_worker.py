@@ -0,0 +1,54 @@
+"""
+Long-running ScheduledTask worker.
+
+Claims due tasks with SELECT ... FOR UPDATE SKIP LOCKED and runs them on a
+bounded thread pool, recording a TaskExecution per run and retrying failures
+with exponential backoff. Safe to run several instances at once. Run under
+systemd (deploy/utho/crm-automation-worker.service), or from cron with --once:
+
+    * * * * * cd /var/www/CRM_FINAL/backend && venv/bin/python manage.py run_automation_worker --once
+"""
+from django.core.management.base import BaseCommand
+
+from apps.automation.executor import (
+    DEFAULT_MAX_SLEEP_SECONDS,
+    DEFAULT_MAX_WORKERS,
+    AutomationWorker,
+    run_due_tasks,
+)
+
+
+class Command(BaseCommand):
+    help = 'Run the scheduled automation task worker'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_MAX_WORKERS,
+            help=f'Maximum tasks running at once (default: {DEFAULT_MAX_WORKERS})',
+        )
+        parser.add_argument(
+            '--max-sleep',
+            type=int,
+            default=DEFAULT_MAX_SLEEP_SECONDS,
+            help=f'Maximum seconds between polls (default: {DEFAULT_MAX_SLEEP_SECONDS})',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run currently due tasks and exit',
+        )
+
+    def handle(self, *args, **options):
+        if options['once']:
+            summary = run_due_tasks()
+            self.stdout.write(self.style.SUCCESS(
+                f"Ran {summary['succeeded'] + summary['failed']} task(s): "
+                f"{summary['succeeded']} succeeded, {summary['failed']} failed."
+            ))
+            return
+        worker = AutomationWorker(max_workers=options['workers'], max_sleep=options['max_sleep'])
+        worker.install_signal_handlers()
+        self.stdout.write('Automation worker running (Ctrl+C to stop)...')
+        worker.run()
@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.clients.models import Appointment, Client
+from apps.sales.models import Sale, SalesPipeline
+from core.snapshots import stored_values
+from . import engine
+from .models import AutomationWorkflow
+
+
+@receiver([post_save, post_delete], sender=AutomationWorkflow)
+def refresh_workflow_index(sender, instance, **kwargs):
+    # After commit, so other processes rebuilding their index see the change
+    transaction.on_commit(engine.invalidate_workflow_index)
+
+
+def _client_store_id(instance):
+    client = instance.client if type(instance).client.is_cached(instance) else None
+    if client is not None:
+        return client.store_id
+    return Client.objects.filter(id=instance.client_id).values_list('store_id', flat=True).first()
+
+
+@receiver(post_save, sender=Client)
+def client_created(sender, instance, created, **kwargs):
+    if created:
+        engine.emit(instance.tenant_id, 'client.created', instance)
+
+
+@receiver(post_save, sender=Sale)
+def sale_saved(sender, instance, created, **kwargs):
+    if engine.has_workflows(instance.tenant_id, 'sale.saved'):
+        engine.emit(instance.tenant_id, 'sale.saved', instance, created=created, store_id=_client_store_id(instance))
+
+
+@receiver(pre_save, sender=SalesPipeline)
+def remember_pipeline_stage(sender, instance, **kwargs):
+    # Only pay for the lookup when some workflow listens for stage changes
+    if instance.pk and engine.has_workflows(instance.tenant_id, 'pipeline.stage_changed'):
+        previous = stored_values(instance, 'stage')
+        instance._workflow_previous_stage = previous['stage'] if previous else None
+
+
+@receiver(post_save, sender=SalesPipeline)
+def pipeline_stage_changed(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_workflow_previous_stage', None)
+    if created or (previous is not None and previous != instance.stage):
+        if engine.has_workflows(instance.tenant_id, 'pipeline.stage_changed'):
+            engine.emit(
+                instance.tenant_id, 'pipeline.stage_changed', instance,
+                previous_stage=previous, store_id=_client_store_id(instance),
+            )
+
+
+@receiver(pre_save, sender=Appointment)
+def remember_appointment_status(sender, instance, **kwargs):
+    if instance.pk and instance.status == Appointment.Status.NO_SHOW and engine.has_workflows(
+        instance.tenant_id, 'appointment.missed'
+    ):
+        instance._workflow_previous_status = (
+            sender.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Appointment)
+def appointment_missed(sender, instance, created, **kwargs):
+    if instance.status != Appointment.Status.NO_SHOW:
+        return
+    if created or getattr(instance, '_workflow_previous_status', None) not in (None, Appointment.Status.NO_SHOW):
+        engine.emit(instance.tenant_id, 'appointment.missed', instance, store_id=_client_store_id(instance))
@@ -1,3 +1,231 @@
-from django.test import TestCase
+from datetime import time, timedelta
 
-# Create your tests here.
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.clients.models import Appointment, Client
+from apps.notifications.models import Notification
+from apps.sales.models import SalesPipeline
+from apps.stores.models import Store
+from apps.tenants.models import Tenant
+from . import engine
+from .executor import claim_due_tasks, execute_task, run_due_tasks
+from .handlers import register_handler
+from .models import AutomationExecution, AutomationWorkflow, ScheduledTask, TaskExecution
+
+User = get_user_model()
+
+CALLS = []
+
+
+@register_handler('tests.record')
+def record_handler(task):
+    CALLS.append(task.id)
+    if (task.task_config or {}).get('fail'):
+        raise RuntimeError('boom')
+    return {'ok': True}
+
+
+class ScheduledTaskExecutorTest(TestCase):
+    def setUp(self):
+        CALLS.clear()
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.now = timezone.now()
+
+    def _task(self, **overrides):
+        fields = {
+            'name': 'Record',
+            'task_type': ScheduledTask.TaskType.CUSTOM,
+            'frequency': ScheduledTask.Frequency.HOURLY,
+            'task_config': {'handler': 'tests.record'},
+            'next_execution': self.now - timedelta(minutes=1),
+            'max_retries': 2,
+            'retry_delay_minutes': 5,
+            'tenant': self.tenant,
+        }
+        fields.update(overrides)
+        return ScheduledTask.objects.create(**fields)
+
+    def test_due_task_runs_and_is_rescheduled(self):
+        task = self._task()
+        self._task(name='Later', next_execution=self.now + timedelta(hours=1))
+        self._task(name='Disabled', is_enabled=False)
+
+        summary = run_due_tasks()
+
+        self.assertEqual(summary, {'succeeded': 1, 'failed': 0})
+        self.assertEqual(CALLS, [task.id])
+        task.refresh_from_db()
+        self.assertEqual((task.execution_count, task.success_count, task.failure_count), (1, 1, 0))
+        self.assertGreater(task.next_execution, self.now + timedelta(minutes=59))
+        execution = task.executions.get()
+        self.assertEqual(execution.status, TaskExecution.Status.COMPLETED)
+        self.assertEqual(execution.output_data, {'ok': True})
+
+    def test_claimed_task_is_not_claimed_again(self):
+        self._task()
+        self.assertEqual(len(claim_due_tasks(10)), 1)
+        self.assertEqual(claim_due_tasks(10), [])
+
+    def test_failures_back_off_exponentially_until_retries_run_out(self):
+        task = self._task(task_config={'handler': 'tests.record', 'fail': True})
+
+        delays = []
+        for _ in range(3):
+            ScheduledTask.objects.filter(id=task.id).update(next_execution=timezone.now())
+            [(claimed, execution)] = claim_due_tasks(1)
+            started = timezone.now()
+            self.assertFalse(execute_task(claimed, execution))
+            task.refresh_from_db()
+            delays.append(round((task.next_execution - started).total_seconds() / 60))
+
+        # two retries (5, then 10 minutes), then back to the hourly schedule
+        self.assertEqual(delays, [5, 10, 60])
+        self.assertEqual(list(task.executions.order_by('created_at').values_list('retry_count', flat=True)), [0, 1, 2])
+        self.assertEqual(task.failure_count, 3)
+
+    def test_unknown_handler_fails_without_retrying(self):
+        task = self._task(task_config={'handler': 'tests.missing'})
+        self.assertEqual(run_due_tasks(), {'succeeded': 0, 'failed': 1})
+        task.refresh_from_db()
+        self.assertIn('No handler', task.executions.get().error_message)
+        self.assertGreater(task.next_execution, self.now + timedelta(minutes=59))
+
+    def test_abandoned_execution_is_marked_failed_on_reclaim(self):
+        task = self._task()
+        [(_, stale)] = claim_due_tasks(1)
+        ScheduledTask.objects.filter(id=task.id).update(next_execution=timezone.now())
+        claim_due_tasks(1)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, TaskExecution.Status.FAILED)
+
+
+class ConditionCompilerTest(TestCase):
+    def test_compiled_conditions(self):
+        predicate = engine.compile_conditions([
+            {'field': 'stage', 'operator': 'in', 'value': ['negotiation', 'closed_won']},
+            {'any': [
+                {'field': 'expected_value', 'operator': 'gte', 'value': 1000},
+                {'not': {'field': 'notes', 'operator': 'is_empty'}},
+            ]},
+        ])
+        self.assertTrue(predicate({'stage': 'closed_won', 'expected_value': 5000, 'notes': ''}))
+        self.assertTrue(predicate({'stage': 'negotiation', 'expected_value': 10, 'notes': 'VIP'}))
+        self.assertFalse(predicate({'stage': 'negotiation', 'expected_value': None, 'notes': None}))
+        self.assertFalse(predicate({'stage': 'interested', 'expected_value': 5000}))
+        with self.assertRaises(ValueError):
+            engine.compile_conditions([{'field': 'stage', 'operator': 'matches'}])
+
+
+@override_settings(AUTOMATION_WORKFLOWS_ASYNC=False)
+class WorkflowEngineTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store = Store.objects.create(
+            name="Main Store", code="MS001", address="123 Test St",
+            city="Test City", state="Test State", tenant=self.tenant,
+        )
+        self.sales_user = User.objects.create_user(
+            username="sales", password="testpass123", role=User.Role.INHOUSE_SALES,
+            tenant=self.tenant, store=self.store,
+        )
+        self.manager = User.objects.create_user(
+            username="manager", password="testpass123", role=User.Role.MANAGER,
+            tenant=self.tenant, store=self.store,
+        )
+        self.client_obj = Client.objects.create(
+            first_name="John", phone="1234567890", tenant=self.tenant, store=self.store,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.workflow = AutomationWorkflow.objects.create(
+                name="Big deal won",
+                trigger_type=AutomationWorkflow.TriggerType.EVENT,
+                trigger_config={'event': 'pipeline.stage_changed'},
+                conditions=[
+                    {'field': 'stage', 'value': 'closed_won'},
+                    {'field': 'expected_value', 'operator': 'gte', 'value': 1000},
+                ],
+                actions=[{
+                    'type': 'notify',
+                    'recipients': ['role:manager'],
+                    'message': '{title} closed at {expected_value}',
+                }],
+                status=AutomationWorkflow.Status.ACTIVE,
+                is_enabled=True,
+                max_executions=1,
+                tenant=self.tenant,
+            )
+
+    def _pipeline(self, value):
+        return SalesPipeline.objects.create(
+            title="Ring", client=self.client_obj, sales_representative=self.sales_user,
+            stage=SalesPipeline.Stage.NEGOTIATION, expected_value=Decimal(value), tenant=self.tenant,
+        )
+
+    def _close(self, pipeline):
+        with self.captureOnCommitCallbacks(execute=True):
+            pipeline.stage = SalesPipeline.Stage.CLOSED_WON
+            pipeline.save()
+
+    def test_matching_stage_change_runs_actions(self):
+        self._close(self._pipeline("5000.00"))
+
+        execution = AutomationExecution.objects.get(workflow=self.workflow)
+        self.assertEqual(execution.status, AutomationExecution.Status.COMPLETED)
+        self.assertEqual(execution.trigger_data['previous_stage'], 'negotiation')
+        notification = Notification.objects.get(user=self.manager)
+        self.assertEqual(notification.message, 'Ring closed at 5000.0')
+
+    def test_non_matching_event_and_execution_limit(self):
+        self._close(self._pipeline("10.00"))
+        self.assertFalse(AutomationExecution.objects.exists())
+
+        self._close(self._pipeline("5000.00"))
+        self._close(self._pipeline("6000.00"))
+        self.assertEqual(AutomationExecution.objects.filter(workflow=self.workflow).count(), 1)
+
+    def test_matching_does_not_query(self):
+        engine.index.entries()
+        payload = {'stage': 'closed_won', 'expected_value': 5000.0}
+        with self.assertNumQueries(0):
+            matched = engine.match(self.tenant.id, 'pipeline.stage_changed', payload)
+        self.assertEqual([workflow.id for workflow in matched], [self.workflow.id])
+
+    def test_update_field_only_writes_allowed_fields(self):
+        other = Tenant.objects.create(name="Other", slug="other")
+        payload = engine.build_payload(self.client_obj)
+        for field in ('tenant', 'tenant_id', 'created_by', 'store', 'phone'):
+            with self.assertRaises(ValueError):
+                engine.update_field(self.workflow, {'field': field, 'value': other.id}, payload)
+
+        result = engine.update_field(self.workflow, {'field': 'client_category', 'value': 'Z Loyal'}, payload)
+        self.assertEqual(result['updated'], 1)
+        self.client_obj.refresh_from_db()
+        self.assertEqual((self.client_obj.client_category, self.client_obj.tenant_id), ('Z Loyal', self.tenant.id))
+
+    def test_missed_appointment_payload_is_serialisable(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            workflow = AutomationWorkflow.objects.create(
+                name="No-show follow up",
+                trigger_type=AutomationWorkflow.TriggerType.EVENT,
+                trigger_config={'event': 'appointment.missed'},
+                actions=[{'type': 'notify', 'recipients': ['role:manager'], 'message': 'Missed at {time}'}],
+                status=AutomationWorkflow.Status.ACTIVE,
+                is_enabled=True,
+                tenant=self.tenant,
+            )
+        appointment = Appointment.objects.create(
+            client=self.client_obj, tenant=self.tenant, date=timezone.localdate(), time=time(11, 30),
+            purpose="Viewing", created_by=self.sales_user, assigned_to=self.sales_user,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            appointment.status = Appointment.Status.NO_SHOW
+            appointment.save()
+
+        execution = AutomationExecution.objects.get(workflow=workflow)
+        self.assertEqual(execution.status, AutomationExecution.Status.COMPLETED)
+        self.assertEqual(execution.trigger_data['time'], '11:30:00')
+        self.assertEqual(Notification.objects.get(user=self.manager).message, 'Missed at 11:30:00')
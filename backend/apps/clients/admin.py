@@ -155,13 +155,13 @@ class ClientAdmin(admin.ModelAdmin):
     mark_as_general.short_description = "Mark selected customers as General"
     
     def update_status_automatically(self, request, queryset):
+        from .status_engine import recalculate_statuses
+
         updated_count = 0
-        for client in queryset:
-            old_status = client.status
-            client.update_status_based_on_behavior()
-            if client.status != old_status:
-                updated_count += 1
-        
+        for tenant_id in queryset.order_by().values_list('tenant_id', flat=True).distinct():
+            ids = queryset.filter(tenant_id=tenant_id).values_list('pk', flat=True)
+            updated_count += recalculate_statuses(tenant_id, client_ids=list(ids))['changed']
+
         self.message_user(
             request, 
             f'Automatically updated status for {updated_count} customers based on their behavior'
@@ -0,0 +1,27 @@
+"""
+Re-run customer auto-tagging in batches (see apps/clients/tagging.py). Saves
+keep tags current; run this daily so the birthday/anniversary week tags come
+and go with the calendar, e.g.:
+  30 2 * * * python manage.py apply_customer_tags
+"""
+from django.core.management.base import BaseCommand
+
+from apps.clients.models import Client
+from apps.clients.tagging import DEFAULT_BATCH_SIZE, apply_tags
+
+
+class Command(BaseCommand):
+    help = 'Apply automatic customer tags to every (or one tenant\'s) customers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=int, help='Only this tenant id')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Customers per batch')
+
+    def handle(self, *args, **options):
+        clients = Client.objects.filter(is_deleted=False)
+        if options['tenant']:
+            clients = clients.filter(tenant_id=options['tenant'])
+        summary = apply_tags(clients.values_list('pk', flat=True), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Tagged {summary['clients']} customer(s): {summary['added']} tag(s) added, {summary['removed']} removed."
+        ))
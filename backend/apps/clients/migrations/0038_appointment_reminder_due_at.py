@@ -0,0 +1,50 @@
+# Generated manually: indexed due-time column for the appointment reminder scheduler
+
+import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+REMINDER_LEAD_MINUTES = 60
+
+
+def backfill_reminder_due_at(apps, schema_editor):
+    """Populate reminder_due_at for appointments that can still receive a reminder."""
+    Appointment = apps.get_model('clients', 'Appointment')
+    yesterday = timezone.localdate() - datetime.timedelta(days=1)
+    pending = Appointment.objects.filter(
+        reminder_sent=False,
+        is_deleted=False,
+        date__gte=yesterday,
+    ).only('id', 'date', 'time')
+    batch = []
+    for appointment in pending.iterator(chunk_size=500):
+        start = timezone.make_aware(datetime.datetime.combine(appointment.date, appointment.time))
+        appointment.reminder_due_at = start - datetime.timedelta(minutes=REMINDER_LEAD_MINUTES)
+        batch.append(appointment)
+        if len(batch) >= 500:
+            Appointment.objects.bulk_update(batch, ['reminder_due_at'])
+            batch = []
+    if batch:
+        Appointment.objects.bulk_update(batch, ['reminder_due_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0037_clientvisit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='reminder_due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['reminder_sent', 'reminder_due_at'], name='clients_app_reminde_ef7966_idx'),
+        ),
+        migrations.RunPython(backfill_reminder_due_at, migrations.RunPython.noop),
+    ]
@@ -245,38 +245,13 @@ class Client(models.Model):
 
     def update_status_based_on_behavior(self):
         """Automatically update customer status based on their behavior and purchase history."""
-        from apps.sales.models import Sale
-        
-        # Count total sales for this customer
-        total_sales = Sale.objects.filter(
-            client=self,
-            status__in=['confirmed', 'processing', 'shipped', 'delivered'],
-            payment_status__in=['paid', 'partial']
-        ).count()
-        
-        # Count total amount spent
-        total_spent = Sale.objects.filter(
-            client=self,
-            status__in=['confirmed', 'processing', 'shipped', 'delivered'],
-            payment_status__in=['paid', 'partial']
-        ).aggregate(total=models.Sum('total_amount'))['total'] or 0
-        
-        # Update status based on behavior
-        if total_sales > 0:
-            if total_spent >= 50000:  # ₹50,000+ spent
-                new_status = self.Status.VVIP
-            elif total_sales >= 2 or total_spent >= 10000:  # 2+ purchases or ₹10,000+ spent
-                new_status = self.Status.VIP
-            else:
-                new_status = self.Status.GENERAL
-        else:
-            # Check if they have any pipeline activity
-            pipeline_count = self.pipelines.filter(stage__in=['interested', 'store_walkin', 'negotiation']).count()
-            if pipeline_count > 0:
-                new_status = self.Status.GENERAL
-            else:
-                new_status = self.Status.GENERAL
-        
+        from .status_engine import classify_status, qualifying_sales
+
+        totals = self.sales.filter(qualifying_sales()).aggregate(
+            purchases=models.Count('id'), spent=models.Sum('total_amount'),
+        )
+        new_status = classify_status(totals['purchases'], totals['spent'] or 0)
+
         # Only update if status changed
         if self.status != new_status:
             self.status = new_status
@@ -456,6 +431,8 @@ class Appointment(models.Model):
     # Reminder settings
     reminder_sent = models.BooleanField(default=False)
     reminder_date = models.DateTimeField(blank=True, null=True)
+    # When the reminder becomes due (appointment start minus REMINDER_LEAD_MINUTES); kept in sync by save()
+    reminder_due_at = models.DateTimeField(blank=True, null=True)
     
     # Follow-up settings
     requires_follow_up = models.BooleanField(default=False)
@@ -501,11 +478,38 @@ class Appointment(models.Model):
             models.Index(fields=['date', 'status']),
             models.Index(fields=['assigned_to']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['reminder_sent', 'reminder_due_at']),
         ]
 
+    # Minutes before the appointment start at which the reminder fires
+    REMINDER_LEAD_MINUTES = 60
+
     def __str__(self):
         return f"{self.client.full_name} - {self.date} {self.time} ({self.get_status_display()})"
 
+    def save(self, *args, **kwargs):
+        """Keep reminder_due_at in sync with date/time so the reminder scheduler can use its index."""
+        self.reminder_due_at = self.compute_reminder_due_at()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and ({'date', 'time'} & set(update_fields)):
+            kwargs['update_fields'] = set(update_fields) | {'reminder_due_at'}
+        return super().save(*args, **kwargs)
+
+    def compute_reminder_due_at(self):
+        """Return the aware datetime at which this appointment's reminder is due, or None."""
+        from django.utils import timezone
+        if not self.date or not self.time:
+            return None
+        appointment_date = self.date
+        appointment_time = self.time
+        # API writes may assign ISO strings (e.g. reschedule); normalise before combining
+        if isinstance(appointment_date, str):
+            appointment_date = datetime.date.fromisoformat(appointment_date)
+        if isinstance(appointment_time, str):
+            appointment_time = datetime.time.fromisoformat(appointment_time)
+        start = timezone.make_aware(datetime.datetime.combine(appointment_date, appointment_time))
+        return start - datetime.timedelta(minutes=self.REMINDER_LEAD_MINUTES)
+
     @property
     def is_upcoming(self):
         """Check if appointment is in the future"""
@@ -12,6 +12,7 @@ from django.db.models import Q
 from .segmentation_service import CustomerSegmentationService
 from .models import Client, CustomerTag
 from apps.users.middleware import ScopedVisibilityMixin
+from core.conditional import conditional, static_stamp
 
 
 @api_view(['GET'])
@@ -124,8 +125,18 @@ def get_segment_customers(request, segment_name):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+# Rules are class attributes, so the stamp only changes with a deploy
+SEGMENTATION_RULES_STAMP = static_stamp(
+    CustomerSegmentationService.SEGMENTATION_RULES,
+    CustomerSegmentationService.MUTUALLY_EXCLUSIVE_GROUPS,
+    CustomerSegmentationService.PRIORITY_OVERRIDES,
+    CustomerSegmentationService.EXCLUSIONS,
+)
+
+
 @api_view(['GET'])
 # @permission_classes([IsAuthenticated])  # Temporarily disabled for testing
+@conditional(lambda request: SEGMENTATION_RULES_STAMP)
 def get_segmentation_rules(request):
     """
     Get available segmentation rules and their configuration.
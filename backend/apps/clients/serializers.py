@@ -5,6 +5,9 @@ from .models import Purchase
 from shared.validators import validate_international_phone_number, normalize_phone_number
 import re
 import logging
+from core.logging_utils import get_logger, lazy
+
+logger = get_logger(__name__)
 
 
 class ClientSerializer(serializers.ModelSerializer):
@@ -252,7 +255,7 @@ class ClientSerializer(serializers.ModelSerializer):
                 for interest in interests
             ]
         except Exception as e:
-            print(f"Error getting customer interests display: {e}")
+            logger.error('Error getting customer interests display: %s', e)
             return []
     
     def get_customer_interests(self, obj):
@@ -334,7 +337,7 @@ class ClientSerializer(serializers.ModelSerializer):
             
             return result
         except Exception as e:
-            print(f"Error getting customer interests: {e}")
+            logger.error('Error getting customer interests: %s', e)
             return []
     
     def _extract_preferences_from_notes(self, notes):
@@ -389,7 +392,7 @@ class ClientSerializer(serializers.ModelSerializer):
                     design_number = design_number[:-1].strip()
                 return design_number
         except Exception as e:
-            print(f"Error extracting design number: {e}")
+            logger.error('Error extracting design number: %s', e)
             pass
         
         return ''
@@ -411,7 +414,7 @@ class ClientSerializer(serializers.ModelSerializer):
                 if isinstance(images, list):
                     return images
         except Exception as e:
-            print(f"Error extracting images: {e}, images_part: {images_part if 'images_part' in locals() else 'N/A'}")
+            logger.error('Error extracting images: %s, images_part: %s', e, images_part if 'images_part' in locals() else 'N/A')
             pass
         
         return []
@@ -900,7 +903,7 @@ class ClientSerializer(serializers.ModelSerializer):
                                                         tenant=result.tenant
                                                     )
                                                 except Category.DoesNotExist:
-                                                    print(f"WARNING: Category ID {category} not found, will create by name")
+                                                    logger.warning('Category ID %s not found, will create by name', category)
                                                     category_obj = None
                                             
                                             if not category_obj:
@@ -953,7 +956,7 @@ class ClientSerializer(serializers.ModelSerializer):
                                                         tenant=result.tenant
                                                     )
                                                 except Product.DoesNotExist:
-                                                    print(f"WARNING: Product ID {product_name} not found, will create by name")
+                                                    logger.warning('Product ID %s not found, will create by name', product_name)
                                                     product_obj = None
                                             
                                             if not product_obj:
@@ -1126,15 +1129,15 @@ class ClientSerializer(serializers.ModelSerializer):
             
             # Check if it's the preferred_flag null constraint error
             if "preferred_flag" in str(e).lower() and "null" in str(e).lower():
-                print(f"⚠️ CRITICAL: preferred_flag is still NULL! Retrying with explicit False...")
+                logger.warning('preferred_flag is still NULL! Retrying with explicit False...')
                 # Force set it and try again
                 validated_data['preferred_flag'] = False
                 try:
                     result = super().create(validated_data)
-                    print(f"✅ Successfully created client after preferred_flag fix")
+                    logger.debug('Successfully created client after preferred_flag fix')
                     return result
                 except Exception as retry_error:
-                    print(f"❌ Retry also failed: {retry_error}")
+                    logger.error('Retry also failed: %s', retry_error)
                     raise serializers.ValidationError('Database error: preferred_flag field issue. Please contact support.')
             
             raise serializers.ValidationError('An error occurred while creating the customer. Please try again.')
@@ -1152,9 +1155,7 @@ class ClientSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         """Override update method to handle tag updates and customer interests"""
-        print(f"=== CLIENT SERIALIZER UPDATE METHOD ===")
-        print(f"Instance: {instance}")
-        print(f"Validated data: {validated_data}")
+        logger.debug('Client serializer update method: Instance: %s, Validated data: %s', instance, validated_data)
 
         # Optimistic locking: require matching updated_at if provided in request
         request = self.context.get('request') if hasattr(self, 'context') else None
@@ -1177,64 +1178,68 @@ class ClientSerializer(serializers.ModelSerializer):
             request = self.context.get('request')
             if request and hasattr(request, 'user'):
                 user = request.user
-        print(f"User context from serializer: {user}")
+        logger.debug('User context from serializer: %s', user)
         
         # Set the audit log user if available
         if user:
             instance._auditlog_user = user
-            print(f"SUCCESS: Set audit log user: {user}")
+            logger.debug('Set audit log user: %s', user)
         else:
-            print(f"WARNING: No user context available for audit log")
+            logger.warning('No user context available for audit log')
         
         # Handle customer interests for updates
         customer_interests_data = None
         if 'customer_interests_input' in validated_data:
-            print(f"Customer interests found in update: {validated_data['customer_interests_input']}")
+            logger.debug('Customer interests found in update: %s', validated_data['customer_interests_input'])
             customer_interests_data = validated_data.pop('customer_interests_input')
-            print(f"Stored customer interests for processing: {customer_interests_data}")
+            logger.debug('Stored customer interests for processing: %s', customer_interests_data)
         elif 'customer_interests' in validated_data:
-            print(f"Customer interests found (legacy field) in update: {validated_data['customer_interests']}")
+            logger.debug('Customer interests found (legacy field) in update: %s', validated_data['customer_interests'])
             customer_interests_data = validated_data.pop('customer_interests')
-            print(f"Stored customer interests for processing: {customer_interests_data}")
+            logger.debug('Stored customer interests for processing: %s', customer_interests_data)
         
         # Handle tag updates
         tag_slugs = validated_data.pop('tag_slugs', None)
         tags = validated_data.pop('tags', None)
         
-        print(f"tag_slugs from request: {tag_slugs}")
-        print(f"tags from request: {tags}")
+        logger.debug('tag_slugs from request: %s', tag_slugs)
+        logger.debug('tags from request: %s', tags)
         
         # Use tag_slugs if provided, otherwise use tags
         if tag_slugs is not None:
-            print(f"Updating tags with tag_slugs: {tag_slugs}")
+            logger.debug('Updating tags with tag_slugs: %s', tag_slugs)
             # Clear existing tags and set new ones
             instance.tags.clear()
             if tag_slugs and len(tag_slugs) > 0:
                 # Get tags by slug
                 from .models import CustomerTag
                 tags_to_add = CustomerTag.objects.filter(slug__in=tag_slugs)
-                print(f"Found tags in database: {[tag.slug for tag in tags_to_add]}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug('Found tags in database: %s', [tag.slug for tag in tags_to_add])
                 if tags_to_add.exists():
                     instance.tags.add(*tags_to_add)
-                    print(f"Added tags: {[tag.name for tag in tags_to_add]}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug('Added tags: %s', [tag.name for tag in tags_to_add])
                 else:
-                    print("No tags found in database for the provided slugs")
+                    logger.debug('No tags found in database for the provided slugs')
             else:
-                print("No tag_slugs provided or empty list")
+                logger.debug('No tag_slugs provided or empty list')
         elif tags is not None:
-            print(f"Updating tags with tags: {tags}")
+            logger.debug('Updating tags with tags: %s', tags)
             # Clear existing tags and set new ones
             instance.tags.clear()
             if tags and len(tags) > 0:
                 # Get tags by slug
                 from .models import CustomerTag
                 tags_to_add = CustomerTag.objects.filter(slug__in=tags)
-                print(f"Found tags in database: {[tag.slug for tag in tags_to_add]}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug('Found tags in database: %s', [tag.slug for tag in tags_to_add])
                 if tags_to_add.exists():
                     instance.tags.add(*tags_to_add)
-                    print(f"Added tags: {[tag.name for tag in tags_to_add]}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug('Added tags: %s', [tag.name for tag in tags_to_add])
                 else:
-                    print("No tags provided or empty list")
+                    logger.debug('No tags provided or empty list')
         
         # Ensure email is None, not empty string, on update as well
         if 'email' in validated_data:
@@ -1243,7 +1248,7 @@ class ClientSerializer(serializers.ModelSerializer):
                 pass
             elif isinstance(email_val, str) and email_val.strip() == "":
                 validated_data['email'] = None
-                print("Normalized update email: empty string -> None")
+                logger.debug('Normalized update email: empty string -> None')
         
         # Call parent update method for other fields
         result = super().update(instance, validated_data)
@@ -1270,24 +1275,22 @@ class ClientSerializer(serializers.ModelSerializer):
                 # Add tag if not already present
                 if tag not in result.tags.all():
                     result.tags.add(tag)
-                    print(f"✅ Auto-tagged customer {result.id} with '{tag_name}'")
+                    logger.debug("Auto-tagged customer %s with '%s'", result.id, tag_name)
         except Exception as e:
-            print(f"⚠️ Error auto-tagging customer with store count: {e}")
+            logger.warning('Error auto-tagging customer with store count: %s', e)
         
         # Process customer interests after client update
         if customer_interests_data:
-            print(f"=== PROCESSING CUSTOMER INTERESTS IN UPDATE ===")
-            print(f"Processing {len(customer_interests_data)} customer interests for client {result.id}")
-            print(f"Raw customer_interests_data: {customer_interests_data}")
+            logger.debug('Processing customer interests in update: Processing %s customer interests for client %s, Raw customer_interests_data: %s', len(customer_interests_data), result.id, customer_interests_data)
             
             # Merge new interests with existing ones instead of replacing
             from .models import CustomerInterest
             existing_interests = CustomerInterest.objects.filter(client=result)
-            print(f"Found {existing_interests.count()} existing interests - will merge with new ones")
+            logger.debug('Found %s existing interests - will merge with new ones', lazy(existing_interests.count))
             
             # Ensure we have a list
             if not isinstance(customer_interests_data, list):
-                print(f"WARNING: customer_interests_data is not a list: {type(customer_interests_data)}")
+                logger.warning('customer_interests_data is not a list: %s', type(customer_interests_data))
                 customer_interests_data = [customer_interests_data] if customer_interests_data else []
             
             # Create a set of existing interest identifiers to avoid duplicates
@@ -1295,36 +1298,36 @@ class ClientSerializer(serializers.ModelSerializer):
             for existing in existing_interests:
                 identifier = f"{existing.category.name}_{existing.product.name}_{existing.revenue}"
                 existing_identifiers.add(identifier)
-                print(f"   Existing interest: {existing.category.name} - {existing.product.name} (₹{existing.revenue})")
+                logger.debug('Existing interest: %s - %s (₹%s)', existing.category.name, existing.product.name, existing.revenue)
             
             # Process new interests and add them if they don't already exist
             new_interests_created = 0
             for i, interest_data in enumerate(customer_interests_data):
                 try:
-                    print(f"\n--- Processing interest {i+1}/{len(customer_interests_data)} ---")
+                    logger.debug('Processing interest %s/%s', i+1, len(customer_interests_data))
                     # Parse the JSON string if it's a string
                     if isinstance(interest_data, str):
                         import json
                         interest_data = json.loads(interest_data)
-                        print(f"Parsed JSON string to: {interest_data}")
+                        logger.debug('Parsed JSON string to: %s', interest_data)
                     
-                    print(f"Processing interest data: {interest_data}")
+                    logger.debug('Processing interest data: %s', interest_data)
                     
                     # Map frontend field names to backend model fields
                     category = interest_data.get('category') or interest_data.get('mainCategory')
                     products = interest_data.get('products', [])
                     preferences = interest_data.get('preferences', {})
                     
-                    print(f"Processing category: '{category}' with {len(products)} products")
-                    print(f"Products data: {products}")
+                    logger.debug("Processing category: '%s' with %s products", category, len(products))
+                    logger.debug('Products data: %s', products)
                     
                     if category and products:
-                        print(f"Processing {len(products)} products for category '{category}'")
+                        logger.debug("Processing %s products for category '%s'", len(products), category)
                         for product_info in products:
                             product_name = product_info.get('product')
                             revenue = product_info.get('revenue', '0')
                             
-                            print(f"Product info: name='{product_name}', revenue='{revenue}'")
+                            logger.debug("Product info: name='%s', revenue='%s'", product_name, revenue)
                             
                             if product_name:
                                 try:
@@ -1338,13 +1341,13 @@ class ClientSerializer(serializers.ModelSerializer):
                                         revenue_value = float(revenue_str)
                                         # Allow 0 as valid revenue (can be updated later)
                                         if revenue_value < 0:
-                                            print(f"Skipping product '{product_name}' with negative revenue: {revenue_value}")
+                                            logger.debug("Skipping product '%s' with negative revenue: %s", product_name, revenue_value)
                                             continue
                                         # Use 0 if revenue is missing or invalid
                                         if revenue_value == 0:
-                                            print(f"Product '{product_name}' has revenue 0 - this is allowed")
+                                            logger.debug("Product '%s' has revenue 0 - this is allowed", product_name)
                                     except (ValueError, TypeError):
-                                        print(f"Invalid revenue value '{revenue}' for product '{product_name}', defaulting to 0")
+                                        logger.warning("Invalid revenue value '%s' for product '%s', defaulting to 0", revenue, product_name)
                                         revenue_value = 0.0
                                     
                                     # Extract design number and images from interest data
@@ -1380,7 +1383,7 @@ class ClientSerializer(serializers.ModelSerializer):
                                     
                                     notes = '. '.join(notes_parts) if notes_parts else 'None'
                                     
-                                    print(f"Creating CustomerInterest: category={category}, product={product_name}, revenue={revenue_value}, notes={notes}")
+                                    logger.debug('Creating CustomerInterest: category=%s, product=%s, revenue=%s, notes=%s', category, product_name, revenue_value, notes)
                                     
                                     # Find the actual Category and Product objects by name
                                     from apps.products.models import Category, Product
@@ -1394,9 +1397,9 @@ class ClientSerializer(serializers.ModelSerializer):
                                                 id=int(category),
                                                 tenant=result.tenant
                                             )
-                                            print(f"SUCCESS: Found category by ID: {category_obj}")
+                                            logger.debug('Found category by ID: %s', category_obj)
                                         except Category.DoesNotExist:
-                                            print(f"WARNING: Category ID {category} not found, will create by name")
+                                            logger.warning('Category ID %s not found, will create by name', category)
                                             category_obj = None
                                     
                                     if not category_obj:
@@ -1406,25 +1409,25 @@ class ClientSerializer(serializers.ModelSerializer):
                                             tenant=result.tenant
                                         ).first()
                                         if category_obj:
-                                            print(f"SUCCESS: Found category by name: {category_obj}")
+                                            logger.debug('Found category by name: %s', category_obj)
                                     
                                     if not category_obj:
-                                        print(f"WARNING: Category '{category}' not found for tenant {result.tenant}, creating it")
+                                        logger.warning("Category '%s' not found for tenant %s, creating it", category, result.tenant)
                                         try:
                                             category_obj = Category.objects.create(
                                                 name=category,
                                                 tenant=result.tenant,
                                                 scope='store' if result.store else 'global'
                                             )
-                                            print(f"SUCCESS: Created new category: {category_obj}")
+                                            logger.debug('Created new category: %s', category_obj)
                                         except Exception as cat_error:
-                                            print(f"ERROR: Error creating category '{category}': {cat_error}")
+                                            logger.error("Error creating category '%s': %s", category, cat_error)
                                             # Try to find any existing category as fallback
                                             category_obj = Category.objects.filter(tenant=result.tenant).first()
                                             if not category_obj:
-                                                print(f"ERROR: No fallback category available, skipping this interest")
+                                                logger.warning('No fallback category available, skipping this interest')
                                                 continue
-                                            print(f"WARNING: Using fallback category: {category_obj}")
+                                            logger.warning('Using fallback category: %s', category_obj)
                                     
                                     # Handle product - could be ID or name
                                     product_obj = None
@@ -1435,9 +1438,9 @@ class ClientSerializer(serializers.ModelSerializer):
                                                 id=int(product_name),
                                                 tenant=result.tenant
                                             )
-                                            print(f"SUCCESS: Found product by ID: {product_obj}")
+                                            logger.debug('Found product by ID: %s', product_obj)
                                         except Product.DoesNotExist:
-                                            print(f"WARNING: Product ID {product_name} not found, will create by name")
+                                            logger.warning('Product ID %s not found, will create by name', product_name)
                                             product_obj = None
                                     
                                     if not product_obj:
@@ -1447,10 +1450,10 @@ class ClientSerializer(serializers.ModelSerializer):
                                             tenant=result.tenant
                                         ).first()
                                         if product_obj:
-                                            print(f"SUCCESS: Found product by name: {product_obj}")
+                                            logger.debug('Found product by name: %s', product_obj)
                                     
                                     if not product_obj:
-                                        print(f"WARNING: Product '{product_name}' not found for tenant {result.tenant}, creating it")
+                                        logger.warning("Product '%s' not found for tenant %s, creating it", product_name, result.tenant)
                                         try:
                                             # Generate unique SKU
                                             base_sku = f"{category[:3].upper()}-{product_name[:3].upper()}"
@@ -1479,15 +1482,15 @@ class ClientSerializer(serializers.ModelSerializer):
                                                 store=result.store,
                                                 scope='store' if result.store else 'global'
                                             )
-                                            print(f"SUCCESS: Created new product: {product_obj}")
+                                            logger.debug('Created new product: %s', product_obj)
                                         except Exception as prod_error:
-                                            print(f"ERROR: Error creating product '{product_name}': {prod_error}")
+                                            logger.error("Error creating product '%s': %s", product_name, prod_error)
                                             # Try to find any existing product as fallback
                                             product_obj = Product.objects.filter(tenant=result.tenant).first()
                                             if not product_obj:
-                                                print(f"ERROR: No fallback product available, skipping this interest")
+                                                logger.warning('No fallback product available, skipping this interest')
                                                 continue
-                                            print(f"WARNING: Using fallback product: {product_obj}")
+                                            logger.warning('Using fallback product: %s', product_obj)
                                     
                                     # Create or update the customer interest
                                     try:
@@ -1506,46 +1509,42 @@ class ClientSerializer(serializers.ModelSerializer):
                                         )
                                         if created:
                                             new_interests_created += 1
-                                            print(f"SUCCESS: Successfully created new customer interest: {interest}")
-                                            print(f"  - ID: {interest.id}")
-                                            print(f"  - Client: {interest.client.full_name}")
-                                            print(f"  - Category: {interest.category.name if interest.category else 'No Category'}")
-                                            print(f"  - Product: {interest.product.name if interest.product else 'No Product'}")
-                                            print(f"  - Revenue: {interest.revenue}")
+                                            logger.debug('Successfully created new customer interest: %s', interest)
+                                            logger.debug('ID: %s', interest.id)
+                                            if logger.isEnabledFor(logging.DEBUG):
+                                                logger.debug('Client: %s', interest.client.full_name)
+                                            logger.debug('Category: %s', interest.category.name if interest.category else 'No Category')
+                                            logger.debug('Product: %s', interest.product.name if interest.product else 'No Product')
+                                            logger.debug('Revenue: %s', interest.revenue)
                                         else:
                                             # Update existing interest with new notes (including design number and images)
                                             interest.notes = notes
                                             interest.revenue = revenue_value
                                             interest.save()
-                                            print(f"INFO: Updated existing customer interest: {interest}")
-                                            print(f"  - Updated notes with design number and images")
+                                            logger.debug('Updated existing customer interest: %s', interest)
+                                            logger.debug('Updated notes with design number and images')
                                     except Exception as interest_error:
-                                        print(f"ERROR: Error creating customer interest: {interest_error}")
-                                        import traceback
-                                        print(f"CustomerInterest creation traceback: {traceback.format_exc()}")
+                                        logger.error('Error creating customer interest: %s', interest_error, exc_info=True)
                                         continue
                                 except Exception as e:
-                                    print(f"ERROR: Error processing product: {e}")
+                                    logger.error('Error processing product: %s', e)
                                     continue
                         else:
-                            print(f"ERROR: Skipping interest with missing category or products: {interest_data}")
+                            logger.warning('Skipping interest with missing category or products: %s', interest_data)
                 except Exception as e:
-                    print(f"ERROR: Error processing customer interest {interest_data}: {e}")
+                    logger.error('Error processing customer interest %s: %s', interest_data, e)
                     continue
             
             # Log summary of interest processing
             final_interests = CustomerInterest.objects.filter(client=result)
-            print(f"TARGET: Interest processing complete:")
-            print(f"   - Existing interests preserved: {existing_interests.count()}")
-            print(f"   - New interests created: {new_interests_created}")
-            print(f"   - Total interests after update: {final_interests.count()}")
+            logger.debug('TARGET: Interest processing complete: Existing interests preserved: %s, New interests created: %s, Total interests after update: %s', lazy(existing_interests.count), new_interests_created, lazy(final_interests.count))
             
             for interest in final_interests:
-                print(f"     • {interest.category.name}: {interest.product.name} (₹{interest.revenue})")
+                logger.debug('%s: %s (₹%s)', interest.category.name, interest.product.name, interest.revenue)
         else:
-            print(f"=== NO CUSTOMER INTERESTS TO PROCESS IN UPDATE ===")
+            logger.debug('No customer interests to process in update')
         
-        print(f"=== UPDATE METHOD COMPLETED ===")
+        logger.debug('Update method completed')
         return result
 
     def to_representation(self, instance):
@@ -1560,25 +1559,20 @@ class ClientSerializer(serializers.ModelSerializer):
         """
         Override to handle tenant field before validation.
         """
-        print(f"=== TO_INTERNAL_VALUE START ===")
-        print(f"Input data: {data}")
-        
-        # Extract created_at from raw data before validation (since it's read-only)
-        # Store it in context for use in create() method
-        print(f"=== CHECKING FOR created_at IN INPUT DATA ===")
-        print(f"Data keys: {list(data.keys())}")
-        print(f"'created_at' in data: {'created_at' in data}")
+        logger.debug('TO_INTERNAL_VALUE START: Input data: %s', data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("CHECKING FOR created_at IN INPUT DATA: Data keys: %s, 'created_at' in data: %s", list(data.keys()), 'created_at' in data)
         if 'created_at' in data:
             self._import_created_at = data.pop('created_at')
-            print(f"✅ Extracted created_at for import: {self._import_created_at}")
+            logger.debug('Extracted created_at for import: %s', self._import_created_at)
         else:
             self._import_created_at = None
-            print(f"❌ No created_at found in input data")
+            logger.warning('No created_at found in input data')
         
         # Remove tenant field from data if it exists
         if 'tenant' in data:
             data.pop('tenant')
-            print("Removed tenant field from input data")
+            logger.debug('Removed tenant field from input data')
         
         # Normalize email: coerce empty string/whitespace to None
         try:
@@ -1588,15 +1582,14 @@ class ClientSerializer(serializers.ModelSerializer):
                     pass
                 elif isinstance(email_val, str) and email_val.strip() == "":
                     data['email'] = None
-                    print("Normalized email: empty string -> None")
+                    logger.debug('Normalized email: empty string -> None')
         except Exception as _:
             # Be defensive; don't block request processing on normalization
             pass
         
         # Call parent method
         result = super().to_internal_value(data)
-        print(f"=== TO_INTERNAL_VALUE RESULT ===")
-        print(f"Result: {result}")
+        logger.debug('TO_INTERNAL_VALUE RESULT: Result: %s', result)
         return result
     
     def validate(self, data):
@@ -1605,8 +1598,7 @@ class ClientSerializer(serializers.ModelSerializer):
         Validates required fields (marked with * in frontend) while allowing optional fields to be null.
         Skips strict validation during CSV import operations.
         """
-        print(f"=== VALIDATING ENTIRE DATA SET ===")
-        print(f"Data to validate: {data}")
+        logger.debug('Validating entire data set: Data to validate: %s', data)
         
         # Check if this is an import operation (skip strict validation)
         request = self.context.get('request')
@@ -1707,7 +1699,7 @@ class ClientSerializer(serializers.ModelSerializer):
             
             # Raise errors if any required fields are missing
             if errors:
-                print(f"=== VALIDATION ERRORS: {errors} ===")
+                logger.debug('Validation errors: %s', errors)
                 raise serializers.ValidationError(errors)
             
         else:
@@ -1726,7 +1718,7 @@ class ClientSerializer(serializers.ModelSerializer):
             # Check if update would result in both name and phone being empty
             if not final_name and not final_phone:
                 errors['name'] = "At least Name or Phone must be maintained. Update cannot remove both fields."
-                print(f"=== UPDATE VALIDATION ERRORS: {errors} ===")
+                logger.debug('Update validation errors: %s', errors)
                 raise serializers.ValidationError(errors)
         
         # Convert empty strings to None for optional fields to ensure they're stored as null
@@ -1743,8 +1735,7 @@ class ClientSerializer(serializers.ModelSerializer):
                 if isinstance(data[field], str) and data[field].strip() == '':
                     data[field] = None
         
-        print("=== VALIDATION PASSED ===")
-        print(f"Final data after validation: {data}")
+        logger.debug('Validation passed: Final data after validation: %s', data)
         return data
 
 
@@ -0,0 +1,163 @@
+"""
+Set-based customer status recalculation (VVIP / VIP / General).
+
+Client.update_status_based_on_behavior() classifies one client with three
+queries and a save() that fires every Client post_save receiver. Recomputing
+a whole tenant that way costs several queries per client. Here a tenant's
+clients are classified in one grouped query: qualifying purchases and spend
+are aggregated per client and the target status is computed by the database
+(CASE WHEN), returning only clients whose status actually changes. Those are
+written with one UPDATE per target status per batch of ids.
+
+The UPDATEs bypass model signals on purpose: the status-driven side effects
+are re-done once per run instead of once per client (dashboard caches are
+invalidated per touched store). updated_at is bumped so change-based readers
+(ETags, sync) still see the rows as changed.
+
+Rules (shared with the per-client method via classify_status):
+  - VVIP:    at least one qualifying purchase and spend >= VVIP_MIN_SPEND
+  - VIP:     VIP_MIN_PURCHASES+ qualifying purchases, or spend >= VIP_MIN_SPEND
+  - General: everybody else
+A qualifying purchase is a sale in QUALIFYING_SALE_STATUSES that is paid or
+partially paid.
+"""
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Case, CharField, Count, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Client
+from .tagging import schedule_tagging
+
+logger = logging.getLogger(__name__)
+
+QUALIFYING_SALE_STATUSES = ['confirmed', 'processing', 'shipped', 'delivered']
+QUALIFYING_PAYMENT_STATUSES = ['paid', 'partial']
+VVIP_MIN_SPEND = Decimal('50000')
+VIP_MIN_SPEND = Decimal('10000')
+VIP_MIN_PURCHASES = 2
+DEFAULT_BATCH_SIZE = 1000
+
+ZERO = Value(Decimal('0'), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+
+def classify_status(purchases, spent):
+    """Status for a client with `purchases` qualifying sales worth `spent` in total."""
+    if purchases > 0:
+        if spent >= VVIP_MIN_SPEND:
+            return Client.Status.VVIP
+        if purchases >= VIP_MIN_PURCHASES or spent >= VIP_MIN_SPEND:
+            return Client.Status.VIP
+    return Client.Status.GENERAL
+
+
+def qualifying_sales(prefix=''):
+    """Q selecting qualifying sales; prefix='sales__' when filtering from Client."""
+    return Q(**{
+        f'{prefix}status__in': QUALIFYING_SALE_STATUSES,
+        f'{prefix}payment_status__in': QUALIFYING_PAYMENT_STATUSES,
+    })
+
+
+def with_target_status(queryset):
+    """Annotate clients with qualifying_purchases, qualifying_spend and target_status (classify_status in SQL)."""
+    qualifying = qualifying_sales('sales__')
+    return queryset.annotate(
+        qualifying_purchases=Count('sales', filter=qualifying),
+        qualifying_spend=Coalesce(Sum('sales__total_amount', filter=qualifying), ZERO),
+    ).annotate(
+        target_status=Case(
+            When(
+                qualifying_purchases__gt=0, qualifying_spend__gte=VVIP_MIN_SPEND,
+                then=Value(Client.Status.VVIP),
+            ),
+            When(
+                Q(qualifying_purchases__gte=VIP_MIN_PURCHASES)
+                | Q(qualifying_purchases__gt=0, qualifying_spend__gte=VIP_MIN_SPEND),
+                then=Value(Client.Status.VIP),
+            ),
+            default=Value(Client.Status.GENERAL),
+            output_field=CharField(),
+        ),
+    )
+
+
+def _apply(buckets, now):
+    for status, pks in buckets.items():
+        if pks:
+            Client.objects.filter(pk__in=pks).update(status=status, updated_at=now)
+
+
+def recalculate_statuses(tenant_id, client_ids=None, dry_run=False, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Recalculate statuses for a tenant's clients (tenant_id=None: clients
+    without a tenant), optionally limited to client_ids. Returns a summary dict:
+    {'tenant_id', 'processed', 'changed', 'transitions': {(old, new): n}, 'distribution': {status: n}}.
+    """
+    from apps.tenants.metrics import invalidate_dashboard_metrics
+
+    clients = Client.objects.filter(tenant_id=tenant_id)
+    if client_ids is not None:
+        clients = clients.filter(pk__in=client_ids)
+
+    changes = list(
+        with_target_status(clients.order_by())
+        .exclude(status=F('target_status'))
+        .values_list('pk', 'tenant_id', 'store_id', 'status', 'target_status')
+    )
+    transitions = Counter((old, new) for _, _, _, old, new in changes)
+
+    if changes and not dry_run:
+        now = timezone.now()
+        buckets = {}
+        with transaction.atomic():
+            for pk, _, _, _, new in changes:
+                bucket = buckets.setdefault(new, [])
+                bucket.append(pk)
+                if len(bucket) >= batch_size:
+                    _apply({new: bucket}, now)
+                    buckets[new] = []
+            _apply(buckets, now)
+            # STATUS_TAGS depend on the status and update() skips auto_apply_tags
+            schedule_tagging(pk for pk, *_ in changes)
+            for changed_tenant, store_id in {(row[1], row[2]) for row in changes}:
+                transaction.on_commit(lambda t=changed_tenant, s=store_id: invalidate_dashboard_metrics(t, s))
+
+        logger.info("Recalculated client statuses for tenant %s: %s change(s)", tenant_id, len(changes))
+
+    distribution = dict(clients.order_by().values_list('status').annotate(total=Count('pk')))
+    if dry_run:
+        # Report the distribution the run would have produced
+        for (old, new), count in transitions.items():
+            distribution[old] -= count
+            distribution[new] = distribution.get(new, 0) + count
+    return {
+        'tenant_id': tenant_id,
+        'processed': sum(distribution.values()),
+        'changed': len(changes),
+        'transitions': dict(transitions),
+        'distribution': {status: count for status, count in distribution.items() if count},
+    }
+
+
+def _recalculate_in_thread(tenant_id, **options):
+    try:
+        return recalculate_statuses(tenant_id, **options)
+    finally:
+        # Worker threads get their own connection; don't leak it
+        connection.close()
+
+
+def recalculate_tenants(tenant_ids, workers=1, **options):
+    """recalculate_statuses() for each tenant, on up to `workers` threads, yielding each summary in order."""
+    if workers <= 1:
+        for tenant_id in tenant_ids:
+            yield recalculate_statuses(tenant_id, **options)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(lambda tenant_id: _recalculate_in_thread(tenant_id, **options), tenant_ids)
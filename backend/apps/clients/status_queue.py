@@ -0,0 +1,106 @@
+"""
+Coalescing queue for customer status recomputation.
+
+A client's status (VVIP / VIP / General) depends on its sales, so it used to
+be recomputed inside every Sale and SalesPipeline save: two aggregates and a
+Client save per write, paid inline by imports and pipeline edits, and again
+when a won pipeline created its sale.
+
+Now the signals only mark the client dirty: each write registers an on_commit
+callback carrying its client id, which hands the id to a process-wide queue
+when the transaction commits (Django drops the callbacks of rolled back
+writes, so nothing is queued for them). The first id to arrive starts a timer; after
+CLIENT_STATUS_DEBOUNCE_SECONDS a worker thread takes everything queued so far
+and recalculates it with status_engine.recalculate_statuses(), one grouped
+query per tenant, so a client touched fifty times in the window is
+recomputed once.
+
+CLIENT_STATUS_RECOMPUTE_ASYNC=False recalculates each write's client inline
+at commit instead (tests, scripts), without coalescing. The queue lives in process memory: ids still queued when a
+worker restarts are lost, and the nightly update_customer_statuses run
+corrects them.
+"""
+import logging
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from .status_engine import recalculate_statuses
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+
+_dirty = set()
+_lock = threading.Lock()
+_timer = None
+
+
+def mark_status_dirty(client_id):
+    """Recompute this client's status once the current transaction commits (coalesced)."""
+    if not client_id:
+        return
+    transaction.on_commit(partial(_on_commit, client_id))
+
+
+def _on_commit(client_id):
+    if not getattr(settings, 'CLIENT_STATUS_RECOMPUTE_ASYNC', True):
+        recompute([client_id])
+        return
+    global _timer
+    with _lock:
+        _dirty.add(client_id)
+        if _timer is None:
+            delay = getattr(settings, 'CLIENT_STATUS_DEBOUNCE_SECONDS', DEFAULT_DEBOUNCE_SECONDS)
+            _timer = threading.Timer(delay, _drain_in_worker_thread)
+            _timer.daemon = True
+            _timer.start()
+
+
+def _take_dirty():
+    global _timer
+    with _lock:
+        ids = set(_dirty)
+        _dirty.clear()
+        _timer = None
+    return ids
+
+
+def recompute(client_ids):
+    """Recalculate the given clients' statuses, grouped by tenant. Returns the number changed."""
+    from .models import Client
+
+    by_tenant = {}
+    for tenant_id, client_id in Client.objects.filter(pk__in=client_ids).values_list('tenant_id', 'pk'):
+        by_tenant.setdefault(tenant_id, []).append(client_id)
+    changed = 0
+    for tenant_id, ids in by_tenant.items():
+        try:
+            changed += recalculate_statuses(tenant_id, client_ids=ids)['changed']
+        except Exception as e:
+            logger.error("Status recompute failed for tenant %s (%s clients): %s", tenant_id, len(ids), e, exc_info=True)
+    return changed
+
+
+def _drain_in_worker_thread():
+    close_old_connections()
+    try:
+        flush()
+    finally:
+        # The timer thread is not reused, so its connection would otherwise stay open
+        connection.close()
+
+
+def flush():
+    """Recompute everything queued so far, now. Returns the number of statuses changed."""
+    ids = _take_dirty()
+    if not ids:
+        return 0
+    try:
+        return recompute(ids)
+    except Exception as e:
+        logger.error("Status recompute failed for %s queued clients: %s", len(ids), e, exc_info=True)
+        return 0
+
@@ -0,0 +1,212 @@
+"""
+Batch customer auto-tagging.
+
+Tags are derived from a client's visit reason, product interests, age, lead
+source, CRM status, community and birthday/anniversary dates (compute_tags).
+The per-save auto_apply_tags receiver used to run the rules for one client at
+a time with several queries each (interest exists/iterate/count with a
+category query per interest, a tag lookup and the add). Bulk writes paid that
+per row, and bulk_create()'d imports got no tags at all.
+
+apply_tags(client_ids) tags any number of clients with a fixed handful of
+queries per batch:
+  - one for the clients' rule fields
+  - one for their interests' category names
+  - one for their current tag links
+  - one bulk insert into the clients<->tags through table (plus one delete)
+Tag slugs resolve to ids through a per-process map (tag_ids()), refreshed
+every TAG_MAP_TTL_SECONDS and whenever a CustomerTag is saved or deleted here.
+
+Only tags are added; manually assigned tags are never removed. The exception
+is the time-bound event tags (TRANSIENT_SLUGS), which are dropped once the
+week is over.
+
+Client saves and interest changes call schedule_tagging(), which tags the
+clients once the transaction commits (core.commit_hooks). Imports and bulk
+status changes call it with all their ids at once, so they tag in batches.
+"""
+import logging
+import threading
+import time
+from datetime import date
+
+from django.db.models import Q
+
+from core.commit_hooks import after_commit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+TAG_MAP_TTL_SECONDS = 300
+
+REASON_TAGS = {
+    'wedding': 'wedding-buyer',
+    'gifting': 'gifting',
+    'self-purchase': 'self-purchase',
+    'repair': 'repair-customer',
+    'browse': 'browsing-prospect',
+}
+CATEGORY_TAGS = {
+    'diamond': 'diamond-interested',
+    'gold': 'gold-interested',
+    'polki': 'polki-interested',
+}
+SOURCE_TAGS = {
+    'instagram': 'social-lead',
+    'facebook': 'facebook-lead',
+    'google': 'google-lead',
+    'referral': 'referral',
+    'walk-in': 'walk-in',
+    'other': 'other-source',
+}
+STATUS_TAGS = {
+    'customer': 'converted-customer',
+    'prospect': 'interested-lead',
+    'inactive': 'not-interested',
+}
+COMMUNITY_TAGS = {
+    'hindu': 'hindu',
+    'muslim': 'muslim',
+    'jain': 'jain',
+    'parsi': 'parsi',
+    'buddhist': 'buddhist',
+    'cross community': 'cross-community',
+}
+TRANSIENT_SLUGS = {'birthday-week', 'anniversary-week'}
+EVENT_WINDOW_DAYS = 7
+
+CLIENT_FIELDS = (
+    'id', 'reason_for_visit', 'date_of_birth', 'anniversary_date', 'lead_source', 'status',
+    'next_follow_up', 'community',
+)
+
+
+def _lookup(mapping, value):
+    return mapping.get(value.strip().lower()) if value else None
+
+
+def _age_tag(date_of_birth, today):
+    age = today.year - date_of_birth.year - ((today.month, today.day) < (date_of_birth.month, date_of_birth.day))
+    if 18 <= age <= 25:
+        return 'young-adult'
+    if 26 <= age <= 35:
+        return 'millennial-shopper'
+    if 36 <= age <= 45:
+        return 'middle-age-shopper'
+    if age > 46:
+        return 'senior-shopper'
+    return None
+
+
+def _this_week(day, today):
+    return day and day.month == today.month and abs(day.day - today.day) <= EVENT_WINDOW_DAYS
+
+
+def compute_tags(client, categories, today=None):
+    """
+    Slugs a client should carry. client is a dict (or object) with the
+    CLIENT_FIELDS; categories lists the category names of its interests.
+    """
+    today = today or date.today()
+    field = client.get if isinstance(client, dict) else lambda name: getattr(client, name, None)
+    slugs = {
+        _lookup(REASON_TAGS, field('reason_for_visit')),
+        _lookup(SOURCE_TAGS, field('lead_source')),
+        _lookup(STATUS_TAGS, str(field('status') or '')),
+        _lookup(COMMUNITY_TAGS, field('community')),
+    }
+    slugs.update(CATEGORY_TAGS.get(name.strip().lower()) for name in categories if name)
+    if len(categories) > 1:
+        slugs.add('mixed-buyer')
+    if field('date_of_birth'):
+        slugs.add(_age_tag(field('date_of_birth'), today))
+    if field('next_follow_up'):
+        slugs.add('needs-follow-up')
+    if _this_week(field('date_of_birth'), today):
+        slugs.add('birthday-week')
+    if _this_week(field('anniversary_date'), today):
+        slugs.add('anniversary-week')
+    slugs.discard(None)
+    return slugs
+
+
+# ---------------------------------------------------------------------------
+# Tag slug -> id map
+# ---------------------------------------------------------------------------
+
+_tag_map = None
+_tag_map_loaded_at = 0.0
+_tag_map_lock = threading.Lock()
+
+
+def tag_ids():
+    """{slug: id} for every CustomerTag, cached in this process."""
+    global _tag_map, _tag_map_loaded_at
+    from .models import CustomerTag
+
+    with _tag_map_lock:
+        if _tag_map is None or time.monotonic() - _tag_map_loaded_at > TAG_MAP_TTL_SECONDS:
+            _tag_map = dict(CustomerTag.objects.values_list('slug', 'id'))
+            _tag_map_loaded_at = time.monotonic()
+        return _tag_map
+
+
+def invalidate_tag_map():
+    global _tag_map
+    with _tag_map_lock:
+        _tag_map = None
+
+
+# ---------------------------------------------------------------------------
+# Batch application
+# ---------------------------------------------------------------------------
+
+def _apply_batch(client_ids, known, today):
+    from .models import Client, CustomerInterest
+
+    Through = Client.tags.through
+    categories = {client_id: [] for client_id in client_ids}
+    rows = CustomerInterest.objects.filter(client_id__in=client_ids).order_by().values_list('client_id', 'category__name')
+    for client_id, name in rows:
+        categories[client_id].append(name)
+    current = {}
+    for client_id, tag_id in Through.objects.filter(client_id__in=client_ids).values_list('client_id', 'customertag_id'):
+        current.setdefault(client_id, set()).add(tag_id)
+    transient = {known[slug] for slug in TRANSIENT_SLUGS if slug in known}
+
+    to_add, to_remove = [], {}
+    for client in Client.objects.filter(pk__in=client_ids).order_by().values(*CLIENT_FIELDS):
+        wanted = {known[slug] for slug in compute_tags(client, categories[client['id']], today) if slug in known}
+        has = current.get(client['id'], set())
+        to_add.extend(Through(client_id=client['id'], customertag_id=tag_id) for tag_id in wanted - has)
+        for tag_id in (has & transient) - wanted:
+            to_remove.setdefault(tag_id, []).append(client['id'])
+
+    if to_add:
+        Through.objects.bulk_create(to_add, ignore_conflicts=True)
+    if to_remove:
+        stale = Q()
+        for tag_id, ids in to_remove.items():
+            stale |= Q(customertag_id=tag_id, client_id__in=ids)
+        Through.objects.filter(stale).delete()
+    return len(to_add), sum(len(ids) for ids in to_remove.values())
+
+
+def apply_tags(client_ids, batch_size=DEFAULT_BATCH_SIZE, today=None):
+    """Auto-tag the given clients in batches. Returns {'clients', 'added', 'removed'}."""
+    client_ids = sorted(set(client_ids))
+    known = tag_ids()
+    today = today or date.today()
+    added = removed = 0
+    for start in range(0, len(client_ids), batch_size):
+        batch_added, batch_removed = _apply_batch(client_ids[start:start + batch_size], known, today)
+        added += batch_added
+        removed += batch_removed
+    return {'clients': len(client_ids), 'added': added, 'removed': removed}
+
+
+def schedule_tagging(client_ids):
+    """Tag these clients once the current transaction commits (one batch per call)."""
+    client_ids = {client_id for client_id in client_ids if client_id}
+    if client_ids:
+        after_commit(apply_tags, client_ids, description=f"Auto-tagging of {len(client_ids)} client(s)")
@@ -1,3 +1,216 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+
+from apps.products.models import Category, Product
+from apps.sales.models import Sale
+from apps.stores.models import Store
+from apps.tenants.models import Tenant
+from . import status_queue, tagging
+from .models import Client, CustomerInterest, CustomerTag
+from .status_engine import recalculate_statuses
+from .tagging import invalidate_tag_map
+
+User = get_user_model()
+
+
+class StatusEngineTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store = Store.objects.create(
+            name="Main Store", code="MS001", address="123 Test St", city="Test City", state="Test State",
+            tenant=self.tenant,
+        )
+        self.seller = User.objects.create_user(
+            username="sales", password="testpass123", role=User.Role.INHOUSE_SALES,
+            tenant=self.tenant, store=self.store,
+        )
+        self.vvip = self._client('vvip@example.com', [Decimal('60000')])
+        self.vip = self._client('vip@example.com', [Decimal('3000'), Decimal('2000')])
+        self.general = self._client('general@example.com', [Decimal('5000')])
+        self.pending_only = self._client('pending@example.com', [Decimal('90000')], payment_status='pending')
+        # Sale signals already classified everybody; start from a stale state
+        Client.objects.update(status=Client.Status.GENERAL)
+
+    def _client(self, email, amounts, payment_status='paid'):
+        client = Client.objects.create(
+            first_name="Test", last_name="Client", email=email, tenant=self.tenant, store=self.store,
+        )
+        for i, amount in enumerate(amounts):
+            Sale.objects.create(
+                client=client, sales_representative=self.seller, order_number=f'{email}-{i}',
+                subtotal=amount, total_amount=amount, status='confirmed', payment_status=payment_status,
+                tenant=self.tenant,
+            )
+        return client
+
+    def _statuses(self):
+        return dict(Client.objects.values_list('email', 'status'))
+
+    def test_matches_per_client_rules(self):
+        summary = recalculate_statuses(self.tenant.id)
+
+        self.assertEqual(self._statuses(), {
+            'vvip@example.com': Client.Status.VVIP,
+            'vip@example.com': Client.Status.VIP,
+            'general@example.com': Client.Status.GENERAL,
+            'pending@example.com': Client.Status.GENERAL,
+        })
+        self.assertEqual(summary['processed'], 4)
+        self.assertEqual(summary['changed'], 2)
+        self.assertEqual(summary['transitions'], {
+            (Client.Status.GENERAL, Client.Status.VVIP): 1, (Client.Status.GENERAL, Client.Status.VIP): 1,
+        })
+        for client in Client.objects.all():
+            self.assertEqual(client.update_status_based_on_behavior(), f"Status remains {client.get_status_display()}")
+
+    def test_dry_run_and_second_run_write_nothing(self):
+        summary = recalculate_statuses(self.tenant.id, dry_run=True)
+        self.assertEqual(summary['changed'], 2)
+        self.assertEqual(summary['distribution'], {Client.Status.VVIP: 1, Client.Status.VIP: 1, Client.Status.GENERAL: 2})
+        self.assertEqual(set(self._statuses().values()), {Client.Status.GENERAL})
+
+        recalculate_statuses(self.tenant.id, batch_size=1)
+        with self.assertNumQueries(2):  # classify + distribution, no writes
+            self.assertEqual(recalculate_statuses(self.tenant.id)['changed'], 0)
+
+    def test_command_limits_to_tenant(self):
+        other = Tenant.objects.create(name="Other Business", slug="other-business")
+        stranger = Client.objects.create(first_name="Other", email="other@example.com", tenant=other)
+        Sale.objects.create(
+            client=stranger, sales_representative=self.seller, order_number='other-1', subtotal=Decimal('70000'),
+            total_amount=Decimal('70000'), status='confirmed', payment_status='paid', tenant=other,
+        )
+        Client.objects.filter(pk=stranger.pk).update(status=Client.Status.GENERAL)
+
+        call_command('update_customer_statuses', tenant=[self.tenant.id], stdout=open('/dev/null', 'w'))
+
+        self.assertEqual(Client.objects.get(pk=self.vvip.pk).status, Client.Status.VVIP)
+        self.assertEqual(Client.objects.get(pk=stranger.pk).status, Client.Status.GENERAL)
+
+
+class StatusQueueTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.seller = User.objects.create_user(
+            username="sales", password="testpass123", role=User.Role.INHOUSE_SALES, tenant=self.tenant,
+        )
+        self.client_record = Client.objects.create(first_name="Test", email="queue@example.com", tenant=self.tenant)
+        # Writes committed by earlier tests may have left a debounce timer running
+        if status_queue._timer is not None:
+            status_queue._timer.cancel()
+        status_queue._take_dirty()
+
+    def _sale(self, number, amount):
+        return Sale.objects.create(
+            client=self.client_record, sales_representative=self.seller, order_number=number,
+            subtotal=amount, total_amount=amount, status='confirmed', payment_status='paid', tenant=self.tenant,
+        )
+
+    def _status(self):
+        return Client.objects.get(pk=self.client_record.pk).status
+
+    @override_settings(CLIENT_STATUS_RECOMPUTE_ASYNC=False)
+    def test_status_is_recomputed_after_commit_and_rolled_back_writes_are_dropped(self):
+        other = Client.objects.create(first_name="Other", email="other@example.com", tenant=self.tenant)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            try:
+                with transaction.atomic():
+                    Sale.objects.create(
+                        client=other, sales_representative=self.seller, order_number='q-0', subtotal=60000,
+                        total_amount=60000, status='confirmed', tenant=self.tenant,
+                    )
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+            self._sale('q-1', Decimal('60000'))
+            self.assertEqual(self._status(), Client.Status.GENERAL)
+
+        with patch('apps.clients.status_queue.recalculate_statuses', wraps=recalculate_statuses) as recalculate:
+            for callback in callbacks:
+                callback()
+        self.assertEqual([call.kwargs['client_ids'] for call in recalculate.call_args_list], [[self.client_record.pk]])
+        self.assertEqual(self._status(), Client.Status.VVIP)
+
+    @override_settings(ANALYTICS_ROLLUP_REFRESH_ASYNC=False)
+    def test_async_writes_are_coalesced_until_flushed(self):
+        with patch('apps.clients.status_queue.threading.Timer') as timer, \
+                self.captureOnCommitCallbacks(execute=True):
+            self._sale('q-1', Decimal('60000'))
+            self._sale('q-2', Decimal('1000'))
+        self.assertEqual(timer.call_count, 1)
+        self.assertEqual(self._status(), Client.Status.GENERAL)
+
+        self.assertEqual(status_queue.flush(), 1)
+        self.assertEqual(self._status(), Client.Status.VVIP)
+        self.assertEqual(status_queue.flush(), 0)
+
+
+class TaggingTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        for slug in ('wedding-buyer', 'gold-interested', 'diamond-interested', 'mixed-buyer', 'birthday-week', 'vip-manual'):
+            CustomerTag.objects.create(name=slug, slug=slug)
+        invalidate_tag_map()
+        self.gold = Category.objects.create(name='Gold', tenant=self.tenant)
+        self.diamond = Category.objects.create(name='Diamond', tenant=self.tenant)
+
+    def _slugs(self, client):
+        return set(client.tags.values_list('slug', flat=True))
+
+    def test_save_tags_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = Client.objects.create(
+                first_name="A", email="a@example.com", tenant=self.tenant, reason_for_visit=' Wedding',
+            )
+            second = Client.objects.create(first_name="B", email="b@example.com", tenant=self.tenant)
+            self.assertEqual(self._slugs(first), set())
+        self.assertEqual(self._slugs(first), {'wedding-buyer'})
+        self.assertEqual(self._slugs(second), set())
+
+    def test_rolled_back_saves_are_not_tagged_later(self):
+        with patch('apps.clients.tagging._apply_batch', wraps=tagging._apply_batch) as apply_batch, \
+                self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Client.objects.create(
+                        first_name="A", email="a@example.com", tenant=self.tenant, reason_for_visit=' Wedding',
+                    )
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+            kept = Client.objects.create(first_name="B", email="b@example.com", tenant=self.tenant)
+        tagged = {client_id for call in apply_batch.call_args_list for client_id in call.args[0]}
+        self.assertEqual(tagged, {kept.pk})
+
+    def test_apply_tags_adds_missing_and_expires_only_transient_tags(self):
+        today = date(2025, 6, 15)
+        client = Client.objects.create(
+            first_name="A", email="a@example.com", tenant=self.tenant, date_of_birth=date(1990, 6, 12),
+        )
+        client.tags.add(*CustomerTag.objects.filter(slug__in=['vip-manual']))
+        for category in (self.gold, self.diamond):
+            product = Product.objects.create(
+                name=f'{category.name} ring', sku=f'SKU-{category.pk}', category=category, tenant=self.tenant,
+                cost_price=Decimal('1'), selling_price=Decimal('1'),
+            )
+            CustomerInterest.objects.create(
+                client=client, category=category, product=product, revenue=Decimal('0'), tenant=self.tenant,
+            )
+
+        tagging.apply_tags([client.pk], today=today)
+        self.assertEqual(
+            self._slugs(client), {'vip-manual', 'gold-interested', 'diamond-interested', 'mixed-buyer', 'birthday-week'},
+        )
+
+        with self.assertNumQueries(4):  # interests, tag links, clients, delete (nothing to insert)
+            summary = tagging.apply_tags([client.pk], today=date(2025, 8, 1))
+        self.assertEqual(summary['removed'], 1)
+        self.assertEqual(
+            self._slugs(client), {'vip-manual', 'gold-interested', 'diamond-interested', 'mixed-buyer'},
+        )
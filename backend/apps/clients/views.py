@@ -7,6 +7,7 @@ from django.db.models import Q, Count
 from django.contrib.auth import get_user_model
 import logging
 from .models import Client, ClientInteraction, ClientVisit, Appointment, FollowUp, Task, Announcement, Purchase, AuditLog, CustomerTag, CustomerInterest, CustomerImportAudit
+from .tagging import schedule_tagging
 from .serializers import (
     ClientSerializer, ClientInteractionSerializer, AppointmentSerializer, FollowUpSerializer, 
     TaskSerializer, AnnouncementSerializer, PurchaseSerializer, AuditLogSerializer,
@@ -23,7 +24,9 @@ from datetime import datetime
 from django.http import HttpResponse, StreamingHttpResponse
 import re
 
-logger = logging.getLogger(__name__)
+from core.conditional import conditional, static_stamp
+from core.logging_utils import get_logger
+logger = get_logger(__name__)
 from django.db import transaction
 from django.db.utils import IntegrityError
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
@@ -118,6 +121,121 @@ class ImportExportPermission(permissions.BasePermission):
         return user.role in ['platform_admin', 'business_admin', 'manager']
 
 
+# Static choices for the customer form, built once rather than per request
+CLIENT_DROPDOWN_OPTIONS = {
+    'states': [
+        {'value': 'AP', 'label': 'Andhra Pradesh'},
+        {'value': 'AR', 'label': 'Arunachal Pradesh'},
+        {'value': 'AS', 'label': 'Assam'},
+        {'value': 'BR', 'label': 'Bihar'},
+        {'value': 'CT', 'label': 'Chhattisgarh'},
+        {'value': 'GA', 'label': 'Goa'},
+        {'value': 'GJ', 'label': 'Gujarat'},
+        {'value': 'HR', 'label': 'Haryana'},
+        {'value': 'HP', 'label': 'Himachal Pradesh'},
+        {'value': 'JK', 'label': 'Jammu and Kashmir'},
+        {'value': 'JH', 'label': 'Jharkhand'},
+        {'value': 'KA', 'label': 'Karnataka'},
+        {'value': 'KL', 'label': 'Kerala'},
+        {'value': 'MP', 'label': 'Madhya Pradesh'},
+        {'value': 'MH', 'label': 'Maharashtra'},
+        {'value': 'MN', 'label': 'Manipur'},
+        {'value': 'ML', 'label': 'Meghalaya'},
+        {'value': 'MZ', 'label': 'Mizoram'},
+        {'value': 'NL', 'label': 'Nagaland'},
+        {'value': 'OR', 'label': 'Odisha'},
+        {'value': 'PB', 'label': 'Punjab'},
+        {'value': 'RJ', 'label': 'Rajasthan'},
+        {'value': 'SK', 'label': 'Sikkim'},
+        {'value': 'TN', 'label': 'Tamil Nadu'},
+        {'value': 'TG', 'label': 'Telangana'},
+        {'value': 'TR', 'label': 'Tripura'},
+        {'value': 'UP', 'label': 'Uttar Pradesh'},
+        {'value': 'UT', 'label': 'Uttarakhand'},
+        {'value': 'WB', 'label': 'West Bengal'},
+        {'value': 'AN', 'label': 'Andaman and Nicobar Islands'},
+        {'value': 'CH', 'label': 'Chandigarh'},
+        {'value': 'DN', 'label': 'Dadra and Nagar Haveli'},
+        {'value': 'DD', 'label': 'Daman and Diu'},
+        {'value': 'DL', 'label': 'Delhi'},
+        {'value': 'LD', 'label': 'Lakshadweep'},
+        {'value': 'PY', 'label': 'Puducherry'},
+    ],
+    'communities': [
+        {'value': 'hindu', 'label': 'Hindu'},
+        {'value': 'muslim', 'label': 'Muslim'},
+        {'value': 'sikh', 'label': 'Sikh'},
+        {'value': 'christian', 'label': 'Christian'},
+        {'value': 'jain', 'label': 'Jain'},
+        {'value': 'buddhist', 'label': 'Buddhist'},
+        {'value': 'parsi', 'label': 'Parsi'},
+        {'value': 'jewish', 'label': 'Jewish'},
+        {'value': 'gujarati', 'label': 'Gujarati'},
+        {'value': 'marwari', 'label': 'Marwari'},
+        {'value': 'punjabi', 'label': 'Punjabi'},
+        {'value': 'sindhi', 'label': 'Sindhi'},
+        {'value': 'bengali', 'label': 'Bengali'},
+        {'value': 'tamil', 'label': 'Tamil'},
+        {'value': 'telugu', 'label': 'Telugu'},
+        {'value': 'kannada', 'label': 'Kannada'},
+        {'value': 'malayalam', 'label': 'Malayalam'},
+        {'value': 'marathi', 'label': 'Marathi'},
+        {'value': 'hindi', 'label': 'Hindi'},
+        {'value': 'urdu', 'label': 'Urdu'},
+        {'value': 'kashmiri', 'label': 'Kashmiri'},
+        {'value': 'assamese', 'label': 'Assamese'},
+        {'value': 'oriya', 'label': 'Oriya'},
+        {'value': 'other', 'label': 'Other'},
+    ],
+    'reasons_for_visit': [
+        {'value': 'purchase', 'label': 'Purchase'},
+        {'value': 'inquiry', 'label': 'Inquiry'},
+        {'value': 'repair', 'label': 'Repair'},
+        {'value': 'exchange', 'label': 'Exchange'},
+        {'value': 'valuation', 'label': 'Valuation'},
+        {'value': 'cleaning', 'label': 'Cleaning'},
+        {'value': 'sizing', 'label': 'Sizing'},
+        {'value': 'warranty', 'label': 'Warranty'},
+        {'value': 'gift', 'label': 'Gift'},
+        {'value': 'investment', 'label': 'Investment'},
+        {'value': 'other', 'label': 'Other'},
+    ],
+    'lead_sources': [
+        {'value': 'walkin', 'label': 'Walk-in'},
+        {'value': 'referral', 'label': 'Referral'},
+        {'value': 'online', 'label': 'Online'},
+        {'value': 'social_media', 'label': 'Social Media'},
+        {'value': 'advertisement', 'label': 'Advertisement'},
+        {'value': 'exhibition', 'label': 'Exhibition'},
+        {'value': 'cold_call', 'label': 'Cold Call'},
+        {'value': 'website', 'label': 'Website'},
+        {'value': 'google', 'label': 'Google Search'},
+        {'value': 'facebook', 'label': 'Facebook'},
+        {'value': 'instagram', 'label': 'Instagram'},
+        {'value': 'whatsapp', 'label': 'WhatsApp'},
+        {'value': 'newspaper', 'label': 'Newspaper'},
+        {'value': 'magazine', 'label': 'Magazine'},
+        {'value': 'tv', 'label': 'TV Advertisement'},
+        {'value': 'radio', 'label': 'Radio Advertisement'},
+        {'value': 'other', 'label': 'Other'},
+    ],
+    'age_groups': [
+        {'value': '18-25', 'label': '18-25'},
+        {'value': '26-35', 'label': '26-35'},
+        {'value': '36-50', 'label': '36-50'},
+        {'value': '51-65', 'label': '51-65'},
+        {'value': '65+', 'label': '65+'},
+    ],
+    'saving_schemes': [
+        {'value': 'active', 'label': 'Active'},
+        {'value': 'inactive', 'label': 'Inactive'},
+        {'value': 'pending', 'label': 'Pending'},
+        {'value': 'completed', 'label': 'Completed'},
+    ],
+}
+CLIENT_DROPDOWN_OPTIONS_STAMP = static_stamp(CLIENT_DROPDOWN_OPTIONS)
+
+
 """
 CLIENT MANAGEMENT SYSTEM - CUSTOMER STATUS MANAGEMENT
 
@@ -181,7 +299,7 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
             # This is for historical imports - preserve the date
             import_created_at = request.data.get('created_at')
             if import_created_at:
-                print(f"=== VIEW: Preserving created_at for import: {import_created_at} ===")
+                logger.debug('VIEW: Preserving created_at for import: %s', import_created_at)
                 # Store it in request.data temporarily, will be handled by serializer
                 # But we need to preserve it since serializer removes it
                 self._preserved_created_at = import_created_at
@@ -217,7 +335,7 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
                     logger.warning("Could not modify request.data directly when setting created_at: %s", e)
                 # Store in view instance so we can pass it via context
                 self._import_created_at = self._preserved_created_at
-                print(f"=== VIEW: Preserved created_at for second serializer call: {self._preserved_created_at} ===")
+                logger.debug('VIEW: Preserved created_at for second serializer call: %s', self._preserved_created_at)
             
             # Set created_by to the selected salesperson, not the logged-in user
             # This allows multiple salespersons to use the same login account but be tracked individually
@@ -871,20 +989,14 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
             logger.warning(f"Error creating customer deleted notifications: {e}")
 
     def update(self, request, *args, **kwargs):
-        print(f"=== CLIENT VIEW UPDATE METHOD ===")
-        print(f"Request data: {request.data}")
-        print(f"Request method: {request.method}")
-        print(f"Request user: {request.user}")
+        logger.debug('Client view update method: Request data: %s, Request method: %s, Request user: %s', request.data, request.method, request.user)
         
         try:
             response = super().update(request, *args, **kwargs)
-            print(f"Update successful: {response.data}")
+            logger.debug('Update successful: %s', response.data)
             return response
         except Exception as e:
-            print(f"Update failed with error: {e}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.error('Update failed with error: %s', e, exc_info=True)
             raise
 
     def perform_destroy(self, instance):
@@ -1179,7 +1291,7 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
                                     # Format: "Product Name (Customer Interest 1) - Category: Category Name [Purchase Status]"
                                     product_info.append(f"{product_name} (Customer Interest {idx}) - Category: {category_name}{purchase_status}")
                         except Exception as e:
-                            print(f"Error exporting product_name: {e}")
+                            logger.error('Error exporting product_name: %s', e)
                         row[field] = ' | '.join(product_info) if product_info else ''
                     elif field == 'category':
                         # Extract category names from customer interests with purchase status
@@ -1197,7 +1309,7 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
                                     # Format: "Category Name (Customer Interest 1) - Product: Product Name [Purchase Status]"
                                     category_info.append(f"{category_name} (Customer Interest {idx}) - Product: {product_name}{purchase_status}")
                         except Exception as e:
-                            print(f"Error exporting category: {e}")
+                            logger.error('Error exporting category: %s', e)
                         row[field] = ' | '.join(category_info) if category_info else ''
                     elif field == 'tags':
                         row[field] = ', '.join([tag.name for tag in client.tags.all()])
@@ -1216,7 +1328,7 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
                                 if latest_pipeline:
                                     pipeline_stage = latest_pipeline.stage
                         except Exception as e:
-                            print(f"Error getting pipeline stage for export: {e}")
+                            logger.error('Error getting pipeline stage for export: %s', e)
                         # Use pipeline stage if available, otherwise fall back to status
                         row[field] = pipeline_stage if pipeline_stage else (client.status or 'general')
                     else:
@@ -1397,7 +1509,7 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
                                     # Format: "Product Name (Customer Interest 1) - Category: Category Name [Purchase Status]"
                                     product_info.append(f"{product_name} (Customer Interest {idx}) - Category: {category_name}{purchase_status}")
                         except Exception as e:
-                            print(f"Error exporting product_name: {e}")
+                            logger.error('Error exporting product_name: %s', e)
                         client_data[field] = ' | '.join(product_info) if product_info else ''
                     elif field == 'category':
                         # Extract category names from customer interests with purchase status
@@ -1415,7 +1527,7 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
                                     # Format: "Category Name (Customer Interest 1) - Product: Product Name [Purchase Status]"
                                     category_info.append(f"{category_name} (Customer Interest {idx}) - Product: {product_name}{purchase_status}")
                         except Exception as e:
-                            print(f"Error exporting category: {e}")
+                            logger.error('Error exporting category: %s', e)
                         client_data[field] = ' | '.join(category_info) if category_info else ''
                     elif field == 'tags':
                         client_data[field] = [tag.name for tag in client.tags.all()]
@@ -1434,7 +1546,7 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
                                 if latest_pipeline:
                                     pipeline_stage = latest_pipeline.stage
                         except Exception as e:
-                            print(f"Error getting pipeline stage for export: {e}")
+                            logger.error('Error getting pipeline stage for export: %s', e)
                         # Use pipeline stage if available, otherwise fall back to status
                         client_data[field] = pipeline_stage if pipeline_stage else (client.status or 'general')
                     else:
@@ -2504,6 +2616,8 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
                                                 if c.phone:
                                                     phone_to_client_id[c.phone] = c.pk
                                                     existing_phones.add(c.phone)
+                                        # bulk_create skips auto_apply_tags: tag the batch on commit
+                                        schedule_tagging(c.pk for c in clients_to_create)
                                         counters['imported_count'] += len(clients_to_create)
                                         clients_to_create = []
                                     
@@ -2576,6 +2690,7 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
                                 if c.phone:
                                     phone_to_client_id[c.phone] = c.pk
                                     existing_phones.add(c.phone)
+                        schedule_tagging(c.pk for c in clients_to_create)
                         counters['imported_count'] += len(clients_to_create)
                         clients_to_create = []
 
@@ -3010,9 +3125,7 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
             else:
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            import traceback
-            print(f"Error updating customer cross-store: {e}")
-            print(traceback.format_exc())
+            logger.error('Error updating customer cross-store: %s', e, exc_info=True)
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -3271,9 +3384,7 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
             })
             
         except Exception as e:
-            import traceback
-            print(f"Error fetching customer journey: {e}")
-            print(traceback.format_exc())
+            logger.error('Error fetching customer journey: %s', e, exc_info=True)
             return Response({
                 'success': False,
                 'error': str(e)
@@ -3398,120 +3509,10 @@ class ClientViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin, GlobalDateFilt
             )
 
     @action(detail=False, methods=['get'])
+    @conditional(lambda view, request: CLIENT_DROPDOWN_OPTIONS_STAMP)
     def dropdown_options(self, request):
         """Get dropdown options for customer form fields"""
-        options = {
-            'states': [
-                {'value': 'AP', 'label': 'Andhra Pradesh'},
-                {'value': 'AR', 'label': 'Arunachal Pradesh'},
-                {'value': 'AS', 'label': 'Assam'},
-                {'value': 'BR', 'label': 'Bihar'},
-                {'value': 'CT', 'label': 'Chhattisgarh'},
-                {'value': 'GA', 'label': 'Goa'},
-                {'value': 'GJ', 'label': 'Gujarat'},
-                {'value': 'HR', 'label': 'Haryana'},
-                {'value': 'HP', 'label': 'Himachal Pradesh'},
-                {'value': 'JK', 'label': 'Jammu and Kashmir'},
-                {'value': 'JH', 'label': 'Jharkhand'},
-                {'value': 'KA', 'label': 'Karnataka'},
-                {'value': 'KL', 'label': 'Kerala'},
-                {'value': 'MP', 'label': 'Madhya Pradesh'},
-                {'value': 'MH', 'label': 'Maharashtra'},
-                {'value': 'MN', 'label': 'Manipur'},
-                {'value': 'ML', 'label': 'Meghalaya'},
-                {'value': 'MZ', 'label': 'Mizoram'},
-                {'value': 'NL', 'label': 'Nagaland'},
-                {'value': 'OR', 'label': 'Odisha'},
-                {'value': 'PB', 'label': 'Punjab'},
-                {'value': 'RJ', 'label': 'Rajasthan'},
-                {'value': 'SK', 'label': 'Sikkim'},
-                {'value': 'TN', 'label': 'Tamil Nadu'},
-                {'value': 'TG', 'label': 'Telangana'},
-                {'value': 'TR', 'label': 'Tripura'},
-                {'value': 'UP', 'label': 'Uttar Pradesh'},
-                {'value': 'UT', 'label': 'Uttarakhand'},
-                {'value': 'WB', 'label': 'West Bengal'},
-                {'value': 'AN', 'label': 'Andaman and Nicobar Islands'},
-                {'value': 'CH', 'label': 'Chandigarh'},
-                {'value': 'DN', 'label': 'Dadra and Nagar Haveli'},
-                {'value': 'DD', 'label': 'Daman and Diu'},
-                {'value': 'DL', 'label': 'Delhi'},
-                {'value': 'LD', 'label': 'Lakshadweep'},
-                {'value': 'PY', 'label': 'Puducherry'},
-            ],
-            'communities': [
-                {'value': 'hindu', 'label': 'Hindu'},
-                {'value': 'muslim', 'label': 'Muslim'},
-                {'value': 'sikh', 'label': 'Sikh'},
-                {'value': 'christian', 'label': 'Christian'},
-                {'value': 'jain', 'label': 'Jain'},
-                {'value': 'buddhist', 'label': 'Buddhist'},
-                {'value': 'parsi', 'label': 'Parsi'},
-                {'value': 'jewish', 'label': 'Jewish'},
-                {'value': 'gujarati', 'label': 'Gujarati'},
-                {'value': 'marwari', 'label': 'Marwari'},
-                {'value': 'punjabi', 'label': 'Punjabi'},
-                {'value': 'sindhi', 'label': 'Sindhi'},
-                {'value': 'bengali', 'label': 'Bengali'},
-                {'value': 'tamil', 'label': 'Tamil'},
-                {'value': 'telugu', 'label': 'Telugu'},
-                {'value': 'kannada', 'label': 'Kannada'},
-                {'value': 'malayalam', 'label': 'Malayalam'},
-                {'value': 'marathi', 'label': 'Marathi'},
-                {'value': 'hindi', 'label': 'Hindi'},
-                {'value': 'urdu', 'label': 'Urdu'},
-                {'value': 'kashmiri', 'label': 'Kashmiri'},
-                {'value': 'assamese', 'label': 'Assamese'},
-                {'value': 'oriya', 'label': 'Oriya'},
-                {'value': 'other', 'label': 'Other'},
-            ],
-            'reasons_for_visit': [
-                {'value': 'purchase', 'label': 'Purchase'},
-                {'value': 'inquiry', 'label': 'Inquiry'},
-                {'value': 'repair', 'label': 'Repair'},
-                {'value': 'exchange', 'label': 'Exchange'},
-                {'value': 'valuation', 'label': 'Valuation'},
-                {'value': 'cleaning', 'label': 'Cleaning'},
-                {'value': 'sizing', 'label': 'Sizing'},
-                {'value': 'warranty', 'label': 'Warranty'},
-                {'value': 'gift', 'label': 'Gift'},
-                {'value': 'investment', 'label': 'Investment'},
-                {'value': 'other', 'label': 'Other'},
-            ],
-            'lead_sources': [
-                {'value': 'walkin', 'label': 'Walk-in'},
-                {'value': 'referral', 'label': 'Referral'},
-                {'value': 'online', 'label': 'Online'},
-                {'value': 'social_media', 'label': 'Social Media'},
-                {'value': 'advertisement', 'label': 'Advertisement'},
-                {'value': 'exhibition', 'label': 'Exhibition'},
-                {'value': 'cold_call', 'label': 'Cold Call'},
-                {'value': 'website', 'label': 'Website'},
-                {'value': 'google', 'label': 'Google Search'},
-                {'value': 'facebook', 'label': 'Facebook'},
-                {'value': 'instagram', 'label': 'Instagram'},
-                {'value': 'whatsapp', 'label': 'WhatsApp'},
-                {'value': 'newspaper', 'label': 'Newspaper'},
-                {'value': 'magazine', 'label': 'Magazine'},
-                {'value': 'tv', 'label': 'TV Advertisement'},
-                {'value': 'radio', 'label': 'Radio Advertisement'},
-                {'value': 'other', 'label': 'Other'},
-            ],
-            'age_groups': [
-                {'value': '18-25', 'label': '18-25'},
-                {'value': '26-35', 'label': '26-35'},
-                {'value': '36-50', 'label': '36-50'},
-                {'value': '51-65', 'label': '51-65'},
-                {'value': '65+', 'label': '65+'},
-            ],
-            'saving_schemes': [
-                {'value': 'active', 'label': 'Active'},
-                {'value': 'inactive', 'label': 'Inactive'},
-                {'value': 'pending', 'label': 'Pending'},
-                {'value': 'completed', 'label': 'Completed'},
-            ],
-        }
-        return Response(options)
+        return Response(CLIENT_DROPDOWN_OPTIONS)
 
 class ClientInteractionViewSet(viewsets.ModelViewSet):
     queryset = ClientInteraction.objects.all()
@@ -3591,12 +3592,8 @@ class AppointmentViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin):
             from apps.notifications.models import Notification
             from apps.users.models import User
             
-            print(f"=== CREATING APPOINTMENT NOTIFICATIONS ===")
-            print(f"Appointment: {appointment.id}")
-            print(f"Client: {appointment.client.first_name if appointment.client else 'No client'} {appointment.client.last_name if appointment.client else ''}")
-            print(f"Client store: {appointment.client.store.name if appointment.client and appointment.client.store else 'No store'}")
-            print(f"Created by user: {created_by_user.username} (role: {created_by_user.role})")
-            print(f"Created by user tenant: {created_by_user.tenant}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Creating appointment notifications: Appointment: %s, Client: %s %s, Client store: %s, Created by user: %s (role: %s), Created by user tenant: %s', appointment.id, appointment.client.first_name if appointment.client else 'No client', appointment.client.last_name if appointment.client else '', appointment.client.store.name if appointment.client and appointment.client.store else 'No store', created_by_user.username, created_by_user.role, created_by_user.tenant)
             
             # Role-based recipients (same tenant only): creator, assignee, manager of creator/assignee, business admin, store manager, store sales/telecalling
             from apps.notifications.services import get_role_based_recipients
@@ -3614,8 +3611,9 @@ class AppointmentViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin):
                 include_store_manager=True,
                 include_store_sales_and_telecalling=True,
             )
-            print(f"Role-based recipients (same tenant only): {[f'{u.username} ({u.role})' for u in unique_users]}")
-            print(f"Unique users to notify: {len(unique_users)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Role-based recipients (same tenant only): %s', [f'{u.username} ({u.role})' for u in unique_users])
+            logger.debug('Unique users to notify: %s', len(unique_users))
             
             # Create notifications
             for user in unique_users:
@@ -3635,15 +3633,14 @@ class AppointmentViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin):
                     is_persistent=False,
                     metadata={'appointment_id': appointment.id, 'customer_id': appointment.client_id}
                 )
-                print(f"Created notification {notification.id} for user {user.username} (role: {user.role})")
+                logger.debug('Created notification %s for user %s (role: %s)', notification.id, user.username, user.role)
             
-            print(f"Created {len(unique_users)} notifications for new appointment")
-            print(f"Users notified: {[f'{user.username} ({user.role})' for user in unique_users]}")
+            logger.debug('Created %s notifications for new appointment', len(unique_users))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Users notified: %s', [f'{user.username} ({user.role})' for user in unique_users])
             
         except Exception as e:
-            print(f"Error creating appointment notification: {e}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.error('Error creating appointment notification: %s', e, exc_info=True)
 
     def _get_appointment_notification_recipients(self, appointment, actor_user):
         """Return unique_users list for appointment-related notifications. Same-tenant only."""
@@ -4253,6 +4250,7 @@ class CustomerTagViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(categories)
     
     @action(detail=False, methods=['get'])
+    @conditional(lambda view, request: static_stamp(CustomerTag.CATEGORY_CHOICES))
     def categories(self, request):
         """Get available tag categories"""
         categories = CustomerTag.CATEGORY_CHOICES
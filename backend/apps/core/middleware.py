@@ -4,6 +4,9 @@ from django.utils.deprecation import MiddlewareMixin
 from django.utils import timezone
 from datetime import datetime
 from django.db.models import Q
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
 
 class GlobalDateFilterMiddleware(MiddlewareMixin):
     """
@@ -48,14 +51,10 @@ class GlobalDateFilterMiddleware(MiddlewareMixin):
                         'enabled': True
                     }
                     
-                    print(f"🌍 Global Date Filter Applied:")
-                    print(f"   Path: {request.path}")
-                    print(f"   Start: {start_date}")
-                    print(f"   End: {end_date}")
-                    print(f"   Type: {filter_type}")
+                    logger.debug('Global Date Filter Applied: Path: %s, Start: %s, End: %s, Type: %s', request.path, start_date, end_date, filter_type)
                     
                 except (ValueError, TypeError) as e:
-                    print(f"❌ Invalid date format: {e}")
+                    logger.warning('Invalid date format: %s', e)
                     request.date_filter = {'enabled': False}
             else:
                 request.date_filter = {'enabled': False}
@@ -3,6 +3,9 @@
 from django.db.models import Q
 from django.utils import timezone
 from datetime import datetime
+from core.logging_utils import get_logger, lazy
+
+logger = get_logger(__name__)
 
 class GlobalDateFilterMixin:
     """
@@ -48,16 +51,12 @@ class GlobalDateFilterMixin:
             
             filtered_queryset = queryset.filter(**filter_kwargs)
             
-            print(f"📅 Date Filter Applied to {queryset.model.__name__}:")
-            print(f"   Field: {date_field}")
-            print(f"   Range: {start_date.date()} to {end_date.date()}")
-            print(f"   Before: {queryset.count()} records")
-            print(f"   After: {filtered_queryset.count()} records")
+            logger.debug('Date Filter Applied to %s: Field: %s, Range: %s to %s, Before: %s records, After: %s records', queryset.model.__name__, date_field, start_date.date(), end_date.date(), lazy(queryset.count), lazy(filtered_queryset.count))
             
             return filtered_queryset
             
         except ValueError as e:
-            print(f"❌ Invalid date format: {e}")
+            logger.warning('Invalid date format: %s', e)
             return queryset
     
     def get_date_filtered_queryset_multiple_fields(self, queryset, date_fields):
@@ -100,14 +99,10 @@ class GlobalDateFilterMixin:
             
             filtered_queryset = queryset.filter(date_conditions)
             
-            print(f"📅 Multi-Field Date Filter Applied to {queryset.model.__name__}:")
-            print(f"   Fields: {date_fields}")
-            print(f"   Range: {start_date.date()} to {end_date.date()}")
-            print(f"   Before: {queryset.count()} records")
-            print(f"   After: {filtered_queryset.count()} records")
+            logger.debug('Multi-Field Date Filter Applied to %s: Fields: %s, Range: %s to %s, Before: %s records, After: %s records', queryset.model.__name__, date_fields, start_date.date(), end_date.date(), lazy(queryset.count), lazy(filtered_queryset.count))
             
             return filtered_queryset
             
         except ValueError as e:
-            print(f"❌ Invalid date format: {e}")
+            logger.warning('Invalid date format: %s', e)
             return queryset
@@ -5,3 +5,6 @@ class EscalationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.escalation'
     verbose_name = 'Escalation Management'
+
+    def ready(self):
+        import apps.escalation.signals  # noqa
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Escalation
+from .stats import invalidate_escalation_stats
+
+
+@receiver([post_save, post_delete], sender=Escalation)
+def invalidate_stats_on_escalation_write(sender, instance, **kwargs):
+    invalidate_escalation_stats(instance.tenant_id)
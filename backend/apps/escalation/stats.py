@@ -0,0 +1,96 @@
+"""
+Escalation statistics.
+
+The stats endpoint used to count each status, priority and category with a
+query apiece and then load every escalation into Python (twice over the
+resolved ones) to work out overdue counts, resolution times and SLA
+compliance from the model properties. compute_escalation_stats() does it in a
+single aggregate: conditional counts per status/priority/category, and the
+duration figures (resolved_at - created_at, compared against sla_hours) are
+computed by the database.
+
+Results are cached per tenant and visibility scope. Escalation writes bump the
+cache version (see signals.py); overdue and resolved-today figures also move
+with the clock, so entries live ESCALATION_STATS_CACHE_TIMEOUT seconds at most.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q
+from django.utils import timezone
+
+from core.cache import bump_version, get_or_set, versioned_key
+
+from .models import Escalation
+
+CACHE_NAMESPACE = 'escalation_stats'
+DEFAULT_CACHE_TIMEOUT = 60
+
+OPEN_STATUSES = [Escalation.Status.OPEN, Escalation.Status.IN_PROGRESS, Escalation.Status.PENDING_CUSTOMER]
+RESOLVED_STATUSES = [Escalation.Status.RESOLVED, Escalation.Status.CLOSED]
+
+RESOLUTION_TIME = ExpressionWrapper(F('resolved_at') - F('created_at'), output_field=DurationField())
+SLA_WINDOW = ExpressionWrapper(F('sla_hours') * timedelta(hours=1), output_field=DurationField())
+
+
+def invalidate_escalation_stats(tenant_id):
+    """Drop cached stats for a tenant and the cross-tenant (platform admin) view."""
+    if tenant_id:
+        bump_version(CACHE_NAMESPACE, tenant_id)
+    bump_version(CACHE_NAMESPACE, None)
+
+
+def compute_escalation_stats(queryset, now=None):
+    """Stats payload (see EscalationStatsSerializer) for a queryset of escalations, in one query."""
+    now = now or timezone.now()
+    resolved = Q(status__in=RESOLVED_STATUSES)
+    timed = resolved & Q(resolved_at__isnull=False)
+
+    aggregates = {
+        'total': Count('pk'),
+        'open': Count('pk', filter=Q(status__in=OPEN_STATUSES)),
+        'overdue': Count('pk', filter=Q(due_date__lt=now) & ~resolved),
+        'resolved_today': Count('pk', filter=resolved & Q(resolved_at__date=now.date())),
+        'timed': Count('pk', filter=timed),
+        'avg_resolution': Avg(RESOLUTION_TIME, filter=timed),
+        'sla_met': Count('pk', filter=timed & Q(resolved_at__lte=F('created_at') + SLA_WINDOW)),
+    }
+    for name, choices in (('priority', Escalation.Priority), ('category', Escalation.Category),
+                          ('status', Escalation.Status)):
+        for value in choices.values:
+            aggregates[f'{name}__{value}'] = Count('pk', filter=Q(**{name: value}))
+    totals = queryset.order_by().aggregate(**aggregates)
+
+    timed_count = totals['timed']
+    avg_hours = totals['avg_resolution'].total_seconds() / 3600 if totals['avg_resolution'] else 0
+    return {
+        'total_escalations': totals['total'],
+        'open_escalations': totals['open'],
+        'overdue_escalations': totals['overdue'],
+        'resolved_today': totals['resolved_today'],
+        'avg_resolution_time': round(avg_hours, 2),
+        'sla_compliance_rate': round(totals['sla_met'] / timed_count * 100, 2) if timed_count else 0,
+        'escalations_by_priority': {value: totals[f'priority__{value}'] for value in Escalation.Priority.values},
+        'escalations_by_category': {value: totals[f'category__{value}'] for value in Escalation.Category.values},
+        'escalations_by_status': {value: totals[f'status__{value}'] for value in Escalation.Status.values},
+    }
+
+
+def stats_scope(user):
+    """Cache scope matching the escalations the stats view shows this user."""
+    if user.is_platform_admin or user.is_business_admin:
+        return 'all'
+    if user.is_manager and user.store_id:
+        return f'store{user.store_id}'
+    return f'user{user.pk}'
+
+
+def get_escalation_stats(user, queryset):
+    """Cached compute_escalation_stats() for the queryset visible to user."""
+    tenant_id = None if user.is_platform_admin else user.tenant_id
+    key = versioned_key(CACHE_NAMESPACE, tenant_id, [stats_scope(user)])
+    return get_or_set(
+        key,
+        lambda: compute_escalation_stats(queryset),
+        getattr(settings, 'ESCALATION_STATS_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT),
+    )
@@ -1,3 +1,64 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.clients.models import Client
+from apps.tenants.models import Tenant
+from .models import Escalation
+from .stats import compute_escalation_stats
+
+User = get_user_model()
+
+
+class EscalationStatsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.admin = User.objects.create_user(
+            username="admin", password="testpass123", role=User.Role.BUSINESS_ADMIN, tenant=self.tenant,
+        )
+        self.client_record = Client.objects.create(first_name="Test", email="esc@example.com", tenant=self.tenant)
+        now = timezone.now()
+        self._escalation('late', 'high', 'open', due_date=now - timedelta(hours=1))
+        self._escalation('fast', 'high', 'resolved', created=now - timedelta(hours=10), resolved=now - timedelta(hours=6))
+        self._escalation('slow', 'low', 'closed', created=now - timedelta(hours=40), resolved=now - timedelta(hours=10))
+        self._escalation('waiting', 'urgent', 'pending_customer')
+
+    def _escalation(self, title, priority, status, created=None, resolved=None, due_date=None):
+        escalation = Escalation.objects.create(
+            title=title, description=title, priority=priority, status=status, client=self.client_record,
+            created_by=self.admin, tenant=self.tenant, due_date=due_date,
+        )
+        if created:
+            Escalation.objects.filter(pk=escalation.pk).update(created_at=created, resolved_at=resolved)
+        return escalation
+
+    def test_stats_match_model_properties_in_one_query(self):
+        escalations = Escalation.objects.filter(tenant=self.tenant)
+        with self.assertNumQueries(1):
+            stats = compute_escalation_stats(escalations)
+
+        timed = [e for e in escalations if e.status in ('resolved', 'closed') and e.time_to_resolution is not None]
+        self.assertEqual(stats['total_escalations'], 4)
+        self.assertEqual(stats['open_escalations'], 2)
+        self.assertEqual(stats['overdue_escalations'], sum(e.is_overdue for e in escalations))
+        self.assertEqual(stats['avg_resolution_time'], round(sum(e.time_to_resolution for e in timed) / len(timed), 2))
+        self.assertEqual(stats['sla_compliance_rate'], 50.0)
+        self.assertEqual(stats['escalations_by_priority'], {'low': 1, 'medium': 0, 'high': 2, 'urgent': 1})
+        self.assertEqual(stats['escalations_by_status']['closed'], 1)
+        self.assertEqual(stats['escalations_by_category']['other'], 4)
+
+    def test_view_is_cached_until_an_escalation_changes(self):
+        api = APIClient()
+        api.force_authenticate(self.admin)
+        self.assertEqual(api.get('/api/escalation/stats/').data['total_escalations'], 4)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(api.get('/api/escalation/stats/').data['total_escalations'], 4)
 
-# Create your tests here.
+        self._escalation('new', 'medium', 'open')
+        self.assertEqual(api.get('/api/escalation/stats/').data['total_escalations'], 5)
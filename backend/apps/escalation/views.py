@@ -11,6 +11,7 @@ from .serializers import (
     EscalationTemplateSerializer, EscalationStatsSerializer
 )
 from apps.users.permissions import IsRoleAllowed
+from .stats import get_escalation_stats
 
 
 class EscalationListView(generics.ListCreateAPIView):
@@ -236,90 +237,27 @@ class EscalationStatsView(generics.GenericAPIView):
             if user.is_platform_admin:
                 queryset = Escalation.objects.all()
             elif user.is_business_admin:
-                queryset = Escalation.objects.filter(tenant=user.tenant)
+                queryset = Escalation.objects.filter(tenant_id=user.tenant_id)
             elif user.is_manager:
                 # Store managers should see all escalations from their store
-                if user.store:
+                if user.store_id:
                     queryset = Escalation.objects.filter(
-                        Q(tenant=user.tenant) & 
-                        Q(client__assigned_to__store=user.store)
+                        Q(tenant_id=user.tenant_id) & 
+                        Q(client__assigned_to__store_id=user.store_id)
                     )
                 else:
                     queryset = Escalation.objects.filter(
-                        Q(tenant=user.tenant) & 
+                        Q(tenant_id=user.tenant_id) & 
                         (Q(assigned_to=user) | Q(assigned_to__isnull=True))
                     )
             else:
                 queryset = Escalation.objects.filter(
-                    Q(tenant=user.tenant) & 
+                    Q(tenant_id=user.tenant_id) & 
                     (Q(created_by=user) | Q(assigned_to=user))
                 )
 
-            # Calculate basic statistics
-            total_escalations = queryset.count()
-            open_escalations = queryset.filter(status__in=['open', 'in_progress', 'pending_customer']).count()
-            
-            # Count overdue escalations
-            overdue_escalations = 0
-            for escalation in queryset:
-                if escalation.is_overdue:
-                    overdue_escalations += 1
-            
-            # Resolved today
-            today = timezone.now().date()
-            resolved_today = queryset.filter(
-                status__in=['resolved', 'closed'],
-                resolved_at__date=today
-            ).count()
-
-            # Average resolution time
-            resolved_escalations = queryset.filter(status__in=['resolved', 'closed'])
-            total_resolution_time = 0
-            resolved_count = 0
-            
-            for escalation in resolved_escalations:
-                if escalation.time_to_resolution is not None:
-                    total_resolution_time += escalation.time_to_resolution
-                    resolved_count += 1
-            
-            avg_resolution_time = (total_resolution_time / resolved_count) if resolved_count > 0 else 0
-
-            # SLA compliance rate
-            sla_compliant = 0
-            for escalation in resolved_escalations:
-                if escalation.sla_compliance:
-                    sla_compliant += 1
-            
-            sla_compliance_rate = (sla_compliant / resolved_count * 100) if resolved_count > 0 else 0
-
-            # Breakdowns
-            escalations_by_priority = {}
-            escalations_by_category = {}
-            escalations_by_status = {}
-            
-            for priority, _ in Escalation.Priority.choices:
-                count = queryset.filter(priority=priority).count()
-                escalations_by_priority[priority] = count
-                
-            for category, _ in Escalation.Category.choices:
-                count = queryset.filter(category=category).count()
-                escalations_by_category[category] = count
-                
-            for status, _ in Escalation.Status.choices:
-                count = queryset.filter(status=status).count()
-                escalations_by_status[status] = count
-
-            stats = {
-                'total_escalations': total_escalations,
-                'open_escalations': open_escalations,
-                'overdue_escalations': overdue_escalations,
-                'resolved_today': resolved_today,
-                'avg_resolution_time': round(avg_resolution_time, 2),
-                'sla_compliance_rate': round(sla_compliance_rate, 2),
-                'escalations_by_priority': escalations_by_priority,
-                'escalations_by_category': escalations_by_category,
-                'escalations_by_status': escalations_by_status,
-            }
+            # One aggregate query, cached per tenant and scope (see stats.py)
+            stats = get_escalation_stats(user, queryset)
 
             serializer = EscalationStatsSerializer(stats)
             return Response(serializer.data)
@@ -0,0 +1,260 @@
+"""
+Batched sync of exhibition leads captured offline.
+
+Staff at a venue capture leads on devices with unreliable connectivity. Sent
+one by one through ClientViewSet.create, every lead paid full serializer
+validation (a duplicate lookup for phone and email each), a Client save with
+all of its signals (audit rows, rollups, tagging, workflows) and a round of
+notifications, so a device coming back online with a few hundred queued
+leads needed as many slow round trips.
+
+sync_captured_leads() takes the device's ordered queue in one request:
+  - records are validated in memory; each carries a device-generated
+    idempotency key, recorded in ExhibitionLeadCapture, so a batch re-sent
+    after a dropped response never creates a lead twice ('duplicate')
+  - phones and emails are matched against the tenant's customers, and
+    against earlier records of the same batch, in one query ('exists')
+  - new leads are bulk_create()'d with one audit row each
+  - the side effects the skipped signals would have had run once per batch:
+    tagging and rollups on commit, dashboard cache invalidation, workflows
+    only when the tenant has 'client.created' workflows
+  - staff are notified after commit with one summary per recipient instead
+    of one notification per lead
+
+Every record gets a result in request order:
+{'key', 'status': created|duplicate|exists|invalid, 'client_id'|'errors'}.
+"""
+import logging
+from contextlib import nullcontext
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from apps.clients.models import AuditLog, Client
+from apps.clients.tagging import schedule_tagging
+from shared.validators import normalize_phone_number
+
+from .models import Exhibition, ExhibitionLeadCapture
+from .serializers import ExhibitionLeadCaptureSerializer
+
+logger = logging.getLogger(__name__)
+
+EXHIBITION_STATUS = 'exhibition'
+EXHIBITION_SOURCE = 'exhibition'
+MAX_BATCH_SIZE = 500
+
+
+def _clean(record):
+    """Validate one record; returns (data, errors)."""
+    serializer = ExhibitionLeadCaptureSerializer(data=record)
+    if not serializer.is_valid():
+        return None, serializer.errors
+    data = dict(serializer.validated_data)
+    data['key'] = data['key'].strip()
+    data['phone'] = normalize_phone_number(data.get('phone') or '') or None
+    data['email'] = (data.get('email') or '').strip().lower() or None
+    return data, None
+
+
+def _existing_contacts(tenant_id, phones, emails):
+    """({phone: client_id}, {email: client_id}) for the tenant's live customers."""
+    if not phones and not emails:
+        return {}, {}
+    rows = (
+        Client.objects.filter(tenant_id=tenant_id, is_deleted=False)
+        .annotate(email_lower=Lower('email'))
+        .filter(Q(phone__in=phones) | Q(email_lower__in=emails))
+        .order_by('id')
+        .values_list('id', 'phone', 'email_lower')
+    )
+    by_phone, by_email = {}, {}
+    for client_id, phone, email in rows:
+        if phone:
+            by_phone.setdefault(phone, client_id)
+        if email:
+            by_email.setdefault(email, client_id)
+    return by_phone, by_email
+
+
+def _notify(user, tenant_id, created):
+    """One summary notification per recipient for the leads created in this sync."""
+    from apps.notifications.models import Notification
+    from apps.notifications.services import bulk_create_notifications, get_role_based_recipients
+    from apps.tenants.models import Tenant
+
+    tenant = Tenant.objects.filter(pk=tenant_id).first()
+    store = user.store
+    recipients = get_role_based_recipients(tenant, creator=user, store=store, include_creator=False)
+    name = user.get_full_name() or user.username
+    bulk_create_notifications([
+        Notification(
+            user=recipient,
+            tenant=tenant,
+            store=store,
+            type='new_customer',
+            title=f'{len(created)} exhibition lead(s) captured',
+            message=f'{name} synced {len(created)} new exhibition lead(s)'
+                    + (f' for {store.name}' if store else '') + '.',
+            priority='low',
+            status='unread',
+            action_url='/exhibition',
+            action_text='View leads',
+            metadata={'client_ids': created, 'captured_by': user.id},
+        )
+        for recipient in recipients
+    ])
+
+
+def _notify_after_commit(user, tenant_id, created):
+    try:
+        with transaction.atomic():
+            _notify(user, tenant_id, created)
+    except Exception as e:
+        # The leads are saved; a missed summary is not worth failing the sync
+        logger.warning("Exhibition capture notifications failed: %s", e, exc_info=True)
+
+
+def sync_captured_leads(user, records, exhibition_id=None, notify=True):
+    """
+    Create the exhibition leads in `records` (a list of dicts, see
+    ExhibitionLeadCaptureSerializer) for user's tenant and store. exhibition_id
+    is the default for records that do not name an exhibition. Returns one
+    result dict per record, in order.
+
+    Raises IntegrityError when another request stored one of the keys
+    concurrently; nothing is written then and the batch can simply be re-sent.
+    """
+    from apps.analytics.rollups import schedule_rollup_refresh
+    from apps.automation import engine
+    from apps.tenants.metrics import invalidate_dashboard_metrics
+
+    tenant_id = user.tenant_id
+    results = [None] * len(records)
+    cleaned = {}
+    for index, record in enumerate(records):
+        data, errors = _clean(record if isinstance(record, dict) else {})
+        if errors:
+            key = record.get('key') if isinstance(record, dict) else None
+            results[index] = {'key': key, 'status': 'invalid', 'errors': errors}
+            continue
+        data.setdefault('exhibition', None)
+        data['exhibition'] = data['exhibition'] or exhibition_id
+        cleaned[index] = data
+
+    exhibition_ids = {data['exhibition'] for data in cleaned.values() if data['exhibition']}
+    known_exhibitions = set(
+        Exhibition.objects.filter(tenant_id=tenant_id, pk__in=exhibition_ids).order_by().values_list('pk', flat=True)
+    ) if exhibition_ids else set()
+    synced = dict(
+        ExhibitionLeadCapture.objects.filter(
+            tenant_id=tenant_id, idempotency_key__in={data['key'] for data in cleaned.values()},
+        ).values_list('idempotency_key', 'client_id')
+    ) if cleaned else {}
+    by_phone, by_email = _existing_contacts(
+        tenant_id,
+        {data['phone'] for data in cleaned.values() if data['phone']},
+        {data['email'] for data in cleaned.values() if data['email']},
+    )
+
+    now = timezone.now()
+    new_clients = {}     # index -> unsaved Client
+    same_as = {}         # index -> index of the record (earlier in the batch) it resolves to
+    first_with_key = {}
+    for index, data in cleaned.items():
+        key = data['key']
+        if key in synced:
+            results[index] = {'key': key, 'status': 'duplicate', 'client_id': synced[key]}
+            continue
+        if key in first_with_key:
+            same_as[index] = first_with_key[key]
+            continue
+        first_with_key[key] = index
+        if data['exhibition'] and data['exhibition'] not in known_exhibitions:
+            results[index] = {'key': key, 'status': 'invalid', 'errors': {'exhibition': ['Exhibition not found.']}}
+            continue
+        match = by_phone.get(data['phone']) or by_email.get(data['email'])
+        if isinstance(match, int):
+            results[index] = {'key': key, 'status': 'exists', 'client_id': match}
+            continue
+        if match is not None:
+            # match is ('batch', index) for a lead created earlier in this batch
+            same_as[index] = match[1]
+            continue
+        new_clients[index] = Client(
+            first_name=data['first_name'].strip(),
+            last_name=(data.get('last_name') or '').strip() or None,
+            phone=data['phone'],
+            email=data['email'],
+            city=(data.get('city') or '').strip() or None,
+            summary_notes=data.get('notes') or '',
+            status=EXHIBITION_STATUS,
+            lead_source=EXHIBITION_SOURCE,
+            exhibition_id=data['exhibition'],
+            tenant_id=tenant_id,
+            store_id=user.store_id,
+            created_by=user,
+        )
+        for contact, lookup in ((data['phone'], by_phone), (data['email'], by_email)):
+            if contact:
+                lookup.setdefault(contact, ('batch', index))
+
+    writes = new_clients or same_as or any(row and row['status'] == 'exists' for row in results)
+    with transaction.atomic() if writes else nullcontext():
+        Client.objects.bulk_create(new_clients.values())
+        for index, client in new_clients.items():
+            results[index] = {'key': cleaned[index]['key'], 'status': 'created', 'client_id': client.pk}
+        for index, target in same_as.items():
+            # A repeated key repeats the first outcome; a repeated contact matches the lead just created
+            outcome = results[target]
+            status = outcome['status'] if cleaned[index]['key'] == cleaned[target]['key'] else 'exists'
+            results[index] = {key: value for key, value in outcome.items() if key != 'status'}
+            results[index].update(key=cleaned[index]['key'], status=status)
+
+        ExhibitionLeadCapture.objects.bulk_create([
+            ExhibitionLeadCapture(
+                tenant_id=tenant_id,
+                idempotency_key=cleaned[index]['key'],
+                client_id=results[index]['client_id'],
+                created=results[index]['status'] == 'created',
+                captured_by=user,
+                captured_at=cleaned[index].get('captured_at'),
+            )
+            for index in cleaned
+            if results[index]['status'] in ('created', 'exists') and first_with_key.get(cleaned[index]['key']) == index
+        ])
+
+        if new_clients:
+            clients = list(new_clients.values())
+            AuditLog.objects.bulk_create([
+                AuditLog(
+                    client=client,
+                    action='create',
+                    user=user,
+                    after={
+                        'status': client.status,
+                        'lead_source': client.lead_source,
+                        'created_at': client.created_at.isoformat(),
+                        'synced': True,
+                    },
+                    timestamp=now,
+                )
+                for client in clients
+            ])
+            created_ids = [client.pk for client in clients]
+            # bulk_create skips the Client signals: do their work once for the batch
+            schedule_tagging(created_ids)
+            schedule_rollup_refresh(tenant_id, {timezone.localdate(now)})
+            transaction.on_commit(lambda: invalidate_dashboard_metrics(tenant_id, user.store_id))
+            if engine.has_workflows(tenant_id, 'client.created'):
+                for client in clients:
+                    engine.emit(tenant_id, 'client.created', client)
+            if notify:
+                transaction.on_commit(lambda: _notify_after_commit(user, tenant_id, created_ids))
+
+    logger.info(
+        "Synced %s exhibition record(s) for tenant %s: %s created",
+        len(records), tenant_id, len(new_clients),
+    )
+    return results
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("clients", "0038_appointment_reminder_due_at"),
+        ("tenants", "0003_alter_tenant_phone"),
+        ("exhibition", "0001_add_exhibition_models"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExhibitionLeadCapture",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "idempotency_key",
+                    models.CharField(
+                        help_text="Key generated on the capture device", max_length=64
+                    ),
+                ),
+                (
+                    "created",
+                    models.BooleanField(
+                        default=True,
+                        help_text="False when the record matched an existing customer",
+                    ),
+                ),
+                (
+                    "captured_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the device captured the lead",
+                        null=True,
+                    ),
+                ),
+                ("synced_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "captured_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="exhibition_lead_captures",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "client",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Lead created for (or matched to) this record",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="exhibition_captures",
+                        to="clients.client",
+                    ),
+                ),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exhibition_lead_captures",
+                        to="tenants.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Exhibition Lead Capture",
+                "verbose_name_plural": "Exhibition Lead Captures",
+                "unique_together": {("tenant", "idempotency_key")},
+            },
+        ),
+    ]
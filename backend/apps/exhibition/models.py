@@ -77,3 +77,42 @@ class Exhibition(models.Model):
 
     def __str__(self):
         return f"{self.name} - {self.date}"
+
+
+class ExhibitionLeadCapture(models.Model):
+    """
+    A lead record synced from an exhibition capture device, keyed by the
+    device-generated idempotency key so re-sent batches never create the lead twice.
+    """
+    tenant = models.ForeignKey(
+        'tenants.Tenant',
+        on_delete=models.CASCADE,
+        related_name='exhibition_lead_captures'
+    )
+    idempotency_key = models.CharField(max_length=64, help_text=_('Key generated on the capture device'))
+    client = models.ForeignKey(
+        'clients.Client',
+        on_delete=models.SET_NULL,
+        related_name='exhibition_captures',
+        null=True,
+        blank=True,
+        help_text=_('Lead created for (or matched to) this record')
+    )
+    created = models.BooleanField(default=True, help_text=_('False when the record matched an existing customer'))
+    captured_by = models.ForeignKey(
+        'users.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='exhibition_lead_captures'
+    )
+    captured_at = models.DateTimeField(null=True, blank=True, help_text=_('When the device captured the lead'))
+    synced_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Exhibition Lead Capture')
+        verbose_name_plural = _('Exhibition Lead Captures')
+        unique_together = ['tenant', 'idempotency_key']
+
+    def __str__(self):
+        return f"{self.idempotency_key} -> {self.client_id}"
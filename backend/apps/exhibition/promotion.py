@@ -0,0 +1,144 @@
+"""
+Exhibition lead promotion, in bulk.
+
+Promoting a lead keeps its 'exhibition' status (the source stays traceable);
+it touches the client, writes an AuditLog row marking it promoted and lets the
+store know. Done lead by lead that was a lookup, an access check, a full
+Client save (every Client signal) and an audit insert per lead, so a 2,000
+lead expo import cost tens of thousands of queries.
+
+promote_leads() handles any number of ids with a fixed number of statements:
+  - one scoped SELECT for the candidates, access checked in memory
+  - one UPDATE touching updated_at for all of them
+  - one bulk INSERT of audit rows
+  - tagging for all of them in one batch on commit
+  - one bulk INSERT of notifications: a single summary per recipient and
+    store instead of one per lead
+"""
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.clients.models import AuditLog, Client
+from apps.clients.tagging import schedule_tagging
+
+logger = logging.getLogger(__name__)
+
+EXHIBITION_STATUS = 'exhibition'
+TENANT_WIDE_ROLES = ('business_admin',)
+STORE_ROLES = ('manager', 'inhouse_sales', 'tele_calling')
+
+
+def can_access(user, client):
+    """Whether user may promote client (a Client or a dict with tenant_id and store_id)."""
+    values = client if isinstance(client, dict) else {'tenant_id': client.tenant_id, 'store_id': client.store_id}
+    if user.role == 'platform_admin':
+        return True
+    if user.role in TENANT_WIDE_ROLES:
+        return values['tenant_id'] == user.tenant_id
+    if user.role in STORE_ROLES:
+        if user.store_id:
+            return values['store_id'] == user.store_id
+        if user.tenant_id:
+            return values['tenant_id'] == user.tenant_id
+    return False
+
+
+def _parse_id(client_id):
+    try:
+        return int(client_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _notify(user, promoted):
+    """One notification per recipient per store, listing how many leads were promoted there."""
+    from apps.notifications.models import Notification
+    from apps.notifications.services import bulk_create_notifications, get_role_based_recipients
+    from apps.stores.models import Store
+    from apps.tenants.models import Tenant
+
+    by_store = {}
+    for row in promoted:
+        by_store.setdefault((row['tenant_id'], row['store_id']), []).append(row['id'])
+    stores = Store.objects.in_bulk({store_id for _, store_id in by_store if store_id})
+    tenants = Tenant.objects.in_bulk({tenant_id for tenant_id, _ in by_store if tenant_id})
+
+    notifications = []
+    for (tenant_id, store_id), ids in by_store.items():
+        tenant = tenants.get(tenant_id)
+        store = stores.get(store_id)
+        recipients = get_role_based_recipients(tenant, creator=user, store=store, include_creator=False)
+        for recipient in recipients:
+            notifications.append(Notification(
+                user=recipient,
+                tenant=tenant,
+                store=store,
+                type='customer_updated',
+                title=f'{len(ids)} exhibition lead(s) promoted',
+                message=f'{user.get_full_name() or user.username} promoted {len(ids)} exhibition lead(s)'
+                        + (f' for {store.name}' if store else '') + '.',
+                priority='low',
+                status='unread',
+                action_url='/exhibition',
+                action_text='View leads',
+                metadata={'promoted_client_ids': ids, 'promoted_by': user.id},
+            ))
+    bulk_create_notifications(notifications)
+    return len(notifications)
+
+
+def promote_leads(user, client_ids, notify=True):
+    """
+    Promote exhibition leads. Returns (promoted_ids, results) where results has
+    one {'client_id', 'status', 'message'|'error'} entry per requested id, in
+    the order requested; an id requested twice is promoted once and reported
+    twice.
+    """
+    requested = [(client_id, _parse_id(client_id)) for client_id in client_ids]
+    ids = {parsed for _, parsed in requested if parsed is not None}
+    queryset = Client.objects.filter(id__in=ids, status=EXHIBITION_STATUS, is_deleted=False)
+    if user.role != 'platform_admin':
+        # Other tenants' leads are simply not found
+        queryset = queryset.filter(tenant_id=user.tenant_id)
+    candidates = {row['id']: row for row in queryset.order_by().values('id', 'tenant_id', 'store_id')}
+
+    results, promoted = [], {}
+    for raw_id, client_id in requested:
+        row = candidates.get(client_id)
+        if row is None:
+            results.append({'client_id': raw_id if client_id is None else client_id,
+                            'status': 'failed', 'error': 'Client not found'})
+        elif not can_access(user, row):
+            results.append({'client_id': client_id, 'status': 'failed', 'error': 'Access denied'})
+        else:
+            promoted[client_id] = row
+            results.append({'client_id': client_id, 'status': 'success', 'message': 'Promoted successfully'})
+    promoted = list(promoted.values())
+
+    if promoted:
+        promoted_ids = [row['id'] for row in promoted]
+        now = timezone.now()
+        with transaction.atomic():
+            Client.objects.filter(pk__in=promoted_ids).update(updated_at=now)
+            AuditLog.objects.bulk_create([
+                AuditLog(
+                    client_id=client_id,
+                    action='update',
+                    user=user,
+                    before={'status': EXHIBITION_STATUS},
+                    after={'status': EXHIBITION_STATUS, 'promoted': True},
+                    timestamp=now,
+                )
+                for client_id in promoted_ids
+            ])
+            schedule_tagging(promoted_ids)
+            if notify:
+                try:
+                    with transaction.atomic():
+                        _notify(user, promoted)
+                except Exception as e:
+                    # Promotion stands even if nobody could be told about it
+                    logger.warning("Exhibition promotion notifications failed: %s", e, exc_info=True)
+    return [row['id'] for row in promoted], results
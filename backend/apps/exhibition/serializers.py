@@ -28,3 +28,23 @@ class ExhibitionSerializer(serializers.ModelSerializer):
             return f"{obj.created_by.first_name} {obj.created_by.last_name}".strip() or obj.created_by.username
         return None
 
+
+
+class ExhibitionLeadCaptureSerializer(serializers.Serializer):
+    """One lead record queued on a capture device (validated in memory, see capture.py)."""
+    key = serializers.CharField(max_length=64)
+    first_name = serializers.CharField(max_length=50, required=False, allow_blank=True, allow_null=True)
+    last_name = serializers.CharField(max_length=50, required=False, allow_blank=True, allow_null=True)
+    phone = serializers.CharField(max_length=20, required=False, allow_blank=True, allow_null=True)
+    email = serializers.EmailField(required=False, allow_blank=True, allow_null=True)
+    city = serializers.CharField(max_length=50, required=False, allow_blank=True, allow_null=True)
+    notes = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    exhibition = serializers.IntegerField(required=False, allow_null=True)
+    captured_at = serializers.DateTimeField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if not (attrs.get('first_name') or '').strip():
+            raise serializers.ValidationError({'first_name': 'This field is required.'})
+        if not (attrs.get('phone') or attrs.get('email')):
+            raise serializers.ValidationError('A phone number or an email address is required.')
+        return attrs
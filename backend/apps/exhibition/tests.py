@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.clients.models import AuditLog, Client
+from apps.notifications.models import Notification
+from apps.stores.models import Store
+from apps.tenants.models import Tenant
+
+from .models import Exhibition, ExhibitionLeadCapture
+
+User = get_user_model()
+
+
+class BulkPromoteTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store = Store.objects.create(
+            name="Main Store", code="MS001", address="123 Test St", city="Test City", state="Test State",
+            tenant=self.tenant,
+        )
+        self.other_store = Store.objects.create(
+            name="Other Store", code="MS002", address="9 Test St", city="Test City", state="Test State",
+            tenant=self.tenant,
+        )
+        self.seller = User.objects.create_user(
+            username="sales", password="testpass123", role=User.Role.INHOUSE_SALES,
+            tenant=self.tenant, store=self.store,
+        )
+        self.manager = User.objects.create_user(
+            username="manager", password="testpass123", role=User.Role.MANAGER, tenant=self.tenant, store=self.store,
+        )
+        self.leads = [self._lead(f'lead{i}@example.com', self.store) for i in range(5)]
+        self.foreign_lead = self._lead('other@example.com', self.other_store)
+        self.api = APIClient()
+        self.api.force_authenticate(self.seller)
+
+    def _lead(self, email, store):
+        return Client.objects.create(
+            first_name="Expo", email=email, tenant=self.tenant, store=store, status='exhibition',
+            lead_source='exhibition',
+        )
+
+    def test_bulk_promote_uses_constant_queries(self):
+        ids = [999999, 'x'] + [lead.id for lead in self.leads] + [self.foreign_lead.id, self.leads[0].id]
+        audit_rows = AuditLog.objects.count()
+
+        # candidates, update, audit insert, store, tenant, 2 recipient lookups, notification insert + savepoints
+        with self.assertNumQueries(12):
+            response = self.api.post('/api/exhibition/exhibition-leads/bulk_promote/', {'client_ids': ids}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['promoted_count'], 5)
+        self.assertEqual([row['client_id'] for row in response.data['results']], ids)
+        errors = {row['client_id']: row.get('error') for row in response.data['results']}
+        self.assertEqual(errors[self.foreign_lead.id], 'Access denied')
+        self.assertEqual(errors[999999], 'Client not found')
+        self.assertEqual(AuditLog.objects.count() - audit_rows, 5)
+        self.assertEqual(set(Client.objects.filter(pk__in=ids[2:]).values_list('status', flat=True)), {'exhibition'})
+        notification = Notification.objects.get(user=self.manager)
+        self.assertEqual(notification.metadata['promoted_client_ids'], [lead.id for lead in self.leads])
+
+
+class CaptureSyncTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store = Store.objects.create(
+            name="Main Store", code="MS001", address="123 Test St", city="Test City", state="Test State",
+            tenant=self.tenant,
+        )
+        self.seller = User.objects.create_user(
+            username="sales", password="testpass123", role=User.Role.INHOUSE_SALES,
+            tenant=self.tenant, store=self.store,
+        )
+        self.manager = User.objects.create_user(
+            username="manager", password="testpass123", role=User.Role.MANAGER, tenant=self.tenant, store=self.store,
+        )
+        self.exhibition = Exhibition.objects.create(name="Expo", date="2026-01-10", tenant=self.tenant)
+        self.existing = Client.objects.create(
+            first_name="Known", phone="+919876500000", email="known@example.com", tenant=self.tenant,
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.seller)
+
+    def _sync(self, records):
+        return self.api.post(
+            '/api/exhibition/exhibition-leads/sync/', {'exhibition': self.exhibition.id, 'records': records},
+            format='json',
+        )
+
+    def test_sync_dedups_and_is_idempotent(self):
+        records = [
+            {'key': 'dev-1', 'first_name': 'Asha', 'phone': '98765 11111'},
+            {'key': 'dev-2', 'first_name': 'Ravi', 'email': 'KNOWN@example.com'},
+            {'key': 'dev-3', 'first_name': 'Asha again', 'phone': '+919876511111'},
+            {'key': 'dev-4', 'phone': '9876522222'},
+            {'key': 'dev-5', 'first_name': 'Meera', 'email': 'meera@example.com'},
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._sync(records)
+
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([row['status'] for row in results], ['created', 'exists', 'exists', 'invalid', 'created'])
+        self.assertEqual(results[1]['client_id'], self.existing.id)
+        self.assertEqual(results[2]['client_id'], results[0]['client_id'])
+        lead = Client.objects.get(pk=results[0]['client_id'])
+        self.assertEqual(
+            (lead.phone, lead.status, lead.lead_source, lead.exhibition_id, lead.store_id, lead.created_by_id),
+            ('+919876511111', 'exhibition', 'exhibition', self.exhibition.id, self.store.id, self.seller.id),
+        )
+        self.assertEqual(AuditLog.objects.filter(client_id__in=[results[0]['client_id'], results[4]['client_id']]).count(), 2)
+        notification = Notification.objects.get(user=self.manager)
+        self.assertEqual(notification.metadata['client_ids'], [results[0]['client_id'], results[4]['client_id']])
+
+        # A device re-sending the same queue after a dropped response creates nothing
+        clients = Client.objects.count()
+        with self.assertNumQueries(3):  # exhibitions, synced keys, contacts
+            replay = self._sync(records[:3] + records[4:])
+        self.assertEqual({row['status'] for row in replay.data['results']}, {'duplicate'})
+        self.assertEqual([row['client_id'] for row in replay.data['results']], [
+            results[0]['client_id'], results[1]['client_id'], results[2]['client_id'], results[4]['client_id'],
+        ])
+        self.assertEqual(Client.objects.count(), clients)
+        self.assertEqual(ExhibitionLeadCapture.objects.count(), 4)
@@ -7,7 +7,9 @@ from apps.clients.models import Client
 from apps.clients.serializers import ClientSerializer
 from apps.users.permissions import IsRoleAllowed
 from apps.users.middleware import ScopedVisibilityMixin
+from .capture import MAX_BATCH_SIZE, sync_captured_leads
 from .models import Exhibition, ExhibitionTag
+from .promotion import promote_leads
 from .serializers import ExhibitionSerializer, ExhibitionTagSerializer
 
 
@@ -234,21 +236,11 @@ class ExhibitionLeadViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Keep status as 'exhibition' to track that customer came from exhibition
-            # The promotion just makes it visible in main customer system
-            # Status remains 'exhibition' to maintain source tracking
-            client.save()
-            
-            # Log the promotion action
-            from apps.clients.models import AuditLog
-            AuditLog.objects.create(
-                client=client,
-                action='update',
-                user=request.user,
-                before={'status': 'exhibition'},
-                after={'status': 'exhibition', 'promoted': True},
-                timestamp=timezone.now()
-            )
+            # Status remains 'exhibition' to maintain source tracking; the
+            # promotion is recorded in the audit log (see promotion.py)
+            promoted_ids, results = promote_leads(request.user, [client.pk])
+            if not promoted_ids:
+                return Response({'error': results[0]['error']}, status=status.HTTP_403_FORBIDDEN)
             
             serializer = self.get_serializer(client)
             return Response({
@@ -279,65 +271,9 @@ class ExhibitionLeadViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin):
             )
         
         try:
-            promoted_count = 0
-            failed_count = 0
-            results = []
-            
-            for client_id in client_ids:
-                try:
-                    client = Client.objects.get(
-                        id=client_id,
-                        status='exhibition',
-                        is_deleted=False
-                    )
-                    
-                    # Check if user has access to this client
-                    if not self.has_access_to_client(request.user, client):
-                        failed_count += 1
-                        results.append({
-                            'client_id': client_id,
-                            'status': 'failed',
-                            'error': 'Access denied'
-                        })
-                        continue
-                    
-                    # Keep status as 'exhibition' to track that customer came from exhibition
-                    # The promotion just makes it visible in main customer system
-                    # Status remains 'exhibition' to maintain source tracking
-                    client.save()
-                    
-                    # Log the promotion
-                    from apps.clients.models import AuditLog
-                    AuditLog.objects.create(
-                        client=client,
-                        action='update',
-                        user=request.user,
-                        before={'status': 'exhibition'},
-                        after={'status': 'exhibition', 'promoted': True},
-                        timestamp=timezone.now()
-                    )
-                    
-                    promoted_count += 1
-                    results.append({
-                        'client_id': client_id,
-                        'status': 'success',
-                        'message': 'Promoted successfully'
-                    })
-                    
-                except Client.DoesNotExist:
-                    failed_count += 1
-                    results.append({
-                        'client_id': client_id,
-                        'status': 'failed',
-                        'error': 'Client not found'
-                    })
-                except Exception as e:
-                    failed_count += 1
-                    results.append({
-                        'client_id': client_id,
-                        'status': 'failed',
-                        'error': str(e)
-                    })
+            promoted_ids, results = promote_leads(request.user, client_ids)
+            promoted_count = len(promoted_ids)
+            failed_count = len(results) - promoted_count
             
             return Response({
                 'message': f'Bulk promotion completed. {promoted_count} promoted, {failed_count} failed.',
@@ -352,20 +288,48 @@ class ExhibitionLeadViewSet(viewsets.ModelViewSet, ScopedVisibilityMixin):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
-    def has_access_to_client(self, user, client):
-        """Check if user has access to a specific client"""
-        # This is a simplified check - you might want to implement more sophisticated access control
-        if user.role in ['platform_admin', 'business_admin']:
-            return True
-        
-        if user.role in ['manager', 'inhouse_sales', 'tele_calling']:
-            # Managers, inhouse_sales, and tele_calling can access clients in their store/tenant
-            if hasattr(user, 'store') and user.store:
-                return client.store == user.store
-            if hasattr(user, 'tenant') and user.tenant:
-                return client.tenant == user.tenant
+    @action(detail=False, methods=['post'])
+    def sync(self, request):
+        """
+        Sync leads captured offline: {'exhibition': id, 'records': [{'key', 'first_name', ...}]}.
+        Re-sending a batch is safe; records already synced come back as 'duplicate'.
+        """
+        from django.db import IntegrityError
+
+        records = request.data.get('records')
+        if not isinstance(records, list) or not records:
+            return Response({'error': 'No records provided'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(records) > MAX_BATCH_SIZE:
+            return Response(
+                {'error': f'At most {MAX_BATCH_SIZE} records can be synced at once'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not request.user.tenant_id:
+            return Response({'error': 'User is not assigned to a business'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            exhibition_id = int(request.data['exhibition']) if request.data.get('exhibition') else None
+        except (TypeError, ValueError):
+            return Response({'error': 'Invalid exhibition'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            results = sync_captured_leads(request.user, records, exhibition_id=exhibition_id)
+        except IntegrityError:
+            # Another request synced some of these keys at the same time
+            return Response(
+                {'error': 'Records are already being synced, retry the batch'},
+                status=status.HTTP_409_CONFLICT
+            )
         
-        return False
+        counts = {}
+        for result in results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        return Response({
+            'created_count': counts.get('created', 0),
+            'duplicate_count': counts.get('duplicate', 0),
+            'exists_count': counts.get('exists', 0),
+            'invalid_count': counts.get('invalid', 0),
+            'results': results
+        })
     
     @action(detail=False, methods=['get'])
     def export(self, request):
@@ -14,6 +14,10 @@ from .serializers import (
     FeedbackStatsSerializer, FeedbackSurveyStatsSerializer
 )
 from apps.users.permissions import IsRoleAllowed
+import logging
+from core.logging_utils import get_logger, lazy
+
+logger = get_logger(__name__)
 
 
 class FeedbackListView(generics.ListCreateAPIView):
@@ -270,7 +274,8 @@ class FeedbackStatsView(generics.GenericAPIView):
     def get(self, request):
         try:
             user = request.user
-            print(f"Stats request from user: {user.username}, tenant: {getattr(user, 'tenant', None)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Stats request from user: %s, tenant: %s', user.username, getattr(user, 'tenant', None))
             
             # Base queryset - handle tenant filtering properly
             if user.is_platform_admin:
@@ -281,8 +286,8 @@ class FeedbackStatsView(generics.GenericAPIView):
                 # If user has no tenant, show all feedback (or you could show none)
                 queryset = Feedback.objects.all()
 
-            print(f"Queryset count: {queryset.count()}")
-            print(f"All feedback count: {Feedback.objects.count()}")
+            logger.debug('Queryset count: %s', lazy(queryset.count))
+            logger.debug('All feedback count: %s', lazy(Feedback.objects.count))
 
             # Calculate statistics with error handling
             total_feedback = queryset.count()
@@ -290,7 +295,7 @@ class FeedbackStatsView(generics.GenericAPIView):
             negative_feedback = queryset.filter(overall_rating__lte=2).count()
             neutral_feedback = queryset.filter(overall_rating=3).count()
             
-            print(f"Stats calculated: total={total_feedback}, positive={positive_feedback}, negative={negative_feedback}, neutral={neutral_feedback}")
+            logger.debug('Stats calculated: total=%s, positive=%s, negative=%s, neutral=%s', total_feedback, positive_feedback, negative_feedback, neutral_feedback)
             
             avg_overall_rating = queryset.aggregate(
                 avg_rating=Avg('overall_rating')
@@ -300,19 +305,19 @@ class FeedbackStatsView(generics.GenericAPIView):
             try:
                 feedback_by_category = dict(queryset.values_list('category').annotate(count=Count('id')))
             except Exception as e:
-                print(f"Error in category breakdown: {e}")
+                logger.error('Error in category breakdown: %s', e)
                 feedback_by_category = {}
                 
             try:
                 feedback_by_status = dict(queryset.values_list('status').annotate(count=Count('id')))
             except Exception as e:
-                print(f"Error in status breakdown: {e}")
+                logger.error('Error in status breakdown: %s', e)
                 feedback_by_status = {}
                 
             try:
                 feedback_by_sentiment = dict(queryset.values_list('sentiment').annotate(count=Count('id')))
             except Exception as e:
-                print(f"Error in sentiment breakdown: {e}")
+                logger.error('Error in sentiment breakdown: %s', e)
                 feedback_by_sentiment = {}
 
             # Recent feedback with error handling
@@ -329,7 +334,7 @@ class FeedbackStatsView(generics.GenericAPIView):
                     feedback.pop('client__first_name', None)
                     feedback.pop('client__last_name', None)
             except Exception as e:
-                print(f"Error in recent feedback: {e}")
+                logger.error('Error in recent feedback: %s', e)
                 recent_feedback = []
 
             # Top issues (negative feedback categories) with error handling
@@ -338,7 +343,7 @@ class FeedbackStatsView(generics.GenericAPIView):
                     count=Count('id')
                 ).order_by('-count')[:5])
             except Exception as e:
-                print(f"Error in top issues: {e}")
+                logger.error('Error in top issues: %s', e)
                 top_issues = []
 
             stats = {
@@ -358,9 +363,7 @@ class FeedbackStatsView(generics.GenericAPIView):
             return Response(serializer.data)
             
         except Exception as e:
-            print(f"Error in FeedbackStatsView: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error('Error in FeedbackStatsView: %s', e, exc_info=True)
             return Response(
                 {
                     'error': 'Failed to fetch feedback statistics',
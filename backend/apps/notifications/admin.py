@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification, NotificationSettings
+from .models import Notification, NotificationArchive, NotificationSettings
 
 
 @admin.register(Notification)
@@ -27,6 +27,20 @@ class NotificationAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ['title', 'type', 'user_id', 'tenant_id', 'status', 'created_at', 'archived_at']
+    list_filter = ['type', 'status']
+    search_fields = ['title', 'message']
+    date_hierarchy = 'created_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(NotificationSettings)
 class NotificationSettingsAdmin(admin.ModelAdmin):
     list_display = ['user', 'tenant', 'email_enabled', 'push_enabled', 'in_app_enabled']
@@ -122,6 +122,17 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             'notification_id': event['notification_id']
         }))
 
+    # Handler for bulk read/acknowledge events (notifications, announcements, messages)
+    async def read_delta(self, event):
+        """Receive a bulk read update"""
+        await self.send(text_data=json.dumps({
+            'type': 'read_delta',
+            'kind': event['kind'],
+            'ids': event['ids'],
+            'before': event['before'],
+            'unread_count': event['unread_count']
+        }))
+
     @database_sync_to_async
     def get_user(self, user_id):
         """Get user from database"""
@@ -0,0 +1,41 @@
+"""
+Move notifications past their retention TTL into NotificationArchive and purge
+old archive rows. Run daily, e.g.:
+  30 2 * * * python manage.py archive_notifications
+"""
+from django.core.management.base import BaseCommand
+
+from apps.notifications.retention import (
+    DEFAULT_BATCH_SIZE,
+    archive_expired_notifications,
+    purge_archived_notifications,
+)
+
+
+class Command(BaseCommand):
+    help = 'Archive expired notifications (per-type TTL) and purge the archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows moved per transaction (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be archived/purged')
+        parser.add_argument('--skip-purge', action='store_true', help='Do not purge the archive table')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        verb = 'Would archive' if dry_run else 'Archived'
+
+        summary = archive_expired_notifications(batch_size=batch_size, dry_run=dry_run)
+        for notif_type, count in sorted(summary.items()):
+            self.stdout.write(f'  {notif_type}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'{verb} {sum(summary.values())} notification(s).'))
+
+        if not options['skip_purge']:
+            purged = purge_archived_notifications(batch_size=batch_size, dry_run=dry_run)
+            verb = 'Would purge' if dry_run else 'Purged'
+            self.stdout.write(self.style.SUCCESS(f'{verb} {purged} archived notification(s).'))
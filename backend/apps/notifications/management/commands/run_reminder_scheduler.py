@@ -0,0 +1,50 @@
+"""
+Long-running appointment reminder scheduler.
+
+Sleeps until the next Appointment.reminder_due_at (capped by --max-sleep), then
+claims due reminders with SELECT ... FOR UPDATE SKIP LOCKED. Safe to run several
+instances at once. Run under systemd (deploy/utho/crm-reminder-scheduler.service)
+or docker-compose instead of the 15-minute cron job.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.notifications.reminders import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_SLEEP_SECONDS,
+    ReminderScheduler,
+)
+
+
+class Command(BaseCommand):
+    help = 'Run the in-process appointment reminder scheduler'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Appointments claimed per transaction (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--max-sleep',
+            type=int,
+            default=DEFAULT_MAX_SLEEP_SECONDS,
+            help=f'Maximum seconds between polls (default: {DEFAULT_MAX_SLEEP_SECONDS})',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Dispatch currently due reminders and exit',
+        )
+
+    def handle(self, *args, **options):
+        scheduler = ReminderScheduler(batch_size=options['batch_size'], max_sleep=options['max_sleep'])
+        if options['once']:
+            summary = scheduler.run_once()
+            self.stdout.write(self.style.SUCCESS(
+                f"Sent {summary['notifications']} reminder notification(s) for {summary['appointments']} appointment(s)."
+            ))
+            return
+        scheduler.install_signal_handlers()
+        self.stdout.write('Reminder scheduler running (Ctrl+C to stop)...')
+        scheduler.run()
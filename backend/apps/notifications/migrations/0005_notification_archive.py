@@ -0,0 +1,69 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0004_add_customer_appointment_notification_types"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("original_id", models.IntegerField(unique=True)),
+                ("type", models.CharField(max_length=50)),
+                ("title", models.CharField(max_length=255)),
+                ("message", models.TextField()),
+                ("priority", models.CharField(max_length=20)),
+                ("status", models.CharField(max_length=20)),
+                ("user_id", models.BigIntegerField()),
+                ("tenant_id", models.BigIntegerField()),
+                ("store_id", models.BigIntegerField(blank=True, null=True)),
+                ("action_url", models.CharField(blank=True, max_length=255, null=True)),
+                ("metadata", models.JSONField(blank=True, default=dict)),
+                ("created_at", models.DateTimeField()),
+                ("read_at", models.DateTimeField(blank=True, null=True)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["type", "created_at"], name="notificatio_type_8e213d_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationarchive",
+            index=models.Index(
+                fields=["tenant_id", "created_at"],
+                name="notificatio_tenant__dae701_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationarchive",
+            index=models.Index(
+                fields=["user_id", "created_at"], name="notificatio_user_id_a70371_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationarchive",
+            index=models.Index(
+                fields=["archived_at"], name="notificatio_archive_641f6a_idx"
+            ),
+        ),
+    ]
@@ -76,6 +76,7 @@ class Notification(models.Model):
             models.Index(fields=['tenant', 'status']),
             models.Index(fields=['store', 'status']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['type', 'created_at']),
         ]
     
     def __str__(self):
@@ -88,6 +89,42 @@ class Notification(models.Model):
         self.save()
 
 
+class NotificationArchive(models.Model):
+    """
+    Rolling archive for notifications past their retention TTL.
+
+    Rows are moved here in batches by the archive_notifications command so the
+    hot Notification table (and its indexes) only holds recent rows. References
+    are stored as plain ids: archived rows must not block or cascade user/store
+    deletes, and are themselves purged after NOTIFICATION_ARCHIVE_RETENTION_DAYS.
+    """
+    original_id = models.IntegerField(unique=True)
+    type = models.CharField(max_length=50)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    priority = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+    user_id = models.BigIntegerField()
+    tenant_id = models.BigIntegerField()
+    store_id = models.BigIntegerField(null=True, blank=True)
+    action_url = models.CharField(max_length=255, blank=True, null=True)
+    metadata = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['tenant_id', 'created_at']),
+            models.Index(fields=['user_id', 'created_at']),
+            models.Index(fields=['archived_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} (archived)"
+
+
 class NotificationSettings(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='user_notification_settings')
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='tenant_notification_settings')
@@ -0,0 +1,182 @@
+"""
+Appointment reminder scheduler.
+
+Reminders are driven by the indexed Appointment.reminder_due_at column instead of
+a periodic full scan. Each batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED,
+so several scheduler instances can run side by side without double-sending, and
+reminder_sent is flipped in the same transaction that inserts the notifications,
+which makes every claim idempotent.
+
+Entry points:
+  - dispatch_due_reminders(): send everything currently due (one-shot / cron)
+  - ReminderScheduler.run(): long-running loop that sleeps until the next due time
+"""
+import logging
+import signal
+import threading
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import Notification
+from .services import bulk_create_notifications
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_MAX_SLEEP_SECONDS = 60
+# Floor between iterations so rows held by another instance don't cause a busy loop
+MIN_SLEEP_SECONDS = 1
+
+
+def _pending_reminders(now):
+    """Appointments whose reminder is due and whose start time has not passed yet."""
+    from apps.clients.models import Appointment
+    lead = timedelta(minutes=Appointment.REMINDER_LEAD_MINUTES)
+    return Appointment.objects.filter(
+        reminder_sent=False,
+        reminder_due_at__lte=now,
+        reminder_due_at__gt=now - lead,
+        status__in=[Appointment.Status.SCHEDULED, Appointment.Status.CONFIRMED],
+        is_deleted=False,
+    )
+
+
+def build_reminder_notifications(appointment):
+    """Return unsaved reminder notifications for the assignee and creator of an appointment."""
+    client = appointment.client
+    store = client.store if client else None
+    first_name = (client.first_name if client else None) or 'Customer'
+    location = (appointment.location or (store.name if store else '')) or 'Store'
+
+    notifications = []
+    seen = set()
+    for user_id in (appointment.assigned_to_id, appointment.created_by_id):
+        if not user_id or user_id in seen:
+            continue
+        seen.add(user_id)
+        notifications.append(Notification(
+            user_id=user_id,
+            tenant_id=appointment.tenant_id,
+            store=store,
+            type='appointment_reminder',
+            title=f'Reminder: {first_name} in 1 hour',
+            message=f'Appointment at {appointment.time} — {location}. Tap to open.',
+            priority='high',
+            status='unread',
+            action_url=f'/appointments/{appointment.id}',
+            action_text='View Appointment',
+            is_persistent=False,
+            metadata={'appointment_id': appointment.id},
+        ))
+    return notifications
+
+
+def claim_due_reminders(now=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Claim up to batch_size due reminders and create their notifications.
+
+    Rows locked by another scheduler are skipped, so concurrent instances split
+    the work. Returns (appointments_claimed, notifications_created).
+    """
+    from apps.clients.models import Appointment
+    now = now or timezone.now()
+    with transaction.atomic():
+        appointments = list(
+            _pending_reminders(now)
+            .select_related('client__store')
+            .select_for_update(skip_locked=True, of=('self',))
+            .order_by('reminder_due_at')[:batch_size]
+        )
+        if not appointments:
+            return 0, 0
+
+        notifications = []
+        for appointment in appointments:
+            notifications.extend(build_reminder_notifications(appointment))
+        created = bulk_create_notifications(notifications)
+
+        Appointment.objects.filter(id__in=[a.id for a in appointments]).update(
+            reminder_sent=True,
+            reminder_date=now,
+        )
+    return len(appointments), len(created)
+
+
+def dispatch_due_reminders(now=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Send every reminder that is currently due, batch by batch. Returns a summary dict."""
+    now = now or timezone.now()
+    total_appointments = 0
+    total_notifications = 0
+    while True:
+        claimed, created = claim_due_reminders(now=now, batch_size=batch_size)
+        total_appointments += claimed
+        total_notifications += created
+        if claimed < batch_size:
+            break
+    return {'appointments': total_appointments, 'notifications': total_notifications}
+
+
+def next_reminder_due_at():
+    """Earliest reminder_due_at still waiting to fire, or None."""
+    from apps.clients.models import Appointment
+    return (
+        Appointment.objects.filter(
+            reminder_sent=False,
+            reminder_due_at__gt=timezone.now() - timedelta(minutes=Appointment.REMINDER_LEAD_MINUTES),
+            status__in=[Appointment.Status.SCHEDULED, Appointment.Status.CONFIRMED],
+            is_deleted=False,
+        )
+        .order_by('reminder_due_at')
+        .values_list('reminder_due_at', flat=True)
+        .first()
+    )
+
+
+class ReminderScheduler:
+    """
+    In-process scheduler loop: dispatch due reminders, then sleep until the next
+    due time (capped at max_sleep so newly created appointments are picked up).
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, max_sleep=DEFAULT_MAX_SLEEP_SECONDS):
+        self.batch_size = batch_size
+        self.max_sleep = max_sleep
+        self._stop = threading.Event()
+
+    def stop(self, *args):
+        self._stop.set()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def seconds_until_next_run(self):
+        next_due = next_reminder_due_at()
+        if next_due is None:
+            return self.max_sleep
+        delay = (next_due - timezone.now()).total_seconds()
+        return max(MIN_SLEEP_SECONDS, min(delay, self.max_sleep))
+
+    def run_once(self):
+        close_old_connections()
+        summary = dispatch_due_reminders(batch_size=self.batch_size)
+        if summary['appointments']:
+            logger.info(
+                "Sent %s reminder notification(s) for %s appointment(s)",
+                summary['notifications'], summary['appointments'],
+            )
+        return summary
+
+    def run(self):
+        logger.info("Reminder scheduler started (batch_size=%s, max_sleep=%ss)", self.batch_size, self.max_sleep)
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+                delay = self.seconds_until_next_run()
+            except Exception as e:
+                logger.error("Reminder scheduler iteration failed: %s", e, exc_info=True)
+                delay = self.max_sleep
+            self._stop.wait(delay)
+        logger.info("Reminder scheduler stopped")
@@ -0,0 +1,109 @@
+"""
+Notification retention.
+
+Every customer create/update, appointment and task writes notification rows, so
+the hot table only grows. This module moves rows past their per-type TTL into
+NotificationArchive in small batches (copy + delete in one transaction) and
+purges the archive after its own TTL. List endpoints only read the last few
+days, so they keep hitting a small table and small indexes.
+
+TTLs come from settings:
+  NOTIFICATION_RETENTION_DAYS = {'default': 30, 'appointment_reminder': 7, ...}
+  NOTIFICATION_ARCHIVE_RETENTION_DAYS = 365
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Notification, NotificationArchive
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_ARCHIVE_RETENTION_DAYS = 365
+
+ARCHIVED_FIELDS = [
+    'id', 'type', 'title', 'message', 'priority', 'status', 'user_id', 'tenant_id',
+    'store_id', 'action_url', 'metadata', 'created_at', 'read_at',
+]
+
+
+def get_retention_policy():
+    """Return {notification_type: ttl_days} for every known type, applying the 'default' entry."""
+    configured = dict(getattr(settings, 'NOTIFICATION_RETENTION_DAYS', {}) or {})
+    default_days = configured.pop('default', DEFAULT_RETENTION_DAYS)
+    policy = {notif_type: default_days for notif_type, _ in Notification.NOTIFICATION_TYPES}
+    policy.update(configured)
+    return policy
+
+
+def _archive_batch(notif_type, cutoff, batch_size):
+    """Move one batch of expired rows of a type into the archive. Returns rows moved."""
+    with transaction.atomic():
+        rows = list(
+            Notification.objects.filter(type=notif_type, created_at__lt=cutoff, is_persistent=False)
+            .select_for_update(skip_locked=True)
+            .order_by('created_at')
+            .values(*ARCHIVED_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        ids = [row['id'] for row in rows]
+        # ignore_conflicts: a row already archived by an interrupted run is simply deleted
+        NotificationArchive.objects.bulk_create(
+            [NotificationArchive(original_id=row.pop('id'), **row) for row in rows],
+            ignore_conflicts=True,
+        )
+        Notification.objects.filter(id__in=ids).delete()
+    return len(ids)
+
+
+def archive_expired_notifications(now=None, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Archive notifications older than their type's TTL.
+
+    Returns {notification_type: count} of rows archived (or that would be, for dry_run).
+    """
+    now = now or timezone.now()
+    summary = {}
+    for notif_type, ttl_days in get_retention_policy().items():
+        if ttl_days is None:
+            continue
+        cutoff = now - timedelta(days=ttl_days)
+        if dry_run:
+            count = Notification.objects.filter(type=notif_type, created_at__lt=cutoff, is_persistent=False).count()
+        else:
+            count = 0
+            while True:
+                moved = _archive_batch(notif_type, cutoff, batch_size)
+                count += moved
+                if moved < batch_size:
+                    break
+        if count:
+            summary[notif_type] = count
+            logger.info("Archived %s '%s' notification(s) older than %s day(s)", count, notif_type, ttl_days)
+    return summary
+
+
+def purge_archived_notifications(now=None, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Delete archived notifications past NOTIFICATION_ARCHIVE_RETENTION_DAYS. Returns rows deleted."""
+    now = now or timezone.now()
+    days = getattr(settings, 'NOTIFICATION_ARCHIVE_RETENTION_DAYS', DEFAULT_ARCHIVE_RETENTION_DAYS)
+    cutoff = now - timedelta(days=days)
+    expired = NotificationArchive.objects.filter(created_at__lt=cutoff)
+    if dry_run:
+        return expired.count()
+    total = 0
+    while True:
+        ids = list(expired.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        deleted, _ = NotificationArchive.objects.filter(id__in=ids).delete()
+        total += deleted
+    if total:
+        logger.info("Purged %s archived notification(s) older than %s day(s)", total, days)
+    return total
@@ -6,6 +6,7 @@ Role-based recipients follow NOTIFICATION_TEMPLATES.md: strict tenant isolation,
 creator, manager of creator, business admin (same tenant only). No cross-tenant.
 """
 import logging
+from django.db import transaction
 from .models import Notification
 
 logger = logging.getLogger(__name__)
@@ -106,3 +107,77 @@ def create_push_notification(
     except Exception as e:
         logger.warning("create_push_notification failed for user %s: %s", getattr(user, 'id', None), e)
         return None
+
+
+def bulk_create_notifications(notifications, batch_size=500):
+    """
+    Insert many unsaved Notification instances in one statement per batch and
+    deliver them (WebSocket + Web Push) once the surrounding transaction commits.
+
+    bulk_create skips post_save, so delivery is triggered explicitly here.
+    Returns the created notifications.
+    """
+    if not notifications:
+        return []
+    created = Notification.objects.bulk_create(notifications, batch_size=batch_size)
+
+    def _deliver():
+        from .signals import deliver_notification
+        for notification in created:
+            try:
+                deliver_notification(notification)
+            except Exception as e:
+                logger.warning("Delivery failed for notification %s: %s", notification.id, e)
+
+    transaction.on_commit(_deliver)
+    return created
+
+
+def parse_read_selection(data):
+    """
+    Items a bulk read/acknowledge request selects: {'ids': [...]} or {'before': <ISO datetime>}.
+    Returns (ids, before); raises ValueError when neither (or something unparsable) is given.
+    """
+    from django.utils import timezone
+    from django.utils.dateparse import parse_datetime
+
+    ids, before = data.get('ids'), data.get('before')
+    if ids:
+        if not isinstance(ids, list):
+            raise ValueError('ids must be a list')
+        try:
+            return sorted({int(item_id) for item_id in ids}), None
+        except (TypeError, ValueError):
+            raise ValueError('ids must be integers')
+    if before:
+        parsed = parse_datetime(str(before))
+        if parsed is None:
+            raise ValueError('before must be an ISO 8601 datetime')
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return None, parsed
+    raise ValueError('Provide ids or before')
+
+
+def broadcast_read_delta(user_id, kind, ids=None, before=None, unread_count=None):
+    """
+    Tell the user's open sessions (WebSocket) that items were read in bulk, once
+    the transaction commits: one 'read_delta' event instead of one per item.
+    """
+    event = {
+        'type': 'read_delta',
+        'kind': kind,
+        'ids': ids,
+        'before': before.isoformat() if before else None,
+        'unread_count': unread_count,
+    }
+
+    def _send():
+        try:
+            from asgiref.sync import async_to_sync
+            from channels.layers import get_channel_layer
+            async_to_sync(get_channel_layer().group_send)(f'notifications_user_{user_id}', event)
+        except Exception as e:
+            logger.warning("Read delta broadcast failed for user %s (Redis may be down): %s", user_id, e)
+
+    transaction.on_commit(_send)
@@ -14,6 +14,16 @@ def broadcast_notification(sender, instance, created, **kwargs):
     """Broadcast notification via WebSocket when created and send Web Push for all priorities."""
     if not created:
         return
+    deliver_notification(instance)
+
+
+def deliver_notification(instance):
+    """
+    Fan a saved notification out over WebSocket and Web Push.
+
+    Called from post_save for single creates, and explicitly for rows written with
+    bulk_create (which does not fire post_save), e.g. by the reminder scheduler.
+    """
     # Guard: avoid AttributeError if user was deleted or FK is stale
     user_id = getattr(instance, 'user_id', None)
     if not user_id or not getattr(instance, 'user', None):
@@ -0,0 +1,155 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.clients.models import Appointment, Client
+from apps.stores.models import Store
+from apps.tenants.models import Tenant
+from .models import Notification, NotificationArchive
+from .reminders import dispatch_due_reminders
+from .retention import archive_expired_notifications
+
+User = get_user_model()
+
+
+class AppointmentReminderSchedulerTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store = Store.objects.create(
+            name="Main Store",
+            code="MS001",
+            address="123 Test St",
+            city="Test City",
+            state="Test State",
+            tenant=self.tenant,
+        )
+        self.sales_user = User.objects.create_user(
+            username="sales",
+            password="testpass123",
+            role=User.Role.INHOUSE_SALES,
+            tenant=self.tenant,
+            store=self.store,
+        )
+        self.manager_user = User.objects.create_user(
+            username="manager",
+            password="testpass123",
+            role=User.Role.MANAGER,
+            tenant=self.tenant,
+            store=self.store,
+        )
+        self.client_obj = Client.objects.create(
+            first_name="John",
+            phone="1234567890",
+            tenant=self.tenant,
+            store=self.store,
+        )
+
+    def _appointment_starting_in(self, minutes):
+        start = timezone.localtime(timezone.now() + timedelta(minutes=minutes))
+        return Appointment.objects.create(
+            client=self.client_obj,
+            tenant=self.tenant,
+            date=start.date(),
+            time=start.time().replace(microsecond=0),
+            purpose="Ring fitting",
+            assigned_to=self.sales_user,
+            created_by=self.manager_user,
+        )
+
+    def test_reminder_due_at_tracks_appointment_start(self):
+        appointment = self._appointment_starting_in(180)
+        start = timezone.make_aware(timezone.datetime.combine(appointment.date, appointment.time))
+        self.assertEqual(appointment.reminder_due_at, start - timedelta(minutes=Appointment.REMINDER_LEAD_MINUTES))
+
+    def test_due_reminders_are_sent_once(self):
+        due = self._appointment_starting_in(55)
+        later = self._appointment_starting_in(180)
+
+        summary = dispatch_due_reminders()
+
+        self.assertEqual(summary, {'appointments': 1, 'notifications': 2})
+        self.assertEqual(
+            set(Notification.objects.filter(type='appointment_reminder').values_list('user_id', flat=True)),
+            {self.sales_user.id, self.manager_user.id},
+        )
+        due.refresh_from_db()
+        later.refresh_from_db()
+        self.assertTrue(due.reminder_sent)
+        self.assertFalse(later.reminder_sent)
+
+        # A second pass (e.g. another scheduler instance) must not re-send
+        self.assertEqual(dispatch_due_reminders(), {'appointments': 0, 'notifications': 0})
+
+    def test_started_appointments_are_skipped(self):
+        self._appointment_starting_in(-5)
+        self.assertEqual(dispatch_due_reminders(), {'appointments': 0, 'notifications': 0})
+
+
+@override_settings(NOTIFICATION_RETENTION_DAYS={'default': 30, 'appointment_reminder': 7})
+class NotificationRetentionTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.user = User.objects.create_user(username="admin", password="testpass123", tenant=self.tenant)
+
+    def _notification(self, notif_type, age_days, **kwargs):
+        notification = Notification.objects.create(
+            user=self.user, tenant=self.tenant, type=notif_type, title=notif_type, message='m', **kwargs
+        )
+        Notification.objects.filter(id=notification.id).update(created_at=timezone.now() - timedelta(days=age_days))
+        return notification
+
+    def test_expired_rows_move_to_archive_per_type_ttl(self):
+        old_reminder = self._notification('appointment_reminder', 10)
+        recent_customer = self._notification('new_customer', 10)
+        old_customer = self._notification('new_customer', 40)
+        self._notification('announcement', 40, is_persistent=True)
+
+        summary = archive_expired_notifications(batch_size=1)
+
+        self.assertEqual(summary, {'appointment_reminder': 1, 'new_customer': 1})
+        self.assertEqual(
+            set(Notification.objects.values_list('type', flat=True)),
+            {'new_customer', 'announcement'},
+        )
+        self.assertTrue(Notification.objects.filter(id=recent_customer.id).exists())
+        self.assertEqual(
+            set(NotificationArchive.objects.values_list('original_id', flat=True)),
+            {old_reminder.id, old_customer.id},
+        )
+
+
+class BulkMarkAsReadTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.user = User.objects.create_user(
+            username="sales", password="testpass123", role=User.Role.INHOUSE_SALES, tenant=self.tenant,
+        )
+        self.notifications = [
+            Notification.objects.create(user=self.user, tenant=self.tenant, type='new_customer', title=str(i), message='m')
+            for i in range(5)
+        ]
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_ids_are_marked_in_one_update_with_one_event(self):
+        ids = [n.id for n in self.notifications[:3]]
+        self.notifications[2].mark_as_read()
+        with patch('apps.notifications.views.broadcast_read_delta') as broadcast:
+            response = self.api.post('/api/notifications/bulk_mark_as_read/', {'ids': ids + [999999]}, format='json')
+
+        self.assertEqual((response.data['count'], response.data['unread_count']), (2, 2))
+        broadcast.assert_called_once_with(self.user.id, 'notification', ids=ids[:2], before=None, unread_count=2)
+        self.assertEqual(set(Notification.objects.filter(status='read').values_list('id', flat=True)), set(ids))
+
+    def test_mark_all_recounts_what_is_left_unread(self):
+        # Arrives while the request runs (created after its cut-off)
+        Notification.objects.filter(pk=self.notifications[0].pk).update(created_at=timezone.now() + timedelta(minutes=1))
+        with patch('apps.notifications.views.broadcast_read_delta') as broadcast:
+            response = self.api.post('/api/notifications/mark_all_as_read/')
+
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(broadcast.call_args.kwargs['unread_count'], 1)
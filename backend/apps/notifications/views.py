@@ -7,7 +7,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.utils import timezone
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.conf import settings
 from apps.users.middleware import ScopedVisibilityMiddleware
@@ -16,6 +16,7 @@ from .serializers import (
     NotificationSerializer, NotificationSettingsSerializer,
     NotificationCreateSerializer, NotificationUpdateSerializer
 )
+from .services import broadcast_read_delta, parse_read_selection
 
 
 def _vapid_public_key_to_base64url(key_value: str) -> str:
@@ -96,8 +97,8 @@ class NotificationViewSet(viewsets.ModelViewSet):
         if not user.is_authenticated:
             return Notification.objects.none()
         
-        # Get last 7 days of notifications (more reasonable than just today)
-        days_back = 7
+        # Only the hot window is listed; older rows are archived by archive_notifications
+        days_back = getattr(settings, 'NOTIFICATION_HOT_DAYS', 7)
         date_start = timezone.now() - timedelta(days=days_back)
         
         # Base queryset with date filter (last 7 days)
@@ -150,12 +151,34 @@ class NotificationViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['post'])
     def mark_all_as_read(self, request):
-        queryset = self.get_queryset()
-        queryset.filter(status='unread').update(
-            status='read',
-            read_at=timezone.now()
-        )
-        return Response({'status': 'success'})
+        unread = self.get_queryset().filter(status='unread')
+        before = timezone.now()
+        updated = unread.filter(created_at__lte=before).update(status='read', read_at=before)
+        if updated:
+            # Notifications created meanwhile are still unread: recount instead of assuming zero
+            broadcast_read_delta(request.user.id, 'notification', before=before, unread_count=unread.count())
+        return Response({'status': 'success', 'count': updated})
+    
+    @action(detail=False, methods=['post'])
+    def bulk_mark_as_read(self, request):
+        """Mark notifications as read in one UPDATE: {'ids': [...]} or {'before': <ISO datetime>}."""
+        try:
+            ids, before = parse_read_selection(request.data)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        unread = self.get_queryset().filter(status='unread')
+        if ids is not None:
+            with transaction.atomic():
+                # Broadcast only what this request flipped: not other users' ids, already read or hidden ones
+                ids = list(unread.filter(id__in=ids).select_for_update().order_by('id').values_list('id', flat=True))
+                updated = Notification.objects.filter(id__in=ids).update(status='read', read_at=timezone.now())
+        else:
+            updated = unread.filter(created_at__lte=before).update(status='read', read_at=timezone.now())
+        remaining = unread.count()
+        if updated:
+            broadcast_read_delta(request.user.id, 'notification', ids=ids, before=before, unread_count=remaining)
+        return Response({'status': 'success', 'count': updated, 'unread_count': remaining})
     
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
@@ -1,3 +1,27 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.tenants.models import Tenant
+from .models import Category
+
+
+class PublicCatalogueConditionalTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.category = Category.objects.create(name="Rings", tenant=self.tenant, scope='global')
+        self.url = '/api/products/public/test-business/categories/'
+
+    def test_unchanged_catalogue_returns_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+        etag = response['ETag']
+
+        with self.assertNumQueries(3):  # tenant lookup + category and product stamps
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.category.name = "Bangles"
+        self.category.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['name'], "Bangles")
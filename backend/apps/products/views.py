@@ -20,6 +20,11 @@ from .serializers import (
 )
 from apps.users.permissions import IsRoleAllowed
 from apps.tenants.models import Tenant
+import logging
+from core.conditional import PUBLIC_CACHE_CONTROL, ConditionalListMixin
+from core.logging_utils import get_logger, lazy
+
+logger = get_logger(__name__)
 
 
 def apply_product_visibility_filter(queryset, user):
@@ -27,39 +32,39 @@ def apply_product_visibility_filter(queryset, user):
     Apply role-based visibility filtering for products.
     Business admins see all products, others see their store products + global products.
     """
-    print(f"🔍 apply_product_visibility_filter:")
-    print(f"  User role: {user.role}")
-    print(f"  User store: {user.store}")
-    print(f"  Input queryset count: {queryset.count()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('apply_product_visibility_filter: User role: %s, User store: %s, Input queryset count: %s', user.role, user.store, queryset.count())
     
     if user.role == 'business_admin':
         # Business admin sees all products (global + store-specific)
-        print(f"  Business admin - returning all products")
+        logger.debug('Business admin - returning all products')
         return queryset
     elif user.role == 'manager':
         # Store manager sees their store products + global products
         if user.store:
             filtered = queryset.filter(Q(store=user.store) | Q(scope='global'))
-            print(f"  Manager with store - filtering by store {user.store} or global scope")
-            print(f"  Filtered count: {filtered.count()}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Manager with store - filtering by store %s or global scope', user.store)
+            logger.debug('Filtered count: %s', lazy(filtered.count))
             return filtered
         else:
             filtered = queryset.filter(scope='global')
-            print(f"  Manager without store - showing only global products")
-            print(f"  Filtered count: {filtered.count()}")
+            logger.debug('Manager without store - showing only global products')
+            logger.debug('Filtered count: %s', lazy(filtered.count))
             return filtered
     else:
         # Other users (sales, telecaller, marketing) see their store products + global products
         if user.store:
             filtered = queryset.filter(Q(store=user.store) | Q(scope='global'))
-            print(f"  Sales user with store - filtering by store {user.store} or global scope")
-            print(f"  Filtered count: {filtered.count()}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Sales user with store - filtering by store %s or global scope', user.store)
+            logger.debug('Filtered count: %s', lazy(filtered.count))
             return filtered
         else:
             # If user has no store assigned, show only global products
             filtered = queryset.filter(scope='global')
-            print(f"  Sales user without store - showing only global products")
-            print(f"  Filtered count: {filtered.count()}")
+            logger.debug('Sales user without store - showing only global products')
+            logger.debug('Filtered count: %s', lazy(filtered.count))
             return filtered
 
 
@@ -80,29 +85,26 @@ class ProductListView(generics.ListAPIView):
         queryset = Product.objects.filter(tenant=user.tenant)
         
         # Debug logging
-        print(f"🔍 ProductListView Debug:")
-        print(f"  User: {user.username} (Role: {user.role})")
-        print(f"  Store: {user.store}")
-        print(f"  Tenant: {user.tenant}")
-        print(f"  Total products in tenant: {queryset.count()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('ProductListView Debug: User: %s (Role: %s), Store: %s, Tenant: %s, Total products in tenant: %s', user.username, user.role, user.store, user.tenant, queryset.count())
         
         # Filter by scope first - this overrides role-based filtering
         scope_filter = self.request.query_params.get('scope')
         if scope_filter == 'all':
             # When scope='all' is requested, show all products regardless of role
-            print(f"  Scope filter: 'all' - showing all products")
+            logger.debug("Scope filter: 'all' - showing all products")
             pass
         elif scope_filter == 'global':
             queryset = queryset.filter(scope='global')
-            print(f"  Scope filter: 'global' - showing only global products")
+            logger.debug("Scope filter: 'global' - showing only global products")
         elif scope_filter == 'store':
             queryset = queryset.filter(scope='store')
-            print(f"  Scope filter: 'store' - showing only store products")
+            logger.debug("Scope filter: 'store' - showing only store products")
         else:
             # Apply scoped visibility based on user role when no specific scope is requested
-            print(f"  No scope filter - applying role-based visibility")
+            logger.debug('No scope filter - applying role-based visibility')
             queryset = apply_product_visibility_filter(queryset, user)
-            print(f"  After role-based filtering: {queryset.count()} products")
+            logger.debug('After role-based filtering: %s products', lazy(queryset.count))
         
         # Filter by status
         status_filter = self.request.query_params.get('status')
@@ -138,11 +140,11 @@ class ProductCreateView(generics.CreateAPIView):
     parser_classes = [JSONParser, MultiPartParser, FormParser]  # JSONParser first for JSON requests
     
     def create(self, request, *args, **kwargs):
-        print(f"🔵 ProductCreateView - Request data: {request.data}")
-        print(f"🔵 ProductCreateView - Content type: {request.content_type}")
+        logger.debug('ProductCreateView - Request data: %s', request.data)
+        logger.debug('ProductCreateView - Content type: %s', request.content_type)
         serializer = self.get_serializer(data=request.data)
         if not serializer.is_valid():
-            print(f"🔴 ProductCreateView - Validation errors: {serializer.errors}")
+            logger.warning('ProductCreateView - Validation errors: %s', serializer.errors)
             return Response({'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
         self.perform_create(serializer)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -259,12 +261,16 @@ class ProductStatsView(generics.GenericAPIView):
         })
 
 
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(ConditionalListMixin, generics.ListAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated, IsRoleAllowed.for_roles(['business_admin', 'manager', 'inhouse_sales', 'tele_calling', 'marketing'])]
     pagination_class = None  # Disable pagination for categories
     
+    def get_conditional_querysets(self):
+        # product_count is serialised, so product writes change the response too
+        return [self.get_queryset(), Product.objects.filter(tenant=self.request.user.tenant)]
+
     def get_queryset(self):
         user = self.request.user
         queryset = Category.objects.filter(tenant=user.tenant)
@@ -740,12 +746,17 @@ class ProductsByCategoryView(generics.ListAPIView):
         return queryset.order_by('-created_at')
 
 
-class PublicProductListView(generics.ListAPIView):
+class PublicProductListView(ConditionalListMixin, generics.ListAPIView):
     """Public endpoint for viewing products by tenant/store slug"""
     serializer_class = ProductListSerializer
     permission_classes = [AllowAny]
     pagination_class = CustomProductPagination
+    conditional_cache_control = PUBLIC_CACHE_CONTROL
     
+    def get_conditional_querysets(self):
+        # category_name is serialised, so category writes change the response too
+        return [self.get_queryset(), Category.objects.filter(tenant__slug=self.kwargs.get('tenant_code'))]
+
     def get_queryset(self):
         # Get tenant/store slug from URL parameter
         tenant_slug = self.kwargs.get('tenant_code')
@@ -775,12 +786,16 @@ class PublicProductListView(generics.ListAPIView):
         return queryset.order_by('-created_at')
 
 
-class PublicCategoryListView(generics.ListAPIView):
+class PublicCategoryListView(ConditionalListMixin, generics.ListAPIView):
     """Public endpoint for viewing categories by tenant/store slug"""
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
     pagination_class = None
+    conditional_cache_control = PUBLIC_CACHE_CONTROL
     
+    def get_conditional_querysets(self):
+        return [self.get_queryset(), Product.objects.filter(tenant__slug=self.kwargs.get('tenant_code'))]
+
     def get_queryset(self):
         # Get tenant/store slug from URL parameter
         tenant_slug = self.kwargs.get('tenant_code')
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:47
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def attribute_existing_rows(apps, schema_editor):
+    """Attribute existing sales and deals to the client's store, else the sales representative's."""
+    Client = apps.get_model('clients', 'Client')
+    User = apps.get_model('users', 'User')
+    for model_name in ('Sale', 'SalesPipeline'):
+        model = apps.get_model('sales', model_name)
+        model.objects.update(store_id=Coalesce(
+            Subquery(Client.objects.filter(pk=OuterRef('client_id')).values('store_id')[:1]),
+            Subquery(User.objects.filter(pk=OuterRef('sales_representative_id')).values('store_id')[:1]),
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stores", "0002_store_tenant"),
+        ("sales", "0004_remove_salespipeline_sale"),
+        ("clients", "0038_appointment_reminder_due_at"),
+        ("users", "0005_alter_user_phone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sale",
+            name="store",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Store the sale counts towards: the client's store, else the sales representative's",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="attributed_sales",
+                to="stores.store",
+            ),
+        ),
+        migrations.AddField(
+            model_name="salespipeline",
+            name="store",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Store the deal counts towards: the client's store, else the sales representative's",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="attributed_pipelines",
+                to="stores.store",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sale",
+            index=models.Index(
+                fields=["store", "created_at"], name="sale_store_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="salespipeline",
+            index=models.Index(
+                fields=["store", "stage"], name="pipeline_store_stage_idx"
+            ),
+        ),
+        migrations.RunPython(attribute_existing_rows, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,41 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from core.snapshots import stored_values, tracking_save
+
+
+def _attribute_store(instance, save_kwargs):
+    """
+    Keep instance.store (the store a sale or deal is attributed to) in sync
+    with its client and sales representative, so store reports can filter on
+    one indexed column instead of OR-ing across both joins.
+    """
+    update_fields = save_kwargs.get('update_fields')
+    if update_fields is not None:
+        if not {'client', 'client_id', 'sales_representative', 'sales_representative_id'} & set(update_fields):
+            return
+        save_kwargs['update_fields'] = set(update_fields) | {'store'}
+    stored = stored_values(instance, 'client_id', 'sales_representative_id', 'store_id')
+    if stored and stored['client_id'] == instance.client_id \
+            and stored['sales_representative_id'] == instance.sales_representative_id:
+        # Client and representative moves re-attribute their rows themselves
+        instance.store_id = stored['store_id']
+        return
+    instance.store_id = (
+        _related_store_id(instance, 'client') or _related_store_id(instance, 'sales_representative')
+    )
+
+
+def _related_store_id(instance, name):
+    """store_id of a related client or representative, without loading the whole row."""
+    field = instance._meta.get_field(name)
+    related_id = getattr(instance, field.attname)
+    if related_id is None:
+        return None
+    if field.is_cached(instance):
+        return getattr(instance, name).store_id
+    return field.related_model._base_manager.filter(pk=related_id).values_list('store_id', flat=True).first()
+
 
 class Sale(models.Model):
     """
@@ -72,6 +107,14 @@ class Sale(models.Model):
         on_delete=models.CASCADE,
         related_name='sales'
     )
+    store = models.ForeignKey(
+        'stores.Store',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='attributed_sales',
+        help_text=_("Store the sale counts towards: the client's store, else the sales representative's")
+    )
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -83,10 +126,18 @@ class Sale(models.Model):
         verbose_name = _('Sale')
         verbose_name_plural = _('Sales')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['store', 'created_at'], name='sale_store_created_idx'),
+        ]
 
     def __str__(self):
         return f"Order #{self.order_number} - {self.client.full_name}"
 
+    def save(self, *args, **kwargs):
+        with tracking_save(self):
+            _attribute_store(self, kwargs)
+            return super().save(*args, **kwargs)
+
     @property
     def remaining_amount(self):
         return self.total_amount - self.paid_amount
@@ -226,6 +277,14 @@ class SalesPipeline(models.Model):
         on_delete=models.CASCADE,
         related_name='pipelines'
     )
+    store = models.ForeignKey(
+        'stores.Store',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='attributed_pipelines',
+        help_text=_("Store the deal counts towards: the client's store, else the sales representative's")
+    )
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -235,10 +294,18 @@ class SalesPipeline(models.Model):
         verbose_name = _('Sales Pipeline')
         verbose_name_plural = _('Sales Pipelines')
         ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['store', 'stage'], name='pipeline_store_stage_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.client.full_name}"
 
+    def save(self, *args, **kwargs):
+        with tracking_save(self):
+            _attribute_store(self, kwargs)
+            return super().save(*args, **kwargs)
+
     @property
     def is_closed(self):
         return self.stage in [self.Stage.CLOSED_WON, self.Stage.CLOSED_LOST]
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from .models import Sale, SaleItem, SalesPipeline
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 class SaleSerializer(serializers.ModelSerializer):
@@ -91,18 +94,18 @@ class SalesPipelineSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         """Create pipeline with proper client assignment"""
-        print(f"SalesPipelineSerializer.create called with: {validated_data}")
+        logger.debug('SalesPipelineSerializer.create called with: %s', validated_data)
         client_id = validated_data.pop('client_id', None)
-        print(f"Client ID: {client_id}")
+        logger.debug('Client ID: %s', client_id)
         if client_id:
             from apps.clients.models import Client
             try:
                 validated_data['client'] = Client.objects.get(id=client_id)
-                print(f"Client found: {validated_data['client']}")
+                logger.debug('Client found: %s', validated_data['client'])
             except Client.DoesNotExist:
-                print(f"Client with ID {client_id} not found")
+                logger.warning('Client with ID %s not found', client_id)
                 raise serializers.ValidationError({"client_id": "Client not found."})
         else:
-            print("No client_id provided")
+            logger.debug('No client_id provided')
             raise serializers.ValidationError({"client_id": "Client is required."})
         return super().create(validated_data)
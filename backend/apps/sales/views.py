@@ -10,6 +10,10 @@ from .models import Sale, SaleItem, SalesPipeline
 from .serializers import SaleSerializer, SaleItemSerializer, SalesPipelineSerializer
 from apps.users.middleware import ScopedVisibilityMixin
 from apps.core.mixins import GlobalDateFilterMixin
+import logging
+from core.logging_utils import get_logger, lazy
+
+logger = get_logger(__name__)
 
 
 class SaleListView(generics.ListAPIView, ScopedVisibilityMixin, GlobalDateFilterMixin):
@@ -89,12 +93,12 @@ class SalesPipelineListView(generics.ListAPIView, ScopedVisibilityMixin, GlobalD
     
     def get_queryset(self):
         """Filter pipelines by user scope and add search/filtering"""
-        print("=== SalesPipelineListView.get_queryset called ===")
-        print(f"User: {self.request.user.username}, Role: {getattr(self.request.user, 'role', 'No role')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('SalesPipelineListView.get_queryset called: User: %s, Role: %s', self.request.user.username, getattr(self.request.user, 'role', 'No role'))
         
         # Use scoped visibility middleware
         queryset = self.get_scoped_queryset(SalesPipeline)
-        print(f"After scoped filtering: {queryset.count()} pipelines")
+        logger.debug('After scoped filtering: %s pipelines', lazy(queryset.count))
         
         # Apply global date filtering by updated_at so updated customers show in current month
         queryset = self.get_date_filtered_queryset(queryset, 'updated_at')
@@ -121,7 +125,7 @@ class SalesPipelineListView(generics.ListAPIView, ScopedVisibilityMixin, GlobalD
         # Optimize queries by prefetching related data
         queryset = queryset.select_related('client', 'sales_representative').prefetch_related('client__interests__category', 'client__interests__product')
         
-        print(f"Final queryset count: {queryset.count()}")
+        logger.debug('Final queryset count: %s', lazy(queryset.count))
         return queryset.order_by('-updated_at')
 
 
@@ -132,15 +136,15 @@ class MySalesPipelineListView(generics.ListAPIView):
     
     def get_queryset(self):
         """Filter pipelines to only show those assigned to the current user"""
-        print("=== MySalesPipelineListView.get_queryset called ===")
-        print(f"User: {self.request.user.username}, Role: {getattr(self.request.user, 'role', 'No role')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('MySalesPipelineListView.get_queryset called: User: %s, Role: %s', self.request.user.username, getattr(self.request.user, 'role', 'No role'))
         
         # Filter to only show pipelines assigned to the current user
         queryset = SalesPipeline.objects.filter(
             sales_representative=self.request.user,
             tenant=self.request.user.tenant
         )
-        print(f"My pipelines count: {queryset.count()}")
+        logger.debug('My pipelines count: %s', lazy(queryset.count))
         
         # Search by title or client name
         search = self.request.query_params.get('search', None)
@@ -167,7 +171,7 @@ class MySalesPipelineListView(generics.ListAPIView):
         # Optimize queries by prefetching related data
         queryset = queryset.select_related('client', 'sales_representative').prefetch_related('client__interests__category', 'client__interests__product')
         
-        print(f"Final my pipelines count: {queryset.count()}")
+        logger.debug('Final my pipelines count: %s', lazy(queryset.count))
         return queryset.order_by('-updated_at')
 
 
@@ -178,15 +182,15 @@ class MySalesPipelineDetailView(generics.RetrieveAPIView):
     
     def get_queryset(self):
         """Filter pipelines to only show those assigned to the current user"""
-        print("=== MySalesPipelineDetailView.get_queryset called ===")
-        print(f"User: {self.request.user.username}, Role: {getattr(self.request.user, 'role', 'No role')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('MySalesPipelineDetailView.get_queryset called: User: %s, Role: %s', self.request.user.username, getattr(self.request.user, 'role', 'No role'))
         
         # Filter to only show pipelines assigned to the current user
         queryset = SalesPipeline.objects.filter(
             sales_representative=self.request.user,
             tenant=self.request.user.tenant
         )
-        print(f"My pipeline detail count: {queryset.count()}")
+        logger.debug('My pipeline detail count: %s', lazy(queryset.count))
         return queryset
 
 
@@ -198,16 +202,14 @@ class SalesPipelineCreateView(generics.CreateAPIView):
     def perform_create(self, serializer):
         """Set tenant and sales representative"""
         try:
-            print(f"Creating pipeline with data: {serializer.validated_data}")
+            logger.debug('Creating pipeline with data: %s', serializer.validated_data)
             pipeline = serializer.save(
                 tenant=self.request.user.tenant,
                 sales_representative=self.request.user
             )
-            print(f"Pipeline created successfully: {pipeline.id}")
+            logger.debug('Pipeline created successfully: %s', pipeline.id)
         except Exception as e:
-            print(f"Error creating pipeline: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error('Error creating pipeline: %s', str(e), exc_info=True)
             raise
 
 
@@ -277,13 +279,12 @@ class PipelineStatsView(generics.GenericAPIView, ScopedVisibilityMixin):
     
     def get(self, request):
         try:
-            print(f"=== PipelineStatsView.get called ===")
-            print(f"User: {request.user.username}, Role: {getattr(request.user, 'role', 'No role')}")
-            print(f"Store: {getattr(request.user, 'store', 'No store')}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('PipelineStatsView.get called: User: %s, Role: %s, Store: %s', request.user.username, getattr(request.user, 'role', 'No role'), getattr(request.user, 'store', 'No store'))
             
             # Get scoped queryset for pipelines
             pipelines = self.get_scoped_queryset(SalesPipeline)
-            print(f"Scoped pipelines count: {pipelines.count()}")
+            logger.debug('Scoped pipelines count: %s', lazy(pipelines.count))
             
             # Calculate statistics
             active_pipelines = pipelines.exclude(
@@ -301,7 +302,7 @@ class PipelineStatsView(generics.GenericAPIView, ScopedVisibilityMixin):
             conversion_rate = (won_deals / total_deals * 100) if total_deals > 0 else 0
             avg_deal_size = (total_value / active_deals) if active_deals > 0 else 0
             
-            print(f"Active deals: {active_deals}, Total deals: {total_deals}, Won deals: {won_deals}")
+            logger.debug('Active deals: %s, Total deals: %s, Won deals: %s', active_deals, total_deals, won_deals)
             
             return Response({
                 'totalValue': float(total_value),
@@ -310,7 +311,7 @@ class PipelineStatsView(generics.GenericAPIView, ScopedVisibilityMixin):
                 'avgDealSize': float(avg_deal_size),
             })
         except Exception as e:
-            print(f"Error in PipelineStatsView: {str(e)}")
+            logger.error('Error in PipelineStatsView: %s', str(e))
             return Response(
                 {'error': 'Internal server error'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -323,13 +324,12 @@ class PipelineStagesView(generics.GenericAPIView, ScopedVisibilityMixin):
     
     def get(self, request):
         try:
-            print(f"=== PipelineStagesView.get called ===")
-            print(f"User: {request.user.username}, Role: {getattr(request.user, 'role', 'No role')}")
-            print(f"Store: {getattr(request.user, 'store', 'No store')}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('PipelineStagesView.get called: User: %s, Role: %s, Store: %s', request.user.username, getattr(request.user, 'role', 'No role'), getattr(request.user, 'store', 'No store'))
             
             # Get scoped queryset for pipelines
             pipelines_queryset = self.get_scoped_queryset(SalesPipeline)
-            print(f"Scoped pipelines count: {pipelines_queryset.count()}")
+            logger.debug('Scoped pipelines count: %s', lazy(pipelines_queryset.count))
             
             stages_data = []
             for stage_code, stage_name in SalesPipeline.Stage.choices:
@@ -350,7 +350,7 @@ class PipelineStagesView(generics.GenericAPIView, ScopedVisibilityMixin):
             
             return Response(stages_data)
         except Exception as e:
-            print(f"Error in PipelineStagesView: {str(e)}")
+            logger.error('Error in PipelineStagesView: %s', str(e))
             return Response(
                 {'error': 'Internal server error'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -379,8 +379,7 @@ class SalesDashboardView(generics.GenericAPIView, ScopedVisibilityMixin):
     def get(self, request):
         try:
             user = request.user
-            print(f"=== SalesDashboardView.get called ===")
-            print(f"User: {user.username}, Role: {user.role}")
+            logger.debug('SalesDashboardView.get called: User: %s, Role: %s', user.username, user.role)
             
             # Get date range from query parameters
             start_date_param = request.query_params.get('start_date')
@@ -410,7 +409,8 @@ class SalesDashboardView(generics.GenericAPIView, ScopedVisibilityMixin):
             if user.role in ['manager', 'inhouse_sales'] and hasattr(user, 'store') and user.store:
                 base_sales_filter['client__store'] = user.store
                 base_pipeline_filter['client__store'] = user.store
-                print(f"Filtering by store: {user.store.name}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug('Filtering by store: %s', user.store.name)
             
             # Get sales data for the filtered period
             period_sales = Sale.objects.filter(
@@ -470,7 +470,7 @@ class SalesDashboardView(generics.GenericAPIView, ScopedVisibilityMixin):
             })
             
         except Exception as e:
-            print(f"Error in SalesDashboardView: {str(e)}")
+            logger.error('Error in SalesDashboardView: %s', str(e))
             return Response({
                 'success': False,
                 'error': 'Failed to fetch dashboard data'
@@ -5,3 +5,6 @@ class StoresConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.stores'
     verbose_name = 'Stores'
+
+    def ready(self):
+        import apps.stores.signals  # noqa
@@ -0,0 +1,269 @@
+"""
+Store performance metrics.
+
+The store performance and staff endpoints used to select a store's sales with
+Q(sales_representative__store=store) | Q(client__store=store) - an OR across
+two joins that no index can serve - once per period (today, this month, all
+time) and per deal status, and the staff view repeated that for every member
+(loading each StoreUserMap user separately).
+
+Sales and pipeline deals now carry the store they are attributed to
+(Sale.store / SalesPipeline.store: the client's store, else the sales
+representative's, kept in sync on save). store_performance() reads every
+period and status figure from one conditional aggregate per model over that
+indexed column, and store_staff() gets all members' figures from one grouped
+query each for sales and closed deals.
+
+store_comparison() puts every store of a tenant side by side for a period,
+from one grouped pass over the daily rollups plus one grouped pipeline query.
+
+Performance and staff figures are cached per store and day. Writes to sales, deals, clients, staff and
+products bump the store's cache version (see signals.py); queryset .update()
+and bulk writes bypass signals, so STORE_PERFORMANCE_CACHE_TIMEOUT bounds how
+stale those can get.
+"""
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.cache import bump_version, get_or_set, versioned_key
+
+from .models import StoreUserMap
+
+CACHE_NAMESPACE = 'store_performance'
+DEFAULT_CACHE_TIMEOUT = 300
+
+ACTIVE_SALE_STATUSES = ['pending', 'confirmed', 'processing']
+WON_SALE_STATUS = 'delivered'
+ACTIVE_PIPELINE_STAGES = ['interested', 'negotiation', 'store_walkin']
+WON_PIPELINE_STAGE = 'closed_won'
+
+ZERO = Value(Decimal('0.00'), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+
+def _sum(field, condition=None):
+    return Coalesce(Sum(field, filter=condition), ZERO)
+
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def invalidate_store_performance(tenant_id, *store_ids):
+    """Drop cached performance and staff figures for the given stores."""
+    for store_id in {store_id for store_id in store_ids if store_id}:
+        bump_version(CACHE_NAMESPACE, tenant_id, store_id)
+
+
+def _cached(store, kind, today, compute):
+    key = versioned_key(CACHE_NAMESPACE, store.tenant_id, [kind, today.isoformat()], scope=(store.id,))
+    return get_or_set(
+        key,
+        compute,
+        getattr(settings, 'STORE_PERFORMANCE_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT),
+    )
+
+
+def sales_totals(sales, today):
+    """Counts and revenue for today, this month and all time, plus open/won counts, in one query."""
+    today_start = _local_midnight(today)
+    month_start = _local_midnight(today.replace(day=1))
+    tomorrow_start = _local_midnight(today + timedelta(days=1))
+    is_today = Q(created_at__gte=today_start, created_at__lt=tomorrow_start)
+    this_month = Q(created_at__gte=month_start, created_at__lt=tomorrow_start)
+    return sales.order_by().aggregate(
+        count=Count('pk'),
+        revenue=_sum('total_amount'),
+        today_count=Count('pk', filter=is_today),
+        today_revenue=_sum('total_amount', is_today),
+        month_count=Count('pk', filter=this_month),
+        month_revenue=_sum('total_amount', this_month),
+        active=Count('pk', filter=Q(status__in=ACTIVE_SALE_STATUSES)),
+        won=Count('pk', filter=Q(status=WON_SALE_STATUS)),
+    )
+
+
+def pipeline_totals(pipelines):
+    """Open and won deal counts in one query."""
+    return pipelines.order_by().aggregate(
+        active=Count('pk', filter=Q(stage__in=ACTIVE_PIPELINE_STAGES)),
+        won=Count('pk', filter=Q(stage=WON_PIPELINE_STAGE)),
+    )
+
+
+def compute_store_performance(store, today=None):
+    """Performance KPIs for a store (see StoreViewSet.performance)."""
+    from apps.clients.models import Client
+    from apps.products.models import Product
+    from apps.sales.models import Sale, SalesPipeline
+    from apps.users.models import User
+
+    today = today or timezone.localdate()
+    sales = sales_totals(Sale.objects.filter(store=store), today)
+    deals = pipeline_totals(SalesPipeline.objects.filter(store=store))
+    total_customers = Client.objects.filter(Q(store=store) | Q(assigned_to__store=store)).count()
+    staff_count = max(User.objects.filter(store=store).count(), StoreUserMap.objects.filter(store=store).count())
+    inventory_value = Product.objects.filter(store=store, status='active').aggregate(
+        total_value=_sum('selling_price'),
+    )['total_value']
+
+    return {
+        'store_id': store.id,
+        'store_name': store.name,
+        'total_sales': sales['count'],
+        'today_sales': float(sales['today_revenue']),
+        'this_month_sales': float(sales['month_revenue']),
+        'total_customers': total_customers,
+        'active_deals': sales['active'] + deals['active'],
+        'closed_won_deals': sales['won'] + deals['won'],
+        'inventory_value': float(inventory_value),
+        'staff_count': staff_count,
+        'today_sales_count': sales['today_count'],
+        'this_month_sales_count': sales['month_count'],
+        'all_time_sales_count': sales['count'],
+    }
+
+
+def compute_store_staff(store, today=None):
+    """
+    Store staff (direct store users first, then StoreUserMap members) with
+    each member's sales and closed deals attributed to the store this month.
+    """
+    from apps.sales.models import Sale, SalesPipeline
+    from apps.users.models import User
+
+    today = today or timezone.localdate()
+    month_start = today.replace(day=1)
+
+    members = [(user, user.role) for user in User.objects.filter(store=store).order_by('id')]
+    seen = {user.id for user, _role in members}
+    for mapping in StoreUserMap.objects.filter(store=store).select_related('user').order_by('id'):
+        if mapping.user_id not in seen:
+            members.append((mapping.user, mapping.role))
+            seen.add(mapping.user_id)
+
+    sales = {
+        row['sales_representative_id']: row
+        for row in Sale.objects.filter(
+            store=store, sales_representative_id__in=seen, created_at__gte=_local_midnight(month_start),
+        ).order_by().values('sales_representative_id').annotate(count=Count('pk'), revenue=_sum('total_amount'))
+    } if seen else {}
+    deals = dict(
+        SalesPipeline.objects.filter(
+            store=store, sales_representative_id__in=seen, stage=WON_PIPELINE_STAGE,
+            actual_close_date__gte=month_start,
+        ).order_by().values('sales_representative_id').annotate(count=Count('pk'))
+        .values_list('sales_representative_id', 'count')
+    ) if seen else {}
+
+    staff_data = []
+    role_distribution = {}
+    for user, role in members:
+        user_sales = sales.get(user.id, {})
+        staff_data.append({
+            'id': user.id,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'role': role,
+            'email': user.email,
+            'phone': user.phone,
+            'is_active': user.is_active,
+            'sales_this_month': float(user_sales.get('revenue') or 0),
+            'deals_closed': deals.get(user.id, 0),
+            'sales_count': user_sales.get('count', 0),
+        })
+        role_distribution[role] = role_distribution.get(role, 0) + 1
+
+    return {
+        'store_id': store.id,
+        'store_name': store.name,
+        'total_staff': len(staff_data),
+        'role_distribution': role_distribution,
+        'staff_members': staff_data,
+    }
+
+
+def store_performance(store, today=None):
+    """Cached compute_store_performance()."""
+    today = today or timezone.localdate()
+    return _cached(store, 'performance', today, lambda: compute_store_performance(store, today))
+
+
+def store_staff(store, today=None):
+    """Cached compute_store_staff()."""
+    today = today or timezone.localdate()
+    return _cached(store, 'staff', today, lambda: compute_store_staff(store, today))
+
+
+def store_comparison(tenant, start_day, end_day):
+    """
+    KPIs for every store of a tenant side by side over [start_day, end_day],
+    in three queries whatever the number of stores: the stores, the period
+    figures grouped by store from the daily rollups, and the pipeline as it
+    stands now grouped by store and stage. Both halves count sales and deals
+    towards their attributed store (Sale/SalesPipeline.store); new clients and
+    appointments count towards the client's store.
+    """
+    from apps.analytics.rollups import COUNT_FIELDS, MEASURE_FIELDS, rollup_breakdown
+    from apps.sales.models import SalesPipeline
+    from .models import Store
+
+    stages = SalesPipeline.Stage.values
+    stores = Store.objects.filter(tenant=tenant).order_by('name').values('id', 'name', 'code', 'city', 'is_active')
+    rollups = rollup_breakdown('store', tenant, start_day, end_day)
+    pipeline = {}
+    for row in (
+        SalesPipeline.objects.filter(tenant=tenant).order_by()
+        .values('store_id', 'stage').annotate(count=Count('pk'), value=_sum('expected_value'))
+    ):
+        pipeline.setdefault(row['store_id'], {})[row['stage']] = {'count': row['count'], 'value': float(row['value'])}
+
+    def kpis(measures, by_stage):
+        measures = {
+            field: value if field in COUNT_FIELDS else float(value)
+            for field, value in measures.items()
+        }
+        won, lost = measures.get('deals_won', 0), measures.get('deals_lost', 0)
+        sales_count = measures.get('confirmed_sales_count', 0)
+        return {
+            **measures,
+            'conversion_rate': round(won / (won + lost) * 100, 2) if won + lost else 0,
+            'average_order_value': round(measures.get('confirmed_sales_revenue', 0) / sales_count, 2)
+            if sales_count else 0,
+            'pipeline_by_stage': {
+                stage: by_stage.get(stage, {'count': 0, 'value': 0.0}) for stage in stages
+            },
+        }
+
+    empty = dict.fromkeys(MEASURE_FIELDS, 0)
+    totals = dict(empty)
+    for measures in rollups.values():
+        for field, value in measures.items():
+            totals[field] += value
+    total_stages = {}
+    for by_stage in pipeline.values():
+        for stage, figures in by_stage.items():
+            bucket = total_stages.setdefault(stage, {'count': 0, 'value': 0.0})
+            bucket['count'] += figures['count']
+            bucket['value'] += figures['value']
+
+    return {
+        'start_date': start_day.isoformat(),
+        'end_date': end_day.isoformat(),
+        'stores': [
+            {
+                'store_id': store['id'],
+                'store_name': store['name'],
+                'code': store['code'],
+                'city': store['city'],
+                'is_active': store['is_active'],
+                **kpis(rollups.get(store['id'], empty), pipeline.get(store['id'], {})),
+            }
+            for store in stores
+        ],
+        'totals': kpis(totals, total_stages),
+    }
@@ -0,0 +1,102 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.analytics.rollups import local_day, schedule_rollup_refresh
+from apps.clients.models import Client
+from apps.products.models import Product
+from apps.sales.models import Sale, SalesPipeline
+from core.snapshots import stored_values
+from .models import StoreUserMap
+from .performance import invalidate_store_performance
+
+User = get_user_model()
+
+
+# User fields shown by the staff view; saves touching none of them (e.g. last_login) keep the cache
+STAFF_FIELDS = {'store', 'first_name', 'last_name', 'email', 'phone', 'role', 'is_active'}
+
+
+def _previous_store_id(sender, instance, update_fields):
+    """Stored store_id of a row being saved; saves that leave store alone are not looked up."""
+    if update_fields is not None and 'store' not in update_fields:
+        return instance.store_id
+    previous = stored_values(instance, 'store_id')
+    return previous['store_id'] if previous else None
+
+
+def _invalidate_on_commit(tenant_id, *store_ids):
+    # After commit, so a read racing the write cannot cache pre-commit figures under the new version
+    transaction.on_commit(partial(invalidate_store_performance, tenant_id, *store_ids))
+
+
+def _reattribute(**filters):
+    """Re-derive Sale/SalesPipeline.store after a client or sales representative moved store."""
+    store = Coalesce(
+        Subquery(Client.objects.filter(pk=OuterRef('client_id')).values('store_id')[:1]),
+        Subquery(User.objects.filter(pk=OuterRef('sales_representative_id')).values('store_id')[:1]),
+    )
+    stores = set()
+    for model in (Sale, SalesPipeline):
+        rows = model.objects.filter(**filters)
+        stores.update(rows.order_by().values_list('store_id', flat=True).distinct())
+        rows.update(store_id=store)
+    return stores
+
+
+@receiver(pre_save, sender=Sale)
+@receiver(pre_save, sender=SalesPipeline)
+@receiver(pre_save, sender=Client)
+@receiver(pre_save, sender=User)
+def remember_store(sender, instance, update_fields=None, **kwargs):
+    instance._performance_previous_store_id = _previous_store_id(sender, instance, update_fields)
+
+
+@receiver([post_save, post_delete], sender=Sale)
+@receiver([post_save, post_delete], sender=SalesPipeline)
+def invalidate_performance_on_sale_write(sender, instance, **kwargs):
+    # A re-attributed sale leaves its previous store's figures as well
+    _invalidate_on_commit(
+        instance.tenant_id, instance.store_id, getattr(instance, '_performance_previous_store_id', None),
+    )
+
+
+@receiver(post_save, sender=Client)
+def reattribute_client_sales(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_performance_previous_store_id', None)
+    stores = {instance.store_id, previous}
+    if not created and previous != instance.store_id:
+        stores |= _reattribute(client=instance)
+    _invalidate_on_commit(instance.tenant_id, *stores)
+
+
+@receiver(post_save, sender=User)
+def reattribute_representative_sales(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not STAFF_FIELDS & set(update_fields):
+        return
+    previous = getattr(instance, '_performance_previous_store_id', None)
+    stores = {instance.store_id, previous}
+    if not created and previous != instance.store_id:
+        # Only sales of clients without a store follow the representative
+        moved = {'sales_representative': instance, 'client__store__isnull': True}
+        stores |= _reattribute(**moved)
+        # The daily rollups bucket those rows by their attributed store too
+        days = {local_day(d) for d in Sale.objects.filter(**moved).values_list('created_at', flat=True)}
+        for created_at, closed_on in SalesPipeline.objects.filter(**moved).values_list('created_at', 'actual_close_date'):
+            days.update((local_day(created_at), closed_on))
+        schedule_rollup_refresh(instance.tenant_id, days)
+    _invalidate_on_commit(instance.tenant_id, *stores)
+
+
+@receiver(post_delete, sender=Client)
+@receiver(post_delete, sender=User)
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=StoreUserMap)
+def invalidate_performance_on_store_write(sender, instance, **kwargs):
+    tenant_id = instance.store.tenant_id if sender is StoreUserMap else instance.tenant_id
+    _invalidate_on_commit(tenant_id, instance.store_id)
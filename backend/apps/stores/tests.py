@@ -1,3 +1,175 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.clients.models import Client
+from apps.sales.models import Sale, SalesPipeline
+from apps.tenants.models import Tenant
+from .models import Store, StoreUserMap
+
+User = get_user_model()
+
+
+@override_settings(ANALYTICS_ROLLUP_REFRESH_ASYNC=False)
+class StorePerformanceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store_a, self.store_b = [
+            Store.objects.create(
+                name=f"Store {code}", code=code, address="1 Test St", city="Test City", state="Test State",
+                tenant=self.tenant,
+            )
+            for code in ("A", "B")
+        ]
+        self.manager = User.objects.create_user(
+            username="manager", password="testpass123", role=User.Role.MANAGER, tenant=self.tenant, store=self.store_a,
+        )
+        self.seller_a = User.objects.create_user(
+            username="seller_a", password="testpass123", role=User.Role.INHOUSE_SALES,
+            tenant=self.tenant, store=self.store_a,
+        )
+        self.seller_b = User.objects.create_user(
+            username="seller_b", password="testpass123", role=User.Role.INHOUSE_SALES,
+            tenant=self.tenant, store=self.store_b,
+        )
+        StoreUserMap.objects.create(user=self.seller_b, store=self.store_a, role='in_house_sales')
+        self.client_a = Client.objects.create(first_name="A", tenant=self.tenant, store=self.store_a)
+        self.walk_in = Client.objects.create(first_name="W", tenant=self.tenant)
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+
+    def _sale(self, number, client, seller, amount, status='confirmed'):
+        return Sale.objects.create(
+            client=client, sales_representative=seller, order_number=number, subtotal=amount,
+            total_amount=amount, status=status, tenant=self.tenant,
+        )
+
+    def test_sales_are_attributed_to_one_store(self):
+        by_client = self._sale('s-1', self.client_a, self.seller_b, 100)
+        by_seller = self._sale('s-2', self.walk_in, self.seller_b, 100)
+        deal = SalesPipeline.objects.create(
+            title="Deal", client=self.walk_in, sales_representative=self.seller_a, tenant=self.tenant,
+        )
+        self.assertEqual((by_client.store_id, by_seller.store_id, deal.store_id),
+                         (self.store_a.id, self.store_b.id, self.store_a.id))
+
+        # Store attribution and every pre_save receiver share one read of the stored row
+        by_client.notes = "Gift wrap"
+        with CaptureQueriesContext(connection) as queries:
+            by_client.save()
+        reads = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertEqual(len(reads), 1, reads)
+
+        self.walk_in.store = self.store_b
+        self.walk_in.save()
+        deal.refresh_from_db()
+        self.assertEqual(deal.store_id, self.store_b.id)
+
+        self.seller_b.store = self.store_a
+        self.seller_b.save()
+        by_client.refresh_from_db()
+        by_seller.refresh_from_db()
+        self.assertEqual((by_client.store_id, by_seller.store_id), (self.store_a.id, self.store_b.id))
+
+    def test_performance_and_staff_are_grouped_and_cached_per_store(self):
+        self._sale('p-1', self.client_a, self.seller_a, Decimal('1000'))
+        self._sale('p-2', self.client_a, self.seller_b, Decimal('500'), status='delivered')
+        self._sale('p-3', self.walk_in, self.seller_b, Decimal('700'))  # attributed to store B
+        old = self._sale('p-4', self.client_a, self.seller_a, Decimal('300'))
+        Sale.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=40))
+        SalesPipeline.objects.create(
+            title="Won", client=self.client_a, sales_representative=self.seller_a, tenant=self.tenant,
+            stage='closed_won', actual_close_date=timezone.localdate(),
+        )
+        url = f'/api/stores/{self.store_a.id}/'
+
+        # store lookup, sales, deals, customers, users, store user maps, inventory
+        with self.assertNumQueries(7):
+            performance = self.api.get(url + 'performance/').data
+        self.assertEqual(
+            (performance['all_time_sales_count'], performance['this_month_sales_count'],
+             performance['today_sales_count'], performance['today_sales']),
+            (3, 2, 2, 1500.0),
+        )
+        self.assertEqual((performance['active_deals'], performance['closed_won_deals']), (2, 2))
+
+        # store lookup, users, store user maps (with their users), sales by member, deals by member
+        with self.assertNumQueries(5):
+            staff = self.api.get(url + 'staff/').data
+        members = {member['id']: member for member in staff['staff_members']}
+        self.assertEqual(staff['total_staff'], 3)
+        self.assertEqual(members[self.seller_a.id]['sales_this_month'], 1000.0)
+        self.assertEqual(members[self.seller_a.id]['deals_closed'], 1)
+        self.assertEqual((members[self.seller_b.id]['sales_count'], members[self.seller_b.id]['role']),
+                         (1, 'in_house_sales'))
+
+        with self.assertNumQueries(1):
+            self.api.get(url + 'performance/')
+        with self.captureOnCommitCallbacks(execute=True):
+            sale = self._sale('p-5', self.client_a, self.seller_a, Decimal('50'))
+        self.assertEqual(self.api.get(url + 'performance/').data['today_sales_count'], 3)
+
+        # Moving the sale to another client re-attributes it: both stores' figures are dropped
+        url_b = f'/api/stores/{self.store_b.id}/performance/'
+        self.assertEqual(self.api.get(url_b).data['today_sales_count'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            sale.client = self.walk_in
+            sale.sales_representative = self.seller_b
+            sale.save()
+        self.assertEqual(self.api.get(url + 'performance/').data['today_sales_count'], 2)
+        self.assertEqual(self.api.get(url_b).data['today_sales_count'], 2)
+
+    def test_comparison_puts_every_store_side_by_side(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._sale('c-1', self.client_a, self.seller_a, Decimal('1000'))
+            self._sale('c-2', self.client_a, self.seller_b, Decimal('500'))
+            self._sale('c-3', self.walk_in, self.seller_b, Decimal('200'))  # attributed to store B
+            client_b = Client.objects.create(first_name="B", tenant=self.tenant, store=self.store_b)
+            for stage in ('closed_won', 'closed_lost', 'negotiation'):
+                SalesPipeline.objects.create(
+                    title=stage, client=client_b, sales_representative=self.seller_b, tenant=self.tenant,
+                    stage=stage, expected_value=100, actual_close_date=timezone.localdate(),
+                )
+        admin = User.objects.create_user(
+            username="admin", password="testpass123", role=User.Role.BUSINESS_ADMIN, tenant=self.tenant,
+        )
+
+        self.assertEqual(self.api.get('/api/stores/comparison/').status_code, 403)
+        self.api.force_authenticate(admin)
+        with self.assertNumQueries(3):
+            report = self.api.get('/api/stores/comparison/').data
+        stores = {row['store_id']: row for row in report['stores']}
+        self.assertEqual(len(stores), 2)
+        self.assertEqual((stores[self.store_a.id]['confirmed_sales_revenue'], stores[self.store_a.id]['new_clients']),
+                         (1500.0, 1))
+        self.assertEqual((stores[self.store_b.id]['deals_won'], stores[self.store_b.id]['conversion_rate']), (1, 50.0))
+        self.assertEqual(stores[self.store_b.id]['pipeline_by_stage']['negotiation'], {'count': 1, 'value': 100.0})
+        self.assertEqual(stores[self.store_b.id]['confirmed_sales_revenue'], 200.0)
+        self.assertEqual(report['totals']['confirmed_sales_count'], 3)
+
+        # A representative moving store takes the sales of store-less clients along, in the rollups too
+        with self.captureOnCommitCallbacks(execute=True):
+            self.seller_b.store = self.store_a
+            self.seller_b.save()
+        stores = {row['store_id']: row for row in self.api.get('/api/stores/comparison/').data['stores']}
+        self.assertEqual((stores[self.store_a.id]['confirmed_sales_revenue'],
+                          stores[self.store_b.id]['confirmed_sales_revenue']), (1700.0, 0.0))
+
+        response = self.api.get('/api/stores/comparison/', {'start_date': '2026-02-10', 'end_date': '2026-01-01'})
+        self.assertEqual(response.status_code, 400)
+
+        platform_admin = User.objects.create_user(
+            username="platform", password="testpass123", role=User.Role.PLATFORM_ADMIN,
+        )
+        self.api.force_authenticate(platform_admin)
+        self.assertEqual(self.api.get('/api/stores/comparison/', {'tenant': 'abc'}).status_code, 400)
+        response = self.api.get('/api/stores/comparison/', {'tenant': self.tenant.id})
+        self.assertEqual(len(response.data['stores']), 2)
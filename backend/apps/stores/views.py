@@ -5,11 +5,18 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Store, StoreUserMap
 from .serializers import StoreSerializer, StoreUserMapSerializer
+from .performance import store_comparison, store_performance, store_staff
 from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Sum, Count, Avg, Q
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from datetime import timedelta
+from apps.tenants.models import Tenant
+from apps.users.permissions import IsBusinessAdminOrHigher
+import logging
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
 
 # Create your views here.
 
@@ -29,7 +36,8 @@ class StoreViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         user = self.request.user
-        print("DEBUG: Creating store for user", user, "tenant", user.tenant)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Creating store for user %s tenant %s', user, user.tenant)
         if not user.tenant:
             raise ValidationError({"detail": "Your user account is not assigned to a tenant. Please contact your administrator."})
         # Only platform admin can set tenant explicitly
@@ -41,221 +49,37 @@ class StoreViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='performance')
     def performance(self, request, pk=None):
         """Get store performance metrics and KPIs"""
-        store = self.get_object()
-        
-        # Get date ranges
-        today = timezone.now().date()
-        this_month_start = today.replace(day=1)
-        this_month_end = today
-        
-        # Import models here to avoid circular imports
-        from apps.sales.models import Sale, SaleItem, SalesPipeline
-        from apps.clients.models import Client
-        from apps.products.models import Product
-        from apps.users.models import User
-        
-        # Get all users assigned to this store
-        store_users = User.objects.filter(store=store)
-        
-        # Today's sales - filter by both sales_representative store AND client store
-        today_sales = Sale.objects.filter(
-            Q(sales_representative__store=store) | Q(client__store=store),
-            created_at__date=today
-        ).aggregate(
-            count=Count('id'),
-            revenue=Sum('total_amount')
-        )
-        
-        # This month's sales
-        this_month_sales = Sale.objects.filter(
-            Q(sales_representative__store=store) | Q(client__store=store),
-            created_at__date__gte=this_month_start,
-            created_at__date__lte=this_month_end
-        ).aggregate(
-            count=Count('id'),
-            revenue=Sum('total_amount')
-        )
-        
-        # All time sales
-        all_time_sales = Sale.objects.filter(
-            Q(sales_representative__store=store) | Q(client__store=store)
-        ).aggregate(
-            count=Count('id'),
-            revenue=Sum('total_amount')
-        )
-        
-        # Customer metrics - count customers assigned to this store
-        total_customers = Client.objects.filter(
-            Q(store=store) | Q(assigned_to__store=store)
-        ).count()
-        
-        # Active deals (sales in progress + pipeline deals)
-        active_deals = Sale.objects.filter(
-            Q(sales_representative__store=store) | Q(client__store=store),
-            status__in=['pending', 'confirmed', 'processing']
-        ).count()
-        
-        # Add pipeline deals
-        pipeline_deals = SalesPipeline.objects.filter(
-            Q(client__store=store) | Q(sales_representative__store=store),
-            stage__in=['interested', 'negotiation', 'store_walkin']
-        ).count()
-        
-        active_deals += pipeline_deals
-        
-        # Closed won deals
-        closed_won_deals = Sale.objects.filter(
-            Q(sales_representative__store=store) | Q(client__store=store),
-            status='delivered'
-        ).count()
-        
-        # Add closed won pipeline deals
-        pipeline_closed = SalesPipeline.objects.filter(
-            Q(client__store=store) | Q(sales_representative__store=store),
-            stage='closed_won'
-        ).count()
-        
-        closed_won_deals += pipeline_closed
-        
-        # Staff count - both direct store users and StoreUserMap
-        staff_count = store_users.count()
-        store_user_map_count = StoreUserMap.objects.filter(store=store).count()
-        total_staff = max(staff_count, store_user_map_count)
-        
-        # Inventory value - calculate from products in this store
-        try:
-            inventory_value = Product.objects.filter(
-                store=store,
-                status='active'  # Use the correct status field
-            ).aggregate(
-                total_value=Sum('selling_price')
-            )['total_value'] or 0
-        except Exception as e:
-            inventory_value = 0
-        
-        response_data = {
-            'store_id': store.id,
-            'store_name': store.name,
-            'total_sales': all_time_sales['count'] or 0,  # Changed from total_revenue to total_sales
-            'today_sales': float(today_sales['revenue'] or 0),
-            'this_month_sales': float(this_month_sales['revenue'] or 0),
-            'total_customers': total_customers,
-            'active_deals': active_deals,
-            'closed_won_deals': closed_won_deals,
-            'inventory_value': float(inventory_value),
-            'staff_count': total_staff,
-            'today_sales_count': today_sales['count'] or 0,
-            'this_month_sales_count': this_month_sales['count'] or 0,
-            'all_time_sales_count': all_time_sales['count'] or 0
-        }
-        
-        return Response(response_data)
+        return Response(store_performance(self.get_object()))
 
     @action(detail=True, methods=['get'], url_path='staff')
     def staff(self, request, pk=None):
         """Get store staff information and roles"""
-        store = self.get_object()
-        
-        # Get staff members through both direct store assignment and StoreUserMap
-        from apps.users.models import User
-        
-        # Direct store users
-        direct_users = User.objects.filter(store=store)
-        
-        # StoreUserMap users
-        store_user_maps = StoreUserMap.objects.filter(store=store)
-        
-        staff_data = []
-        processed_user_ids = set()
-        
-        # Process direct store users first
-        for user in direct_users:
-            if user.id not in processed_user_ids:
-                # Calculate sales and deals for this month
-                from apps.sales.models import Sale, SalesPipeline
-                this_month = timezone.now().date().replace(day=1)
-                
-                # Sales this month
-                sales_this_month = Sale.objects.filter(
-                    Q(sales_representative=user) | Q(client__store=store),
-                    created_at__date__gte=this_month
-                ).aggregate(
-                    count=Count('id'),
-                    revenue=Sum('total_amount')
-                )
-                
-                # Deals closed this month
-                deals_closed = SalesPipeline.objects.filter(
-                    Q(sales_representative=user) | Q(client__store=store),
-                    stage='closed_won',
-                    actual_close_date__gte=this_month
-                ).count()
-                
-                staff_data.append({
-                    'id': user.id,
-                    'first_name': user.first_name,
-                    'last_name': user.last_name,
-                    'role': user.role,
-                    'email': user.email,
-                    'phone': user.phone,
-                    'is_active': user.is_active,
-                    'sales_this_month': float(sales_this_month['revenue'] or 0),
-                    'deals_closed': deals_closed,
-                    'sales_count': sales_this_month['count'] or 0
-                })
-                processed_user_ids.add(user.id)
-        
-        # Process StoreUserMap users
-        for staff_member in store_user_maps:
-            user = staff_member.user
-            if user.id not in processed_user_ids:
-                # Calculate sales and deals for this month
-                from apps.sales.models import Sale, SalesPipeline
-                this_month = timezone.now().date().replace(day=1)
-                
-                # Sales this month
-                sales_this_month = Sale.objects.filter(
-                    Q(sales_representative=user) | Q(client__store=store),
-                    created_at__date__gte=this_month
-                ).aggregate(
-                    count=Count('id'),
-                    revenue=Sum('total_amount')
-                )
-                
-                # Deals closed this month
-                deals_closed = SalesPipeline.objects.filter(
-                    Q(sales_representative=user) | Q(client__store=store),
-                    stage='closed_won',
-                    actual_close_date__gte=this_month
-                ).count()
-                
-                staff_data.append({
-                    'id': user.id,
-                    'first_name': user.first_name,
-                    'last_name': user.last_name,
-                    'role': staff_member.role,  # Use role from StoreUserMap
-                    'email': user.email,
-                    'phone': user.phone,
-                    'is_active': user.is_active,
-                    'sales_this_month': float(sales_this_month['revenue'] or 0),
-                    'deals_closed': deals_closed,
-                    'sales_count': sales_this_month['count'] or 0
-                })
-                processed_user_ids.add(user.id)
-        
-        # Calculate role distribution
-        role_distribution = {}
-        for member in staff_data:
-            role = member['role']
-            role_distribution[role] = role_distribution.get(role, 0) + 1
-        
-        return Response({
-            'store_id': store.id,
-            'store_name': store.name,
-            'total_staff': len(staff_data),
-            'role_distribution': role_distribution,
-            'staff_members': staff_data
-        })
+        return Response(store_staff(self.get_object()))
+
+    @action(detail=False, methods=['get'], url_path='comparison', permission_classes=[IsBusinessAdminOrHigher])
+    def comparison(self, request):
+        """Compare KPIs of all the tenant's stores over ?start_date=&end_date= (YYYY-MM-DD, default last 30 days)"""
+        tenant = request.user.tenant
+        if request.user.is_platform_admin and request.query_params.get('tenant'):
+            try:
+                tenant_id = int(request.query_params['tenant'])
+            except ValueError:
+                return Response({'error': 'tenant must be a tenant id'}, status=status.HTTP_400_BAD_REQUEST)
+            tenant = Tenant.objects.filter(pk=tenant_id).first()
+        if not tenant:
+            return Response({'error': 'No tenant found'}, status=status.HTTP_400_BAD_REQUEST)
+
+        end_day = timezone.localdate()
+        start_day = end_day - timedelta(days=30)
+        try:
+            start_day = parse_date(request.query_params.get('start_date', '')[:10]) or start_day
+            end_day = parse_date(request.query_params.get('end_date', '')[:10]) or end_day
+        except ValueError:
+            return Response({'error': 'Dates must be YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+        if start_day > end_day:
+            return Response({'error': 'start_date must not be after end_date'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(store_comparison(tenant, start_day, end_day))
 
     @action(detail=True, methods=['get'], url_path='recent-sales')
     def recent_sales(self, request, pk=None):
@@ -268,10 +92,8 @@ class StoreViewSet(viewsets.ModelViewSet):
         # Import Sale model here to avoid circular imports
         from apps.sales.models import Sale
         
-        # Get recent sales for staff in this store OR clients from this store
-        recent_sales = Sale.objects.filter(
-            Q(sales_representative__store=store) | Q(client__store=store)
-        ).select_related(
+        # Sales attributed to this store (see apps/stores/performance.py)
+        recent_sales = Sale.objects.filter(store=store).select_related(
             'client', 
             'sales_representative'
         ).order_by('-created_at')[:limit]
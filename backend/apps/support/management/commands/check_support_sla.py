@@ -0,0 +1,28 @@
+"""
+Alert platform admins about support tickets that missed their response SLA.
+
+Each overdue ticket is alerted once (SupportTicket.overdue_notified_at), so it
+is safe to run as often as needed, e.g. every 15 minutes from cron
+(deploy/utho/cron.d/crm-support-sla):
+
+    python manage.py check_support_sla
+"""
+from django.core.management.base import BaseCommand
+
+from apps.support.sla import DEFAULT_BATCH_SIZE, notify_overdue_tickets
+
+
+class Command(BaseCommand):
+    help = 'Notify platform admins about unassigned support tickets past their SLA'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Tickets alerted per transaction (default: {DEFAULT_BATCH_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        tickets = notify_overdue_tickets(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Alerted platform admins about {len(tickets)} overdue ticket(s)."))
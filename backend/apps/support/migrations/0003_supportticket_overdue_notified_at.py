@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("support", "0002_alter_supportticket_callback_phone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="supportticket",
+            name="overdue_notified_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When platform admins were alerted that the response SLA was missed",
+                null=True,
+            ),
+        ),
+    ]
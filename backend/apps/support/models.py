@@ -86,6 +86,11 @@ class SupportTicket(models.Model):
     requires_callback = models.BooleanField(default=False, help_text=_('Business admin requested a callback'))
     callback_phone = models.CharField(max_length=20, blank=True, null=True)
     callback_preferred_time = models.CharField(max_length=100, blank=True, null=True)
+    overdue_notified_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_('When platform admins were alerted that the response SLA was missed')
+    )
 
     class Meta:
         verbose_name = _('Support Ticket')
@@ -167,48 +167,9 @@ class SupportTicketService:
     
     @staticmethod
     def check_overdue_tickets():
-        """Check for overdue tickets and send notifications"""
-        from datetime import timedelta
-        
-        # Define response time limits based on priority
-        time_limits = {
-            'critical': 4,
-            'high': 8,
-            'medium': 24,
-            'low': 48
-        }
-        
-        now = timezone.now()
-        overdue_tickets = []
-        
-        for priority, hours in time_limits.items():
-            limit_time = now - timedelta(hours=hours)
-            
-            overdue = SupportTicket.objects.filter(
-                priority=priority,
-                status__in=['open', 'in_progress'],
-                created_at__lt=limit_time,
-                assigned_to__isnull=True  # Only unassigned tickets
-            )
-            
-            overdue_tickets.extend(list(overdue))
-        
-        # Send notifications for overdue tickets
-        for ticket in overdue_tickets:
-            platform_admins = User.objects.filter(role='platform_admin')
-            title = f"Overdue Ticket: {ticket.ticket_id}"
-            message = f"Support ticket #{ticket.ticket_id} is overdue for {ticket.priority} priority issue. Please assign and respond."
-            for admin in platform_admins:
-                SupportNotification.objects.create(
-                    ticket=ticket,
-                    recipient=admin,
-                    notification_type=SupportNotification.NotificationType.TICKET_UPDATED,
-                    title=title,
-                    message=message
-                )
-                SupportTicketService._push_for_recipient(admin, title, message, priority='high')
-        
-        return overdue_tickets
+        """Alert platform admins once about each unassigned ticket that missed its response SLA (see sla.py)"""
+        from .sla import notify_overdue_tickets
+        return notify_overdue_tickets()
     
     @staticmethod
     def auto_close_resolved_tickets():
@@ -0,0 +1,23 @@
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from .models import SupportTicket
+
+
+@receiver(pre_save, sender=SupportTicket)
+def reset_overdue_watermark(sender, instance, update_fields=None, **kwargs):
+    """
+    A reopened or reassigned ticket starts a new SLA episode: clear
+    overdue_notified_at so check_support_sla alerts about it again if it
+    ends up unattended.
+    """
+    if not instance.pk or instance.overdue_notified_at is None:
+        return
+    if update_fields is not None and 'overdue_notified_at' not in update_fields:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values('status', 'assigned_to_id').first()
+    if previous is None:
+        return
+    reopened = instance.status == SupportTicket.Status.REOPENED and previous['status'] != instance.status
+    if reopened or previous['assigned_to_id'] != instance.assigned_to_id:
+        instance.overdue_notified_at = None
@@ -0,0 +1,140 @@
+"""
+Support ticket SLA monitor.
+
+An unassigned ticket breaches its response SLA SLA_HOURS[priority] hours after
+it was opened. The old check ran one query per priority, then for every
+overdue ticket re-read the platform admins and created and pushed their
+notifications one row at a time, and it alerted about the same tickets again
+on every run.
+
+notify_overdue_tickets() instead:
+  - finds breached tickets in one query, the deadline computed per row by a
+    priority -> created_at + hours CASE
+  - skips tickets already alerted: overdue_notified_at is the watermark, set in
+    the same transaction that writes the alerts, and rows are claimed with
+    SELECT ... FOR UPDATE SKIP LOCKED so overlapping runs never double-alert;
+    reopening or reassigning a ticket clears it (see signals.py)
+  - loads the platform admins once per run
+  - bulk_create()s the support notifications and the CRM notifications that
+    carry the push, which are delivered after commit (bulk_create_notifications)
+"""
+import logging
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Case, DateTimeField, ExpressionWrapper, F, When
+from django.utils import timezone
+
+from .models import SupportNotification, SupportTicket
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+SLA_HOURS = {
+    SupportTicket.Priority.CRITICAL: 4,
+    SupportTicket.Priority.HIGH: 8,
+    SupportTicket.Priority.MEDIUM: 24,
+    SupportTicket.Priority.LOW: 48,
+}
+MONITORED_STATUSES = [SupportTicket.Status.OPEN, SupportTicket.Status.IN_PROGRESS, SupportTicket.Status.REOPENED]
+DEFAULT_BATCH_SIZE = 200
+
+
+def response_deadline():
+    """created_at + the ticket's SLA hours; NULL for priorities without an SLA."""
+    return Case(
+        *[
+            When(priority=priority, then=ExpressionWrapper(
+                F('created_at') + timedelta(hours=hours), output_field=DateTimeField(),
+            ))
+            for priority, hours in SLA_HOURS.items()
+        ],
+        output_field=DateTimeField(),
+    )
+
+
+def overdue_tickets(now=None):
+    """Unassigned open tickets past their response deadline."""
+    now = now or timezone.now()
+    return SupportTicket.objects.annotate(response_deadline=response_deadline()).filter(
+        status__in=MONITORED_STATUSES,
+        assigned_to__isnull=True,
+        response_deadline__lt=now,
+    )
+
+
+def build_overdue_notifications(ticket, admins):
+    """Unsaved (support notifications, CRM push notifications) alerting admins about ticket."""
+    from apps.notifications.models import Notification
+
+    title = f"Overdue Ticket: {ticket.ticket_id}"
+    message = f"Support ticket #{ticket.ticket_id} is overdue for {ticket.priority} priority issue. Please assign and respond."
+    alerts = [
+        SupportNotification(
+            ticket=ticket,
+            recipient=admin,
+            notification_type=SupportNotification.NotificationType.TICKET_UPDATED,
+            title=title,
+            message=message,
+        )
+        for admin in admins
+    ]
+    # Same shape create_push_notification() gives; users without a tenant get no push
+    pushes = [
+        Notification(
+            user=admin,
+            tenant_id=admin.tenant_id,
+            store_id=admin.store_id,
+            type='announcement',
+            title=title,
+            message=message,
+            priority='high',
+            status='unread',
+            action_url='/support',
+            action_text='View',
+            is_persistent=False,
+            metadata={'ticket_id': ticket.ticket_id},
+        )
+        for admin in admins
+        if admin.tenant_id
+    ]
+    return alerts, pushes
+
+
+def notify_overdue_tickets(now=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Alert platform admins about tickets that breached their SLA since the last
+    run, batch_size tickets per transaction. Returns the tickets alerted.
+    """
+    from apps.notifications.services import bulk_create_notifications
+
+    now = now or timezone.now()
+    admins = list(User.objects.filter(role='platform_admin'))
+    notified = []
+    while True:
+        with transaction.atomic():
+            tickets = list(
+                overdue_tickets(now)
+                .filter(overdue_notified_at__isnull=True)
+                .order_by('response_deadline')
+                .select_for_update(skip_locked=True, of=('self',))[:batch_size]
+            )
+            if not tickets:
+                break
+            alerts, pushes = [], []
+            for ticket in tickets:
+                ticket_alerts, ticket_pushes = build_overdue_notifications(ticket, admins)
+                alerts.extend(ticket_alerts)
+                pushes.extend(ticket_pushes)
+            SupportNotification.objects.bulk_create(alerts)
+            bulk_create_notifications(pushes)
+            SupportTicket.objects.filter(pk__in=[ticket.pk for ticket in tickets]).update(overdue_notified_at=now)
+        notified.extend(tickets)
+        if len(tickets) < batch_size:
+            break
+
+    if notified:
+        logger.info("Alerted %s platform admin(s) about %s overdue ticket(s)", len(admins), len(notified))
+    return notified
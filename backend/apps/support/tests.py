@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.notifications.models import Notification
+from apps.tenants.models import Tenant
+from .models import SupportNotification, SupportTicket
+from .services import SupportTicketService
+
+User = get_user_model()
+
+
+class SupportSlaMonitorTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.owner = User.objects.create_user(
+            username="owner", password="testpass123", role=User.Role.BUSINESS_ADMIN, tenant=self.tenant,
+        )
+        self.admins = [
+            User.objects.create_user(username="platform", password="testpass123", role=User.Role.PLATFORM_ADMIN),
+            User.objects.create_user(
+                username="platform2", password="testpass123", role=User.Role.PLATFORM_ADMIN, tenant=self.tenant,
+            ),
+        ]
+
+    def _ticket(self, priority, hours_old, assigned_to=None, status='open'):
+        ticket = SupportTicket.objects.create(
+            title=priority, summary=priority, priority=priority, status=status, created_by=self.owner,
+            tenant=self.tenant, assigned_to=assigned_to,
+        )
+        SupportTicket.objects.filter(pk=ticket.pk).update(created_at=timezone.now() - timedelta(hours=hours_old))
+        return ticket
+
+    def test_overdue_tickets_are_alerted_once(self):
+        critical = self._ticket('critical', 5)
+        medium = self._ticket('medium', 30)
+        self._ticket('low', 5)
+        self._ticket('high', 10, assigned_to=self.admins[0])
+        self._ticket('high', 10, status='resolved')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notified = SupportTicketService.check_overdue_tickets()
+
+        self.assertEqual({ticket.pk for ticket in notified}, {critical.pk, medium.pk})
+        self.assertEqual(SupportNotification.objects.count(), 4)
+        self.assertEqual(Notification.objects.filter(user=self.admins[1]).count(), 2)
+        self.assertFalse(SupportTicket.objects.filter(pk__in=[critical.pk, medium.pk], overdue_notified_at=None).exists())
+
+        with self.assertNumQueries(4):  # admins, savepoint, claim, release
+            self.assertEqual(SupportTicketService.check_overdue_tickets(), [])
+        self.assertEqual(SupportNotification.objects.count(), 4)
+
+    def test_reopened_or_reassigned_tickets_are_alerted_again(self):
+        reopened = self._ticket('critical', 5, assigned_to=self.admins[0], status='resolved')
+        reassigned = self._ticket('medium', 30)
+        with self.captureOnCommitCallbacks(execute=True):
+            SupportTicketService.check_overdue_tickets()
+        reassigned.refresh_from_db()
+        self.assertIsNotNone(reassigned.overdue_notified_at)
+        SupportTicket.objects.filter(pk=reopened.pk).update(overdue_notified_at=timezone.now())
+
+        reopened.refresh_from_db()
+        reopened.status, reopened.assigned_to = SupportTicket.Status.REOPENED, None
+        reopened.save()
+        reassigned.assigned_to = self.admins[0]
+        reassigned.save()
+        reassigned.assigned_to = None
+        reassigned.save()
+        reassigned.title = 'renamed'
+        reassigned.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notified = SupportTicketService.check_overdue_tickets()
+        self.assertEqual({ticket.pk for ticket in notified}, {reopened.pk, reassigned.pk})
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class TasksConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.tasks'
+    verbose_name = 'Tasks & Goals'
+
+    def ready(self):
+        import apps.tasks.signals  # noqa
@@ -0,0 +1,19 @@
+"""
+Recompute progress for every tracked goal (sales, revenue, task completion).
+
+Progress is refreshed on write; run this once after deploying, or after
+changing sales or tasks outside the ORM:
+
+    python manage.py sync_goal_progress
+"""
+from django.core.management.base import BaseCommand
+
+from apps.tasks.progress import refresh_goal_progress
+
+
+class Command(BaseCommand):
+    help = 'Recompute current_value of goals tracked from sales and tasks'
+
+    def handle(self, *args, **options):
+        updated = refresh_goal_progress()
+        self.stdout.write(self.style.SUCCESS(f"Updated progress of {updated} goal(s)."))
@@ -0,0 +1,116 @@
+"""
+Goal and task metrics.
+
+The statistics endpoints used to run a COUNT per status (and per priority,
+overdue bucket, ...) plus a separate average, each over the user's scoped
+queryset. goal_metrics() and task_metrics() compute every figure, including
+the full status/priority/type breakdowns, with one conditional aggregate over
+that queryset.
+
+The filters the dashboards use (active, overdue, due soon) live here as Q
+objects so lists and counts always agree on what they mean.
+"""
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from .models import Goal, WorkTask
+
+DUE_SOON_DAYS = 7
+
+OPEN_TASK_STATUSES = [WorkTask.Status.PENDING, WorkTask.Status.IN_PROGRESS]
+HIGH_PRIORITIES = [WorkTask.Priority.HIGH, WorkTask.Priority.URGENT]
+
+ACTIVE_GOAL = Q(is_active=True, is_completed=False)
+
+
+def overdue_goal(today=None):
+    return Q(end_date__lt=today or timezone.localdate(), is_completed=False)
+
+
+def overdue_task(now=None):
+    return Q(due_date__lt=now or timezone.now(), status__in=OPEN_TASK_STATUSES)
+
+
+def due_soon_task(now=None):
+    return Q(due_date__lte=(now or timezone.now()) + timedelta(days=DUE_SOON_DAYS), status__in=OPEN_TASK_STATUSES)
+
+
+def _breakdowns(aggregates, fields):
+    """Add a conditional count per choice value of each (name, field, choices)."""
+    for name, field, choices in fields:
+        for value in choices.values:
+            aggregates[f'{name}__{value}'] = Count('pk', filter=Q(**{field: value}))
+
+
+def _unpack(totals, fields):
+    return {
+        name: {value: totals[f'{name}__{value}'] for value in choices.values}
+        for name, _field, choices in fields
+    }
+
+
+GOAL_BREAKDOWNS = [
+    ('goals_by_type', 'goal_type', Goal.GoalType),
+    ('goals_by_period', 'period', Goal.GoalPeriod),
+]
+TASK_BREAKDOWNS = [
+    ('tasks_by_status', 'status', WorkTask.Status),
+    ('tasks_by_priority', 'priority', WorkTask.Priority),
+    ('tasks_by_type', 'task_type', WorkTask.TaskType),
+]
+
+
+def goal_metrics(queryset, today=None):
+    """Goal statistics for a queryset of goals, in one query."""
+    aggregates = {
+        'total': Count('pk'),
+        'active': Count('pk', filter=ACTIVE_GOAL),
+        'completed': Count('pk', filter=Q(is_completed=True)),
+        'overdue': Count('pk', filter=overdue_goal(today)),
+        'average_progress': Avg('current_value', filter=ACTIVE_GOAL),
+    }
+    _breakdowns(aggregates, GOAL_BREAKDOWNS)
+    totals = queryset.order_by().aggregate(**aggregates)
+
+    total = totals['total']
+    return {
+        'total_goals': total,
+        'active_goals': totals['active'],
+        'completed_goals': totals['completed'],
+        'overdue_goals': totals['overdue'],
+        'average_progress': float(totals['average_progress'] or 0),
+        'completion_rate': (totals['completed'] / total * 100) if total > 0 else 0,
+        **_unpack(totals, GOAL_BREAKDOWNS),
+    }
+
+
+def task_metrics(queryset, now=None):
+    """Task statistics for a queryset of tasks, in one query."""
+    now = now or timezone.now()
+    aggregates = {
+        'total': Count('pk'),
+        'overdue': Count('pk', filter=overdue_task(now)),
+        'due_soon': Count('pk', filter=due_soon_task(now)),
+        'high_priority': Count('pk', filter=Q(priority__in=HIGH_PRIORITIES)),
+        'average_progress': Avg('progress_percentage', filter=Q(status=WorkTask.Status.IN_PROGRESS)),
+    }
+    _breakdowns(aggregates, TASK_BREAKDOWNS)
+    totals = queryset.order_by().aggregate(**aggregates)
+
+    total = totals['total']
+    completed = totals[f'tasks_by_status__{WorkTask.Status.COMPLETED}']
+    return {
+        'total_tasks': total,
+        'pending_tasks': totals[f'tasks_by_status__{WorkTask.Status.PENDING}'],
+        'in_progress_tasks': totals[f'tasks_by_status__{WorkTask.Status.IN_PROGRESS}'],
+        'completed_tasks': completed,
+        'overdue_tasks': totals['overdue'],
+        'due_soon_tasks': totals['due_soon'],
+        'high_priority_tasks': totals['high_priority'],
+        'urgent_tasks': totals[f'tasks_by_priority__{WorkTask.Priority.URGENT}'],
+        'average_progress': float(totals['average_progress'] or 0),
+        'completion_rate': (completed / total * 100) if total > 0 else 0,
+        **_unpack(totals, TASK_BREAKDOWNS),
+    }
@@ -0,0 +1,128 @@
+"""
+Goal progress maintenance.
+
+Goals of a tracked type have their current_value derived from the underlying
+records instead of being typed in:
+  - sales:           confirmed sales by the assignee created within the goal's dates
+  - revenue:         total_amount of those sales
+  - task_completion: completed work tasks linked to the goal
+
+Progress is kept up to date on write rather than computed on read: saving a
+sale or a work task queues the goals it can affect (see signals.py), and once
+the transaction commits refresh_goal_progress() recomputes just those goals
+with one query and bulk_update()s the ones that moved. As with the daily
+rollups, goals are recomputed from the source rows rather than nudged by
+deltas, so a refresh always converges and re-running it is harmless; the
+sync_goal_progress command does it for every tracked goal.
+
+Other goal types keep their manually entered progress (update_progress).
+"""
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from core.commit_hooks import after_commit
+
+from .models import Goal, WorkTask
+
+CONFIRMED_SALE_STATUSES = ['confirmed', 'delivered']
+SALES_GOAL_TYPES = [Goal.GoalType.SALES, Goal.GoalType.REVENUE]
+TRACKED_GOAL_TYPES = SALES_GOAL_TYPES + [Goal.GoalType.TASK_COMPLETION]
+
+
+def _sales_subquery(aggregate, output_field):
+    from apps.sales.models import Sale
+
+    return Subquery(
+        Sale.objects.filter(
+            sales_representative=OuterRef('assigned_to'),
+            status__in=CONFIRMED_SALE_STATUSES,
+            created_at__date__gte=OuterRef('start_date'),
+            created_at__date__lte=OuterRef('end_date'),
+        )
+        .order_by()
+        .values('sales_representative')
+        .annotate(value=aggregate)
+        .values('value'),
+        output_field=output_field,
+    )
+
+
+def tracked_goals():
+    """Tracked goals annotated with the values their progress derives from."""
+    return Goal.objects.filter(goal_type__in=TRACKED_GOAL_TYPES).annotate(
+        tracked_sales=_sales_subquery(Count('pk'), IntegerField()),
+        tracked_revenue=_sales_subquery(Sum('total_amount'), DecimalField(max_digits=15, decimal_places=2)),
+        tracked_tasks=Subquery(
+            WorkTask.objects.filter(goal=OuterRef('pk'), status=WorkTask.Status.COMPLETED)
+            .order_by()
+            .values('goal')
+            .annotate(value=Count('pk'))
+            .values('value'),
+            output_field=IntegerField(),
+        ),
+    )
+
+
+def _tracked_value(goal):
+    if goal.goal_type == Goal.GoalType.SALES:
+        value = goal.tracked_sales
+    elif goal.goal_type == Goal.GoalType.REVENUE:
+        value = goal.tracked_revenue
+    else:
+        value = goal.tracked_tasks
+    return Decimal(value or 0).quantize(Decimal('0.01'))
+
+
+def refresh_goal_progress(goal_ids=None):
+    """
+    Recompute current_value for the given tracked goals (all when None) and
+    save the ones that changed. As in Goal.update_progress(), reaching the
+    target marks a goal completed; it is never un-completed. Returns the
+    number of goals updated.
+    """
+    goals = tracked_goals()
+    if goal_ids is not None:
+        goal_ids = {goal_id for goal_id in goal_ids if goal_id}
+        if not goal_ids:
+            return 0
+        goals = goals.filter(pk__in=goal_ids)
+
+    now = timezone.now()
+    changed = []
+    for goal in goals.order_by('pk').iterator(chunk_size=500):
+        value = _tracked_value(goal)
+        completed = goal.is_completed or value >= goal.target_value
+        if value != goal.current_value or completed != goal.is_completed:
+            goal.current_value, goal.is_completed, goal.updated_at = value, completed, now
+            changed.append(goal)
+    Goal.objects.bulk_update(changed, ['current_value', 'is_completed', 'updated_at'], batch_size=500)
+    return len(changed)
+
+
+def goals_for_sales(keys):
+    """Ids of sales/revenue goals covering any (salesperson_id, day) in keys."""
+    condition = Q()
+    for user_id, day in keys:
+        condition |= Q(assigned_to_id=user_id, start_date__lte=day, end_date__gte=day)
+    if not condition:
+        return []
+    return list(
+        Goal.objects.filter(condition, goal_type__in=SALES_GOAL_TYPES).order_by().values_list('pk', flat=True)
+    )
+
+
+def _refresh_queued(goal_ids, sales):
+    refresh_goal_progress(goal_ids | set(goals_for_sales(sales)))
+
+
+def schedule_goal_refresh(goal_ids=(), sales=()):
+    """
+    Refresh goals once the current transaction commits: goal_ids directly, and
+    the sales goals covering each (salesperson_id, day) in sales.
+    """
+    goal_ids = {goal_id for goal_id in goal_ids if goal_id}
+    sales = {(user_id, day) for user_id, day in sales if user_id and day}
+    if goal_ids or sales:
+        after_commit(_refresh_queued, goal_ids, sales, description=f"Goal progress refresh for goals {sorted(goal_ids)}")
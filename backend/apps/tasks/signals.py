@@ -0,0 +1,51 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.sales.models import Sale
+from core.snapshots import stored_values
+from .models import Goal, WorkTask
+from .progress import TRACKED_GOAL_TYPES, schedule_goal_refresh
+
+GOAL_SCOPE_FIELDS = ('goal_type', 'assigned_to_id', 'start_date', 'end_date', 'target_value')
+
+
+@receiver(pre_save, sender=Sale)
+def remember_sale_representative(sender, instance, **kwargs):
+    previous = stored_values(instance, 'sales_representative_id')
+    instance._goal_previous_representative_id = previous['sales_representative_id'] if previous else None
+
+
+@receiver([post_save, post_delete], sender=Sale)
+def refresh_goals_for_sale(sender, instance, **kwargs):
+    day = timezone.localdate(instance.created_at) if instance.created_at else None
+    schedule_goal_refresh(sales={
+        (instance.sales_representative_id, day),
+        (getattr(instance, '_goal_previous_representative_id', None), day),
+    })
+
+
+@receiver(pre_save, sender=WorkTask)
+def remember_task_goal(sender, instance, **kwargs):
+    previous = stored_values(instance, 'goal_id')
+    instance._goal_previous_goal_id = previous['goal_id'] if previous else None
+
+
+@receiver([post_save, post_delete], sender=WorkTask)
+def refresh_goals_for_task(sender, instance, **kwargs):
+    schedule_goal_refresh(goal_ids={instance.goal_id, getattr(instance, '_goal_previous_goal_id', None)})
+
+
+@receiver(pre_save, sender=Goal)
+def remember_goal_scope(sender, instance, **kwargs):
+    instance._goal_previous_scope = stored_values(instance, *GOAL_SCOPE_FIELDS)
+
+
+@receiver(post_save, sender=Goal)
+def refresh_new_or_rescoped_goal(sender, instance, created, **kwargs):
+    # Manual progress updates leave the scope alone and are not overridden here
+    if instance.goal_type not in TRACKED_GOAL_TYPES:
+        return
+    previous = getattr(instance, '_goal_previous_scope', None)
+    if created or previous is None or any(previous[field] != getattr(instance, field) for field in GOAL_SCOPE_FIELDS):
+        schedule_goal_refresh(goal_ids={instance.pk})
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.clients.models import Client
+from apps.sales.models import Sale
+from apps.stores.models import Store
+from apps.tenants.models import Tenant
+from .models import Goal, WorkTask
+
+User = get_user_model()
+
+
+class GoalAndTaskMetricsTest(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store = Store.objects.create(
+            name="Main Store", code="MS001", address="123 Test St", city="Test City", state="Test State",
+            tenant=self.tenant,
+        )
+        self.manager = User.objects.create_user(
+            username="manager", password="testpass123", role=User.Role.MANAGER,
+            tenant=self.tenant, store=self.store,
+        )
+        self.seller = User.objects.create_user(
+            username="sales", password="testpass123", role=User.Role.INHOUSE_SALES,
+            tenant=self.tenant, store=self.store,
+        )
+        self.client_record = Client.objects.create(first_name="John", tenant=self.tenant, store=self.store)
+        self.today = timezone.localdate()
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+
+    def _goal(self, goal_type, target, **extra):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Goal.objects.create(
+                title=goal_type, goal_type=goal_type, target_value=target, assigned_to=self.seller,
+                store=self.store, start_date=self.today - timedelta(days=3), end_date=self.today + timedelta(days=3),
+                **extra,
+            )
+
+    def _task(self, status, priority=WorkTask.Priority.MEDIUM, **extra):
+        return WorkTask.objects.create(
+            title=status, description="d", status=status, priority=priority, assigned_to=self.seller,
+            store=self.store, **extra,
+        )
+
+    def test_statistics_come_from_one_query_per_model(self):
+        now = timezone.now()
+        self._task(WorkTask.Status.PENDING, WorkTask.Priority.URGENT, due_date=now - timedelta(days=1))
+        self._task(WorkTask.Status.IN_PROGRESS, due_date=now + timedelta(days=2), progress_percentage=40)
+        self._task(WorkTask.Status.COMPLETED, WorkTask.Priority.HIGH)
+        self._task(WorkTask.Status.ON_HOLD)
+        self._goal(Goal.GoalType.CUSTOM, 10, current_value=4)
+        self._goal(Goal.GoalType.LEADS, 10, is_completed=True)
+
+        with self.assertNumQueries(1):
+            tasks = self.api.get('/api/tasks/tasks/statistics/').data
+        self.assertEqual(
+            (tasks['total_tasks'], tasks['pending_tasks'], tasks['completed_tasks'], tasks['overdue_tasks'],
+             tasks['due_soon_tasks'], tasks['high_priority_tasks'], tasks['urgent_tasks']),
+            (4, 1, 1, 1, 2, 2, 1),
+        )
+        self.assertEqual(tasks['tasks_by_status']['on_hold'], 1)
+        self.assertEqual(tasks['average_progress'], 40.0)
+        self.assertEqual(tasks['completion_rate'], 25.0)
+
+        with self.assertNumQueries(1):
+            goals = self.api.get('/api/tasks/goals/statistics/').data
+        self.assertEqual((goals['total_goals'], goals['active_goals'], goals['completed_goals']), (2, 1, 1))
+        self.assertEqual(goals['goals_by_type']['leads'], 1)
+        self.assertEqual(goals['average_progress'], 4.0)
+
+    def test_goal_progress_follows_sales_and_tasks(self):
+        revenue = self._goal(Goal.GoalType.REVENUE, Decimal('50000'))
+        sales = self._goal(Goal.GoalType.SALES, 5)
+        tasks = self._goal(Goal.GoalType.TASK_COMPLETION, 2)
+        manual = self._goal(Goal.GoalType.CUSTOM, 10, current_value=3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for number, amount in (('g-1', '30000'), ('g-2', '25000')):
+                Sale.objects.create(
+                    client=self.client_record, sales_representative=self.seller, order_number=number,
+                    subtotal=amount, total_amount=amount, status='confirmed', tenant=self.tenant,
+                )
+            Sale.objects.create(
+                client=self.client_record, sales_representative=self.seller, order_number='g-3',
+                subtotal=1000, total_amount=1000, status='pending', tenant=self.tenant,
+            )
+            self._task(WorkTask.Status.COMPLETED, goal=tasks)
+            self._task(WorkTask.Status.PENDING, goal=tasks)
+
+        revenue.refresh_from_db()
+        sales.refresh_from_db()
+        tasks.refresh_from_db()
+        manual.refresh_from_db()
+        self.assertEqual((revenue.current_value, revenue.is_completed), (Decimal('55000.00'), True))
+        self.assertEqual((sales.current_value, sales.is_completed), (Decimal('2.00'), False))
+        self.assertEqual(tasks.current_value, Decimal('1.00'))
+        self.assertEqual(manual.current_value, Decimal('3.00'))
+
+        # Reads never recompute progress: one query however many goals are listed
+        with self.assertNumQueries(1):
+            self.api.get('/api/tasks/goals/dashboard/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            WorkTask.objects.filter(goal=tasks, status=WorkTask.Status.PENDING).first().complete_task()
+        tasks.refresh_from_db()
+        self.assertEqual((tasks.current_value, tasks.is_completed), (Decimal('2.00'), True))
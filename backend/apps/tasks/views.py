@@ -3,11 +3,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count, Avg
-from django.utils import timezone
-from datetime import datetime, timedelta
 
 from .models import Goal, WorkTask, TaskComment, TaskAttachment
+from .metrics import ACTIVE_GOAL, due_soon_task, goal_metrics, overdue_goal, overdue_task, task_metrics
 from .serializers import (
     GoalSerializer, GoalCreateSerializer, GoalUpdateSerializer, GoalProgressUpdateSerializer,
     WorkTaskSerializer, TaskCreateSerializer, TaskUpdateSerializer, TaskStatusUpdateSerializer,
@@ -75,42 +73,24 @@ class GoalViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
         """Get goals for dashboard view."""
-        queryset = self.get_queryset()
+        queryset = self.get_queryset().select_related('assigned_to')
         
         # Filter by status if provided
         status_filter = request.query_params.get('status')
         if status_filter == 'active':
-            queryset = queryset.filter(is_active=True, is_completed=False)
+            queryset = queryset.filter(ACTIVE_GOAL)
         elif status_filter == 'completed':
             queryset = queryset.filter(is_completed=True)
         elif status_filter == 'overdue':
-            queryset = queryset.filter(end_date__lt=timezone.now().date(), is_completed=False)
+            queryset = queryset.filter(overdue_goal())
         
         serializer = GoalDashboardSerializer(queryset, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def statistics(self, request):
-        """Get goal statistics."""
-        queryset = self.get_queryset()
-        
-        total_goals = queryset.count()
-        active_goals = queryset.filter(is_active=True, is_completed=False).count()
-        completed_goals = queryset.filter(is_completed=True).count()
-        overdue_goals = queryset.filter(end_date__lt=timezone.now().date(), is_completed=False).count()
-        
-        # Average progress for active goals
-        active_goals_data = queryset.filter(is_active=True, is_completed=False)
-        avg_progress = active_goals_data.aggregate(avg_progress=Avg('current_value'))['avg_progress'] or 0
-        
-        return Response({
-            'total_goals': total_goals,
-            'active_goals': active_goals,
-            'completed_goals': completed_goals,
-            'overdue_goals': overdue_goals,
-            'average_progress': float(avg_progress),
-            'completion_rate': (completed_goals / total_goals * 100) if total_goals > 0 else 0
-        })
+        """Get goal statistics, with per-type and per-period breakdowns, in one query."""
+        return Response(goal_metrics(self.get_queryset()))
 
 
 class WorkTaskViewSet(viewsets.ModelViewSet):
@@ -198,7 +178,7 @@ class WorkTaskViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
         """Get tasks for dashboard view."""
-        queryset = self.get_queryset()
+        queryset = self.get_queryset().select_related('assigned_to')
         
         # Filter by status if provided
         status_filter = request.query_params.get('status')
@@ -213,57 +193,27 @@ class WorkTaskViewSet(viewsets.ModelViewSet):
         # Filter overdue tasks
         overdue_filter = request.query_params.get('overdue')
         if overdue_filter == 'true':
-            queryset = queryset.filter(due_date__lt=timezone.now(), status__in=['pending', 'in_progress'])
+            queryset = queryset.filter(overdue_task())
         
         serializer = TaskDashboardSerializer(queryset, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def statistics(self, request):
-        """Get task statistics."""
-        queryset = self.get_queryset()
-        
-        total_tasks = queryset.count()
-        pending_tasks = queryset.filter(status='pending').count()
-        in_progress_tasks = queryset.filter(status='in_progress').count()
-        completed_tasks = queryset.filter(status='completed').count()
-        overdue_tasks = queryset.filter(due_date__lt=timezone.now(), status__in=['pending', 'in_progress']).count()
-        
-        # Priority breakdown
-        high_priority_tasks = queryset.filter(priority__in=['high', 'urgent']).count()
-        urgent_tasks = queryset.filter(priority='urgent').count()
-        
-        # Average progress for in-progress tasks
-        in_progress_data = queryset.filter(status='in_progress')
-        avg_progress = in_progress_data.aggregate(avg_progress=Avg('progress_percentage'))['avg_progress'] or 0
-        
-        return Response({
-            'total_tasks': total_tasks,
-            'pending_tasks': pending_tasks,
-            'in_progress_tasks': in_progress_tasks,
-            'completed_tasks': completed_tasks,
-            'overdue_tasks': overdue_tasks,
-            'high_priority_tasks': high_priority_tasks,
-            'urgent_tasks': urgent_tasks,
-            'average_progress': float(avg_progress),
-            'completion_rate': (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        })
+        """Get task statistics, with per-status/priority/type breakdowns, in one query."""
+        return Response(task_metrics(self.get_queryset()))
 
     @action(detail=False, methods=['get'])
     def my_tasks(self, request):
         """Get current user's tasks."""
-        queryset = self.get_queryset().filter(assigned_to=request.user)
+        queryset = self.get_queryset().filter(assigned_to=request.user).select_related('assigned_to')
         serializer = TaskDashboardSerializer(queryset, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def due_soon(self, request):
         """Get tasks due within the next 7 days."""
-        seven_days_from_now = timezone.now() + timedelta(days=7)
-        queryset = self.get_queryset().filter(
-            due_date__lte=seven_days_from_now,
-            status__in=['pending', 'in_progress']
-        )
+        queryset = self.get_queryset().filter(due_soon_task()).select_related('assigned_to').order_by('due_date')
         serializer = TaskDashboardSerializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -0,0 +1,273 @@
+"""
+Business dashboard metrics.
+
+Every KPI shown on the business dashboard for a period is computed here with a
+fixed number of conditional-aggregation queries (Count/Sum with filter=...),
+grouped by store and sales representative where the dashboard breaks figures
+down, instead of one query per metric per store/user.
+
+Results are cached per (tenant, store scope, role, period). Cache keys embed a
+version number that is bumped by sale, pipeline and client writes (see
+apps/tenants/signals.py), so a write makes the next dashboard load recompute.
+Queryset .update()/bulk writes bypass signals; DASHBOARD_CACHE_TIMEOUT bounds
+how stale those can get.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.clients.models import Client
+from apps.sales.models import Sale, SalesPipeline
+from apps.stores.models import Store
+from apps.users.models import User
+from core.cache import bump_version, get_or_set, versioned_key
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAMESPACE = 'dashboard'
+DEFAULT_CACHE_TIMEOUT = 300
+ACTIVE_PIPELINE_STAGES = ['exhibition', 'social_media', 'interested', 'store_walkin', 'negotiation']
+TOP_PERFORMERS_LIMIT = 5
+
+ZERO = Value(Decimal('0.00'), output_field=DecimalField(max_digits=12, decimal_places=2))
+
+
+def _sum(field, condition):
+    return Coalesce(Sum(field, filter=condition), ZERO)
+
+
+# ---------------------------------------------------------------------------
+# Cache invalidation
+# ---------------------------------------------------------------------------
+
+def invalidate_dashboard_metrics(tenant_id, store_id=None):
+    """Invalidate cached dashboards for a tenant: the all-stores view plus the given store."""
+    if not tenant_id:
+        return
+    bump_version(CACHE_NAMESPACE, tenant_id, 'all')
+    if store_id:
+        bump_version(CACHE_NAMESPACE, tenant_id, store_id)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+def _closed_won_since(since, now):
+    """Closed-won pipelines closed in [since, now]; falls back to updated_at when no close date is set."""
+    return Q(stage='closed_won') & (
+        Q(actual_close_date__gte=since, actual_close_date__lte=now)
+        | Q(actual_close_date__isnull=True, updated_at__gte=since, updated_at__lte=now)
+    )
+
+
+def _bucket_total(buckets, user_id, store_id=None):
+    """Sum per-(user, store) buckets for a user, optionally restricted to one store."""
+    totals = {'revenue': Decimal('0.00'), 'deals': 0, 'recent_revenue': Decimal('0.00')}
+    for (bucket_user_id, bucket_store_id), values in buckets.items():
+        if bucket_user_id != user_id or (store_id and bucket_store_id != store_id):
+            continue
+        for field in totals:
+            totals[field] += values[field]
+    return totals
+
+
+def _performer_row(user, totals, with_store_info):
+    row = {
+        'id': user.id,
+        'name': f"{user.first_name} {user.last_name}",
+        'revenue': float(totals['revenue']),
+        'deals_closed': totals['deals'],
+    }
+    if with_store_info and user.store:
+        row['store_name'] = user.store.name
+        row['store_location'] = getattr(user.store, 'location', '')
+    return row
+
+
+def compute_dashboard_metrics(tenant, store, role, start_date, end_date, now=None):
+    """
+    Compute the business dashboard payload for a tenant, optionally scoped to one store.
+
+    Returns (has_data, data). data holds every section of the dashboard response
+    except date_range, which depends on the request rather than the figures.
+    """
+    now = now or timezone.now()
+    is_business_admin = role == 'business_admin'
+
+    sales = Sale.objects.filter(tenant=tenant)
+    pipelines = SalesPipeline.objects.filter(tenant=tenant)
+    clients = Client.objects.filter(tenant=tenant, is_deleted=False)
+    stores = Store.objects.filter(tenant=tenant)
+    if store:
+        sales = sales.filter(client__store=store)
+        pipelines = pipelines.filter(client__store=store)
+        clients = clients.filter(store=store)
+        stores = stores.filter(id=store.id)
+
+    in_period = Q(created_at__gte=start_date, created_at__lte=end_date)
+    closed_in_period = Q(stage='closed_won', actual_close_date__gte=start_date, actual_close_date__lte=end_date)
+    active_in_period = Q(stage__in=ACTIVE_PIPELINE_STAGES) & in_period
+
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = now - timedelta(days=7)
+    month_start = now - timedelta(days=30)
+
+    # 1. Sales and pipeline totals: one query each
+    sales_totals = sales.aggregate(period_count=Count('id', filter=in_period))
+    pipeline_totals = pipelines.aggregate(
+        closed_any_in_period=Count('id', filter=Q(
+            actual_close_date__gte=start_date.date(), actual_close_date__lte=end_date.date(),
+        )),
+        period_revenue=_sum('expected_value', closed_in_period),
+        period_count=Count('id', filter=closed_in_period),
+        today_revenue=_sum('expected_value', _closed_won_since(today_start, now)),
+        today_count=Count('id', filter=_closed_won_since(today_start, now)),
+        week_revenue=_sum('expected_value', _closed_won_since(week_start, now)),
+        week_count=Count('id', filter=_closed_won_since(week_start, now)),
+        month_revenue=_sum('expected_value', _closed_won_since(month_start, now)),
+        month_count=Count('id', filter=_closed_won_since(month_start, now)),
+        active_revenue=_sum('expected_value', active_in_period),
+        active_count=Count('id', filter=active_in_period),
+    )
+
+    if not (sales_totals['period_count'] or pipeline_totals['closed_any_in_period']):
+        return False, {
+            'monthly_sales': {'count': 0, 'revenue': 0},
+            'monthly_customers': {'new': 0, 'total': 0},
+            'monthly_pipeline': {'active': 0, 'closed': 0, 'revenue': 0},
+            'store_performance': [],
+            'top_performers': [],
+        }
+
+    # 2. New customers in the period
+    new_customers_count = clients.filter(in_period).count()
+
+    # 3. Closed-won and sales figures per (sales rep, store): drives store
+    #    performance, top managers and top salesmen
+    buckets = defaultdict(lambda: {'revenue': Decimal('0.00'), 'deals': 0, 'recent_revenue': Decimal('0.00')})
+    pipeline_rows = (
+        pipelines.filter(closed_in_period)
+        .values('sales_representative_id', 'client__store_id')
+        .annotate(revenue=Sum('expected_value'), deals=Count('id'))
+    )
+    for row in pipeline_rows:
+        bucket = buckets[(row['sales_representative_id'], row['client__store_id'])]
+        bucket['revenue'] = row['revenue'] or Decimal('0.00')
+        bucket['deals'] = row['deals']
+    sales_rows = (
+        sales.filter(in_period)
+        .values('sales_representative_id', 'client__store_id')
+        .annotate(recent_revenue=Sum('total_amount'))
+    )
+    for row in sales_rows:
+        buckets[(row['sales_representative_id'], row['client__store_id'])]['recent_revenue'] = (
+            row['recent_revenue'] or Decimal('0.00')
+        )
+
+    # 4. Store performance
+    store_totals = defaultdict(lambda: {'revenue': Decimal('0.00'), 'deals': 0})
+    for (_, store_id), values in buckets.items():
+        store_totals[store_id]['revenue'] += values['revenue']
+        store_totals[store_id]['deals'] += values['deals']
+    store_performance = []
+    for store_obj in stores.only('id', 'name'):
+        totals = store_totals[store_obj.id]
+        store_performance.append({
+            'id': store_obj.id,
+            'name': store_obj.name,
+            'revenue': float(totals['revenue']),
+            'sales_count': totals['deals'],
+            'closed_deals': totals['deals'],
+            'purchased_revenue': float(totals['revenue']),
+        })
+
+    # 5. Top managers (business admin and manager dashboards only)
+    top_managers = []
+    if role in ['business_admin', 'manager']:
+        managers = User.objects.filter(
+            tenant=tenant, role__in=['business_admin', 'manager'], is_active=True,
+        ).select_related('store')
+        if not is_business_admin:
+            managers = managers.filter(store=store)
+        managers = list(managers)
+        for manager in managers:
+            # Business admins see each manager's figures for the manager's own store
+            store_id = manager.store_id if is_business_admin else None
+            totals = _bucket_total(buckets, manager.id, store_id)
+            if totals['revenue'] > 0 or totals['deals'] > 0:
+                row = _performer_row(manager, totals, is_business_admin)
+                row['recent_revenue'] = float(totals['recent_revenue'])
+                top_managers.append(row)
+        if not top_managers:
+            for manager in managers:
+                row = _performer_row(manager, {'revenue': 0, 'deals': 0}, is_business_admin)
+                row['recent_revenue'] = 0.0
+                top_managers.append(row)
+        top_managers.sort(key=lambda x: x['revenue'], reverse=True)
+        top_managers = top_managers[:TOP_PERFORMERS_LIMIT]
+
+    # 6. Top salesmen
+    top_salesmen = []
+    salesmen = User.objects.filter(tenant=tenant, role='inhouse_sales', is_active=True).select_related('store')
+    for salesman in salesmen:
+        store_id = salesman.store_id if is_business_admin else None
+        totals = _bucket_total(buckets, salesman.id, store_id)
+        if totals['revenue'] > 0:
+            top_salesmen.append(_performer_row(salesman, totals, is_business_admin))
+    top_salesmen.sort(key=lambda x: x['revenue'], reverse=True)
+    top_salesmen = top_salesmen[:TOP_PERFORMERS_LIMIT]
+
+    period_revenue = float(pipeline_totals['period_revenue'])
+    period_count = pipeline_totals['period_count']
+    active_revenue = float(pipeline_totals['active_revenue'])
+    return True, {
+        'monthly_sales': {
+            'count': period_count,
+            'revenue': period_revenue,
+        },
+        'monthly_customers': {
+            'new': new_customers_count,
+            'total': new_customers_count,
+        },
+        'monthly_pipeline': {
+            'active': pipeline_totals['active_count'],
+            'closed': period_count,
+            'revenue': active_revenue,
+        },
+        'total_sales': {
+            'period': period_revenue,
+            'today': float(pipeline_totals['today_revenue']),
+            'week': float(pipeline_totals['week_revenue']),
+            'month': float(pipeline_totals['month_revenue']),
+            'period_count': period_count,
+            'today_count': pipeline_totals['today_count'],
+            'week_count': pipeline_totals['week_count'],
+            'month_count': pipeline_totals['month_count'],
+        },
+        'pipeline_revenue': active_revenue,
+        'purchased_pipeline_count': period_count,
+        'pipeline_deals_count': pipeline_totals['active_count'],
+        'store_performance': store_performance,
+        'top_managers': top_managers,
+        'top_salesmen': top_salesmen,
+    }
+
+
+def get_dashboard_metrics(tenant, store, role, start_date, end_date):
+    """Cached wrapper around compute_dashboard_metrics, keyed per (tenant, store, role, period)."""
+    key = versioned_key(
+        CACHE_NAMESPACE, tenant.id, [role, start_date.isoformat(), end_date.isoformat()],
+        scope=[store.id if store else 'all'],
+    )
+    return get_or_set(
+        key,
+        lambda: compute_dashboard_metrics(tenant, store, role, start_date, end_date),
+        getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT),
+    )
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.clients.models import Client
+from apps.sales.models import Sale, SalesPipeline
+from .metrics import invalidate_dashboard_metrics
+
+
+@receiver([post_save, post_delete], sender=Client)
+def invalidate_dashboard_on_client_write(sender, instance, **kwargs):
+    invalidate_dashboard_metrics(instance.tenant_id, instance.store_id)
+
+
+@receiver([post_save, post_delete], sender=Sale)
+@receiver([post_save, post_delete], sender=SalesPipeline)
+def invalidate_dashboard_on_sale_write(sender, instance, **kwargs):
+    client_field = sender._meta.get_field('client')
+    if client_field.is_cached(instance):
+        store_id = instance.client.store_id
+    else:
+        store_id = Client.objects.filter(id=instance.client_id).values_list('store_id', flat=True).first()
+    invalidate_dashboard_metrics(instance.tenant_id, store_id)
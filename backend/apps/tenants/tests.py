@@ -1,7 +1,10 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
+from .metrics import compute_dashboard_metrics, get_dashboard_metrics
 from .models import Tenant
 from apps.clients.models import Client
 from apps.sales.models import Sale, SalesPipeline
@@ -172,3 +175,60 @@ class BusinessDashboardViewTest(APITestCase):
         
         # Should return 403 Forbidden
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class DashboardMetricsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store = Store.objects.create(
+            name="Main Store", code="MS001", address="123 Test St", city="Test City", state="Test State",
+            tenant=self.tenant,
+        )
+        self.other_store = Store.objects.create(
+            name="Second Store", code="SS001", address="456 Test St", city="Test City", state="Test State",
+            tenant=self.tenant,
+        )
+        self.sales_user = User.objects.create_user(
+            username="sales", password="testpass123", role=User.Role.INHOUSE_SALES,
+            tenant=self.tenant, store=self.store,
+        )
+        self.client_obj = Client.objects.create(
+            first_name="John", phone="1234567890", tenant=self.tenant, store=self.store,
+        )
+        self.now = timezone.now()
+        self.start = self.now.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.end = self.now.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+    def _close_deal(self, value):
+        return SalesPipeline.objects.create(
+            title="Deal", client=self.client_obj, sales_representative=self.sales_user,
+            stage=SalesPipeline.Stage.CLOSED_WON, expected_value=Decimal(value),
+            actual_close_date=self.now.date(), tenant=self.tenant,
+        )
+
+    def test_kpis_are_grouped_by_store(self):
+        self._close_deal("500.00")
+        self._close_deal("250.00")
+
+        has_data, data = compute_dashboard_metrics(self.tenant, None, 'business_admin', self.start, self.end)
+
+        self.assertTrue(has_data)
+        self.assertEqual(data['monthly_sales'], {'count': 2, 'revenue': 750.0})
+        stores = {row['id']: row for row in data['store_performance']}
+        self.assertEqual(stores[self.store.id]['closed_deals'], 2)
+        self.assertEqual(stores[self.other_store.id]['revenue'], 0.0)
+        self.assertEqual(data['top_salesmen'][0]['id'], self.sales_user.id)
+        self.assertEqual(data['top_salesmen'][0]['store_name'], "Main Store")
+
+    def test_cached_metrics_are_invalidated_by_writes(self):
+        self._close_deal("500.00")
+        _, first = get_dashboard_metrics(self.tenant, self.store, 'manager', self.start, self.end)
+        with self.assertNumQueries(0):
+            get_dashboard_metrics(self.tenant, self.store, 'manager', self.start, self.end)
+
+        self._close_deal("250.00")
+        _, second = get_dashboard_metrics(self.tenant, self.store, 'manager', self.start, self.end)
+
+        self.assertEqual(first['monthly_sales']['revenue'], 500.0)
+        self.assertEqual(second['monthly_sales']['revenue'], 750.0)
@@ -0,0 +1,138 @@
+"""
+JWT authentication with a cached principal.
+
+simplejwt's JWTAuthentication loads the User row on every request, and views
+and ScopedVisibilityMiddleware then lazily load user.tenant and user.store on
+top. Here the user is loaded once with its tenant and store, cached for
+AUTH_PRINCIPAL_CACHE_TIMEOUT seconds and rehydrated from the cache, so an
+authenticated read needs no users/tenants/stores queries.
+
+Tokens issued through CRMRefreshToken carry role, tenant_id and store_id
+claims. A token whose claims no longer match the user (role or store changed)
+is rejected, so the client has to log in again and gets a token with the new
+scope. Tokens issued before the claims existed still authenticate.
+
+Invalidation (see signals.py):
+  - saving or deleting a user drops that user's cached principal
+  - saving or deleting a tenant or store bumps the tenant's principal version,
+    which makes every cached principal of that tenant stale at once
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.cache import bump_version, get_version, version_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRINCIPAL_CACHE_TIMEOUT = 60
+PRINCIPAL_NAMESPACE = 'auth:principal'
+PRINCIPAL_CLAIMS = ('role', 'tenant_id', 'store_id')
+
+
+def principal_cache_timeout():
+    return getattr(settings, 'AUTH_PRINCIPAL_CACHE_TIMEOUT', DEFAULT_PRINCIPAL_CACHE_TIMEOUT)
+
+
+def principal_key(user_id):
+    return f'auth:principal:{user_id}'
+
+
+def tenant_version_key(tenant_id):
+    return version_key(PRINCIPAL_NAMESPACE, tenant_id)
+
+
+def principal_claims(user):
+    return {claim: getattr(user, claim) for claim in PRINCIPAL_CLAIMS}
+
+
+def invalidate_principal(user_id):
+    cache.delete(principal_key(user_id))
+
+
+def invalidate_tenant_principals(tenant_id):
+    """Make every cached principal of a tenant stale (tenant or store changed)."""
+    bump_version(PRINCIPAL_NAMESPACE, tenant_id)
+
+
+class CRMRefreshToken(RefreshToken):
+    """Refresh token whose access tokens also carry the user's role, tenant_id and store_id."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim, value in principal_claims(user).items():
+            token[claim] = value
+        return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves the user from the principal cache."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        has_claims = all(claim in validated_token for claim in PRINCIPAL_CLAIMS)
+        try:
+            user = self._cached_principal(user_id, validated_token.get('tenant_id') if has_claims else None)
+        except Exception as e:
+            logger.warning("Principal cache unavailable: %s", e)
+            user = None
+        if user is None:
+            user = self._load_principal(user_id, validated_token.get('tenant_id'))
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        if has_claims and any(validated_token[claim] != value for claim, value in principal_claims(user).items()):
+            raise AuthenticationFailed(
+                _("The user's role or store has changed, please log in again."), code='token_scope_changed',
+            )
+        return user
+
+    def _cached_principal(self, user_id, tenant_id):
+        key = principal_key(user_id)
+        if tenant_id is not None:
+            # Token names the tenant: fetch principal and tenant version together
+            cached = cache.get_many([key, tenant_version_key(tenant_id)])
+            entry, version = cached.get(key), cached.get(tenant_version_key(tenant_id))
+            if entry is not None and entry[1].tenant_id != tenant_id:
+                version = cache.get(tenant_version_key(entry[1].tenant_id))
+        else:
+            entry = cache.get(key)
+            version = cache.get(tenant_version_key(entry[1].tenant_id)) if entry is not None else None
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def _load_principal(self, user_id, tenant_id):
+        User = get_user_model()
+        # Read the version before loading so a tenant/store change racing with
+        # this load leaves the entry stale rather than caching old data as fresh
+        version = get_version(PRINCIPAL_NAMESPACE, tenant_id)
+        try:
+            user = User.objects.select_related('tenant', 'store').get(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if user.tenant_id != tenant_id:
+            version = get_version(PRINCIPAL_NAMESPACE, user.tenant_id)
+        try:
+            cache.set(principal_key(user_id), (version, user), principal_cache_timeout())
+        except Exception as e:
+            logger.warning("Principal cache unavailable: %s", e)
+        return user
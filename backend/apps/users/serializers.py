@@ -3,6 +3,10 @@ from django.contrib.auth.password_validation import validate_password
 from .models import User, TeamMember, TeamMemberActivity, TeamMemberPerformance
 from apps.stores.models import Store
 from shared.validators import validate_international_phone_number, normalize_phone_number
+import logging
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -240,7 +244,8 @@ class TeamMemberListSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         """Add debugging to see what data is being serialized."""
         data = super().to_representation(instance)
-        print(f"Serializing team member: {instance.user.get_full_name()} - Data: {data}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Serializing team member: %s - Data: %s', instance.user.get_full_name(), data)
         return data
 
 
@@ -290,17 +295,17 @@ class TeamMemberCreateSerializer(serializers.ModelSerializer):
 
     def validate_username(self, value):
         """Check that username is unique."""
-        print(f"Validating username: {value}")
+        logger.debug('Validating username: %s', value)
         if User.objects.filter(username=value).exists():
-            print(f"Username {value} already exists")
+            logger.debug('Username %s already exists', value)
             raise serializers.ValidationError("Username already exists")
         return value
 
     def validate_email(self, value):
         """Check that email is unique."""
-        print(f"Validating email: {value}")
+        logger.debug('Validating email: %s', value)
         if User.objects.filter(email=value).exists():
-            print(f"Email {value} already exists")
+            logger.debug('Email %s already exists', value)
             raise serializers.ValidationError("Email already exists")
         return value
 
@@ -321,30 +326,30 @@ class TeamMemberCreateSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        print(f"TeamMemberCreateSerializer.create called with validated_data: {validated_data}")
+        logger.debug('TeamMemberCreateSerializer.create called with validated_data: %s', validated_data)
         
         # Extract user data from the request data
         request_data = self.context.get('request').data
         request = self.context.get('request')
         current_user = request.user if request else None
         
-        print(f"Request data: {request_data}")
-        print(f"Current user: {current_user.username if current_user else 'None'}")
+        logger.debug('Request data: %s', request_data)
+        logger.debug('Current user: %s', current_user.username if current_user else 'None')
         
         # Automatically assign store from current manager's store
         store = None
         if current_user and current_user.store:
             store = current_user.store
-            print(f"Auto-assigning store: {store.name} (ID: {store.id})")
+            logger.debug('Auto-assigning store: %s (ID: %s)', store.name, store.id)
         else:
             # Fallback: try to get store from request data
             store_id = request_data.get('store')
             if store_id:
                 try:
                     store = Store.objects.get(id=store_id)
-                    print(f"Using store from request: {store.name} (ID: {store.id})")
+                    logger.debug('Using store from request: %s (ID: %s)', store.name, store.id)
                 except Store.DoesNotExist:
-                    print(f"Store with ID {store_id} not found")
+                    logger.warning('Store with ID %s not found', store_id)
         
         user_data = {
             'username': request_data.get('username'),
@@ -409,7 +414,7 @@ class TeamMemberCreateSerializer(serializers.ModelSerializer):
         
         team_member.save()
         
-        print(f"Team member created successfully: {team_member.id}, Employee ID: {employee_id}")
+        logger.debug('Team member created successfully: %s, Employee ID: %s', team_member.id, employee_id)
         return team_member
 
     def to_representation(self, instance):
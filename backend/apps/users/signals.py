@@ -0,0 +1,28 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.stores.models import Store
+from apps.tenants.models import Tenant
+from .authentication import invalidate_principal, invalidate_tenant_principals
+from .models import User
+
+
+# Invalidate after commit: a request loading the principal while the change is
+# still uncommitted would otherwise re-cache the old row straight away.
+
+@receiver([post_save, post_delete], sender=User)
+def drop_cached_principal(sender, instance, **kwargs):
+    transaction.on_commit(partial(invalidate_principal, instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Tenant)
+def tenant_changed(sender, instance, **kwargs):
+    transaction.on_commit(partial(invalidate_tenant_principals, instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Store)
+def store_changed(sender, instance, **kwargs):
+    transaction.on_commit(partial(invalidate_tenant_principals, instance.tenant_id))
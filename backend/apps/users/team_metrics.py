@@ -0,0 +1,144 @@
+"""
+Per-salesperson performance metrics computed in bulk.
+
+The team views used to run a separate count/sum query per metric per user. This
+module computes every figure for a whole list of users with three grouped
+aggregate queries (clients and appointments keyed by created_by_id, pipelines
+keyed by sales_representative_id), so cost no longer grows with team size.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Avg, Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+OPEN_PIPELINE_STAGES = ['exhibition', 'social_media', 'interested', 'store_walkin', 'negotiation']
+
+# Look-back windows reported alongside the all-time totals
+WINDOWS = {'30_days': 30, '90_days': 90, '1_year': 365}
+
+ZERO = Value(Decimal('0.00'), output_field=DecimalField(max_digits=12, decimal_places=2))
+
+
+def _empty_metrics():
+    metrics = {
+        'total_customers': 0,
+        'total_deals': 0,
+        'open_deals': 0,
+        'closed_won_deals': 0,
+        'closed_lost_deals': 0,
+        'deals_30_days': 0,
+        'total_revenue': Decimal('0.00'),
+        'average_deal_value': Decimal('0.00'),
+        'total_appointments': 0,
+    }
+    for window in WINDOWS:
+        metrics[f'customers_{window}'] = 0
+        metrics[f'revenue_{window}'] = Decimal('0.00')
+        metrics[f'appointments_{window}'] = 0
+    return metrics
+
+
+def compute_team_metrics(users, tenant=None, now=None):
+    """
+    Compute performance metrics for many users at once.
+
+    users may be a queryset or an iterable of users/ids. Returns
+    {user_id: metrics}; users with no activity get zeroed metrics.
+    Counts are scoped to tenant when given (each user's own tenant otherwise
+    matches the per-user queries these replace).
+    """
+    from apps.clients.models import Appointment, Client
+    from apps.sales.models import SalesPipeline
+
+    user_ids = [getattr(user, 'id', user) for user in users]
+    metrics = {user_id: _empty_metrics() for user_id in user_ids}
+    if not user_ids:
+        return metrics
+
+    now = now or timezone.now()
+    cutoffs = {window: now - timedelta(days=days) for window, days in WINDOWS.items()}
+    scope = {'tenant': tenant} if tenant is not None else {}
+
+    # 1. Customers created by each user
+    client_rows = (
+        Client.objects.filter(created_by_id__in=user_ids, **scope)
+        .values('created_by_id')
+        .annotate(
+            total_customers=Count('id'),
+            **{
+                f'customers_{window}': Count('id', filter=Q(created_at__gte=cutoff))
+                for window, cutoff in cutoffs.items()
+            },
+        )
+        .order_by()
+    )
+    for row in client_rows:
+        metrics[row.pop('created_by_id')].update(row)
+
+    # 2. Deals and revenue per sales representative
+    won = Q(stage='closed_won')
+    pipeline_rows = (
+        SalesPipeline.objects.filter(sales_representative_id__in=user_ids, **scope)
+        .values('sales_representative_id')
+        .annotate(
+            total_deals=Count('id'),
+            open_deals=Count('id', filter=Q(stage__in=OPEN_PIPELINE_STAGES)),
+            closed_won_deals=Count('id', filter=won),
+            closed_lost_deals=Count('id', filter=Q(stage='closed_lost')),
+            deals_30_days=Count('id', filter=Q(created_at__gte=cutoffs['30_days'])),
+            total_revenue=Coalesce(Sum('expected_value', filter=won), ZERO),
+            average_deal_value=Coalesce(Avg('expected_value', filter=won), ZERO),
+            **{
+                f'revenue_{window}': Coalesce(
+                    Sum('actual_value', filter=won & Q(actual_close_date__gte=timezone.localdate(cutoff))),
+                    ZERO,
+                )
+                for window, cutoff in cutoffs.items()
+            },
+        )
+        .order_by()
+    )
+    for row in pipeline_rows:
+        metrics[row.pop('sales_representative_id')].update(row)
+
+    # 3. Appointments created by each user
+    appointment_rows = (
+        Appointment.objects.filter(created_by_id__in=user_ids, **scope)
+        .values('created_by_id')
+        .annotate(
+            total_appointments=Count('id'),
+            **{
+                f'appointments_{window}': Count('id', filter=Q(created_at__gte=cutoff))
+                for window, cutoff in cutoffs.items()
+            },
+        )
+        .order_by()
+    )
+    for row in appointment_rows:
+        metrics[row.pop('created_by_id')].update(row)
+
+    for user_metrics in metrics.values():
+        total_deals = user_metrics['total_deals']
+        user_metrics['conversion_rate'] = (
+            user_metrics['closed_won_deals'] / total_deals * 100 if total_deals else 0
+        )
+    return metrics
+
+
+def calculate_performance_score(customers, deals, revenue, conversion_rate):
+    """Weighted 0-100 score from customers, closed deals, revenue and conversion rate."""
+    # Convert Decimal to float to avoid type mismatch
+    revenue_float = float(revenue) if revenue else 0.0
+
+    customer_score = min(customers * 10, 100)        # Max 100 points for customers
+    deal_score = min(deals * 5, 100)                 # Max 100 points for deals
+    revenue_score = min(revenue_float / 1000, 100)   # Max 100 points for revenue (₹100k = 100 points)
+    conversion_score = conversion_rate               # 0-100 points for conversion rate
+
+    total_score = (customer_score * 0.25 +
+                   deal_score * 0.25 +
+                   revenue_score * 0.3 +
+                   conversion_score * 0.2)
+    return round(total_score, 1)
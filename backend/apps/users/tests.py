@@ -1,3 +1,118 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.clients.models import Client
+from apps.sales.models import SalesPipeline
+from apps.stores.models import Store
+from apps.tenants.models import Tenant
+from .authentication import CachedJWTAuthentication, CRMRefreshToken
+from .team_metrics import compute_team_metrics
+
+User = get_user_model()
+
+
+class TeamMetricsTest(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store = Store.objects.create(
+            name="Main Store", code="MS001", address="123 Test St", city="Test City", state="Test State",
+            tenant=self.tenant,
+        )
+        self.manager = User.objects.create_user(
+            username="manager", password="testpass123", role=User.Role.MANAGER,
+            tenant=self.tenant, store=self.store,
+        )
+        self.sales_users = [
+            User.objects.create_user(
+                username=f"sales{i}", password="testpass123", role=User.Role.INHOUSE_SALES,
+                tenant=self.tenant, store=self.store,
+            )
+            for i in range(3)
+        ]
+        top = self.sales_users[0]
+        client = Client.objects.create(
+            first_name="John", phone="1234567890", tenant=self.tenant, store=self.store, created_by=top,
+        )
+        for stage, value in [('closed_won', '1000.00'), ('closed_won', '500.00'), ('negotiation', '200.00')]:
+            SalesPipeline.objects.create(
+                title="Deal", client=client, sales_representative=top, stage=stage,
+                expected_value=Decimal(value), actual_value=Decimal(value),
+                actual_close_date=timezone.localdate() if stage == 'closed_won' else None,
+                tenant=self.tenant,
+            )
+
+    def test_metrics_are_grouped_per_user(self):
+        with self.assertNumQueries(3):
+            metrics = compute_team_metrics(self.sales_users, tenant=self.tenant)
+
+        top = metrics[self.sales_users[0].id]
+        self.assertEqual(top['total_customers'], 1)
+        self.assertEqual(top['total_deals'], 3)
+        self.assertEqual(top['closed_won_deals'], 2)
+        self.assertEqual(top['open_deals'], 1)
+        self.assertEqual(top['total_revenue'], Decimal('1500.00'))
+        self.assertEqual(top['revenue_30_days'], Decimal('1500.00'))
+        self.assertEqual(metrics[self.sales_users[1].id]['total_deals'], 0)
+
+    def test_team_performance_query_count_is_independent_of_team_size(self):
+        self.client.force_authenticate(user=self.manager)
+        url = '/api/sales-team/performance/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['performance_data'][0]['user_id'], self.sales_users[0].id)
+
+        with self.assertNumQueries(4):  # sales users + three grouped metric queries
+            self.client.get(url)
+
+
+class CachedPrincipalTest(TestCase):
+    def setUp(self):
+        # Principals cached by earlier tests would be served for the reused user ids
+        cache.clear()
+        self.tenant = Tenant.objects.create(name="Test Business", slug="test-business")
+        self.store = Store.objects.create(
+            name="Main Store", code="MS001", address="123 Test St", city="Test City", state="Test State",
+            tenant=self.tenant,
+        )
+        self.user = User.objects.create_user(
+            username="manager", password="testpass123", role=User.Role.MANAGER,
+            tenant=self.tenant, store=self.store,
+        )
+        self.auth = CachedJWTAuthentication()
+        self.token = AccessToken(str(CRMRefreshToken.for_user(self.user).access_token))
+
+    def test_token_carries_scope_claims(self):
+        self.assertEqual(
+            (self.token['role'], self.token['tenant_id'], self.token['store_id']),
+            (User.Role.MANAGER, self.tenant.id, self.store.id),
+        )
+
+    def test_cached_principal_needs_no_queries(self):
+        with self.assertNumQueries(1):
+            self.auth.get_user(self.token)
+        with self.assertNumQueries(0):
+            user = self.auth.get_user(self.token)
+            self.assertEqual((user.id, user.tenant.name, user.store.name), (self.user.id, "Test Business", "Main Store"))
+
+    def test_role_change_rejects_old_token(self):
+        self.auth.get_user(self.token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = User.Role.INHOUSE_SALES
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
 
-# Create your tests here.
+    def test_store_change_refreshes_principal(self):
+        self.auth.get_user(self.token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.store.name = "Renamed Store"
+            self.store.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.auth.get_user(self.token).store.name, "Renamed Store")
@@ -15,6 +15,7 @@ from django.utils import timezone
 from datetime import datetime, timedelta
 import logging
 from .models import User, TeamMember, TeamMemberActivity, TeamMemberPerformance
+from .team_metrics import calculate_performance_score, compute_team_metrics
 from .serializers import (
     UserSerializer, UserCreateSerializer, UserRegistrationSerializer, UserProfileSerializer,
     TeamMemberSerializer, TeamMemberListSerializer, TeamMemberCreateSerializer,
@@ -27,6 +28,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
+from .authentication import CRMRefreshToken
 from django.contrib.auth import authenticate
 from django.shortcuts import render
 from django.db.models import Q
@@ -828,11 +830,19 @@ class TeamStatsView(APIView):
             team_members = TeamMember.objects.filter(user=user)
         
         # Calculate statistics
-        total_members = team_members.count()
-        active_members = team_members.filter(status='active').count()
-        total_sales = team_members.aggregate(
-            total=Sum('current_sales')
-        )['total'] or 0
+        members = list(team_members.select_related('user'))
+        total_members = len(members)
+        active_members = sum(1 for member in members if member.status == 'active')
+        
+        # Live closed-won revenue per member, computed for the whole team at once
+        team_metrics = compute_team_metrics(
+            [member.user_id for member in members],
+            tenant=None if user.is_platform_admin else user.tenant,
+        )
+        member_revenue = {
+            member.id: team_metrics[member.user_id]['total_revenue'] for member in members
+        }
+        total_sales = sum(member_revenue.values())
         
         # Calculate average performance
         performance_ratings = {
@@ -846,15 +856,17 @@ class TeamStatsView(APIView):
         avg_performance = 0
         if total_members > 0:
             total_rating = 0
-            for member in team_members:
+            for member in members:
                 if member.performance_rating:
                     total_rating += performance_ratings.get(member.performance_rating, 3)
             avg_performance = total_rating / total_members
         
         # Get top performers
-        top_performers = team_members.filter(
-            performance_rating__in=['excellent', 'good']
-        ).order_by('-current_sales')[:5]
+        top_performers = sorted(
+            (member for member in members if member.performance_rating in ['excellent', 'good']),
+            key=lambda member: member_revenue[member.id],
+            reverse=True
+        )[:5]
         
         top_performers_data = []
         for member in top_performers:
@@ -862,14 +874,14 @@ class TeamStatsView(APIView):
                 'id': member.id,
                 'name': member.user.get_full_name(),
                 'role': member.user.get_role_display(),
-                'sales': float(member.current_sales),
+                'sales': float(member_revenue[member.id]),
                 'performance': member.performance_rating
             })
         
         # Get recent activities
         recent_activities = TeamMemberActivity.objects.filter(
             team_member__in=team_members
-        ).order_by('-created_at')[:10]
+        ).select_related('team_member__user').order_by('-created_at')[:10]
         
         recent_activities_data = []
         for activity in recent_activities:
@@ -1161,7 +1173,7 @@ def login_view(request):
     )
 
     # Generate tokens
-    refresh = RefreshToken.for_user(user)
+    refresh = CRMRefreshToken.for_user(user)
 
     return Response(
         {
@@ -1210,10 +1222,11 @@ def sales_pin_login_view(request):
         client_ip = request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')[0] or request.META.get('REMOTE_ADDR', 'unknown')
         cache = caches['default']
         key = f"sales_pin_attempts:{client_ip}"
-        attempts = cache.get(key, 0)
-        if attempts >= 20:
+        # add + incr is atomic on a shared cache, so concurrent workers count every attempt
+        cache.add(key, 0, timeout=60)  # window 60s
+        attempts = cache.incr(key)
+        if attempts > 20:
             return Response({'error': 'Too many attempts. Please try again later.'}, status=status.HTTP_429_TOO_MANY_REQUESTS)
-        cache.set(key, attempts + 1, timeout=60)  # window 60s
     except Exception:
         pass
 
@@ -1243,7 +1256,7 @@ def sales_pin_login_view(request):
             return Response({'error': 'Your organization account is currently inactive. Please contact your administrator.'}, status=status.HTTP_401_UNAUTHORIZED)
 
     # Issue tokens (bypass password by design for PIN flow)
-    refresh = RefreshToken.for_user(user)
+    refresh = CRMRefreshToken.for_user(user)
     return Response({
         'success': True,
         'message': 'Login successful',
@@ -1462,94 +1475,34 @@ class SalesTeamPerformanceView(APIView):
                 is_active=True
             )
         
-        # Get performance data for each sales user
+        # Get performance data for all sales users in a constant number of queries
+        sales_users = list(sales_users.select_related('store'))
+        team_metrics = compute_team_metrics(sales_users, tenant=user.tenant)
+        now = timezone.now()
         performance_data = []
         for sales_user in sales_users:
-            # Get recent activity (last 30 days)
-            thirty_days_ago = timezone.now() - timedelta(days=30)
-            
-            # Import models for performance calculation
-            from apps.clients.models import Client
-            from apps.sales.models import SalesPipeline
-            
-            # Count total customers created by this sales person
-            total_customers = Client.objects.filter(
-                created_by=sales_user,
-                tenant=sales_user.tenant
-            ).count()
-            
-            # Count recent customers (last 30 days)
-            recent_customers = Client.objects.filter(
-                created_by=sales_user,
-                tenant=sales_user.tenant,
-                created_at__gte=thirty_days_ago
-            ).count()
-            
-            # Count total deals/opportunities
-            total_deals = SalesPipeline.objects.filter(
-                sales_representative=sales_user,
-                tenant=sales_user.tenant
-            ).count()
-            
-            # Count closed deals
-            closed_deals = SalesPipeline.objects.filter(
-                sales_representative=sales_user,
-                tenant=sales_user.tenant,
-                stage='closed_won'
-            ).count()
-            
-            # Calculate total revenue from closed deals
-            total_revenue = SalesPipeline.objects.filter(
-                sales_representative=sales_user,
-                tenant=sales_user.tenant,
-                stage='closed_won'
-            ).aggregate(
-                total=Sum('expected_value', default=0)
-            )['total'] or 0
-            
-            # Calculate recent revenue (last 30 days)
-            recent_revenue = SalesPipeline.objects.filter(
-                sales_representative=sales_user,
-                tenant=sales_user.tenant,
-                stage='closed_won',
-                actual_close_date__gte=thirty_days_ago
-            ).aggregate(
-                total=Sum('actual_value', default=0)
-            )['total'] or 0
-            
-            # Count appointments
-            from apps.clients.models import Appointment
-            total_appointments = Appointment.objects.filter(
-                created_by=sales_user,
-                tenant=sales_user.tenant
-            ).count()
-            
-            recent_appointments = Appointment.objects.filter(
-                created_by=sales_user,
-                tenant=sales_user.tenant,
-                created_at__gte=thirty_days_ago
-            ).count()
+            metrics = team_metrics[sales_user.id]
+            total_customers = metrics['total_customers']
+            total_deals = metrics['total_deals']
+            closed_deals = metrics['closed_won_deals']
+            total_revenue = metrics['total_revenue']
+            conversion_rate = metrics['conversion_rate']
             
             # Get last activity
             last_activity = sales_user.last_login or sales_user.created_at
             
-            # Calculate conversion rate
-            conversion_rate = 0
-            if total_deals > 0:
-                conversion_rate = (closed_deals / total_deals) * 100
-            
             performance_data.append({
                 'user_id': sales_user.id,
                 'username': sales_user.username,
                 'full_name': sales_user.get_full_name() or sales_user.username,
                 'store_name': sales_user.store.name if sales_user.store else None,
-                'is_online': sales_user.last_login and sales_user.last_login > (timezone.now() - timedelta(minutes=15)),
+                'is_online': sales_user.last_login and sales_user.last_login > (now - timedelta(minutes=15)),
                 'last_activity': last_activity,
                 'status': 'active' if sales_user.is_active else 'inactive',
                 
                 # Customer metrics
                 'total_customers': total_customers,
-                'recent_customers': recent_customers,
+                'recent_customers': metrics['customers_30_days'],
                 
                 # Deal metrics
                 'total_deals': total_deals,
@@ -1558,16 +1511,16 @@ class SalesTeamPerformanceView(APIView):
                 
                 # Revenue metrics
                 'total_revenue': total_revenue,
-                'recent_revenue': recent_revenue,
+                'recent_revenue': metrics['revenue_30_days'],
                 'average_deal_value': total_revenue / closed_deals if closed_deals > 0 else 0,
                 
                 # Appointment metrics
-                'total_appointments': total_appointments,
-                'recent_appointments': recent_appointments,
+                'total_appointments': metrics['total_appointments'],
+                'recent_appointments': metrics['appointments_30_days'],
                 
                 # Performance metrics
                 'conversion_rate': round(conversion_rate, 2),
-                'performance_score': self._calculate_performance_score(
+                'performance_score': calculate_performance_score(
                     total_customers, closed_deals, total_revenue, conversion_rate
                 )
             })
@@ -1591,25 +1544,6 @@ class SalesTeamPerformanceView(APIView):
             },
             'performance_data': performance_data
         })
-    
-    def _calculate_performance_score(self, customers, deals, revenue, conversion_rate):
-        """Calculate a performance score based on multiple metrics"""
-        # Convert Decimal to float to avoid type mismatch
-        revenue_float = float(revenue) if revenue else 0.0
-        
-        # Weighted scoring system
-        customer_score = min(customers * 10, 100)  # Max 100 points for customers
-        deal_score = min(deals * 5, 100)           # Max 100 points for deals
-        revenue_score = min(revenue_float / 1000, 100)   # Max 100 points for revenue (₹100k = 100 points)
-        conversion_score = conversion_rate          # 0-100 points for conversion rate
-        
-        # Calculate weighted average
-        total_score = (customer_score * 0.25 + 
-                      deal_score * 0.25 + 
-                      revenue_score * 0.3 + 
-                      conversion_score * 0.2)
-        
-        return round(total_score, 1)
 
 
 class SalesPersonDetailView(APIView):
@@ -1661,18 +1595,11 @@ class SalesPersonDetailView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Import models for detailed metrics
-        from apps.clients.models import Client, Appointment
+        # Import models for recent activity
+        from apps.clients.models import Client
         from apps.sales.models import SalesPipeline
-        from django.db.models import Sum, Count, Avg
-        from django.utils import timezone
-        from datetime import timedelta
         
-        # Time periods for analysis
         now = timezone.now()
-        thirty_days_ago = now - timedelta(days=30)
-        ninety_days_ago = now - timedelta(days=90)
-        one_year_ago = now - timedelta(days=365)
         
         # Basic profile information
         profile_data = {
@@ -1691,117 +1618,47 @@ class SalesPersonDetailView(APIView):
             'is_online': sales_person.last_login and sales_person.last_login > (now - timedelta(minutes=15))
         }
         
+        metrics = compute_team_metrics([sales_person], tenant=sales_person.tenant, now=now)[sales_person.id]
+        
         # Customer metrics
         customer_metrics = {
-            'total_customers': Client.objects.filter(
-                created_by=sales_person,
-                tenant=sales_person.tenant
-            ).count(),
-            'customers_30_days': Client.objects.filter(
-                created_by=sales_person,
-                tenant=sales_person.tenant,
-                created_at__gte=thirty_days_ago
-            ).count(),
-            'customers_90_days': Client.objects.filter(
-                created_by=sales_person,
-                tenant=sales_person.tenant,
-                created_at__gte=ninety_days_ago
-            ).count(),
-            'customers_1_year': Client.objects.filter(
-                created_by=sales_person,
-                tenant=sales_person.tenant,
-                created_at__gte=one_year_ago
-            ).count()
+            'total_customers': metrics['total_customers'],
+            'customers_30_days': metrics['customers_30_days'],
+            'customers_90_days': metrics['customers_90_days'],
+            'customers_1_year': metrics['customers_1_year']
         }
         
         # Deal metrics
         deal_metrics = {
-            'total_deals': SalesPipeline.objects.filter(
-                sales_representative=sales_person,
-                tenant=sales_person.tenant
-            ).count(),
-            'open_deals': SalesPipeline.objects.filter(
-                sales_representative=sales_person,
-                tenant=sales_person.tenant,
-                stage__in=['prospecting', 'qualification', 'proposal', 'negotiation']
-            ).count(),
-            'closed_won_deals': SalesPipeline.objects.filter(
-                sales_representative=sales_person,
-                tenant=sales_person.tenant,
-                stage='closed_won'
-            ).count(),
-            'closed_lost_deals': SalesPipeline.objects.filter(
-                sales_representative=sales_person,
-                tenant=sales_person.tenant,
-                stage='closed_lost'
-            ).count(),
-            'deals_30_days': SalesPipeline.objects.filter(
-                sales_representative=sales_person,
-                tenant=sales_person.tenant,
-                created_at__gte=thirty_days_ago
-            ).count()
+            'total_deals': metrics['total_deals'],
+            'open_deals': metrics['open_deals'],
+            'closed_won_deals': metrics['closed_won_deals'],
+            'closed_lost_deals': metrics['closed_lost_deals'],
+            'deals_30_days': metrics['deals_30_days']
         }
         
         # Revenue metrics
-        revenue_data = SalesPipeline.objects.filter(
-            sales_representative=sales_person,
-            tenant=sales_person.tenant,
-            stage='closed_won'
-        ).aggregate(
-            total_revenue=Sum('expected_value', default=0),
-            avg_deal_value=Avg('expected_value', default=0),
-            total_deals=Count('id')
-        )
-        
         revenue_metrics = {
-            'total_revenue': revenue_data['total_revenue'] or 0,
-            'average_deal_value': revenue_data['avg_deal_value'] or 0,
-            'revenue_30_days': SalesPipeline.objects.filter(
-                sales_representative=sales_person,
-                tenant=sales_person.tenant,
-                stage='closed_won',
-                actual_close_date__gte=thirty_days_ago
-            ).aggregate(total=Sum('actual_value', default=0))['total'] or 0,
-            'revenue_90_days': SalesPipeline.objects.filter(
-                sales_representative=sales_person,
-                tenant=sales_person.tenant,
-                stage='closed_won',
-                actual_close_date__gte=ninety_days_ago
-            ).aggregate(total=Sum('actual_value', default=0))['total'] or 0,
-            'revenue_1_year': SalesPipeline.objects.filter(
-                sales_representative=sales_person,
-                tenant=sales_person.tenant,
-                stage='closed_won',
-                actual_close_date__gte=one_year_ago
-            ).aggregate(total=Sum('actual_value', default=0))['total'] or 0
+            'total_revenue': metrics['total_revenue'],
+            'average_deal_value': metrics['average_deal_value'],
+            'revenue_30_days': metrics['revenue_30_days'],
+            'revenue_90_days': metrics['revenue_90_days'],
+            'revenue_1_year': metrics['revenue_1_year']
         }
         
         # Appointment metrics
         appointment_metrics = {
-            'total_appointments': Appointment.objects.filter(
-                created_by=sales_person,
-                tenant=sales_person.tenant
-            ).count(),
-            'appointments_30_days': Appointment.objects.filter(
-                created_by=sales_person,
-                tenant=sales_person.tenant,
-                created_at__gte=thirty_days_ago
-            ).count(),
-            'appointments_90_days': Appointment.objects.filter(
-                created_by=sales_person,
-                tenant=sales_person.tenant,
-                created_at__gte=ninety_days_ago
-            ).count()
+            'total_appointments': metrics['total_appointments'],
+            'appointments_30_days': metrics['appointments_30_days'],
+            'appointments_90_days': metrics['appointments_90_days']
         }
         
         # Performance metrics
-        conversion_rate = 0
-        if deal_metrics['total_deals'] > 0:
-            conversion_rate = (deal_metrics['closed_won_deals'] / deal_metrics['total_deals']) * 100
+        conversion_rate = metrics['conversion_rate']
         
         performance_metrics = {
             'conversion_rate': round(conversion_rate, 2),
-            'performance_score': self._calculate_performance_score(
+            'performance_score': calculate_performance_score(
                 customer_metrics['total_customers'],
                 deal_metrics['closed_won_deals'],
                 revenue_metrics['total_revenue'],
@@ -1868,25 +1725,6 @@ class SalesPersonDetailView(APIView):
             }
         })
     
-    def _calculate_performance_score(self, customers, deals, revenue, conversion_rate):
-        """Calculate a performance score based on multiple metrics"""
-        # Convert Decimal to float to avoid type mismatch
-        revenue_float = float(revenue) if revenue else 0.0
-        
-        # Weighted scoring system
-        customer_score = min(customers * 10, 100)  # Max 100 points for customers
-        deal_score = min(deals * 5, 100)           # Max 100 points for deals
-        revenue_score = min(revenue_float / 1000, 100)   # Max 100 points for revenue (₹100k = 100 points)
-        conversion_score = conversion_rate          # 0-100 points for conversion rate
-        
-        # Calculate weighted average
-        total_score = (customer_score * 0.25 + 
-                      deal_score * 0.25 + 
-                      revenue_score * 0.3 + 
-                      conversion_score * 0.2)
-        
-        return round(total_score, 1)
-    
     def _calculate_efficiency_rating(self, recent_customers, recent_deals, recent_revenue):
         """Calculate efficiency rating based on recent performance"""
         if recent_customers == 0 and recent_deals == 0:
@@ -1955,7 +1793,7 @@ class TeamMembersView(APIView):
                         manager=manager_team_member,
                         user__role__in=['inhouse_sales', 'tele_calling'],
                         user__is_active=True
-                    ).distinct('user').order_by('user')  # Ensure unique users
+                    ).select_related('user__store', 'user__tenant').distinct('user_id').order_by('user_id')  # Ensure unique users
                     logger.debug(f"Found {team_member_objects.count()} TeamMember objects")
                     team_members = [tm.user for tm in team_member_objects]
                 except TeamMember.DoesNotExist:
@@ -1979,7 +1817,7 @@ class TeamMembersView(APIView):
                         user__role__in=['inhouse_sales', 'tele_calling'],
                         user__is_active=True,
                         user__tenant=current_user.tenant
-                    ).distinct('user').order_by('user')  # Ensure unique users
+                    ).select_related('user__store', 'user__tenant').distinct('user_id').order_by('user_id')  # Ensure unique users
                     team_members = [tm.user for tm in team_member_objects]
                 except TeamMember.DoesNotExist:
                     team_members = []
@@ -1993,7 +1831,7 @@ class TeamMembersView(APIView):
                         manager=manager_team_member,
                         user__role__in=['inhouse_sales', 'tele_calling'],
                         user__is_active=True
-                    ).distinct('user').order_by('user')  # Ensure unique users
+                    ).select_related('user__store', 'user__tenant').distinct('user_id').order_by('user_id')  # Ensure unique users
                     team_members = [tm.user for tm in team_member_objects]
                 except TeamMember.DoesNotExist:
                     team_members = []
@@ -2007,13 +1845,22 @@ class TeamMembersView(APIView):
             logger.debug(f"Found {len(team_members)} team members for manager {manager_id}")
             logger.debug(f"Team members: {[(tm.id, tm.username, tm.role) for tm in team_members]}")
             
+            # Performance summary for the whole team in a constant number of queries
+            team_metrics = compute_team_metrics(team_members)
+            
             # Return only necessary user data for salesperson assignment
             users = [{
                 'id': member.id,
                 'name': member.get_full_name() or member.username,
                 'role': member.role,
                 'store_name': member.store.name if member.store else None,
-                'tenant_name': member.tenant.name if member.tenant else None
+                'tenant_name': member.tenant.name if member.tenant else None,
+                'metrics': {
+                    'total_customers': team_metrics[member.id]['total_customers'],
+                    'open_deals': team_metrics[member.id]['open_deals'],
+                    'closed_won_deals': team_metrics[member.id]['closed_won_deals'],
+                    'total_revenue': float(team_metrics[member.id]['total_revenue'])
+                }
             } for member in team_members]
             
             return Response({
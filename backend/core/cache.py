@@ -0,0 +1,245 @@
+"""
+Shared cache helpers.
+
+The cache backend is configured in settings.CACHES: Redis when REDIS_CACHE_URL
+is set (shared by every gunicorn worker), per-process locmem otherwise. Code
+should go through these helpers rather than inventing its own key formats.
+
+Keys are namespaced per tenant and embed a version number:
+
+    {namespace}:t{tenant_id}[:{scope}...]:v{version}:{parts}
+
+Invalidation never deletes keys (the Django cache API cannot delete by
+pattern on every backend); it bumps the version with bump_version() and old
+entries simply age out. Version keys are seeded from the clock, so an evicted
+version key can never bring back entries written under an older version.
+
+get_or_set() adds stampede protection: on a miss one caller takes a short lock
+and computes while concurrent callers wait for its result (computing it
+themselves only if the wait runs out).
+
+    @cached_query('catalogue', timeout=600)
+    def category_tree(tenant):
+        ...
+
+    category_tree.invalidate(tenant.id)
+
+    class DropdownView(APIView):
+        @cached_view('dropdowns')
+        def get(self, request):
+            ...
+
+Cache errors (e.g. Redis down) are logged and treated as misses; they never
+fail the request.
+"""
+import hashlib
+import logging
+import time
+from datetime import date, datetime
+from functools import wraps
+
+from django.core.cache import cache
+from django.db.models import Model
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 300
+LOCK_TIMEOUT = 30
+STAMPEDE_WAIT_SECONDS = 5
+STAMPEDE_POLL_SECONDS = 0.05
+
+# Roles that see all of a tenant's data; store-scoped roles vary by store and
+# everybody else only sees their own records (ScopedVisibilityMiddleware).
+TENANT_WIDE_ROLES = ('platform_admin', 'business_admin')
+STORE_SCOPED_ROLES = ('manager',)
+
+
+def _scope_suffix(tenant_id, scope):
+    return ':'.join([f't{tenant_id or "global"}', *(str(part) for part in scope)])
+
+
+def tenant_key(namespace, tenant_id, *parts):
+    """Plain tenant-namespaced key (no versioning)."""
+    return ':'.join([namespace, _scope_suffix(tenant_id, ()), *(str(part) for part in parts)])
+
+
+def version_key(namespace, tenant_id=None, *scope):
+    return f'{namespace}:{_scope_suffix(tenant_id, scope)}:version'
+
+
+def get_version(namespace, tenant_id=None, *scope):
+    key = version_key(namespace, tenant_id, *scope)
+    try:
+        version = cache.get(key)
+        if version is None:
+            # Seed from the clock so an evicted version key never resurrects old entries
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+    except Exception as e:
+        logger.warning("Cache unavailable reading %s: %s", key, e)
+        return None
+    return version
+
+
+def bump_version(namespace, tenant_id=None, *scope):
+    """Invalidate everything cached under (namespace, tenant, scope)."""
+    key = version_key(namespace, tenant_id, *scope)
+    try:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+    except Exception as e:
+        logger.warning("Cache unavailable bumping %s: %s", key, e)
+
+
+def versioned_key(namespace, tenant_id, parts, scope=()):
+    """Key for an entry that bump_version(namespace, tenant_id, *scope) invalidates."""
+    version = get_version(namespace, tenant_id, *scope)
+    return ':'.join([namespace, _scope_suffix(tenant_id, scope), f'v{version}', *(str(part) for part in parts)])
+
+
+def get_or_set(key, compute, timeout=None):
+    """
+    Return the cached value for key, computing and caching it on a miss.
+
+    Only one caller computes a missing key at a time; the others poll for the
+    result for up to STAMPEDE_WAIT_SECONDS. None results are not cached.
+    """
+    timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+    lock_key = f'{key}:lock'
+    try:
+        value = cache.get(key)
+        if value is not None:
+            return value
+        locked = cache.add(lock_key, 1, LOCK_TIMEOUT)
+        if not locked:
+            deadline = time.monotonic() + STAMPEDE_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(STAMPEDE_POLL_SECONDS)
+                value = cache.get(key)
+                if value is not None:
+                    return value
+            logger.warning("Gave up waiting for %s to be computed; computing it here", key)
+    except Exception as e:
+        logger.warning("Cache unavailable reading %s: %s", key, e)
+        return compute()
+
+    # Computed outside the try blocks: errors raised by compute() propagate as-is
+    if not locked:
+        return compute()
+    try:
+        value = compute()
+        if value is not None:
+            try:
+                cache.set(key, value, timeout)
+            except Exception as e:
+                logger.warning("Cache unavailable writing %s: %s", key, e)
+        return value
+    finally:
+        try:
+            cache.delete(lock_key)
+        except Exception:
+            pass
+
+
+def _key_part(value):
+    if isinstance(value, Model):
+        return f'{value._meta.label_lower}.{value.pk}'
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(_key_part(item) for item in value) + ']'
+    if isinstance(value, dict):
+        return '{' + ','.join(f'{k}={_key_part(v)}' for k, v in sorted(value.items())) + '}'
+    return repr(value)
+
+
+def digest(*parts, **named):
+    """Short stable hash of arguments (model instances hash by pk) for use in keys."""
+    raw = '|'.join([_key_part(part) for part in parts] + [f'{k}={_key_part(v)}' for k, v in sorted(named.items())])
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _tenant_id_from(args, kwargs):
+    for name in ('tenant', 'tenant_id'):
+        if name in kwargs:
+            value = kwargs[name]
+            return getattr(value, 'pk', value)
+    if args:
+        first = args[0]
+        if isinstance(first, Model):
+            return first.pk if first._meta.model_name == 'tenant' else getattr(first, 'tenant_id', None)
+        if isinstance(first, int):
+            return first
+    return None
+
+
+def cached_query(namespace, timeout=None, tenant=None):
+    """
+    Cache a function's return value per tenant and arguments.
+
+    The tenant is taken from tenant(*args, **kwargs) when given, otherwise from
+    a tenant/tenant_id keyword or the first argument (a Tenant, an object with
+    tenant_id, or an id). The wrapper gets .invalidate(tenant_id).
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            tenant_id = tenant(*args, **kwargs) if tenant else _tenant_id_from(args, kwargs)
+            key = versioned_key(namespace, tenant_id, [func.__name__, digest(*args, **kwargs)])
+            return get_or_set(key, lambda: func(*args, **kwargs), timeout)
+
+        wrapper.invalidate = lambda tenant_id=None: bump_version(namespace, tenant_id)
+        return wrapper
+    return decorator
+
+
+def visibility_scope(user):
+    """Cache scope for data shaped by ScopedVisibilityMiddleware: 'all', 'store<id>' or 'user<id>'."""
+    if user.role in TENANT_WIDE_ROLES:
+        return 'all'
+    if user.role in STORE_SCOPED_ROLES:
+        return f'store{user.store_id}'
+    return f'user{user.pk}'
+
+
+def cached_view(namespace, timeout=None):
+    """
+    Cache successful GET responses of a DRF view function or method.
+
+    Entries vary by tenant, role, visibility scope and the full request path
+    including query string; bump_version(namespace, tenant_id) (or the
+    decorated view's .invalidate) drops them.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            request = args[0] if hasattr(args[0], 'META') else args[1]
+            user = request.user
+            if request.method != 'GET' or not user.is_authenticated:
+                return view(*args, **kwargs)
+
+            key = versioned_key(
+                namespace, user.tenant_id,
+                [user.role, visibility_scope(user), digest(request.get_full_path())],
+            )
+
+            def render():
+                response = view(*args, **kwargs)
+                # Only plain 200 DRF responses can be rebuilt from their data
+                if isinstance(response, Response) and response.status_code == 200:
+                    return response.data
+                render.uncacheable = response
+                return None
+
+            render.uncacheable = None
+            data = get_or_set(key, render, timeout)
+            if render.uncacheable is not None:
+                return render.uncacheable
+            return Response(data)
+
+        wrapper.invalidate = lambda tenant_id=None: bump_version(namespace, tenant_id)
+        return wrapper
+    return decorator
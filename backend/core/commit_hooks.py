@@ -0,0 +1,35 @@
+"""
+Work deferred until the current transaction commits.
+
+Derived data (daily rollups, client tags, announcement inboxes, goal progress)
+is refreshed once the writes that affect it have committed. after_commit()
+registers one on_commit callback per call carrying that call's keys, so when
+the transaction - or the savepoint the call was made in - rolls back, Django
+drops the callback and its keys with it. Nothing is collected per thread, so
+keys of a rolled back write can never be flushed with the next commit.
+
+Handlers receive the keys of one call, so bulk paths should pass all their
+ids in one call. Work that must coalesce across writes queues the keys it
+receives in a process-wide set and drains it from a worker (see
+apps.analytics.rollups and apps.clients.status_queue). Handler errors are
+logged, not raised: the data has committed and the request must not fail
+because a derived table lagged.
+"""
+import logging
+from functools import partial
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def _run(handler, args, description):
+    try:
+        handler(*args)
+    except Exception as e:
+        logger.error("%s failed after commit: %s", description, e, exc_info=True)
+
+
+def after_commit(handler, *args, description=None):
+    """Call handler(*args) once the current transaction commits (right away outside one)."""
+    transaction.on_commit(partial(_run, handler, args, description or handler.__name__))
@@ -0,0 +1,110 @@
+"""
+Conditional GET responses (ETag / Last-Modified -> 304 Not Modified).
+
+Read-heavy endpoints whose data rarely changes compute a cheap version stamp
+before doing any real work: an aggregate of max(updated_at) and the row count
+over the queryset they would serialise (the count catches deletions), or a
+constant hash for data defined in code. The stamp, the request path and the
+caller's tenant/visibility scope make a weak ETag; when the client already
+holds it the view is skipped and a 304 goes back.
+
+    class CategoryListView(ConditionalListMixin, generics.ListAPIView):
+        ...
+
+    @action(detail=False, methods=['get'])
+    @conditional(lambda view, request: OPTIONS_STAMP)
+    def dropdown_options(self, request):
+        ...
+
+Authenticated responses get "Cache-Control: private, no-cache" (browsers keep
+them but revalidate every time) and vary on Authorization; public endpoints
+pass their own cache_control, e.g. PUBLIC_CACHE_CONTROL.
+"""
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .cache import digest, visibility_scope
+
+PRIVATE_CACHE_CONTROL = {'private': True, 'no_cache': True}
+PUBLIC_CACHE_CONTROL = {'public': True, 'max_age': 60}
+
+
+def queryset_stamp(*querysets, field='updated_at'):
+    """(seed, last_modified) from max(field) and count(*) of each queryset, one aggregate query each."""
+    parts, last_modified = [], None
+    for queryset in querysets:
+        row = queryset.order_by().aggregate(latest=Max(field), total=Count('pk'))
+        parts.append(f"{queryset.model._meta.label_lower}:{row['total']}:{row['latest'] and row['latest'].isoformat()}")
+        if row['latest'] and (last_modified is None or row['latest'] > last_modified):
+            last_modified = row['latest']
+    return '|'.join(parts), last_modified
+
+
+def static_stamp(*values):
+    """Stamp for data defined in code: changes only when the data (i.e. a deploy) does."""
+    return digest(*values)
+
+
+def _request_from(args):
+    return args[0] if hasattr(args[0], 'META') else args[1]
+
+
+def conditional(stamp, cache_control=None):
+    """
+    Answer GET/HEAD with 304 when the client's ETag or Last-Modified is current.
+
+    stamp gets the view's arguments ((self, request, ...) for methods,
+    (request, ...) for function views) and returns a seed string or a
+    (seed, last_modified) pair.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            request = _request_from(args)
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            seed = stamp(*args, **kwargs)
+            seed, last_modified = seed if isinstance(seed, tuple) else (seed, None)
+            user = getattr(request, 'user', None)
+            authenticated = bool(user and user.is_authenticated)
+            scope = (user.tenant_id, visibility_scope(user)) if authenticated else ()
+            etag = f'W/"{digest(seed, request.get_full_path(), *scope)}"'
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view(*args, **kwargs)
+            if response.status_code in (200, 304):
+                response.headers.setdefault('ETag', etag)
+                if timestamp is not None:
+                    response.headers.setdefault('Last-Modified', http_date(timestamp))
+                patch_cache_control(response, **(cache_control or PRIVATE_CACHE_CONTROL))
+            if authenticated:
+                patch_vary_headers(response, ['Authorization'])
+            return response
+
+        return wrapper
+    return decorator
+
+
+class ConditionalListMixin:
+    """
+    ListAPIView mixin: stamp the list from get_queryset() (or
+    get_conditional_querysets() when the serialised data depends on more
+    tables) and answer 304 when nothing changed.
+    """
+    conditional_cache_control = None
+
+    def get_conditional_querysets(self):
+        return [self.get_queryset()]
+
+    def list(self, request, *args, **kwargs):
+        view = conditional(
+            lambda request, *args, **kwargs: queryset_stamp(*self.get_conditional_querysets()),
+            cache_control=self.conditional_cache_control,
+        )(super().list)
+        return view(request, *args, **kwargs)
@@ -122,35 +122,72 @@ class StructuredLogger:
         
         return " | ".join(parts)
     
-    def info(self, message: str, request: Optional[HttpRequest] = None, **kwargs):
-        """Log an info message with context."""
+    def isEnabledFor(self, level: int) -> bool:
+        """True if a record at this level would be emitted (use to guard expensive debug-only work)."""
+        return self.logger.isEnabledFor(level)
+
+    def _log(self, level: int, message: str, args: tuple, request: Optional[HttpRequest],
+             exc_info: bool = False, **kwargs):
+        # Bail out before touching the request: building context can hit the
+        # database (user.tenant, user.store) and disabled levels must cost nothing
+        if not self.logger.isEnabledFor(level):
+            return
         context = self._get_context(request, **kwargs)
-        formatted_message = self._format_message(message, context)
-        self.logger.info(formatted_message, extra={'context': context})
-    
-    def warning(self, message: str, request: Optional[HttpRequest] = None, **kwargs):
+        context_suffix = self._format_message('', context)
+        if args:
+            # message stays a %-template; logging formats it only when a handler emits it
+            context_suffix = context_suffix.replace('%', '%%')
+        self.logger.log(level, message + context_suffix, *args, extra={'context': context}, exc_info=exc_info)
+
+    def info(self, message: str, *args, request: Optional[HttpRequest] = None, **kwargs):
+        """Log an info message with context."""
+        self._log(logging.INFO, message, args, request, **kwargs)
+
+    def warning(self, message: str, *args, request: Optional[HttpRequest] = None, **kwargs):
         """Log a warning message with context."""
-        context = self._get_context(request, **kwargs)
-        formatted_message = self._format_message(message, context)
-        self.logger.warning(formatted_message, extra={'context': context})
-    
-    def error(self, message: str, request: Optional[HttpRequest] = None, exc_info: bool = False, **kwargs):
+        self._log(logging.WARNING, message, args, request, **kwargs)
+
+    def error(self, message: str, *args, request: Optional[HttpRequest] = None, exc_info: bool = False, **kwargs):
         """Log an error message with context."""
-        context = self._get_context(request, **kwargs)
-        formatted_message = self._format_message(message, context)
-        self.logger.error(formatted_message, extra={'context': context}, exc_info=exc_info)
-    
-    def debug(self, message: str, request: Optional[HttpRequest] = None, **kwargs):
-        """Log a debug message with context."""
-        context = self._get_context(request, **kwargs)
-        formatted_message = self._format_message(message, context)
-        self.logger.debug(formatted_message, extra={'context': context})
-    
-    def critical(self, message: str, request: Optional[HttpRequest] = None, **kwargs):
+        self._log(logging.ERROR, message, args, request, exc_info=exc_info, **kwargs)
+
+    def exception(self, message: str, *args, request: Optional[HttpRequest] = None, **kwargs):
+        """Log an error message with context and the current exception's traceback."""
+        self._log(logging.ERROR, message, args, request, exc_info=True, **kwargs)
+
+    def debug(self, message: str, *args, request: Optional[HttpRequest] = None, **kwargs):
+        """
+        Log a debug message with context.
+
+        Pass values as %-style args rather than an f-string so nothing is
+        formatted unless DEBUG is enabled for this module; wrap expensive
+        values (e.g. queryset.count) in lazy() so they are not even computed.
+        """
+        self._log(logging.DEBUG, message, args, request, **kwargs)
+
+    def critical(self, message: str, *args, request: Optional[HttpRequest] = None, **kwargs):
         """Log a critical message with context."""
-        context = self._get_context(request, **kwargs)
-        formatted_message = self._format_message(message, context)
-        self.logger.critical(formatted_message, extra={'context': context})
+        self._log(logging.CRITICAL, message, args, request, **kwargs)
+
+
+class lazy:
+    """
+    Defer computing a log argument until the record is actually formatted.
+
+    Usage:
+        logger.debug("Products before filtering: %s", lazy(queryset.count))
+    """
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        return str(self.func(*self.args))
+
+    def __repr__(self):
+        return repr(self.func(*self.args))
 
 
 def get_logger(name: str) -> StructuredLogger:
@@ -0,0 +1,161 @@
+"""
+Per-request query profiler and N+1 detector (opt-in: QUERY_PROFILER_ENABLED).
+
+Every query run while a request is handled goes through a database execute
+wrapper that records its duration and a fingerprint of its SQL (whitespace
+collapsed, IN (%s, %s, ...) lists folded to one placeholder). The same
+fingerprint showing up QUERY_PROFILER_DUPLICATE_THRESHOLD times or more in one
+request is reported as a likely N+1.
+
+For each request the profiler:
+  - adds a Server-Timing header (db time, query count, app time), visible in
+    the browser devtools network panel
+  - logs the figures as structured fields (warning when slow or N+1)
+  - appends slow / N+1 requests, sampled at QUERY_PROFILER_SAMPLE_RATE, to
+    QUERY_PROFILER_SAMPLE_FILE as one JSON object per line
+
+Rank the sampled endpoints with `python manage.py query_profile_report`.
+Works with DEBUG off; nothing is recorded for requests outside /api/.
+"""
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+
+from core.logging_utils import format_event_message, get_logger, log_event_warning
+
+logger = get_logger('query_profiler')
+
+DEFAULT_SLOW_MS = 500
+DEFAULT_DUPLICATE_THRESHOLD = 5
+DEFAULT_SAMPLE_RATE = 1.0
+MAX_SQL_LENGTH = 500
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_WHITESPACE = re.compile(r'\s+')
+_write_lock = threading.Lock()
+
+
+def normalize_sql(sql):
+    return _IN_LIST.sub('IN (%s...)', _WHITESPACE.sub(' ', sql).strip())
+
+
+def fingerprint(sql):
+    return hashlib.md5(normalize_sql(sql).encode()).hexdigest()[:12]
+
+
+class QueryProfile:
+    """Queries seen while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.db_ms = 0.0
+        self.fingerprints = Counter()
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - started) * 1000
+            self.count += 1
+            key = fingerprint(sql)
+            self.fingerprints[key] += 1
+            self.statements.setdefault(key, normalize_sql(sql)[:MAX_SQL_LENGTH])
+
+    def duplicates(self, threshold):
+        return [
+            {'fingerprint': key, 'count': count, 'sql': self.statements[key]}
+            for key, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryProfilerMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_PROFILER_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'QUERY_PROFILER_SLOW_MS', DEFAULT_SLOW_MS)
+        self.duplicate_threshold = getattr(
+            settings, 'QUERY_PROFILER_DUPLICATE_THRESHOLD', DEFAULT_DUPLICATE_THRESHOLD,
+        )
+        self.sample_rate = getattr(settings, 'QUERY_PROFILER_SAMPLE_RATE', DEFAULT_SAMPLE_RATE)
+        self.sample_file = getattr(settings, 'QUERY_PROFILER_SAMPLE_FILE', None)
+        if self.sample_file:
+            os.makedirs(os.path.dirname(self.sample_file) or '.', exist_ok=True)
+
+    def __call__(self, request):
+        if not request.path.startswith('/api/'):
+            return self.get_response(request)
+
+        profile = QueryProfile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        duplicates = profile.duplicates(self.duplicate_threshold)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={profile.db_ms:.1f};desc="{profile.count} queries"',
+            f'app;dur={total_ms - profile.db_ms:.1f}',
+            *([f'dup;desc="{len(duplicates)} repeated queries"'] if duplicates else []),
+        ])
+        self._report(request, response, profile, total_ms, duplicates)
+        return response
+
+    def _route(self, request):
+        match = getattr(request, 'resolver_match', None)
+        return '/' + match.route if match and match.route else request.path
+
+    def _report(self, request, response, profile, total_ms, duplicates):
+        fields = {
+            'method': request.method,
+            'route': self._route(request),
+            'status': response.status_code,
+            'duration_ms': f'{total_ms:.1f}',
+            'queries': profile.count,
+            'db_ms': f'{profile.db_ms:.1f}',
+            'duplicated': len(duplicates),
+            'request_id': getattr(request, 'request_id', None),
+        }
+        slow = total_ms >= self.slow_ms
+        if duplicates or slow:
+            log_event_warning(
+                logger, service='api', event='request.profile',
+                note='possible N+1' if duplicates else 'slow request', **fields,
+            )
+            if self.sample_file and random.random() < self.sample_rate:
+                self._sample(request, fields, duplicates)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(format_event_message('api', 'request.profile', **fields))
+
+    def _sample(self, request, fields, duplicates):
+        record = {
+            'at': timezone.now().isoformat(),
+            **fields,
+            'path': request.path,
+            'duration_ms': float(fields['duration_ms']),
+            'db_ms': float(fields['db_ms']),
+            'duplicates': duplicates,
+        }
+        line = json.dumps(record, default=str) + '\n'
+        try:
+            with _write_lock, open(self.sample_file, 'a') as sample_file:
+                sample_file.write(line)
+        except OSError as e:
+            logger.warning("Could not write query profile sample to %s: %s", self.sample_file, e)
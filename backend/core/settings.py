@@ -87,6 +87,17 @@ MIDDLEWARE = [
     'apps.core.middleware.GlobalDateFilterMiddleware',  # Global date filtering
 ]
 
+# Query profiler: per-request query count, DB time and repeated (N+1) queries as
+# Server-Timing headers and log fields; slow/N+1 requests are sampled to a JSONL
+# file for `manage.py query_profile_report`. Opt-in, see core/query_profiler_middleware.py
+QUERY_PROFILER_ENABLED = config('QUERY_PROFILER_ENABLED', default=False, cast=bool)
+QUERY_PROFILER_SLOW_MS = config('QUERY_PROFILER_SLOW_MS', default=500, cast=int)
+QUERY_PROFILER_DUPLICATE_THRESHOLD = config('QUERY_PROFILER_DUPLICATE_THRESHOLD', default=5, cast=int)
+QUERY_PROFILER_SAMPLE_RATE = config('QUERY_PROFILER_SAMPLE_RATE', default=1.0, cast=float)
+QUERY_PROFILER_SAMPLE_FILE = config('QUERY_PROFILER_SAMPLE_FILE', default=str(BASE_DIR / 'logs' / 'query_profile.jsonl'))
+if QUERY_PROFILER_ENABLED:
+    MIDDLEWARE.insert(0, 'core.query_profiler_middleware.QueryProfilerMiddleware')
+
 # Debug toolbar: only load when DEBUG so manage.py check works when toolbar not installed
 if DEBUG:
     INSTALLED_APPS += ['debug_toolbar']
@@ -230,7 +241,7 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',  # Enable authentication for production
@@ -262,6 +273,56 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
 }
 
+# Cache: Redis when REDIS_CACHE_URL is set so every worker shares it (login rate
+# limits, dashboards, cached principals); per-process locmem otherwise.
+# Helpers for tenant-namespaced, versioned entries live in core/cache.py.
+REDIS_CACHE_URL = config('REDIS_CACHE_URL', default='')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+            'KEY_PREFIX': 'crm',
+            'TIMEOUT': 300,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'crm',
+            'TIMEOUT': 300,
+        },
+    }
+
+# Seconds an authenticated user (with tenant and store) stays cached between
+# requests; user/tenant/store changes invalidate it sooner (apps.users.signals)
+AUTH_PRINCIPAL_CACHE_TIMEOUT = config('AUTH_PRINCIPAL_CACHE_TIMEOUT', default=60, cast=int)
+
+# Sale writes queue the client's status (VVIP/VIP/General) for recomputation; the
+# queue is drained this many seconds after the first write (apps.clients.status_queue)
+CLIENT_STATUS_DEBOUNCE_SECONDS = config('CLIENT_STATUS_DEBOUNCE_SECONDS', default=2.0, cast=float)
+# False recalculates the status inline when the transaction commits (tests, scripts)
+CLIENT_STATUS_RECOMPUTE_ASYNC = config('CLIENT_STATUS_RECOMPUTE_ASYNC', default=True, cast=bool)
+
+# Sale/client/pipeline/appointment writes queue their (tenant, day) rollup buckets; a worker
+# rebuilds them this many seconds after the first write (apps.analytics.rollups).
+# False rebuilds inline when the transaction commits (tests, scripts)
+ANALYTICS_ROLLUP_DEBOUNCE_SECONDS = config('ANALYTICS_ROLLUP_DEBOUNCE_SECONDS', default=2.0, cast=float)
+ANALYTICS_ROLLUP_REFRESH_ASYNC = config('ANALYTICS_ROLLUP_REFRESH_ASYNC', default=True, cast=bool)
+
+# Notification retention
+# The notifications list only reads the last NOTIFICATION_HOT_DAYS days; rows older than
+# their type's TTL are moved to NotificationArchive by `manage.py archive_notifications`
+# and archived rows are purged after NOTIFICATION_ARCHIVE_RETENTION_DAYS.
+NOTIFICATION_HOT_DAYS = config('NOTIFICATION_HOT_DAYS', default=7, cast=int)
+NOTIFICATION_RETENTION_DAYS = {
+    'default': config('NOTIFICATION_RETENTION_DAYS', default=30, cast=int),
+    'appointment_reminder': 7,
+    'customer_updated': 14,
+}
+NOTIFICATION_ARCHIVE_RETENTION_DAYS = config('NOTIFICATION_ARCHIVE_RETENTION_DAYS', default=365, cast=int)
+
 # Feature flags and lightweight auth configs
 # Sales PIN quick login is enabled by default for sales users
 SALES_PIN_LOGIN_ENABLED = config('SALES_PIN_LOGIN_ENABLED', default=True, cast=bool)
@@ -399,6 +460,12 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'terminal',
         },
+        # Used by modules given an explicit level in LOG_LEVELS, so their debug output isn't dropped
+        'module_console': {
+            'level': 'DEBUG',
+            'class': 'logging.StreamHandler',
+            'formatter': 'terminal',
+        },
     },
     'root': {
         'handlers': ['console'],
@@ -431,6 +498,17 @@ LOGGING = {
     },
 }
 
+# Per-module log levels, e.g. LOG_LEVELS=apps.products.views=DEBUG,apps.core.middleware=DEBUG
+# Debug output in the app (formerly print statements) is off unless enabled here.
+for _module_level in config('LOG_LEVELS', default='', cast=Csv()):
+    _module, _, _level = _module_level.partition('=')
+    if _module.strip() and _level.strip():
+        LOGGING['loggers'][_module.strip()] = {
+            'handlers': ['module_console'],
+            'level': _level.strip().upper(),
+            'propagate': False,
+        }
+
 
 # Channels Configuration
 ASGI_APPLICATION = 'core.asgi.application'
@@ -0,0 +1,44 @@
+"""
+The stored row behind an instance being saved.
+
+pre_save receivers in several apps compare an instance with the row as
+currently stored (its previous store, representative, stage, close date...).
+Each doing its own SELECT cost one query per receiver on every save. Models
+saved on hot paths wrap their save() in tracking_save(): the first
+stored_values() call during that save reads the whole row once and later calls
+reuse it. For other models stored_values() reads just the fields asked for.
+
+    def save(self, *args, **kwargs):
+        with tracking_save(self):
+            return super().save(*args, **kwargs)
+
+    previous = stored_values(instance, 'store_id')   # None for new rows
+"""
+from contextlib import contextmanager
+
+_UNLOADED = object()
+
+
+@contextmanager
+def tracking_save(instance):
+    """Share one read of the stored row between everything that asks during this save."""
+    instance._stored_row = _UNLOADED
+    try:
+        yield
+    finally:
+        instance.__dict__.pop('_stored_row', None)
+
+
+def stored_values(instance, *fields):
+    """{attname: value} of fields as currently stored, or None when the row is not saved yet."""
+    if not instance.pk:
+        return None
+    model = type(instance)
+    row = instance.__dict__.get('_stored_row')
+    if row is None:
+        return model._base_manager.filter(pk=instance.pk).values(*fields).first()
+    if row is _UNLOADED:
+        attnames = [field.attname for field in instance._meta.concrete_fields]
+        row = model._base_manager.filter(pk=instance.pk).values(*attnames).first() or {}
+        instance._stored_row = row
+    return {field: row[field] for field in fields} if row else None
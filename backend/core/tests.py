@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.response import Response
+
+from apps.tenants.models import Tenant
+from .cache import bump_version, cached_query, cached_view, get_or_set, tenant_key, versioned_key
+from .conditional import PUBLIC_CACHE_CONTROL, conditional, static_stamp
+from .query_profiler_middleware import QueryProfilerMiddleware, normalize_sql
+
+CALLS = []
+
+
+@cached_query('tests')
+def tenant_total(tenant_id, multiplier=1):
+    CALLS.append(tenant_id)
+    return tenant_id * multiplier
+
+
+class CacheHelpersTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        CALLS.clear()
+
+    def test_keys_are_tenant_namespaced(self):
+        self.assertEqual(tenant_key('catalogue', 7, 'tree'), 'catalogue:t7:tree')
+        self.assertNotEqual(versioned_key('catalogue', 7, ['tree']), versioned_key('catalogue', 8, ['tree']))
+
+    def test_bump_version_invalidates_only_that_tenant(self):
+        self.assertEqual([tenant_total(1), tenant_total(1), tenant_total(2)], [1, 1, 2])
+        self.assertEqual(CALLS, [1, 2])
+
+        tenant_total.invalidate(1)
+        tenant_total(1)
+        tenant_total(2)
+        tenant_total(1, multiplier=3)
+        self.assertEqual(CALLS, [1, 2, 1, 1])
+
+    def test_evicted_version_does_not_resurrect_old_entries(self):
+        old = versioned_key('tests', 1, ['x'])
+        cache.set(old, 'stale')
+        bump_version('tests', 1)
+        cache.delete('tests:t1:version')
+        self.assertEqual(get_or_set(versioned_key('tests', 1, ['x']), lambda: 'fresh'), 'fresh')
+
+    def test_waits_for_concurrent_computation(self):
+        key = versioned_key('tests', 1, ['slow'])
+        cache.add(f'{key}:lock', 1)
+        cache.set(key, 'computed elsewhere')
+        self.assertEqual(get_or_set(key, lambda: self.fail('should not recompute')), 'computed elsewhere')
+
+    def test_compute_errors_propagate_once_and_write_errors_are_swallowed(self):
+        calls = []
+
+        def failing():
+            calls.append(1)
+            raise RuntimeError('db down')
+
+        key = versioned_key('tests', 1, ['fails'])
+        cache.add(f'{key}:lock', 1)
+        with patch('core.cache.STAMPEDE_WAIT_SECONDS', 0), self.assertRaises(RuntimeError):
+            get_or_set(key, failing)
+        self.assertEqual(calls, [1])
+
+        with patch.object(cache, 'set', side_effect=ConnectionError('redis down')):
+            self.assertEqual(get_or_set(versioned_key('tests', 1, ['set']), lambda: 'value'), 'value')
+
+
+class User:
+    is_authenticated = True
+    pk = 5
+    tenant_id = 1
+    store_id = 2
+
+    def __init__(self, role):
+        self.role = role
+
+
+class CachedViewTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.hits = 0
+
+        @cached_view('tests.view')
+        def view(request):
+            self.hits += 1
+            return Response({'hits': self.hits})
+
+        self.view = view
+
+    def _get(self, role, path='/api/x/'):
+        request = RequestFactory().get(path)
+        request.user = User(role)
+        return self.view(request).data
+
+    def test_responses_vary_by_scope_and_query(self):
+        self.assertEqual(self._get('business_admin'), {'hits': 1})
+        self.assertEqual(self._get('business_admin'), {'hits': 1})
+        self.assertEqual(self._get('manager'), {'hits': 2})
+        self.assertEqual(self._get('business_admin', '/api/x/?page=2'), {'hits': 3})
+
+        self.view.invalidate(1)
+        self.assertEqual(self._get('business_admin'), {'hits': 4})
+
+
+class ConditionalViewTest(SimpleTestCase):
+    def test_static_stamp_answers_not_modified(self):
+        calls = []
+
+        @conditional(lambda request: static_stamp({'a': 1}), cache_control=PUBLIC_CACHE_CONTROL)
+        def view(request):
+            calls.append(request)
+            return Response({'a': 1})
+
+        request = RequestFactory().get('/api/options/')
+        response = view(request)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+
+        request = RequestFactory().get('/api/options/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(view(request).status_code, 304)
+        self.assertEqual(len(calls), 1)
+
+
+class QueryProfilerTest(TestCase):
+    def test_repeated_queries_are_reported_and_sampled(self):
+        def view(request):
+            for tenant_id in range(6):
+                Tenant.objects.filter(id=tenant_id).exists()
+            return HttpResponse('ok')
+
+        with tempfile.TemporaryDirectory() as directory:
+            sample_file = os.path.join(directory, 'profile.jsonl')
+            with override_settings(QUERY_PROFILER_ENABLED=True, QUERY_PROFILER_SAMPLE_FILE=sample_file):
+                response = QueryProfilerMiddleware(view)(RequestFactory().get('/api/tenants/'))
+            with open(sample_file) as f:
+                [record] = [json.loads(line) for line in f]
+
+        self.assertIn('desc="6 queries"', response['Server-Timing'])
+        self.assertIn('dup;', response['Server-Timing'])
+        self.assertEqual(record['queries'], 6)
+        self.assertEqual(record['duplicates'][0]['count'], 6)
+
+    def test_in_lists_share_a_fingerprint(self):
+        self.assertEqual(
+            normalize_sql('SELECT 1 WHERE id IN (%s, %s)'), normalize_sql('SELECT 1 WHERE id IN (%s)'),
+        )
@@ -35,6 +35,7 @@ class Command(BaseCommand):
                 'task_type': 'data_sync',
                 'frequency': 'hourly',  # Sync every hour
                 'task_config': {
+                    'handler': 'google_sheets.sync',
                     'service': 'google_sheets',
                     'auto_assign': True,
                     'notify_on_success': True,
@@ -65,6 +66,7 @@ class Command(BaseCommand):
                 'task_type': 'notification',
                 'frequency': 'daily',  # Check daily
                 'task_config': {
+                    'handler': 'google_sheets.check_connection',
                     'service': 'google_sheets',
                     'check_connection': True,
                     'alert_on_failure': True,
@@ -1,5 +1,6 @@
 #!/usr/bin/env bash
-# Run appointment reminder notifications (1 hour before).
+# Run appointment reminder notifications (1 hour before) once and exit.
+# For continuous delivery prefer: python manage.py run_reminder_scheduler
 # Used on Utho production from cron or systemd.
 # Usage: run from backend dir, or set BACKEND_DIR.
 
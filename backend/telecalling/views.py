@@ -18,6 +18,9 @@ from .serializers import (
     BulkAssignmentSerializer, AssignmentStatsSerializer, DashboardDataSerializer,
     LeadSerializer, LeadDetailSerializer, LeadTransferSerializer, LeadTransferCreateSerializer
 )
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
 
 class CustomerVisitViewSet(viewsets.ModelViewSet):
     """Step 1: In-House Sales Rep records customer visit info"""
@@ -772,12 +775,12 @@ class LeadTransferViewSet(viewsets.ModelViewSet):
                         client_data['notes'] += f"\nOriginal tags: {', '.join(lead.tags)}"
                     
                     client = Client.objects.create(**client_data)
-                    print(f"✅ Created client {client.id} for transferred lead {lead.name}")
+                    logger.debug('Created client %s for transferred lead %s', client.id, lead.name)
                 else:
                     # Update existing client assignment
                     existing_client.assigned_to = to_user
                     existing_client.save()
-                    print(f"✅ Updated existing client {existing_client.id} assignment for transferred lead {lead.name}")
+                    logger.debug('Updated existing client %s assignment for transferred lead %s', existing_client.id, lead.name)
                 
                 return Response({
                     'message': 'Lead transferred successfully',
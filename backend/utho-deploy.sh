@@ -243,11 +243,20 @@ restart_service "postgresql" "PostgreSQL"
 restart_service "redis-server" "Redis"
 restart_service "crm-backend.service" "CRM Backend"
 
-# Step 9b: Install and enable appointment reminder timer (Option A)
-# Safe: job runs every 15 min but only sends ONE reminder per appointment (~1 hr before); reminder_sent flag prevents repeat.
-log "Step 9b: Installing appointment reminder timer (runs every 15 min)..."
+# Step 9b: Install and enable the appointment reminder scheduler
+# Long-running service that fires each reminder at its due time (~1 hr before); reminder_sent flag prevents repeat.
+# Falls back to the 15-minute timer when the scheduler unit is not present.
+log "Step 9b: Installing appointment reminder scheduler..."
 DEPLOY_UTHO="$PROJECT_ROOT/backend/deploy/utho"
-if [[ -f "$DEPLOY_UTHO/crm-appointment-reminders.service" && -f "$DEPLOY_UTHO/crm-appointment-reminders.timer" ]]; then
+if [[ -f "$DEPLOY_UTHO/crm-reminder-scheduler.service" ]]; then
+    sudo cp "$DEPLOY_UTHO/crm-reminder-scheduler.service" /etc/systemd/system/
+    sudo systemctl daemon-reload
+    # The scheduler replaces the periodic timer
+    sudo systemctl disable crm-appointment-reminders.timer --now 2>/dev/null || true
+    sudo systemctl enable crm-reminder-scheduler.service
+    sudo systemctl restart crm-reminder-scheduler.service
+    success "Appointment reminder scheduler enabled"
+elif [[ -f "$DEPLOY_UTHO/crm-appointment-reminders.service" && -f "$DEPLOY_UTHO/crm-appointment-reminders.timer" ]]; then
     sudo cp "$DEPLOY_UTHO/crm-appointment-reminders.service" /etc/systemd/system/
     sudo cp "$DEPLOY_UTHO/crm-appointment-reminders.timer" /etc/systemd/system/
     sudo systemctl daemon-reload
@@ -310,7 +319,7 @@ echo "  ✅ Dependencies installed/verified"
 echo "  ✅ Database migrated"
 echo "  ✅ Static files collected"
 echo "  ✅ Services restarted"
-echo "  ✅ Appointment reminder timer (every 15 min)"
+echo "  ✅ Appointment reminder scheduler"
 echo "  ✅ Health checks completed"
 echo ""
 echo "=================================="
@@ -360,7 +369,7 @@ echo ""
 info "📝 Quick log commands for future use:"
 echo "  - All logs:       sudo journalctl -f"
 echo "  - Backend:        sudo journalctl -u crm-backend.service -f"
-echo "  - Reminder timer: sudo journalctl -u crm-appointment-reminders.service -f"
+echo "  - Reminders:      sudo journalctl -u crm-reminder-scheduler.service -f"
 echo "  - PostgreSQL:     sudo journalctl -u postgresql -f"
 echo "  - Redis:          sudo journalctl -u redis-server -f"
 echo "  - Nginx access:   sudo tail -f /var/log/nginx/access.log"